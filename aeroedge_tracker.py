@@ -18,15 +18,33 @@ Usage:
 
     # Track custom events
     track_event('user_signup', {'source': 'landing_page'})
+
+Events are queued in memory and posted in batches by one background sender
+thread per process, over a single keep-alive session. Request handlers never
+wait on the tracking API. Batches the API rejects or times out on are written
+to an on-disk spool and replayed with backoff once it recovers.
+
+Page views and feature usage are not sent one by one: they are rolled up
+per minute (counts, unique visitors, duration and byte percentiles per
+route / feature / aircraft) and shipped as one "rollup" event per interval.
+Rollups need the collector's /track/batch endpoint, so events are only
+rolled up once a batch POST has succeeded; until then, and for good on a
+collector without that endpoint, raw events are sent. Set
+TRACKING_ROLLUPS=false to always send raw events.
 """
 
+import atexit
+import bisect
+import glob
 import hashlib
+import json
+import tempfile
 import time
 import os
 import threading
+from collections import deque
 from functools import wraps
 from typing import Optional, Callable, Any
-import requests
 from flask import request, g, has_request_context
 
 # Configuration
@@ -35,6 +53,24 @@ PROJECT_SLUG = os.environ.get('PROJECT_SLUG', 'em-diagram')
 IP_HASH_SALT = os.environ.get('IP_HASH_SALT', 'aeroedge')
 TRACKING_ENABLED = os.environ.get('TRACKING_ENABLED', 'true').lower() == 'true'
 TRACKING_TIMEOUT = 0.5  # seconds - fire-and-forget timeout
+TRACKING_BATCH_SIZE = int(os.environ.get('TRACKING_BATCH_SIZE', '50'))  # events per POST
+TRACKING_FLUSH_INTERVAL = float(os.environ.get('TRACKING_FLUSH_INTERVAL', '2.0'))  # seconds
+TRACKING_QUEUE_SIZE = int(os.environ.get('TRACKING_QUEUE_SIZE', '10000'))  # oldest dropped beyond this
+# Spool for undelivered batches; set TRACKING_SPOOL_DIR to "" to disable
+TRACKING_SPOOL_DIR = os.environ.get(
+    'TRACKING_SPOOL_DIR', os.path.join(tempfile.gettempdir(), f'aeroedge_tracking_spool_{PROJECT_SLUG}')
+)
+TRACKING_SPOOL_SEGMENT_BYTES = 1024 * 1024  # rotate segment files at this size
+TRACKING_SPOOL_MAX_BYTES = 64 * 1024 * 1024  # oldest segments deleted beyond this
+TRACKING_RETRY_MIN = 1.0  # seconds; replay backoff doubles up to TRACKING_RETRY_MAX
+TRACKING_RETRY_MAX = 300.0
+TRACKING_ROLLUPS = os.environ.get('TRACKING_ROLLUPS', 'true').lower() == 'true'
+TRACKING_ROLLUP_INTERVAL = 60  # seconds per rollup bucket
+PER_KIND_ENDPOINTS = ('pageview', 'feature', 'event')  # /track/<kind> on collectors without /track/batch
+
+# Histogram bucket upper bounds; the last bucket is open-ended
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+BYTES_BUCKETS = tuple(256 * 4 ** i for i in range(10))  # 256 B .. 64 MB
 
 
 def hash_ip(ip: str) -> str:
@@ -58,19 +94,607 @@ def get_client_ip() -> str:
     return request.remote_addr or 'unknown'
 
 
-def _send_async(url: str, data: dict):
-    """Send tracking data asynchronously (fire-and-forget)"""
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists but not ours to signal
+    return True
+
+
+class EventSpool:
+    """
+    Append-only on-disk spool of tracking events.
+
+    Events are stored one JSON object per line in segment files named
+    "<time_ns>-<pid>.jsonl". Each process appends only to its own current
+    segment and rotates it at segment_bytes. A segment is replayed by
+    renaming it to ".replay" first, so two workers never send the same file;
+    segments of processes that are no longer running are picked up by
+    whichever worker replays next. Past max_bytes the oldest segments are
+    deleted.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = TRACKING_SPOOL_SEGMENT_BYTES,
+                 max_bytes: int = TRACKING_SPOOL_MAX_BYTES):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.dropped_segments = 0
+        self._current = None
+        self._current_size = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _segments(self):
+        return sorted(glob.glob(os.path.join(self.directory, '*.jsonl')))
+
+    def append(self, events: list):
+        """Write events to this process's current segment."""
+        data = ''.join(json.dumps(e, separators=(',', ':')) + '\n' for e in events).encode('utf-8')
+        with self._lock:
+            if self._current is None or self._current_size >= self.segment_bytes \
+                    or not os.path.exists(self._current):
+                self._current = os.path.join(self.directory, f"{time.time_ns():020d}-{os.getpid()}.jsonl")
+                self._current_size = 0
+            with open(self._current, 'ab') as f:
+                f.write(data)
+            self._current_size += len(data)
+        self._enforce_cap()
+
+    def _enforce_cap(self):
+        segments = self._segments()
+        sizes = {}
+        for path in segments:
+            try:
+                sizes[path] = os.path.getsize(path)
+            except OSError:
+                pass
+        total = sum(sizes.values())
+        for path in segments:
+            if total <= self.max_bytes or path == self._current:
+                break
+            try:
+                os.remove(path)
+                total -= sizes.get(path, 0)
+                self.dropped_segments += 1
+            except OSError:
+                pass
+
+    def rotate(self):
+        """Close the current segment so it can be replayed."""
+        with self._lock:
+            self._current = None
+            self._current_size = 0
+
+    def pending(self) -> bool:
+        return bool(self._segments())
+
+    def claim(self):
+        """
+        Take the oldest replayable segment.
+
+        Returns:
+            (path, events) with the segment renamed to .replay, or None
+        """
+        pid = os.getpid()
+        for path in self._segments():
+            if path == self._current:
+                continue
+            owner = os.path.basename(path).rsplit('-', 1)[-1].split('.')[0]
+            if owner.isdigit() and int(owner) != pid and _pid_alive(int(owner)):
+                continue  # another live worker still owns it
+            claimed = f"{path}.{pid}.replay"
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue  # taken by another worker
+            events = []
+            with open(claimed, 'rb') as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        pass  # torn last line after a crash
+            return claimed, events
+        return None
+
+    def done(self, claimed_path: str):
+        try:
+            os.remove(claimed_path)
+        except OSError:
+            pass
+
+
+class EventSender:
+    """
+    Background batching sender for tracking events.
+
+    Events go into a bounded queue; one daemon thread posts them in batches
+    of up to batch_size, or whatever is queued every flush_interval seconds.
+    When the queue is full the oldest event is dropped and counted.
+
+    Batches are posted to {base_url}/track/batch as {"events": [...]}, each
+    event being {"kind": "pageview" | "feature" | "event", "data": {...}}.
+    If the collector has no batch endpoint (404/405), the sender falls back
+    to the per-kind endpoints, still over the same keep-alive session.
+    batch_supported is None until the first batch POST is answered, then
+    True or False.
+
+    With a spool, a batch that fails (collector down, erroring or slower than
+    the timeout) is written to disk. While the collector is failing, new
+    batches go straight to the spool, and spooled segments are replayed with
+    exponential backoff (TRACKING_RETRY_MIN..TRACKING_RETRY_MAX).
+    """
+
+    def __init__(self, base_url: str, batch_size: int = TRACKING_BATCH_SIZE,
+                 flush_interval: float = TRACKING_FLUSH_INTERVAL,
+                 max_queue: int = TRACKING_QUEUE_SIZE, timeout: float = TRACKING_TIMEOUT,
+                 spool: Optional[EventSpool] = None):
+        self.base_url = base_url.rstrip('/')
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.batch_supported = None  # unknown until the first batch POST answers
+        self.spool = spool
+        self.counters = {'queued': 0, 'sent': 0, 'dropped': 0, 'failed': 0, 'batches': 0,
+                         'spooled': 0, 'replayed': 0}
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+        self._tick_hooks = []
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._stopping = False
+        self._thread = None
+        self._pid = None
+        self._session = None
+
+    def enqueue(self, kind: str, data: dict):
+        """Queue one event; never blocks."""
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self.counters['dropped'] += 1
+            self._queue.append({'kind': kind, 'data': data})
+            self.counters['queued'] += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        self._ensure_started()
+
+    def add_tick(self, hook: Callable[..., Any]):
+        """
+        Run hook() on the sender thread once per wake-up (at least every
+        flush_interval), and hook(True) once when the sender shuts down.
+        """
+        self._tick_hooks.append(hook)
+
+    def _tick(self, final: bool = False):
+        for hook in self._tick_hooks:
+            try:
+                hook(final) if final else hook()
+            except Exception:
+                pass
+
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def ensure_running(self):
+        """Start the sender thread in this process (tick hooks need it)."""
+        self._ensure_started()
+
+    def _ensure_started(self):
+        # Threads do not survive fork: each worker process starts its own
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            import requests  # ~0.1 s to import; only needed once there is something to send
+            self._session = requests.Session()
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='tracking-sender', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _take_batch(self):
+        with self._cond:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            self._in_flight = len(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._queue) < self.batch_size:
+                    self._cond.wait(self._wait_time())
+                stopping = self._stopping
+            self._tick(final=stopping)
+            with self._cond:
+                if self._stopping and not self._queue:
+                    if self.spool is not None:
+                        self.spool.rotate()
+                    return
+            batch = self._take_batch()
+            while batch:
+                self._deliver(batch)
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+                    if len(self._queue) < self.batch_size and not self._stopping:
+                        break
+                batch = self._take_batch()
+            if not self._stopping:
+                self._replay()
+
+    def _wait_time(self) -> float:
+        if self.spool is not None and self._retry_at and self.spool.pending():
+            return max(0.05, min(self.flush_interval, self._retry_at - time.monotonic()))
+        return self.flush_interval
+
+    def _backing_off(self) -> bool:
+        return time.monotonic() < self._retry_at
+
+    def _failed(self):
+        self._retry_delay = min(max(self._retry_delay * 2, TRACKING_RETRY_MIN), TRACKING_RETRY_MAX)
+        self._retry_at = time.monotonic() + self._retry_delay
+
+    def _recovered(self):
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+
+    def _spool(self, batch: list):
+        try:
+            self.spool.append(batch)
+            self.counters['spooled'] += len(batch)
+        except OSError:
+            self.counters['failed'] += len(batch)
+
+    def _deliver(self, batch: list):
+        if self.spool is not None and self._backing_off():
+            self._spool(batch)  # collector is down: don't wait on it
+            return
+        delivered = self._post(batch)
+        if delivered == len(batch):
+            self._recovered()
+        elif self.spool is not None:
+            self._failed()
+            self._spool(batch[delivered:])  # the rest was accepted: don't resend it
+        else:
+            self.counters['failed'] += len(batch) - delivered
+
+    def _replay(self):
+        """Send one spooled segment if the backoff allows it."""
+        if self.spool is None or self._backing_off() or not self.spool.pending():
+            return
+        self.spool.rotate()
+        claimed = self.spool.claim()
+        if claimed is None:
+            return
+        path, events = claimed
+        for start in range(0, len(events), self.batch_size):
+            chunk = events[start:start + self.batch_size]
+            delivered = self._post(chunk)
+            self.counters['replayed'] += delivered
+            if delivered < len(chunk):
+                self._failed()
+                self._spool(events[start + delivered:])
+                break
+        else:
+            self._recovered()
+        self.spool.done(path)
+
+    def _post(self, batch: list) -> int:
+        """
+        Post a batch; returns how many events, from the front, the collector
+        accepted (all or none on the batch endpoint, a prefix when falling
+        back to per-kind posts; kinds with no per-kind endpoint are dropped
+        as failed there rather than retried).
+        """
+        delivered = unsendable = 0
+        try:
+            if self.batch_supported is not False:
+                response = self._session.post(
+                    f"{self.base_url}/track/batch", json={'events': batch}, timeout=self.timeout
+                )
+                if response.status_code in (404, 405):
+                    self.batch_supported = False
+                else:
+                    response.raise_for_status()
+                    self.batch_supported = True
+                    delivered = len(batch)
+            if self.batch_supported is False:
+                for event in batch:
+                    if event['kind'] not in PER_KIND_ENDPOINTS:
+                        # e.g. a rollup queued before the fallback: nowhere to send it
+                        self.counters['failed'] += 1
+                        delivered += 1
+                        unsendable += 1
+                        continue
+                    self._session.post(
+                        f"{self.base_url}/track/{event['kind']}", json=event['data'], timeout=self.timeout
+                    ).raise_for_status()
+                    delivered += 1
+            self.counters['batches'] += 1
+        except Exception:
+            pass  # tracking should never break the app
+        self.counters['sent'] += delivered - unsendable
+        return delivered
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far has been posted (or failed)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._queue or self._in_flight:
+                if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                    return False
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.notify_all()
+                self._cond.wait(min(remaining, 0.05))
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Flush the queue and stop the sender thread (called at exit)."""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._session.close()
+
+    def stats(self) -> dict:
+        return {**self.counters, 'queue_depth': len(self._queue)}
+
+
+class Histogram:
+    """Fixed-bucket histogram with interpolated percentiles."""
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        value = value or 0
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= target:
+                lower = self.bounds[i - 1] if i else 0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                value = lower + (upper - lower) * (target - seen) / n
+                return round(min(value, self.max), 1)
+            seen += n
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            'sum': self.total, 'max': self.max,
+            'p50': self.percentile(0.50), 'p95': self.percentile(0.95), 'p99': self.percentile(0.99),
+        }
+
+
+class _Rollup:
+    __slots__ = ('count', 'visitors', 'duration', 'response_bytes', 'request_bytes')
+
+    def __init__(self):
+        self.count = 0
+        self.visitors = set()
+        self.duration = Histogram(DURATION_BUCKETS_MS)
+        self.response_bytes = Histogram(BYTES_BUCKETS)
+        self.request_bytes = 0
+
+
+class UsageAggregator:
+    """
+    Per-interval rollups of page views and feature usage.
+
+    record() is a dict update under a lock. Rows are keyed by
+    (kind, route or feature key, aircraft). Once an interval has passed,
+    flush() turns it into one compact rollup event for the sender.
+    """
+
+    def __init__(self, emit: Callable[[str, dict], None], interval: int = TRACKING_ROLLUP_INTERVAL):
+        self.emit = emit
+        self.interval = interval
+        self._buckets = {}  # interval start -> {(kind, key, aircraft): _Rollup}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, data: dict, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        start = int(now // self.interval * self.interval)
+        metadata = data.get('metadata')
+        aircraft = metadata.get('aircraft') if isinstance(metadata, dict) else None
+        key = (kind, data.get('route') or data.get('feature_key'), aircraft)
+        with self._lock:
+            rows = self._buckets.setdefault(start, {})
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = _Rollup()
+            row.count += 1
+            if data.get('hashed_ip'):
+                row.visitors.add(data['hashed_ip'])
+            row.duration.add(data.get('duration_ms'))
+            if data.get('response_bytes') is not None:  # unknown outside a request
+                row.response_bytes.add(data['response_bytes'])
+            row.request_bytes += data.get('request_bytes') or 0
+
+    def flush(self, final: bool = False, now: Optional[float] = None) -> int:
+        """Emit every finished interval (all of them when final); returns rollups sent."""
+        now = time.time() if now is None else now
+        current = int(now // self.interval * self.interval)
+        with self._lock:
+            ready = sorted(start for start in self._buckets if final or start < current)
+            buckets = [(start, self._buckets.pop(start)) for start in ready]
+        for start, rows in buckets:
+            self.emit('rollup', {
+                'project_slug': PROJECT_SLUG,
+                'interval_start': start,
+                'interval_seconds': self.interval,
+                'rows': [
+                    {
+                        'kind': kind,
+                        'key': key,
+                        'aircraft': aircraft,
+                        'count': row.count,
+                        'unique_visitors': len(row.visitors),
+                        'request_bytes': row.request_bytes,
+                        'duration_ms': row.duration.summary(),
+                        'response_bytes': row.response_bytes.summary(),
+                    }
+                    for (kind, key, aircraft), row in rows.items()
+                ],
+            })
+        return len(buckets)
+
+
+def _default_spool() -> Optional[EventSpool]:
+    if not TRACKING_SPOOL_DIR:
+        return None
+    try:
+        return EventSpool(TRACKING_SPOOL_DIR)
+    except OSError:
+        return None
+
+
+_sender = EventSender(TRACKING_API_URL, spool=_default_spool())
+_aggregator = UsageAggregator(_sender.enqueue)
+_sender.add_tick(_aggregator.flush)
+atexit.register(_sender.close)
+
+
+def _enqueue(kind: str, data: dict):
+    """Queue a tracking event for the background sender (or its rollup)."""
     if not TRACKING_ENABLED:
         return
+    # Roll up only once the collector has accepted a batch, so no rollup is
+    # queued for a collector that turns out to have no /track/batch
+    if TRACKING_ROLLUPS and _sender.batch_supported is True and kind in ('pageview', 'feature'):
+        _aggregator.record(kind, data)
+        _sender.ensure_running()
+    else:
+        _sender.enqueue(kind, data)
+
 
-    def _do_send():
+def get_sender() -> EventSender:
+    """The process-wide sender (for stats and tests)."""
+    return _sender
+
+
+class _CountingIterable:
+    """Wraps a WSGI response iterable, counting bytes as they stream."""
+
+    def __init__(self, iterable, on_close: Callable[[int], None]):
+        self._iterable = iterable
+        self._on_close = on_close
+        self.bytes_sent = 0
+
+    def __iter__(self):
+        for chunk in self._iterable:
+            self.bytes_sent += len(chunk)
+            yield chunk
+
+    def close(self):
         try:
-            requests.post(url, json=data, timeout=TRACKING_TIMEOUT)
-        except Exception:
-            pass  # Silently fail - tracking should never break the app
+            if hasattr(self._iterable, 'close'):
+                self._iterable.close()
+        finally:
+            self._on_close(self.bytes_sent)
 
-    thread = threading.Thread(target=_do_send, daemon=True)
-    thread.start()
+
+class ResponseSizeMiddleware:
+    """
+    WSGI middleware that measures response size without buffering.
+
+    Request handlers leave a pending page view in the WSGI environ (under
+    PENDING_KEY), and feature events without a known size in the list under
+    FEATURES_KEY. Once the server has streamed the whole body and closed the
+    response, the middleware fills in the bytes actually sent (and the page
+    view's end-to-end duration), then queues the events.
+
+    Responses with neither (Dash component suites, assets) are returned
+    untouched, and so are wsgi.file_wrapper responses, which
+    are counted from their Content-Length: wrapping either would stop the
+    server from sending the file with sendfile().
+    """
+    PENDING_KEY = 'aeroedge.pageview'
+    FEATURES_KEY = 'aeroedge.features'
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        response = {'written': 0, 'content_length': 0}
+
+        def counting_start_response(status, headers, exc_info=None):
+            write = start_response(status, headers, exc_info)
+            for name, value in headers:
+                if name.lower() == 'content-length' and value.isdigit():
+                    response['content_length'] = int(value)
+
+            def counting_write(data):
+                # Legacy write() callable bypasses the iterable
+                response['written'] += len(data)
+                return write(data)
+            return counting_write
+
+        features = environ[self.FEATURES_KEY] = []
+        iterable = self.wsgi_app(environ, counting_start_response)
+        if self.PENDING_KEY not in environ and not features:
+            return iterable
+
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if isinstance(file_wrapper, type) and isinstance(iterable, file_wrapper):
+            self._finish(environ, response['content_length'])
+            return iterable
+
+        return _CountingIterable(
+            iterable, lambda bytes_sent: self._finish(environ, bytes_sent + response['written'])
+        )
+
+    def _finish(self, environ, bytes_sent):
+        for data in environ.pop(self.FEATURES_KEY, ()):
+            data['response_bytes'] = bytes_sent
+            _enqueue('feature', data)
+        pending = environ.pop(self.PENDING_KEY, None)
+        if pending is None:
+            return
+        data, start_time = pending
+        data['response_bytes'] = bytes_sent
+        data['duration_ms'] = int((time.time() - start_time) * 1000)
+        _enqueue('pageview', data)
+
+
+def _enqueue_feature(data: dict):
+    """
+    Queue a feature event. Without a known response_bytes, an event raised
+    inside a request that ResponseSizeMiddleware wraps waits for that
+    response to stream and is sent with its size; otherwise it is sent as is.
+    """
+    if data['response_bytes'] is None and has_request_context():
+        features = request.environ.get(ResponseSizeMiddleware.FEATURES_KEY)
+        if features is not None:
+            features.append(data)
+            return
+    _enqueue('feature', data)
 
 
 def init_tracking(app):
@@ -78,7 +702,9 @@ def init_tracking(app):
     Initialize tracking middleware on a Flask application.
 
     This sets up before_request and after_request hooks to automatically
-    track page views with timing and bandwidth metrics.
+    track page views with timing and bandwidth metrics. Response sizes are
+    counted by ResponseSizeMiddleware as the body streams, so tracking never
+    buffers a response.
 
     Args:
         app: Flask application instance (typically dash_app.server)
@@ -86,6 +712,8 @@ def init_tracking(app):
     if not TRACKING_ENABLED:
         return
 
+    app.wsgi_app = ResponseSizeMiddleware(app.wsgi_app)
+
     @app.before_request
     def before_request():
         g.start_time = time.time()
@@ -98,23 +726,14 @@ def init_tracking(app):
         if any(path.startswith(p) for p in ['/_dash', '/static', '/favicon', '/health', '/assets']):
             return response
 
-        duration_ms = int((time.time() - getattr(g, 'start_time', time.time())) * 1000)
-        response_size = response.content_length or 0
-
-        # Try to get actual response size if content_length is None
-        if response_size == 0:
-            try:
-                response_size = len(response.get_data())
-            except Exception:
-                pass
-
-        _send_async(f"{TRACKING_API_URL}/track/pageview", {
+        # Sent by ResponseSizeMiddleware once the body has streamed
+        request.environ[ResponseSizeMiddleware.PENDING_KEY] = ({
             'project_slug': PROJECT_SLUG,
             'hashed_ip': hash_ip(get_client_ip()),
             'route': path,
             'user_agent': request.user_agent.string if request.user_agent else None,
-            'response_bytes': response_size
-        })
+            'request_bytes': getattr(g, 'request_size', 0),
+        }, getattr(g, 'start_time', time.time()))
 
         return response
 
@@ -147,17 +766,9 @@ def track_feature(
             result = func(*args, **kwargs)
             duration_ms = int((time.time() - start) * 1000)
 
-            # Estimate response size
-            response_bytes = 0
-            if result is not None:
-                try:
-                    if hasattr(result, '__len__'):
-                        response_bytes = len(result)
-                    elif isinstance(result, (dict, list)):
-                        import json
-                        response_bytes = len(json.dumps(result))
-                except Exception:
-                    pass
+            # Only raw payloads have a size without serializing them; for
+            # anything else ResponseSizeMiddleware fills in the response size
+            response_bytes = len(result) if isinstance(result, (bytes, bytearray, str)) else None
 
             # Get metadata if function provided
             metadata = None
@@ -174,7 +785,7 @@ def track_feature(
                 hashed_ip = hash_ip(get_client_ip())
                 request_bytes = getattr(g, 'request_size', 0)
 
-            _send_async(f"{TRACKING_API_URL}/track/feature", {
+            _enqueue_feature({
                 'project_slug': PROJECT_SLUG,
                 'feature_key': feature_key,
                 'hashed_ip': hashed_ip,
@@ -204,7 +815,7 @@ def track_event(event_name: str, metadata: Optional[dict] = None):
     if has_request_context():
         hashed_ip = hash_ip(get_client_ip())
 
-    _send_async(f"{TRACKING_API_URL}/track/event", {
+    _enqueue("event", {
         'project_slug': PROJECT_SLUG,
         'event_name': event_name,
         'hashed_ip': hashed_ip,
@@ -212,7 +823,7 @@ def track_event(event_name: str, metadata: Optional[dict] = None):
     })
 
 
-def log_feature(feature_key: str, metadata: Optional[dict] = None, response_bytes: int = 0):
+def log_feature(feature_key: str, metadata: Optional[dict] = None, response_bytes: Optional[int] = None):
     """
     Log feature usage directly (non-decorator version).
 
@@ -222,7 +833,8 @@ def log_feature(feature_key: str, metadata: Optional[dict] = None, response_byte
     Args:
         feature_key: Unique identifier for the feature (e.g., 'aircraft_select')
         metadata: Optional dictionary with details (e.g., {'aircraft': 'C172'})
-        response_bytes: Optional size of response data
+        response_bytes: Optional size of response data (default: the size of
+                        the current request's response, once it has streamed)
 
     Example:
         @app.callback(...)
@@ -236,7 +848,7 @@ def log_feature(feature_key: str, metadata: Optional[dict] = None, response_byte
         hashed_ip = hash_ip(get_client_ip())
         request_bytes = getattr(g, 'request_size', 0)
 
-    _send_async(f"{TRACKING_API_URL}/track/feature", {
+    _enqueue_feature({
         'project_slug': PROJECT_SLUG,
         'feature_key': feature_key,
         'hashed_ip': hashed_ip,
@@ -261,7 +873,7 @@ class FeatureTracker:
         self.feature_key = feature_key
         self.start_time = None
         self.metadata = None
-        self.response_bytes = 0
+        self.response_bytes = None
 
     def __enter__(self):
         self.start_time = time.time()
@@ -276,7 +888,7 @@ class FeatureTracker:
             hashed_ip = hash_ip(get_client_ip())
             request_bytes = getattr(g, 'request_size', 0)
 
-        _send_async(f"{TRACKING_API_URL}/track/feature", {
+        _enqueue_feature({
             'project_slug': PROJECT_SLUG,
             'feature_key': self.feature_key,
             'hashed_ip': hashed_ip,
@@ -16,14 +16,16 @@ import dash
 from dash import dcc, html, Input, Output, State, ctx
 from dash.dependencies import ALL
 import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
 import numpy as np
-import webbrowser
 import threading
 import copy
 import time
 import sys
 import os
+import io
 import json
+import traceback
 from itertools import zip_longest
 from dash.exceptions import PreventUpdate
 
@@ -56,27 +58,78 @@ from core import (
     compute_stall_speed_at_load_factor,
     interpolate_stall_speed,
     # Aircraft data
-    AIRCRAFT_DATA,
+    AIRCRAFT_CATALOG,
     aircraft_data,
+    AircraftReloader,
     extract_vmca_value,
     resource_path,
+    write_aircraft_file,
+    # EM computation
+    compute_em,
+    EMInputError,
+    EM_STATE_FIELDS,
+    parse_state_params,
+    resolve_state,
+    write_npz,
+    # Logging
+    DEBUG,
+    get_logger,
+    # Caching, metrics and tracing
+    LRUCache,
+    PERF_TRACE_ENABLED,
+    PERF_TRACES,
+    annotate,
+    span,
+    trace,
+    MetricsRegistry,
+    DEFAULT_BYTES_BUCKETS,
+    process_rss_bytes,
+    state_hash,
+    FIGURE_CACHE_MAX_ENTRIES,
+    ENVELOPE_CACHE_MAX_ENTRIES,
+    LAYOUT_CACHE_MAX_ENTRIES,
+    AIRCRAFT_UI_CACHE_MAX_ENTRIES,
+    RENDER_SEQUENCER_MAX_SESSIONS,
+    DRAG_UPDATES_PER_SECOND,
+    ENVELOPE_API_MAX_AGE,
+    ExportCache,
+    RenderSequencer,
     # Airport data
-    AIRPORT_DATA,
-    AIRPORT_OPTIONS,
+    AIRPORT_INDEX,
     get_airport_by_id,
 )
 
+from ui.em_figure import render_em_figure
+from ui.export import decorate_export_figure, get_export_summary_lines
+from ui.aircraft_context import aircraft_ui_descriptor, total_weight
 from edit_aircraft_page import edit_aircraft_layout
 import dash_bootstrap_components as dbc
 
+log = get_logger("app")
+
 # ✅ Initialize Dash app
 app = dash.Dash(__name__, suppress_callback_exceptions=True, external_stylesheets=[dbc.themes.BOOTSTRAP])
 server = app.server
 
 # Initialize usage tracking
-from aeroedge_tracker import init_tracking, log_feature
+from aeroedge_tracker import init_tracking, log_feature, get_sender
 init_tracking(server)
 
+# Metrics served at /metrics (see core.metrics). Under gunicorn, point
+# PROMETHEUS_MULTIPROC_DIR at a directory shared by the workers.
+METRICS = MetricsRegistry(shared_dir=os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None)
+CALLBACK_SECONDS = METRICS.histogram(
+    "dash_callback_duration_seconds", "Dash callback request latency, by output id")
+CALLBACK_BYTES = METRICS.histogram(
+    "dash_callback_response_bytes", "Dash callback response size, by output id (em-graph.figure = figure payload)",
+    DEFAULT_BYTES_BUCKETS)
+CALLBACK_ERRORS = METRICS.counter(
+    "dash_callback_errors_total", "Dash callback requests that returned an HTTP error, by output id")
+EM_RENDERS = METRICS.counter(
+    "em_graph_renders_total", "update_graph calls, by result (rendered / unchanged / superseded / discarded)")
+EXPORTS_IN_PROGRESS = METRICS.gauge(
+    "export_renders_in_progress", "PNG/PDF exports currently being rendered (export queue depth)")
+
 
 
 
@@ -187,99 +240,107 @@ app.index_string = """
 </html>
 """
 
-app.layout = html.Div([
-    dcc.Location(id="url"),
-    dcc.Store(id="aircraft-data-store", data=AIRCRAFT_DATA),
-    dcc.Store(id="last-saved-aircraft"),
-    dcc.Store(id="stored-total-weight"),
-    dcc.Store(id="screen-width"),
-    dcc.Store(id="sidebar-collapsed", data=False),
-    html.Div(id="page-content"),
-    dcc.Download(id="download-aircraft"),
-
-    # Global Modals (shared between desktop and mobile)
-    dbc.Modal([
-        dbc.ModalHeader(dbc.ModalTitle("AeroEdge Disclaimer"), close_button=True),
-        dbc.ModalBody([
-            html.P("This tool supplements—not replaces—FAA-published documentation.", style={"marginBottom": "8px"}),
-            html.P("It is intended for educational and reference use only, and has not been approved or endorsed by the Federal Aviation Administration (FAA).", style={"marginBottom": "8px"}),
-            html.P("While AeroEdge is aligned with FAA safety principles, it is not an official source of operational data. Users must consult certified instructors and approved aircraft documentation when making flight decisions.", style={"marginBottom": "8px"}),
-            html.P("The data presented may be incomplete, inaccurate, outdated, or derived from public or user-submitted sources. No warranties, express or implied, are made regarding its accuracy, completeness, or fitness for purpose.", style={"marginBottom": "8px"}),
-            html.P("Instructors and users are encouraged to verify all EM diagram outputs against certified POH/AFM values. This tool is not a substitute for competent flight instruction, or for compliance with applicable regulations, including Airworthiness Directives (ADs), Federal Aviation Regulations (FARs), or Advisory Circulars (ACs).", style={"marginBottom": "8px"}),
-            html.P("If any information conflicts with the aircraft's FAA-approved AFM or POH, the official documentation shall govern.", style={"marginBottom": "8px"}),
-            html.P("AeroEdge disclaims all liability for errors, omissions, injuries, or damages resulting from the use of this application or website. Use of this tool constitutes acceptance of these terms.", style={"marginBottom": "8px"})
-        ]),
-        dbc.ModalFooter(
-            dbc.Button("Close", id="close-disclaimer", className="ms-auto", color="secondary")
-        )
-    ], id="disclaimer-modal", is_open=False, centered=True, size="lg"),
-
-    dbc.Modal([
-        dbc.ModalHeader(dbc.ModalTitle("Terms of Use & Privacy Policy"), close_button=True),
-        dbc.ModalBody([
-            html.H6("Terms of Use", className="mb-2 mt-2"),
-            html.P("By accessing or using the AeroEdge application and its associated services, you agree to use this tool solely for educational and informational purposes. This tool is not FAA-certified and should not be relied upon for flight planning, aircraft operation, or regulatory compliance.", style={"marginBottom": "8px"}),
-            html.P("Users must verify all performance data with the aircraft's official Pilot's Operating Handbook (POH) or Aircraft Flight Manual (AFM). Use of AeroEdge is at your own risk. AeroEdge disclaims liability for any direct, indirect, incidental, or consequential damages arising from its use.", style={"marginBottom": "8px"}),
-            html.H6("Privacy Policy", className="mb-2 mt-4"),
-            html.P("AeroEdge does not collect, store, or share any personally identifiable information (PII). All use of the application is anonymous. Uploaded aircraft files remain local to your device and are not transmitted or stored on any external servers.", style={"marginBottom": "8px"}),
-            html.P("If you submit feedback through linked forms, that information is governed by the terms of Google Forms. AeroEdge does not sell or distribute any user-submitted information and uses it only to improve functionality and user experience.", style={"marginBottom": "8px"}),
-            html.P("By using this application, you acknowledge and accept these terms.")
-        ]),
-        dbc.ModalFooter(
-            dbc.Button("Close", id="close-terms-policy", className="ms-auto", color="secondary")
-        )
-    ], id="terms-policy-modal", is_open=False, centered=True, size="lg"),
-
-    # Quick Start Modal
-    dbc.Modal([
-        dbc.ModalHeader(dbc.ModalTitle("Quick Start Guide"), close_button=True),
-        dbc.ModalBody([
-            html.P([
-                html.Strong("What is an EM Diagram? "),
-                "An Energy-Maneuverability diagram visualizes your aircraft's performance envelope—showing the relationship between airspeed, load factor (G), and turn rate at any given configuration."
-            ], style={"marginBottom": "8px"}),
-            html.P([
-                html.Strong("Why it matters: "),
-                "Understanding these limits is critical for safe and effective flight training:"
-            ], style={"marginBottom": "6px"}),
-            html.Ul([
-                html.Li([html.Strong("Stall/Spin Training: "), "See exactly how stall speed increases with bank angle and G-load"]),
-                html.Li([html.Strong("Steep Turns: "), "Visualize the energy cost of maintaining altitude in 45°+ banks"]),
-                html.Li([html.Strong("Emergency Maneuvers: "), "Know your corner speed and maximum instantaneous turn rate"]),
-                html.Li([html.Strong("Multi-Engine: "), "Understand Vmc variations with weight, altitude, and configuration"]),
-                html.Li([html.Strong("CFI/CFII Instruction: "), "Demonstrate performance concepts with real aircraft data"]),
-            ], style={"paddingLeft": "20px", "marginBottom": "10px", "fontSize": "13px"}),
-            html.Hr(style={"margin": "10px 0"}),
-            html.P(html.Strong("Getting Started:"), style={"marginBottom": "6px"}),
-            html.Ol([
-                html.Li("Select an aircraft or load a custom JSON file"),
-                html.Li("Adjust weight, altitude, and power settings"),
-                html.Li("Toggle overlays (Ps contours, G-lines, turn radius, etc.)"),
-                html.Li("Hover over the graph for detailed values"),
-                html.Li("Export with PNG/PDF buttons"),
-            ], style={"paddingLeft": "20px", "marginBottom": "10px", "fontSize": "13px"}),
-            html.Hr(style={"margin": "10px 0"}),
-            html.P([
-                html.Strong("Tip: "),
-                "Click the ", html.Span("?", style={"backgroundColor": "#2980B9", "color": "white", "borderRadius": "50%", "padding": "1px 5px", "fontSize": "10px"}),
-                " icons next to any option for detailed explanations."
-            ], style={"marginBottom": "0", "fontSize": "13px"})
-        ]),
-        dbc.ModalFooter(
-            dbc.Button("Close", id="close-readme", className="ms-auto", color="secondary")
-        )
-    ], id="readme-modal", is_open=False, centered=True, size="lg"),
-
-    # Help Modal for feature explanations
-    dcc.Store(id="help-topic", data=None),
-    dbc.Modal([
-        dbc.ModalHeader(dbc.ModalTitle(id="help-modal-title"), close_button=True),
-        dbc.ModalBody(id="help-modal-body"),
-        dbc.ModalFooter(
-            dbc.Button("Close", id="close-help-modal", className="ms-auto", color="secondary")
-        )
-    ], id="help-modal", is_open=False, centered=True, size="lg"),
-])
+def serve_layout():
+    """Root layout, built per page load so the aircraft store reflects hot reloads."""
+    return html.Div([
+        dcc.Location(id="url"),
+        dcc.Store(id="aircraft-data-store", data=aircraft_data.get_raw_dict()),
+        dcc.Store(id="last-saved-aircraft"),
+        dcc.Store(id="stored-total-weight"),
+        dcc.Store(id="em-figure-state"),
+        dcc.Store(id="render-seq"),
+        dcc.Store(id="screen-width"),
+        dcc.Store(id="is-mobile"),
+        dcc.Store(id="sidebar-collapsed", data=False),
+        html.Div(id="page-content"),
+        dcc.Download(id="download-aircraft"),
+
+        # Global Modals (shared between desktop and mobile)
+        dbc.Modal([
+            dbc.ModalHeader(dbc.ModalTitle("AeroEdge Disclaimer"), close_button=True),
+            dbc.ModalBody([
+                html.P("This tool supplements—not replaces—FAA-published documentation.", style={"marginBottom": "8px"}),
+                html.P("It is intended for educational and reference use only, and has not been approved or endorsed by the Federal Aviation Administration (FAA).", style={"marginBottom": "8px"}),
+                html.P("While AeroEdge is aligned with FAA safety principles, it is not an official source of operational data. Users must consult certified instructors and approved aircraft documentation when making flight decisions.", style={"marginBottom": "8px"}),
+                html.P("The data presented may be incomplete, inaccurate, outdated, or derived from public or user-submitted sources. No warranties, express or implied, are made regarding its accuracy, completeness, or fitness for purpose.", style={"marginBottom": "8px"}),
+                html.P("Instructors and users are encouraged to verify all EM diagram outputs against certified POH/AFM values. This tool is not a substitute for competent flight instruction, or for compliance with applicable regulations, including Airworthiness Directives (ADs), Federal Aviation Regulations (FARs), or Advisory Circulars (ACs).", style={"marginBottom": "8px"}),
+                html.P("If any information conflicts with the aircraft's FAA-approved AFM or POH, the official documentation shall govern.", style={"marginBottom": "8px"}),
+                html.P("AeroEdge disclaims all liability for errors, omissions, injuries, or damages resulting from the use of this application or website. Use of this tool constitutes acceptance of these terms.", style={"marginBottom": "8px"})
+            ]),
+            dbc.ModalFooter(
+                dbc.Button("Close", id="close-disclaimer", className="ms-auto", color="secondary")
+            )
+        ], id="disclaimer-modal", is_open=False, centered=True, size="lg"),
+
+        dbc.Modal([
+            dbc.ModalHeader(dbc.ModalTitle("Terms of Use & Privacy Policy"), close_button=True),
+            dbc.ModalBody([
+                html.H6("Terms of Use", className="mb-2 mt-2"),
+                html.P("By accessing or using the AeroEdge application and its associated services, you agree to use this tool solely for educational and informational purposes. This tool is not FAA-certified and should not be relied upon for flight planning, aircraft operation, or regulatory compliance.", style={"marginBottom": "8px"}),
+                html.P("Users must verify all performance data with the aircraft's official Pilot's Operating Handbook (POH) or Aircraft Flight Manual (AFM). Use of AeroEdge is at your own risk. AeroEdge disclaims liability for any direct, indirect, incidental, or consequential damages arising from its use.", style={"marginBottom": "8px"}),
+                html.H6("Privacy Policy", className="mb-2 mt-4"),
+                html.P("AeroEdge does not collect, store, or share any personally identifiable information (PII). All use of the application is anonymous. Uploaded aircraft files remain local to your device and are not transmitted or stored on any external servers.", style={"marginBottom": "8px"}),
+                html.P("If you submit feedback through linked forms, that information is governed by the terms of Google Forms. AeroEdge does not sell or distribute any user-submitted information and uses it only to improve functionality and user experience.", style={"marginBottom": "8px"}),
+                html.P("By using this application, you acknowledge and accept these terms.")
+            ]),
+            dbc.ModalFooter(
+                dbc.Button("Close", id="close-terms-policy", className="ms-auto", color="secondary")
+            )
+        ], id="terms-policy-modal", is_open=False, centered=True, size="lg"),
+
+        # Quick Start Modal
+        dbc.Modal([
+            dbc.ModalHeader(dbc.ModalTitle("Quick Start Guide"), close_button=True),
+            dbc.ModalBody([
+                html.P([
+                    html.Strong("What is an EM Diagram? "),
+                    "An Energy-Maneuverability diagram visualizes your aircraft's performance envelope—showing the relationship between airspeed, load factor (G), and turn rate at any given configuration."
+                ], style={"marginBottom": "8px"}),
+                html.P([
+                    html.Strong("Why it matters: "),
+                    "Understanding these limits is critical for safe and effective flight training:"
+                ], style={"marginBottom": "6px"}),
+                html.Ul([
+                    html.Li([html.Strong("Stall/Spin Training: "), "See exactly how stall speed increases with bank angle and G-load"]),
+                    html.Li([html.Strong("Steep Turns: "), "Visualize the energy cost of maintaining altitude in 45°+ banks"]),
+                    html.Li([html.Strong("Emergency Maneuvers: "), "Know your corner speed and maximum instantaneous turn rate"]),
+                    html.Li([html.Strong("Multi-Engine: "), "Understand Vmc variations with weight, altitude, and configuration"]),
+                    html.Li([html.Strong("CFI/CFII Instruction: "), "Demonstrate performance concepts with real aircraft data"]),
+                ], style={"paddingLeft": "20px", "marginBottom": "10px", "fontSize": "13px"}),
+                html.Hr(style={"margin": "10px 0"}),
+                html.P(html.Strong("Getting Started:"), style={"marginBottom": "6px"}),
+                html.Ol([
+                    html.Li("Select an aircraft or load a custom JSON file"),
+                    html.Li("Adjust weight, altitude, and power settings"),
+                    html.Li("Toggle overlays (Ps contours, G-lines, turn radius, etc.)"),
+                    html.Li("Hover over the graph for detailed values"),
+                    html.Li("Export with PNG/PDF buttons"),
+                ], style={"paddingLeft": "20px", "marginBottom": "10px", "fontSize": "13px"}),
+                html.Hr(style={"margin": "10px 0"}),
+                html.P([
+                    html.Strong("Tip: "),
+                    "Click the ", html.Span("?", style={"backgroundColor": "#2980B9", "color": "white", "borderRadius": "50%", "padding": "1px 5px", "fontSize": "10px"}),
+                    " icons next to any option for detailed explanations."
+                ], style={"marginBottom": "0", "fontSize": "13px"})
+            ]),
+            dbc.ModalFooter(
+                dbc.Button("Close", id="close-readme", className="ms-auto", color="secondary")
+            )
+        ], id="readme-modal", is_open=False, centered=True, size="lg"),
+
+        # Help Modal for feature explanations
+        dcc.Store(id="help-topic", data=None),
+        dbc.Modal([
+            dbc.ModalHeader(dbc.ModalTitle(id="help-modal-title"), close_button=True),
+            dbc.ModalBody(id="help-modal-body"),
+            dbc.ModalFooter(
+                dbc.Button("Close", id="close-help-modal", className="ms-auto", color="secondary")
+            )
+        ], id="help-modal", is_open=False, centered=True, size="lg"),
+    ])
+
+
+app.layout = serve_layout
 
 # Define clientside JS callback to detect screen width
 app.clientside_callback(
@@ -292,6 +353,65 @@ app.clientside_callback(
     Input("url", "pathname")
 )
 
+# Mobile flag for display_page; only changes when the width crosses the
+# breakpoint, so other width changes never re-send the page layout
+app.clientside_callback(
+    """
+    function(width, current) {
+        var mobile = width !== null && width !== undefined && width < 768;
+        return mobile === current ? window.dash_clientside.no_update : mobile;
+    }
+    """,
+    Output("is-mobile", "data"),
+    Input("screen-width", "data"),
+    State("is-mobile", "data")
+)
+
+# Sliders whose drags update the graph. Dash sliders only report `value` on
+# release; while dragging, drag_value is copied into value at most
+# DRAG_UPDATES_PER_SECOND times a second (the release always lands).
+DRAG_SLIDERS = ("altitude-slider", "fuel-slider", "power-setting", "cg-slider")
+
+if DRAG_UPDATES_PER_SECOND > 0:
+    for _slider_id in DRAG_SLIDERS:
+        app.clientside_callback(
+            """
+            function(drag, current) {
+                var last = window._emDragSent = window._emDragSent || {};
+                var now = Date.now();
+                if (drag === null || drag === undefined || drag === current ||
+                        now - (last["%s"] || 0) < %d) {
+                    return window.dash_clientside.no_update;
+                }
+                last["%s"] = now;
+                return drag;
+            }
+            """ % (_slider_id, 1000 // DRAG_UPDATES_PER_SECOND, _slider_id),
+            Output(_slider_id, "value", allow_duplicate=True),
+            Input(_slider_id, "drag_value"),
+            State(_slider_id, "value"),
+            prevent_initial_call=True
+        )
+
+# Per-tab request sequence for update_graph (see RENDER_SEQUENCER), bumped
+# on every slider change. update_graph takes it as an Input: the renderer
+# only holds a callback back for pending producers of its inputs (not its
+# state), so this makes the slider change and the new seq one request.
+app.clientside_callback(
+    """
+    function() {
+        var current = arguments[arguments.length - 1] || {};
+        var session = current.session ||
+            Date.now().toString(36) + Math.random().toString(36).slice(2, 10);
+        return {session: session, seq: (current.seq || 0) + 1};
+    }
+    """,
+    Output("render-seq", "data"),
+    *[Input(slider_id, "value") for slider_id in DRAG_SLIDERS],
+    State("render-seq", "data"),
+    prevent_initial_call=True
+)
+
 # Callback to forward ghost help trigger clicks to the hidden help-ghost element
 @app.callback(
     Output("help-ghost", "n_clicks"),
@@ -433,7 +553,9 @@ def desktop_layout():
                                 )
                             ], className="mb-2"),
                             html.Div([
-                                dcc.Slider(id="cg-slider", min=0, max=1, value=0.5, step=0.01)
+                                html.Label("Center of Gravity (inches)", className="input-label-sm"),
+                                dcc.Slider(id="cg-slider", min=0, max=1, value=0.5, step=0.1, marks={},
+                                           tooltip={"always_visible": True})
                             ], id="cg-slider-container", className="mb-2"),
                             html.Div([
                                 html.Div([
@@ -456,7 +578,7 @@ def desktop_layout():
                             html.Label("Airport", className="input-label-sm"),
                             dcc.Dropdown(
                                 id="airport-select",
-                                options=AIRPORT_OPTIONS,
+                                options=[],
                                 placeholder="Search airport...",
                                 searchable=True,
                                 clearable=True,
@@ -595,6 +717,7 @@ def desktop_layout():
                             )
                         ], className="mb-2"),
                         html.Div(id="maneuver-options-container"),
+                        dcc.Store(id="maneuver-state"),
                         # Hidden help-ghost element for callback
                         html.Span("?", id="help-ghost", className="help-icon", n_clicks=0, style={"display": "none"})
                     ], title="Maneuver Overlays", item_id="maneuvers"),
@@ -728,7 +851,9 @@ def mobile_layout():
                                 marks={0.05: "IDLE", 0.5: "50%", 1: "100%"}, tooltip={"always_visible": True})
                         ], className="mb-2"),
                         html.Div([
-                            dcc.Slider(id="cg-slider", min=0, max=1, value=0.5, step=0.01)
+                            html.Label("Center of Gravity (inches)", className="input-label-sm"),
+                            dcc.Slider(id="cg-slider", min=0, max=1, value=0.5, step=0.1, marks={},
+                                       tooltip={"always_visible": True})
                         ], id="cg-slider-container", className="mb-2"),
                         html.Div([
                             html.Label("FPA (deg)", className="input-label-sm"),
@@ -740,7 +865,7 @@ def mobile_layout():
                     # Environment (compact)
                     html.Div([
                         html.Label("Airport", className="input-label-sm"),
-                        dcc.Dropdown(id="airport-select", options=AIRPORT_OPTIONS, placeholder="Search...", searchable=True, clearable=True)
+                        dcc.Dropdown(id="airport-select", options=[], placeholder="Search...", searchable=True, clearable=True)
                     ], className="mb-2"),
                     html.Div([
                         html.Label("Altitude (ft)", className="input-label-sm"),
@@ -802,6 +927,7 @@ def mobile_layout():
                         dcc.Dropdown(id="maneuver-select", options=[{"label": "Steep Turn", "value": "steep_turn"}, {"label": "Chandelle", "value": "chandelle"}], placeholder="Select...")
                     ], className="mb-2"),
                     html.Div(id="maneuver-options-container"),
+                    dcc.Store(id="maneuver-state"),
                 ], className="mobile-settings-content")
             ], id="mobile-settings-collapse", is_open=False),
 
@@ -884,24 +1010,41 @@ def mobile_layout():
 
 # ✅ Automatically open the browser when the app starts
 def open_browser():
+    import webbrowser
     webbrowser.open("http://127.0.0.1:8050/")
 
+# Page layouts as plain JSON, keyed by (page, is_mobile, catalog version).
+# Building the component tree and encoding it (component by component) is
+# most of a page load; a plain dict encodes ~25x faster, and the layouts
+# only depend on those three.
+LAYOUT_CACHE = LRUCache(max_entries=LAYOUT_CACHE_MAX_ENTRIES)
+
+
+def cached_layout(page, is_mobile, build):
+    """Serialized layout from build(), built once per catalog version."""
+    version = aircraft_data.version
+    key = (page, is_mobile, version)
+    layout = LAYOUT_CACHE.get(key)
+    if layout is None:
+        layout = json.loads(to_json_plotly(build()))
+        if version is not None:  # None: edited at runtime, nothing to key on
+            LAYOUT_CACHE.put(key, layout)
+    return layout
+
+
 @app.callback(
     Output("page-content", "children"),
     Input("url", "pathname"),
-    Input("screen-width", "data")
+    Input("is-mobile", "data")
 )
-def display_page(pathname, screen_width):
-    # Gracefully handle undefined screen width
-    if screen_width is None:
-        screen_width = 1024  # assume desktop by default
-
-    is_mobile = screen_width < 768
+def display_page(pathname, is_mobile):
+    # Undefined until the browser reports its width; assume desktop
+    is_mobile = bool(is_mobile)
 
     if pathname == "/" or pathname is None:
-        return em_diagram_layout(is_mobile=is_mobile)
+        return cached_layout("em", is_mobile, lambda: em_diagram_layout(is_mobile=is_mobile))
     elif pathname == "/edit-aircraft":
-        return edit_aircraft_layout()
+        return cached_layout("edit", False, edit_aircraft_layout)
     else:
         return html.H1("404 - Page not found")
 
@@ -943,32 +1086,124 @@ def update_aircraft_options(data):
         return []
     return [{"label": name, "value": name} for name in sorted(data.keys())]
 
-@app.callback(
-    Output("category-select", "options"),
-    Output("category-select", "value"),
-    Input("aircraft-select", "value"),
-)
-def update_category_dropdown(ac_name):
-    if not ac_name or ac_name not in aircraft_data:
-        raise PreventUpdate
+# Sidebar options per aircraft, keyed by (name, data revision) so an edit or
+# hot reload rebuilds only that aircraft's entry
+AIRCRAFT_UI_CACHE = LRUCache(max_entries=AIRCRAFT_UI_CACHE_MAX_ENTRIES)
+
+
+def get_aircraft_ui(ac_name):
+    """aircraft_ui_descriptor() for an aircraft, cached per revision."""
+    key = (ac_name, aircraft_data.revision(ac_name))
+    descriptor = AIRCRAFT_UI_CACHE.get(key)
+    if descriptor is None:
+        descriptor = aircraft_ui_descriptor(aircraft_data[ac_name])
+        AIRCRAFT_UI_CACHE.put(key, descriptor, tag=ac_name)
+        if log.is_enabled(DEBUG):
+            log.debug("CG slider: %s", {
+                "cg_min": descriptor["cg_min"],
+                "cg_max": descriptor["cg_max"],
+                "marks": descriptor["cg_marks"],
+            })
+    return descriptor
+
 
-    ac = aircraft_data[ac_name]
-    categories = list(ac.get("G_limits", {}).keys())
-    options = [{"label": cat.capitalize(), "value": cat} for cat in categories]
-    default = options[0]["value"] if options else None
-    return options, default
+def weight_display(descriptor, fuel, occupants, pax_weight):
+    """(text, style, total) for the total-weight box."""
+    total = total_weight(descriptor, fuel, occupants, pax_weight)
+    color = "darkgreen" if total <= descriptor["max_weight"] else "red"
+    return f"{int(total)} lbs", {"color": color, "fontWeight": "bold", "fontSize": "16px"}, total
+
+
+def oei_control_styles(is_multi, oei_toggle, multi_engine_opts):
+    """Styles for the dynamic Vmc/Vyse toggles and the prop condition selector."""
+    oei_enabled = oei_toggle and "enabled" in oei_toggle
+    vmca_enabled = "vmca" in (multi_engine_opts or [])
+
+    # Show dynamic overlays only when OEI is active
+    show_vmca_block = {"display": "block"} if is_multi and oei_enabled else {"display": "none"}
+
+    # Show prop condition only when Dynamic Vmc is toggled *and* OEI is active
+    show_prop_condition = {"display": "block", "marginTop": "5px"} if is_multi and oei_enabled and vmca_enabled else {"display": "none"}
+
+    return show_vmca_block, show_prop_condition
+
+
+def _if_changed(value, current):
+    # An unchanged value still fires every callback that listens to it
+    return dash.no_update if value == current else value
 
 
 @app.callback(
+    Output("category-select", "options"),
+    Output("category-select", "value"),
+    Output("engine-select", "options"),
+    Output("engine-select", "value"),
+    Output("occupants-select", "options"),
+    Output("occupants-select", "value"),
+    Output("fuel-slider", "max"),
+    Output("fuel-slider", "marks"),
+    Output("altitude-slider", "max"),
+    Output("altitude-slider", "marks"),
+    Output("cg-slider", "min"),
+    Output("cg-slider", "max"),
+    Output("cg-slider", "value"),
+    Output("cg-slider", "marks"),
+    Output("config-select", "options"),
+    Output("config-select", "value"),
+    Output("gear-select", "options"),
+    Output("gear-select", "value"),
+    Output("gear-select-container", "style"),
     Output("config-details", "style"),
     Output("sidebar-accordion", "active_item"),
+    Output("multi-engine-toggles", "style"),
+    Output("prop-condition-container", "style"),
+    Output("total-weight-display", "children"),
+    Output("total-weight-display", "style"),
+    Output("stored-total-weight", "data"),
     Input("aircraft-select", "value"),
+    State("category-select", "value"),
+    State("engine-select", "value"),
+    State("occupants-select", "value"),
+    State("cg-slider", "value"),
+    State("config-select", "value"),
+    State("gear-select", "value"),
+    State("fuel-slider", "value"),
+    State("passenger-weight-input", "value"),
+    State("oei-toggle", "value"),
+    State("multi-engine-toggle-options", "data"),
 )
-def expand_ui_on_aircraft_select(ac_name):
-    """Show config details and expand all accordions when aircraft is selected."""
+def update_aircraft_context(ac_name, category, engine, occupants, cg, config, gear,
+                            fuel, pax_weight, oei_toggle, multi_engine_opts):
+    """
+    Everything that follows from the selected aircraft, in one response.
+
+    Values equal to the current ones are sent as no_update, so update_graph
+    runs once per selection instead of once per changed control.
+    """
     if not ac_name:
-        return {"display": "none"}, ["config"]
-    return {"display": "block"}, ["config", "environment", "overlays", "maneuvers"]
+        # Show config details and expand the accordions only once selected
+        return (dash.no_update,) * 18 + (
+            {"display": "none"}, {"display": "none"}, ["config"],
+        ) + (dash.no_update,) * 5
+    if ac_name not in aircraft_data:
+        raise PreventUpdate
+
+    ui = get_aircraft_ui(ac_name)
+    return (
+        ui["category_options"], _if_changed(ui["category"], category),
+        ui["engine_options"], _if_changed(ui["engine"], engine),
+        ui["occupant_options"], _if_changed(ui["occupants"], occupants),
+        ui["fuel_max"], ui["fuel_marks"],
+        ui["altitude_max"], ui["altitude_marks"],
+        ui["cg_min"], ui["cg_max"], _if_changed(ui["cg"], cg), ui["cg_marks"],
+        ui["config_options"], _if_changed(ui["config"], config),
+        ui["gear_options"], _if_changed(ui["gear"], gear),
+        {"display": "block"} if ui["retractable"] else {"display": "none"},
+        {"display": "block"},
+        ["config", "environment", "overlays", "maneuvers"],
+        *oei_control_styles(ui["multi_engine"], oei_toggle, multi_engine_opts),
+        *weight_display(ui, fuel, ui["occupants"], pax_weight),
+    )
 
 from dash import html
 from dash.exceptions import PreventUpdate
@@ -1013,108 +1248,33 @@ def toggle_prop_condition(feathered_clicks, stationary_clicks, windmilling_click
     return "feathered", "segment-btn active", "segment-btn", "segment-btn"
 
 @app.callback(
-    Output("multi-engine-toggles", "style"),
-    Output("prop-condition-container", "style"),
-    Input("aircraft-select", "value"),
+    Output("multi-engine-toggles", "style", allow_duplicate=True),
+    Output("prop-condition-container", "style", allow_duplicate=True),
     Input("oei-toggle", "value"),
     Input("multi-engine-toggle-options", "data"),
+    State("aircraft-select", "value"),
     prevent_initial_call=True
 )
-def update_dynamic_vmca_visibility(ac_name, oei_toggle, multi_engine_opts):
-    from dash.exceptions import PreventUpdate
-
+def update_dynamic_vmca_visibility(oei_toggle, multi_engine_opts, ac_name):
+    """OEI overlay controls; on aircraft changes update_aircraft_context sets these."""
     if not ac_name or ac_name not in aircraft_data:
         raise PreventUpdate
 
-    ac = aircraft_data[ac_name]
-    is_multi = ac.get("engine_count", 1) >= 2
-    oei_enabled = oei_toggle and "enabled" in oei_toggle
-    vmca_enabled = "vmca" in (multi_engine_opts or [])
+    return oei_control_styles(get_aircraft_ui(ac_name)["multi_engine"], oei_toggle, multi_engine_opts)
 
-    # Show dynamic overlays only when OEI is active
-    show_vmca_block = {"display": "block"} if is_multi and oei_enabled else {"display": "none"}
-
-    # Show prop condition only when Dynamic Vmc is toggled *and* OEI is active
-    show_prop_condition = {"display": "block", "marginTop": "5px"} if is_multi and oei_enabled and vmca_enabled else {"display": "none"}
-
-    return show_vmca_block, show_prop_condition
+# =============================================================================
+# AIRPORT & ENVIRONMENT CALLBACKS
+# =============================================================================
 
 @app.callback(
-    Output("engine-select", "options"),
-    Output("engine-select", "value"),
-    Output("occupants-select", "options"),
-    Output("occupants-select", "value"),
-    Output("fuel-slider", "max"),
-    Output("fuel-slider", "marks"),
-    Output("altitude-slider", "max"),
-    Output("altitude-slider", "marks"),
-    Input("aircraft-select", "value"),
-    
+    Output("airport-select", "options"),
+    Input("airport-select", "search_value"),
+    State("airport-select", "value"),
 )
-def update_aircraft_dependent_inputs(ac_name):
-    if not ac_name or ac_name not in aircraft_data:
-        raise PreventUpdate
-
-    ac = aircraft_data[ac_name]
-
-    # Engine
-    engines = ac["engine_options"]
-    engine_opts = [{"label": name, "value": name} for name in engines.keys()]
-    engine_val = engine_opts[0]["value"]
-
-    # Occupants
-    seat_count = ac["seats"]
-    occ_opts = [{"label": str(i), "value": i} for i in range(seat_count + 1)]
-    occ_val = min(2, seat_count)
-
-    # Fuel - create intuitive even marks
-    fuel_max = ac["fuel_capacity_gal"]
-
-    # Determine a nice step size based on fuel capacity
-    if fuel_max <= 20:
-        step = 5
-    elif fuel_max <= 50:
-        step = 10
-    elif fuel_max <= 100:
-        step = 20
-    elif fuel_max <= 200:
-        step = 25
-    else:
-        step = 50
-
-    # Generate marks at even intervals
-    fuel_marks = {}
-    mark_val = 0
-    while mark_val < fuel_max:
-        fuel_marks[mark_val] = str(mark_val)
-        mark_val += step
-    # Always include the max value
-    fuel_marks[fuel_max] = str(fuel_max)
-
-    # Altitude
-    ceiling = ac.get("mx_altitude") or ac.get("max_altitude")
-    if ceiling is None:
-        ceiling = 15000
-    alt_marks = {i: str(i) for i in range(0, ceiling + 1, 5000)}
-    alt_marks[0] = "Sea Level"
-    alt_marks[ceiling] = f"{ceiling} ft"
+def search_airports(search_value, airport_id):
+    """Filter airports server-side so the page only ships a screenful of options."""
+    return AIRPORT_INDEX.search_options(search_value, selected=airport_id)
 
-    return (
-        engine_opts,
-        engine_val,
-        occ_opts,
-        occ_val,
-        fuel_max,
-        fuel_marks,
-        ceiling,
-        alt_marks,
-
-    )
-
-
-# =============================================================================
-# AIRPORT & ENVIRONMENT CALLBACKS
-# =============================================================================
 
 @app.callback(
     Output("altitude-slider", "min"),
@@ -1134,7 +1294,7 @@ def update_altitude_from_airport(airport_id, current_alt, max_alt):
         return 0, 0, marks
 
     # Find airport elevation
-    airport = get_airport_by_id(AIRPORT_DATA, airport_id)
+    airport = get_airport_by_id(AIRPORT_INDEX, airport_id)
     if not airport:
         return 0, current_alt, dash.no_update
 
@@ -1222,372 +1382,101 @@ def update_oat_fahrenheit(oat_c):
 
 
 @app.callback(
-    Output("cg-slider-container", "children"),
-    Input("aircraft-select", "value")
+    Output("total-weight-display", "children", allow_duplicate=True),
+    Output("total-weight-display", "style", allow_duplicate=True),
+    Output("stored-total-weight", "data", allow_duplicate=True),
+    Input("fuel-slider", "value"),
+    Input("occupants-select", "value"),
+    Input("passenger-weight-input", "value"),
+    State("aircraft-select", "value"),
+    prevent_initial_call=True
 )
-def render_cg_slider(ac_name):
+def update_total_weight(fuel, occupants, pax_weight, ac_name):
     if not ac_name or ac_name not in aircraft_data:
         raise PreventUpdate
+    return weight_display(get_aircraft_ui(ac_name), fuel, occupants, pax_weight)
 
-    ac = aircraft_data[ac_name]
-    raw_min, raw_max = ac["cg_range"]
-    cg_min = round(float(raw_min), 2)
-    cg_max = round(float(raw_max), 2)
-    cg_range = cg_max - cg_min
-
-    # Determine step size based on CG range
-    if cg_range <= 5:
-        step = 0.5
-    elif cg_range <= 10:
-        step = 1.0
-    else:
-        step = 2.0
-
-    # Generate marks at even intervals
-    import math
-    # Start from the first even step value >= cg_min
-    first_mark = math.ceil(cg_min / step) * step
-
-    cg_marks = {}
-    # Add FWD label at min
-    cg_marks[cg_min] = f"FWD"
-
-    # Add intermediate marks
-    mark_val = first_mark
-    while mark_val < cg_max:
-        if mark_val > cg_min:  # Don't duplicate the min
-            cg_marks[round(mark_val, 1)] = f"{mark_val:.1f}"
-        mark_val += step
-
-    # Add AFT label at max
-    cg_marks[cg_max] = f"AFT"
-
-    dprint("CG DEBUG:", {
-        "cg_min": cg_min,
-        "cg_max": cg_max,
-        "step": step,
-        "marks": cg_marks
-    })
+from dash.exceptions import PreventUpdate
 
-    return html.Div([
-        html.Label("Center of Gravity (inches)", className="input-label-sm"),
-        dcc.Slider(
-            id="cg-slider",
-            min=cg_min,
-            max=cg_max,
-            value=round((cg_min + cg_max) / 2, 2),
-            step=0.1,
-            marks=cg_marks,
-            tooltip={"always_visible": True}
-        )
-    ])
+# Computed EMResults keyed by (state hash, aircraft revision), shared by the
+# graph and /api/envelope
+ENVELOPE_CACHE = LRUCache(max_entries=ENVELOPE_CACHE_MAX_ENTRIES)
+
+
+def aircraft_revision(ac_name):
+    """aircraft_data.revision(), or None for names not in the catalog."""
+    return aircraft_data.revision(ac_name) if ac_name in aircraft_data else None
+
+
+def get_envelope(state, key=None, revision=None):
+    """Return the EMResult for a full flight state, computing it on a cache miss."""
+    # The revision is read before computing: a result built from data that
+    # is replaced meanwhile lands under the old revision, never the new one
+    if revision is None:
+        revision = aircraft_revision(state.get("ac_name"))
+    key = (key or state_hash(state), revision)
+    result = ENVELOPE_CACHE.get(key)
+    annotate(envelope_cache="miss" if result is None else "hit")
+    if result is None:
+        with span("compute_em"):
+            result = compute_em(state)
+        ENVELOPE_CACHE.put(key, result, tag=state.get("ac_name"))
+    return result
 
-@app.callback(
-    Output("config-select", "options"),
-    Output("config-select", "value"),
-    Input("aircraft-select", "value"),
-)
-def update_config_dropdown(ac_name):
-    if not ac_name or ac_name not in aircraft_data:
-        raise PreventUpdate
 
-    flaps = aircraft_data[ac_name]["configuration_options"]["flaps"]
-    options = [{"label": flap, "value": flap} for flap in flaps]
-    default = options[0]["value"] if options else None
-    return options, default
+def build_em_figure(**state):
+    """
+    Render the EM diagram for one flight state (keyword args per EM_STATE_FIELDS).
 
-@app.callback(
-    Output("gear-select", "options"),
-    Output("gear-select", "value"),
-    Input("aircraft-select", "value"),
-)
-def update_gear_dropdown(ac_name):
-    if not ac_name or ac_name not in aircraft_data:
+    Physics runs headless in core.compute_em; this only draws the result.
+    """
+    t_start = time.perf_counter()
+    if not state.get("ac_name") or state["ac_name"] not in aircraft_data:
+        return go.Figure()  # Return an empty graph if no aircraft is selected
+    try:
+        result = get_envelope(state)
+    except EMInputError:
         raise PreventUpdate
 
-    ac = aircraft_data[ac_name]
-    if ac.get("gear_type") == "retractable":
-        options = [{"label": "Up", "value": "up"}, {"label": "Down", "value": "down"}]
-        return options, "up"
-    else:
-        return [], None
+    with span("figure_assembly"):
+        fig = render_em_figure(result)
 
-@app.callback(
-    Output("gear-select-container", "style"),
-    Input("aircraft-select", "value")
-)
-def toggle_gear_selector_visibility(ac_name):
-    if not ac_name or ac_name not in aircraft_data:
-        return {"display": "none"}
+    t_end = time.perf_counter()
+    dprint(f"[PERF] update_graph total: {(t_end - t_start):.3f} sec")
 
-    gear_type = aircraft_data[ac_name].get("gear_type", "fixed")
-    return {"display": "block"} if gear_type == "retractable" else {"display": "none"}
+    return fig
 
-@app.callback(
-    Output("total-weight-display", "children"),
-    Output("total-weight-display", "style"),
-    Output("stored-total-weight", "data"),
-    Input("aircraft-select", "value"),
-    Input("fuel-slider", "value"),
-    Input("occupants-select", "value"),
-    Input("passenger-weight-input", "value"),
-)
-def update_total_weight(ac_name, fuel, occupants, pax_weight):
-    if not ac_name or ac_name not in aircraft_data:
-        raise PreventUpdate
 
-    ac = aircraft_data[ac_name]
-    empty = ac["empty_weight"]
-    fuel = fuel if fuel is not None else 0
-    fuel_weight = fuel * ac["fuel_weight_per_gal"]
-    pax_weight = pax_weight if pax_weight is not None else 180
-    occupants = occupants if occupants is not None else 0
-    people_weight = occupants * pax_weight
-    total = empty + fuel_weight + people_weight
-    max_weight = ac["max_weight"]
+# Rendered figures keyed by (state hash, aircraft revision), so exports
+# never upload the figure
+FIGURE_CACHE = LRUCache(max_entries=FIGURE_CACHE_MAX_ENTRIES)
 
-    color = "darkgreen" if total <= max_weight else "red"
+# Newest update_graph request per browser tab; older ones are dropped
+RENDER_SEQUENCER = RenderSequencer(max_sessions=RENDER_SEQUENCER_MAX_SESSIONS)
 
-    return (
-        f"{int(total)} lbs",
-        {"color": color, "fontWeight": "bold", "fontSize": "16px"},
-        total
-    )
+# Pick up edits to aircraft_data without a restart (see core.hot_reload).
+# The caches key on aircraft_data.revision(), so edited data is never served
+# from them; they are also tagged by aircraft name so a change frees that
+# aircraft's entries right away.
+AIRCRAFT_RELOADER = AircraftReloader(aircraft_data, AIRCRAFT_CATALOG)
 
-from dash.exceptions import PreventUpdate
 
-def calculate_vmca(
-    published_vmca,
-    power_fraction,
-    total_weight,
-    reference_weight,
-    cg,
-    cg_range,
-    prop_condition,
-    pressure_altitude=0,
-    oat_c=15,
-    unit="KIAS",
-    bank_angles_deg=np.linspace(-5, 10, 50)
-):
-    """
-    Returns Vmca values across a range of bank angles based on power, weight, CG,
-    prop condition, and density altitude.
-
-    Physics basis:
-    - Vmc is the minimum speed at which directional control can be maintained with
-      critical engine inoperative and max power on the operating engine
-    - Published Vmc is typically at: max gross weight, most aft CG, sea level,
-      5° bank into dead engine, critical engine windmilling/feathered
-
-    Args:
-        published_vmca: Published Vmca speed (KIAS) - typically at max weight, aft CG
-        power_fraction: Power setting on operating engine (0-1)
-        total_weight: Current aircraft weight (lbs)
-        reference_weight: Weight at which Vmca was published (typically max gross)
-        cg: Current CG position
-        cg_range: [forward_limit, aft_limit] CG range
-        prop_condition: "feathered", "stationary", or "windmilling"
-        pressure_altitude: Pressure altitude in feet
-        oat_c: Outside air temperature in Celsius
-        unit: Output unit ("KIAS" or "MPH")
-        bank_angles_deg: Array of bank angles to compute Vmca for
-
-    Returns:
-        (bank_angles_deg, vmca_vals): Tuple of bank angles and corresponding Vmca values
-    """
-    # --- Extract usable numeric Vmca if a dict was passed ---
-    if isinstance(published_vmca, dict):
-        published_vmca = published_vmca.get("clean_up") or next(iter(published_vmca.values()), None)
-
-    if not isinstance(published_vmca, (int, float)):
-        return bank_angles_deg, np.full_like(bank_angles_deg, np.nan)
-
-    # --- Calculate density altitude for altitude effects ---
-    isa_temp_c = TEMP_SL_C - (pressure_altitude * LAPSE_RATE_K_FT)
-    temp_dev_c = oat_c - isa_temp_c
-    density_altitude = pressure_altitude + (120 * temp_dev_c)
-
-    # --- Base modifier (1.0 = no change from published) ---
-    modifiers = np.ones_like(bank_angles_deg, dtype=float)
-
-    # --- Power effect ---
-    # Lower power = less asymmetric thrust = lower Vmc
-    # At full power: modifier = 1.0 (published condition)
-    # At 50% power: modifier ≈ 0.85
-    # At idle: modifier ≈ 0.70
-    power_mod = 0.70 + 0.30 * power_fraction
-    modifiers *= np.clip(power_mod, 0.70, 1.05)
-
-    # --- Weight effect ---
-    # Lighter weight = less inertia to resist yaw = higher Vmc
-    # Published Vmc is at max gross, so lighter = higher Vmc
-    # Typical effect: ~1 kt per 100 lbs from max gross
-    weight_ratio = total_weight / reference_weight
-    # Invert: lighter (ratio < 1) should increase Vmc
-    weight_factor = 1.0 + 0.15 * (1.0 - weight_ratio)
-    modifiers *= np.clip(weight_factor, 0.90, 1.15)
-
-    # --- CG effect ---
-    # Aft CG = shorter moment arm for rudder = higher Vmc
-    # Published Vmc is typically at aft CG limit
-    # Forward CG improves directional control (lower Vmc)
-    cg_span = cg_range[1] - cg_range[0]
-    if cg_span > 0:
-        # cg_percent: 0 = forward limit, 1 = aft limit
-        cg_percent = (cg - cg_range[0]) / cg_span
-        # At forward CG: slight reduction; at aft CG: baseline (published condition)
-        cg_factor = 0.96 + 0.04 * cg_percent
-    else:
-        cg_factor = 1.0
-    modifiers *= cg_factor
-
-    # --- Density altitude effect ---
-    # Higher DA = less power available from operating engine = lower Vmc
-    # Also less rudder effectiveness, but power effect dominates
-    # Typical: ~1% reduction per 3,000 ft DA
-    da_factor = 1.0 - (density_altitude / 30000.0) * 0.10
-    modifiers *= np.clip(da_factor, 0.85, 1.0)
-
-    # --- Prop condition effect ---
-    # Windmilling: max drag/yaw from dead engine = highest Vmc
-    # Feathered: minimum drag = lowest Vmc
-    prop_factors = {
-        "windmilling": 1.08,   # +8% - significant yaw from windmilling prop
-        "stationary": 1.03,    # +3% - some drag, no rotation
-        "feathered": 0.92      # -8% - minimum drag, best case
-    }
-    modifiers *= prop_factors.get(prop_condition, 1.0)
-
-    # --- Bank angle effect (refined model) ---
-    # The relationship between bank and Vmc is nonlinear:
-    # - Wings level (0°): High sideslip needed, moderate Vmc
-    # - 5° into dead engine: Optimal - sideslip eliminated, lowest Vmc
-    # - Bank away from dead engine (negative): Dramatically increases Vmc
-    # - Excessive bank into dead engine (>5°): Increases Vmc due to increased
-    #   load factor and loss of vertical lift component
-    bank_mod = np.ones_like(bank_angles_deg, dtype=float)
-    for i, bank in enumerate(bank_angles_deg):
-        if bank < 0:
-            # Banking away from dead engine - significant Vmc increase
-            # Up to +15% at -5° bank
-            bank_mod[i] = 1.0 + 0.03 * abs(bank)
-        elif 0 <= bank <= 5:
-            # Optimal range - Vmc decreases as bank approaches 5°
-            # Minimum at 5° (published condition)
-            bank_mod[i] = 1.0 - 0.04 * (bank / 5.0)
-        else:
-            # Beyond optimal bank - Vmc increases due to load factor
-            # Gradual increase: ~0.5% per degree beyond 5°
-            bank_mod[i] = 0.96 + 0.005 * (bank - 5)
-
-    modifiers *= bank_mod
-
-    # --- Final Vmca array ---
-    vmca_vals = published_vmca * modifiers
-
-    # Convert to MPH if needed
-    if unit == "MPH":
-        vmca_vals = vmca_vals * KTS_TO_MPH
-
-    return bank_angles_deg, vmca_vals
-
-
-def calculate_dynamic_vyse(
-    published_vyse,
-    total_weight,
-    reference_weight,
-    pressure_altitude=0,
-    oat_c=15,
-    gear_position="up",
-    flap_config="clean",
-    prop_condition="feathered"
-):
-    """
-    Compute dynamic Vyse (best single-engine rate of climb speed) based on weight,
-    density altitude, configuration, and prop condition.
-
-    Physics basis:
-    - Vyse is the speed that provides best rate of climb with one engine inoperative
-    - It's determined by the point where excess thrust power is maximum
-    - Weight affects required lift and thus optimal L/D point
-    - Density altitude affects available power from operating engine
-    - Configuration (gear, flaps) affects drag and optimal speed
-
-    Args:
-        published_vyse: Baseline Vyse (KIAS) - typically at max gross, sea level
-        total_weight: Current aircraft weight (lbs)
-        reference_weight: Weight at which Vyse is published (typically max gross)
-        pressure_altitude: Pressure altitude in feet
-        oat_c: Outside air temperature in Celsius
-        gear_position: "up" or "down"
-        flap_config: "clean", "takeoff", or "landing"
-        prop_condition: "feathered", "stationary", or "windmilling"
-
-    Returns:
-        Adjusted Vyse in KIAS
-    """
-    # --- Calculate density altitude ---
-    isa_temp_c = TEMP_SL_C - (pressure_altitude * LAPSE_RATE_K_FT)
-    temp_dev_c = oat_c - isa_temp_c
-    density_altitude = pressure_altitude + (120 * temp_dev_c)
-
-    # --- Weight effect ---
-    # Heavier aircraft needs to fly faster for optimal L/D
-    # Vyse scales approximately with sqrt(weight ratio) for constant L/D
-    # Simplified: ~5% change for 10% weight change
-    weight_ratio = total_weight / reference_weight
-    weight_factor = 1.0 + 0.5 * (weight_ratio - 1.0)
-    weight_factor = np.clip(weight_factor, 0.92, 1.08)
-
-    # --- Density altitude effect (refined) ---
-    # At higher DA, TAS increases for same IAS, but available power decreases
-    # The optimal IAS actually decreases slightly at altitude because:
-    # - Less power available means flying at lower speed for best L/D
-    # - But also less margin, so slightly higher IAS for safety
-    # Net effect: very small change, approximately +0.5% per 5,000 ft DA
-    # This is much less than the original 2% per 10,000 ft
-    da_factor = 1.0 + (density_altitude / 50000.0) * 0.05
-    da_factor = np.clip(da_factor, 1.0, 1.03)
-
-    # --- Gear effect ---
-    # Gear down = more drag = shifts L/D curve right = higher Vyse
-    # Typical effect: +3-5% with gear down
-    gear_factor = 1.04 if gear_position == "down" else 1.0
-
-    # --- Flap effect ---
-    # Flaps increase both lift and drag, shifting optimal speed
-    # More flaps = more drag penalty = higher optimal speed
-    flap_factors = {
-        "clean": 1.00,
-        "takeoff": 1.02,    # Small increase
-        "landing": 1.05     # Larger increase due to more drag
-    }
-    config_factor = flap_factors.get(flap_config, 1.00)
-
-    # --- Prop condition effect ---
-    # Dead engine prop condition affects total drag
-    # More drag from dead engine = need to fly slightly faster
-    prop_factors = {
-        "feathered": 0.98,    # Minimum drag - can fly slightly slower
-        "stationary": 1.02,   # Moderate drag
-        "windmilling": 1.05   # Maximum drag - need more speed
-    }
-    prop_factor = prop_factors.get(prop_condition, 1.0)
-
-    # --- Final dynamic Vyse ---
-    adjusted_vyse = (
-        published_vyse
-        * weight_factor
-        * da_factor
-        * gear_factor
-        * config_factor
-        * prop_factor
-    )
+@AIRCRAFT_RELOADER.add_listener
+def invalidate_aircraft_caches(changed):
+    for name in changed:
+        ENVELOPE_CACHE.invalidate(name)
+        FIGURE_CACHE.invalidate(name)
+        AIRCRAFT_UI_CACHE.invalidate(name)
+
+
+@app.server.before_request
+def start_aircraft_reloader():
+    AIRCRAFT_RELOADER.ensure_started()
 
-    return adjusted_vyse
 
 @app.callback(
     Output("em-graph", "figure"),
+    Output("em-figure-state", "data"),
     Input("aircraft-select", "value"),
     Input("config-select", "value"),
     Input("engine-select", "value"),
@@ -1604,7 +1493,7 @@ def calculate_dynamic_vyse(
     Input("category-select", "value"),
     Input("unit-select", "data"),
     Input("multi-engine-toggle-options", "data"),
-    Input("maneuver-select", "value"),
+    Input("maneuver-state", "data"),
     Input({"type": "steepturn-aob", "index": ALL}, "value"),
     Input({"type": "steepturn-ias", "index": ALL}, "value"),
     Input({"type": "steepturn-standard", "index": ALL}, "value"),
@@ -1616,1734 +1505,89 @@ def calculate_dynamic_vyse(
     Input("screen-width", "data"),
     Input("oat-input", "value"),
     Input("altimeter-input", "value"),
+    Input("render-seq", "data"),
+    State("em-figure-state", "data"),
 )
+def update_graph(*args):
+    """
+    Render the EM figure and publish a compact handle for the export callbacks.
+
+    The maneuver arrives through the maneuver-state store, which
+    render_maneuver_options writes together with the maneuver's inputs, so a
+    maneuver change renders once with its inputs in place instead of once
+    without them and again when they appear. The published key doubles as a
+    state-version token: a triggered call whose state matches the figure on
+    screen is answered with no_update. Initial calls always render, since
+    they may come from a freshly mounted (empty) em-graph.
+
+    During slider drags, requests carry the tab's render-seq token: one
+    render per tab runs at a time, and a request (or finished figure) that a
+    newer one from the same tab has superseded is dropped.
+    """
+    *inputs, render_seq, figure_state = args
+    state = dict(zip(EM_STATE_FIELDS, inputs))
+    key = state_hash(state)
+    revision = aircraft_revision(state["ac_name"])
+    # Entering the turn registers the seq even when nothing is rendered, so
+    # a drag back to the figure on screen still supersedes older requests
+    with RENDER_SEQUENCER.turn(render_seq) as current:
+        if (ctx.triggered_id is not None and figure_state and figure_state.get("key") == key
+                and figure_state.get("revision") == revision):
+            EM_RENDERS.inc(result="unchanged")
+            return dash.no_update, dash.no_update
+        if not current:
+            EM_RENDERS.inc(result="superseded")
+            return dash.no_update, dash.no_update
+        with trace("update_graph", state):
+            fig = build_em_figure(**state)
+            FIGURE_CACHE.put((key, revision), fig, tag=state["ac_name"])
+    if RENDER_SEQUENCER.superseded(render_seq):
+        # Kept in FIGURE_CACHE, but the browser would discard it
+        EM_RENDERS.inc(result="discarded")
+        return dash.no_update, dash.no_update
+    EM_RENDERS.inc(result="rendered")
+    return fig, {"key": key, "revision": revision, "state": state}
+
+
+def get_cached_figure(figure_state):
+    """
+    Fetch the figure for an export from the server-side cache.
 
-def update_graph(
-    ac_name,
-    config,
-    engine_name,
-    occupants,
-    fuel,
-    altitude_ft,
-    total_weight,
-    power_fraction,
-    overlay_toggle,
-    gear,
-    oei_toggle,
-    prop_condition,
-    cg,
-    selected_category,
-    unit,
-    multi_engine_toggle_options,
-    maneuver,
-    aob_values,
-    ias_values,
-    steepturn_standard_values,
-    steepturn_ghost_values,
-    chandelle_ias_values,
-    chandelle_bank_values,
-    chandelle_ghost_values,
-    pitch_angle,
-    screen_width,
-    oat_c,
-    altimeter_inhg
-):
-    t_start = time.perf_counter()
-    import plotly.graph_objects as go  # <== you must ensure this is imported here if not at top of file
-    
-    # ---- existing validation, etc. ----
-    if not ac_name or ac_name not in aircraft_data:
-        return go.Figure()
-
-    # === Resolution tuning based on screen width ===
-    if screen_width is None:
-        screen_width = 1400  # fallback for server-side calls
-
-    if screen_width < 1200:
-        aob_ias_step = 1.0     # 1 kt increments
-        aob_tr_step = 1.0      # 1 deg/s increments
-    else:
-        aob_ias_step = 0.5     # 0.5 kt increments
-        aob_tr_step = 0.5      # 0.5 deg/s increments
-
-    # Handle None values for overlay lists
-    overlay_toggle = overlay_toggle if overlay_toggle is not None else []
-    multi_engine_toggle_options = multi_engine_toggle_options if multi_engine_toggle_options is not None else []
-
-    all_overlays = overlay_toggle + multi_engine_toggle_options
-
-    if not ac_name or ac_name not in aircraft_data:
-        return go.Figure()  # Return an empty graph if no aircraft is selected
-
-    if engine_name is None or engine_name not in aircraft_data[ac_name]["engine_options"]:
-        raise PreventUpdate
-
-    def convert_display_airspeed(ias_vals, unit):
-        return ias_vals * KTS_TO_MPH if unit == "MPH" else ias_vals
-    def convert_input_airspeed(ias_vals, unit):
-        return ias_vals / KTS_TO_MPH if unit == "MPH" else ias_vals
-    
-    if not ac_name or ac_name not in aircraft_data:
-        raise PreventUpdate
-    from dash import ctx
-    if oei_toggle is None:
-        oei_toggle = []
-    if prop_condition is None:
-        prop_condition = "feathered"
-
-    oei_active = "enabled" in oei_toggle
-    prop_mode = prop_condition if oei_active else None
- 
-
-    ac = aircraft_data[ac_name]
-    engine_data = ac["engine_options"][engine_name]
-    
-    # --- Power Derating Based on Altitude ---
-    power_curve = engine_data.get("power_curve", {})
-    sea_level_max = power_curve.get("sea_level_max", engine_data["horsepower"])
-    max_altitude = power_curve.get("max_altitude", 12000)
-    derate_per_1000ft = power_curve.get("derate_per_1000ft", 0.03)
-
-    alt_frac = min(altitude_ft / 1000.0, max_altitude / 1000.0)
-    alt_derate = max(0.0, 1 - derate_per_1000ft * alt_frac)
-    derated_hp = sea_level_max * alt_derate
-
-    hp = derated_hp * power_fraction  # ✅ override earlier hp
-
-    g_limit_block = ac.get("G_limits", {}).get(selected_category, {}).get(config, {})
-
-    if isinstance(g_limit_block, dict):
-        g_limit = g_limit_block.get("positive", 3.8)
-        neg = g_limit_block.get("negative", -1.5)
-        g_limit_neg = abs(neg) if isinstance(neg, (int, float)) else 1.5
-    elif isinstance(g_limit_block, (int, float)):
-        g_limit = g_limit_block
-        g_limit_neg = 1.5
-    else:
-        g_limit = 3.8
-        g_limit_neg = 1.5
-
-        # --- Gear Drag & Lift Modifiers ---
-    gear_drag_factor = 1.0
-    gear_lift_factor = 1.0
-
-    if gear == "down":
-        gear_drag_factor = 1.15  # +15% drag when gear down
-        gear_lift_factor = 0.98  # -2% CLmax when gear down
-
-    # --- Determine Final Power Based on OEI Toggle ---
-    oei_config_key = f"{config}_{gear or 'up'}"
-    oei_data = (
-        engine_data
-        .get("oei_performance", {})
-        .get(oei_config_key, {})
-        .get(prop_mode, {})
-    )
-    # If OEI config lookup failed, try defaulting to "clean_up"
-    if oei_active and not oei_data:
-        oei_data = (
-            engine_data.get("oei_performance", {})
-            .get("clean_up", {})
-            .get(prop_mode, {})
-        )
-
-    if oei_active and oei_data:
-        hp = sea_level_max * oei_data.get("max_power_fraction", 1.0) * alt_derate
-    else:
-        hp = derated_hp * power_fraction
-        
-
-    # ✅ Debug log
-    dprint("ENGINE DEBUG:", {
-        "ac": ac_name,
-        "engine": engine_name,
-        "oei_active": oei_active,
-        "prop_mode": prop_mode,
-        "config_key": oei_config_key,
-        "hp": hp,
-    })
-    
-    import re
-    import numpy as np
-    from math import pi
-    import plotly.graph_objects as go
-
-  
-
-    # ✅ Continue with existing logic...
-
-    fig = go.Figure()
-    weight = total_weight  # passed in directly from dcc.Store
-    total_weight = weight  # ✅ ensures total_weight is defined
-
-    fig.add_layout_image(
-        dict(
-            source="/assets/logo2.png",
-            xref="paper", yref="paper",
-            x=0, y=1,
-            sizex=0.2, sizey=0.2,
-            xanchor="left", yanchor="top",
-            layer="above"
-        )
-    )
-
-    fig.update_layout(
-        paper_bgcolor="#f7f9fc",   # outside the plot
-        plot_bgcolor="#f7f9fc",    # inside the plotting area
-        font=dict(color="#1b1e23"),  # match your UI's text color
-        margin=dict(l=40, r=40, t=40, b=40),
-        xaxis=dict(showgrid=True),
-        yaxis=dict(showgrid=True),
-        dragmode=False,             # ✅ disables box zoom drag
-        hovermode="closest",        # ✅ enables hover tooltips
-        autosize=True               # ✅ responsive sizing
-    )
-    
-    # --- CG Effects ---
-    cl_base = ac["CL_max"][config]
-    cg_min_val, cg_max_val = ac["cg_range"]
-    cg_span = cg_max_val - cg_min_val
-    cg_fraction = (cg - cg_min_val) / cg_span if cg_span else 0.5  # Avoid div by zero
-
-    # Apply simple linear model: more forward = lower CL_max, more drag
-    cl_max = cl_base * (1 - 0.05 * (1 - cg_fraction))  # up to 5% penalty at full forward CG
-    cl_max *= gear_lift_factor
-    cg_drag_factor = 1 + 0.04 * (0.5 - cg_fraction)     # up to 4% added drag for FWD CG
-
-    dprint("CG INFLUENCE:", {
-        "cg": cg,
-        "cl_base": cl_base,
-        "cl_max_adj": cl_max,
-        "cg_fraction": cg_fraction,
-        "cg_drag_factor": cg_drag_factor
-    })
-
-
-    wing_area = ac["wing_area"]
-    # Aircraft drag/lift parameters - used throughout update_graph
-    CD0 = ac.get("CD0", 0.025)
-    e = ac.get("e", 0.8)
-    AR = ac.get("aspect_ratio", 7.5)
-
-    # === Environment calculations using OAT and altimeter ===
-    # Default values if not provided
-    oat_c = oat_c if oat_c is not None else 15
-    altimeter_inhg = altimeter_inhg if altimeter_inhg is not None else 29.92
-
-    # Calculate pressure altitude from field elevation and altimeter
-    pressure_altitude = compute_pressure_altitude(altitude_ft, altimeter_inhg)
-
-    # Use centralized air density calculation with OAT for accurate density
-    rho = compute_air_density(pressure_altitude, oat_c)
-
-    dprint("ENVIRONMENT DEBUG:", {
-        "field_elev_ft": altitude_ft,
-        "oat_c": oat_c,
-        "altimeter_inhg": altimeter_inhg,
-        "pressure_altitude": pressure_altitude,
-        "density_altitude": compute_density_altitude(pressure_altitude, oat_c),
-        "rho": rho
-    })
-
-    stall_data = ac.get("stall_speeds", {}).get(config, {})
-    # Use weight-interpolated stall speed instead of just minimum
-    vs_1g = interpolate_stall_speed(stall_data, weight) if stall_data else 30
-    ias_start = max(0, int(vs_1g * 0.7))
-
-    if config == "clean":
-        max_speed = ac.get("Vne", 200)
-        label = "Vne"
-    else:
-        max_speed = ac.get("Vfe", {}).get(config, 120)
-        label = f"Vfe ({config})"
-
-    max_speed_internal = max_speed  # always in KIAS for physics
-    max_speed_display = convert_display_airspeed(max_speed, unit)
-
-    ias_start = max(0, int(vs_1g * 0.8))  # Add dynamic padding (20% below Vs)
-    ias_vals = np.arange(ias_start, max_speed + 1, 1)
-    ias_vals_display = convert_display_airspeed(ias_vals, unit)
-    
-    g_curve_x, g_curve_y = [], []
-    for ias in ias_vals:
-        v = ias * KTS_TO_FPS
-        omega = g * ((g_limit**2 - 1) ** 0.5) / v
-        tr = omega * 180 / pi
-        g_curve_x.append(ias)
-        g_curve_y.append(tr)
-
-    stall_x, stall_y = [], []
-    # Use finer steps near stall speed for smoother curve, coarser elsewhere
-    stall_ias_fine = np.concatenate([
-        np.arange(ias_start, vs_1g + 15, 0.5),  # Fine steps near stall
-        np.arange(vs_1g + 15, max_speed + 1, 2)  # Coarser steps elsewhere
-    ])
-    for ias in stall_ias_fine:
-        v = ias * KTS_TO_FPS
-        n_stall = (0.5 * rho * v**2 * wing_area * cl_max) / weight
-        if n_stall >= 1:
-            omega = g * ((n_stall**2 - 1) ** 0.5) / v
-            tr = omega * 180 / pi
-            if not stall_x:
-                stall_x.append(ias)
-                stall_y.append(0)
-            stall_x.append(ias)
-            stall_y.append(tr)
-
-    stall_x_display = convert_display_airspeed(np.array(stall_x), unit)
-    g_curve_x_display = convert_display_airspeed(np.array(g_curve_x), unit)
-
-    from numpy import interp
-    corner_ias, corner_tr = None, None
-    min_diff = float("inf")
-    for ias in ias_vals:
-        stall_tr = interp(ias, stall_x, stall_y)
-        g_tr = interp(ias, g_curve_x, g_curve_y)
-        diff = abs(stall_tr - g_tr)
-        if diff < min_diff:
-            min_diff = diff
-            corner_ias = ias
-            corner_tr = stall_tr
-        if diff < 0.5:
-            break
-
-    if corner_ias is None:
-        corner_ias = ias_vals[0]
-        corner_tr = 0
-
-    stall_clipped_x = [x for x in stall_x if x <= corner_ias]
-    stall_clipped_y = stall_y[:len(stall_clipped_x)]
-    g_clipped_x = [x for x in g_curve_x if x >= corner_ias]
-    g_clipped_y = g_curve_y[-len(g_clipped_x):]
-
-    oei_active = "enabled" in oei_toggle
-    prop_mode = prop_condition if oei_active else None
-
-    # === Early DVmc calculation to modify flight envelope ===
-    dvmc_active = False
-    if "vmca" in all_overlays and ac.get("engine_count", 1) > 1 and oei_active:
-        dvmc_active = True
-        published_vmca_early = ac.get("single_engine_limits", {}).get("Vmca", 70)
-        reference_weight_early = ac.get("max_weight", 3600)
-        cg_range_early = ac.get("cg_range", [10, 20])
-
-        # Calculate DVmc curve
-        bank_angles_early = np.linspace(5, 90, 150)
-        _, vmca_vals_kias_early = calculate_vmca(
-            published_vmca=published_vmca_early,
-            power_fraction=power_fraction,
-            total_weight=weight,
-            reference_weight=reference_weight_early,
-            cg=cg,
-            cg_range=cg_range_early,
-            prop_condition=prop_mode,
-            pressure_altitude=pressure_altitude,
-            oat_c=oat_c,
-            bank_angles_deg=bank_angles_early
-        )
-
-        # Convert to turn rates
-        v_fts_early = vmca_vals_kias_early * KTS_TO_FPS
-        bank_rad_early = np.radians(bank_angles_early)
-        omega_rad_early = g * np.tan(bank_rad_early) / v_fts_early
-        turn_rates_early = np.degrees(omega_rad_early)
-
-        # Modify stall boundary where DVmc is more restrictive
-        stall_clipped_x_modified = []
-        stall_clipped_y_modified = []
-
-        for ias_stall, tr_stall in zip(stall_clipped_x, stall_clipped_y):
-            # Interpolate DVmc speed at this turn rate
-            if tr_stall >= min(turn_rates_early) and tr_stall <= max(turn_rates_early):
-                dvmc_at_tr = np.interp(tr_stall, turn_rates_early, vmca_vals_kias_early)
-                # Use max(stall, dvmc) as the effective boundary
-                effective_ias = max(ias_stall, dvmc_at_tr)
-            else:
-                effective_ias = ias_stall
-            stall_clipped_x_modified.append(effective_ias)
-            stall_clipped_y_modified.append(tr_stall)
-
-        # Replace stall boundary with modified version
-        stall_clipped_x = stall_clipped_x_modified
-        stall_clipped_y = stall_clipped_y_modified
-
-    stall_clipped_x_display = convert_display_airspeed(np.array(stall_clipped_x), unit)
-    g_clipped_x_display = convert_display_airspeed(np.array(g_clipped_x), unit)
-    corner_ias_display = convert_display_airspeed(corner_ias, unit)
-
-    if "negative_g" in overlay_toggle:
-        # === Negative Lift Limit Curve ===
-        # Use same fine steps near stall as positive boundary for consistency
-        neg_stall_x, neg_stall_y = [], []
-        for ias in stall_ias_fine:
-            v = ias * KTS_TO_FPS
-            n_stall = (0.5 * rho * v**2 * wing_area * -cl_max) / weight
-            if n_stall <= -1:
-                # Compute turn rate, limit to G envelope
-                try:
-                    tr_limit_neg = g * np.sqrt(abs(g_limit_neg)**2 - 1) / v
-                    omega = g * np.sqrt(n_stall**2 - 1) / v
-                    tr = -min(omega * 180 / pi, tr_limit_neg * 180 / pi)
-                except:
-                    continue  # Skip invalid values (e.g. sqrt of negative)
-                if not neg_stall_x:
-                    neg_stall_x.append(ias)
-                    neg_stall_y.append(0)
-                neg_stall_x.append(ias)
-                neg_stall_y.append(tr)
-
-        neg_corner_idx = np.argmin(np.abs(np.array(neg_stall_y) - (-corner_tr)))
-        neg_stall_x_clip = neg_stall_x[:neg_corner_idx + 1]
-        neg_stall_y_clip = neg_stall_y[:neg_corner_idx + 1]
-        neg_stall_x_display = convert_display_airspeed(np.array(neg_stall_x_clip), unit)
-
-        # === Negative G-Limit Curve ===
-        neg_g_x, neg_g_y = [], []
-        for ias in ias_vals:
-            v = ias * KTS_TO_FPS
-            try:
-                omega = g * np.sqrt(g_limit_neg**2 - 1) / v
-                tr = -omega * 180 / pi
-                neg_g_x.append(ias)
-                neg_g_y.append(tr)
-            except:
-                continue
-
-        neg_g_x_clip = [x for x in neg_g_x if x >= neg_stall_x_clip[-1]]
-        neg_g_y_clip = neg_g_y[-len(neg_g_x_clip):]
-        neg_g_x_display = convert_display_airspeed(np.array(neg_g_x_clip), unit)
-
-        # === Plot Negative G Envelope ===
-        fig.add_trace(go.Scatter(
-            x=neg_stall_x_display,
-            y=neg_stall_y_clip,
-            mode="lines",
-            name="Neg Lift Limit",
-            line=dict(color="red", width=3),
-            hoverinfo="skip"
-        ))
-
-        fig.add_trace(go.Scatter(
-            x=neg_g_x_display,
-            y=neg_g_y_clip,
-            mode="lines",
-            name=f"Neg Load Limit ({g_limit_neg:.1f} G)",
-            line=dict(color="black", width=3, dash="solid"),
-            hoverinfo="skip"
-        ))
-
-        vne_y_top = None
-        vne_y_bot = None
-
-        # Adjust y_max/y_min to show full envelope
-        y_span = max(
-            abs(min(neg_g_y_clip)) if neg_g_y_clip else 0,
-            max(g_clipped_y) if g_clipped_y else 0
-        )
-        y_max = y_span * 1.1
-        y_min = -y_span * 1.1
-    else:
-        y_max = max(g_clipped_y) * 1.1 if g_clipped_y else 100
-        y_min = 0
-
-    # Lift Limit - color changes when DVmc modifies the boundary
-    lift_limit_color = "#DC143C" if dvmc_active else "red"
-    lift_limit_name = "Lift Limit (DVmc)" if dvmc_active else "Lift Limit"
-    fig.add_trace(go.Scatter(x=stall_clipped_x_display, y=stall_clipped_y,
-        mode="lines", name=lift_limit_name, line=dict(color=lift_limit_color, width=3), hoverinfo="skip")),
-    fig.add_trace(go.Scatter(x=g_clipped_x_display, y=g_clipped_y,
-        mode="lines", name=f"Load Limit ({g_limit:.1f} G)", line=dict(color="black", width=3, dash="solid"), hoverinfo="skip")),
-    fig.add_trace(go.Scatter(x=[corner_ias_display], y=[corner_tr],
-        mode="markers", name=f"Corner Speed ({corner_ias_display:.0f} {unit})", marker=dict(color="orange", size=9, symbol="x"), hoverinfo="skip")),
-
-    # Corner speed tick mark on x-axis
-    fig.add_shape(
-        type="line",
-        x0=corner_ias_display, x1=corner_ias_display,
-        y0=0, y1=-0.015,
-        xref="x", yref="paper",
-        line=dict(color="orange", width=1.5)
-    )
-    # Corner speed annotation on x-axis (inline with tick labels)
-    fig.add_annotation(
-        x=corner_ias_display,
-        y=-0.06,
-        yref="paper",
-        xref="x",
-        text=f"<b>{corner_ias_display:.0f}</b>",
-        showarrow=False,
-        font=dict(size=11, color="orange"),
-    )
-
-  # --- Interpolate Vne Y-positions (always present) ---
-    vne_y_top = np.interp(max_speed, g_clipped_x, g_clipped_y) if g_clipped_x and g_clipped_y else 0
-    vne_y_bot = 0  # Default if negative_g not shown
-
-    # If negative G envelope is enabled and valid, interpolate bottom of Vne line
-    if "negative_g" in overlay_toggle and 'neg_g_x_clip' in locals() and neg_g_x_clip and neg_g_y_clip:
-        vne_y_bot = np.interp(max_speed, neg_g_x_clip, neg_g_y_clip)
-
-    # Convert X for display units
-    vne_x_display = convert_display_airspeed(max_speed, unit)
-
-    # --- Plot Vne line
-    fig.add_trace(go.Scatter(
-        x=[vne_x_display, vne_x_display],
-        y=[vne_y_bot, vne_y_top],
-        mode="lines",
-        name=label,
-        line=dict(color="black", width=3, dash="dash"),
-        hoverinfo="skip"
-    ))  
-    
-    # Setup for overlays (continue with part 2)
-    # --- INTERMEDIATE G CURVES (toggle controlled) ---
-    if "g" in overlay_toggle:
-        intermediate_gs = [round(g_val, 1) for g_val in np.arange(1.5, g_limit, 0.5)]
-        for g_inter in intermediate_gs:
-            gx, gy = [], []
-            for ias in ias_vals:
-                v = ias * KTS_TO_FPS
-                stall_v = np.sqrt((2 * weight * g_inter) / (rho * wing_area * cl_max))
-                if v < stall_v:
-                    continue
-                omega = g * np.sqrt(g_inter**2 - 1) / v
-                tr = omega * 180 / pi
-
-                # Check DVmc limit when active
-                dvmc_ok = True
-                if dvmc_active:
-                    dvmc_at_tr = np.interp(tr, turn_rates_early, vmca_vals_kias_early)
-                    dvmc_ok = ias >= dvmc_at_tr
-
-                if dvmc_ok:
-                    gx.append(ias)
-                    gy.append(tr)
-
-            if len(gx) > 5:
-                gx_display = convert_display_airspeed(np.array(gx), unit)
-                fig.add_trace(go.Scatter(
-                    x=gx_display, y=gy, mode="lines",
-                    line=dict(color="yellow", width=1.2, dash="solid"),
-                    showlegend=False, hoverinfo="skip"
-                ))
-                fig.add_annotation(
-                    x=gx_display[-1] + 4, y=gy[-1], text=f"{g_inter:.1f}G",
-                    showarrow=False, font=dict(color="black", size=10),
-                    bgcolor="rgba(255,255,255,0.5)", borderpad=1
-                )
-# === Negative G Lines ===
-        
-        neg_intermediate_gs = [
-            round(g_val, 1)
-            for g_val in np.arange(-1.0, g_limit_neg, -0.5)
-            if abs(g_val) >= 1.5 and abs(g_val - g_limit_neg) > 0.2
-        ]
-        for g_inter in neg_intermediate_gs:
-            gx, gy = [], []
-            for ias in ias_vals:
-                v = ias * KTS_TO_FPS
-                stall_v = np.sqrt((2 * weight * abs(g_inter)) / (rho * wing_area * cl_max))
-                if v < stall_v:
-                    continue
-                omega = g * np.sqrt(g_inter**2 - 1) / v
-                tr = -omega * 180 / pi  # negative turn rate
-                gx.append(ias)
-                gy.append(tr)
-            if len(gx) > 5:
-                gx_display = convert_display_airspeed(np.array(gx), unit)
-                fig.add_trace(go.Scatter(
-                    x=gx_display, y=gy, mode="lines",
-                    line=dict(color="yellow", width=1.2, dash="dot"),
-                    showlegend=False, hoverinfo="skip"
-                ))
-                fig.add_annotation(
-                    x=gx_display[-1] + 4, y=gy[-1], text=f"{g_inter:.1f}G",
-                    showarrow=False, font=dict(color="black", size=10),
-                    bgcolor="rgba(255,255,255,0.5)", borderpad=1
-                )
-
-    # --- Ps GRID CALCULATION (only if Ps overlay enabled) ---
-    Ps_masked = None
-    ias_vals_ps_display = None
-    tr_vals_ps = None
-
-    if "ps" in overlay_toggle:
-        ias_vals_ps_internal = np.arange(ias_start, max_speed_internal + 1, 1)
-        ias_vals_ps_display = convert_display_airspeed(ias_vals_ps_internal, unit)
-        CD0 = ac.get("CD0", 0.025)
-        e = ac.get("e", 0.8)
-        AR = ac.get("aspect_ratio", 7.5)
-
-        # Detect steep turn override
-        steep_turn_override = maneuver == "steep_turn" and ias_values and aob_values
-        if steep_turn_override:
-            aob_deg = aob_values[0]
-            aob_rad = np.radians(aob_deg)
-            V = ias_vals_ps_internal * KTS_TO_FPS
-            TR_fixed = np.degrees(g * np.tan(aob_rad) / V)  # TR as a function of IAS
-            TR = np.tile(TR_fixed, (len(ias_vals_ps_internal), 1)).T  # 2D grid shape
-            IAS = np.tile(ias_vals_ps_internal, (len(TR), 1))
-            tr_vals_ps = TR[:, 0]  # save for mask / plotting
-        else:
-            tr_vals_ps = np.arange(-100, 100, 1)
-            IAS, TR = np.meshgrid(ias_vals_ps_internal, tr_vals_ps)
-
-        V = IAS * KTS_TO_FPS  # convert to ft/s
-        omega_rad = TR * (np.pi / 180)
-        n = np.sqrt(1 + (V * omega_rad / g) ** 2)
-
-        q = 0.5 * rho * V**2
-        CL = weight * n / (q * wing_area)
-        CL_clipped = np.minimum(CL, cl_max)
-        CD = (CD0 + (CL_clipped**2) / (np.pi * e * AR)) * cg_drag_factor * gear_drag_factor
-        D = q * wing_area * CD
-
-        # === Propeller Thrust Decay ===
-        V_kts = IAS
-        V_max_kts = ac.get("prop_thrust_decay", {}).get("V_max_kts", 160)
-        T_static = ac.get("prop_thrust_decay", {}).get("T_static_factor", 2.6) * hp
-        V_fraction = np.clip(V_kts / V_max_kts, 0, 1)
-        T_available = T_static * (1 - V_fraction**2)
-        T_available = np.maximum(T_available, 0)
-
-        gamma_rad = np.radians(pitch_angle)
-
-        # Vertical speed term (ft/s); for gamma=0 this is just 0
-        V_vertical = V * np.sin(gamma_rad)
-
-        # Ps in knots per second
-        Ps = ((T_available - D) * V / weight - V_vertical) * FPS_TO_KTS
-
-        # Envelope mask (vectorized)
-        v_fts_env = IAS * KTS_TO_FPS
-        omega_rad_env = TR * (np.pi / 180)
-
-        n_env = np.sqrt(1 + (v_fts_env * omega_rad_env / g) ** 2)
-        stall_v_fts_env = np.sqrt((2 * weight * n_env) / (rho * wing_area * cl_max))
-        stall_ias_env = stall_v_fts_env * FPS_TO_KTS
-
-        tr_limit_pos_env = g * np.sqrt(g_limit**2 - 1) / v_fts_env * 180 / np.pi
-        tr_limit_neg_env = g * np.sqrt(g_limit_neg**2 - 1) / v_fts_env * 180 / np.pi
-
-        valid_pos = (TR >= 0) & (TR <= tr_limit_pos_env)
-        valid_neg = (TR < 0) & (TR >= -tr_limit_neg_env)  # Negate limit for negative TR region
-
-        # Base envelope mask
-        within_env = (
-            (IAS >= stall_ias_env) &
-            (IAS <= max_speed_internal) &
-            (valid_pos | valid_neg)
-        )
-
-        # Add DVmc masking when active
-        if dvmc_active:
-            # For each point, check if IAS >= DVmc at that turn rate
-            dvmc_ias_at_tr = np.interp(TR, turn_rates_early, vmca_vals_kias_early)
-            dvmc_mask = IAS >= dvmc_ias_at_tr
-            within_env = within_env & dvmc_mask
-
-        # Ps_masked = usable Ps; outside envelope = NaN
-        Ps_masked = np.where(within_env, Ps, np.nan)
-
-        dprint(f"[Ps DEBUG] ----")
-        dprint(f"  Air Density: {rho:.5f} slugs/ft³")
-        dprint(f"  CL avg: {np.nanmean(CL):.2f}, CD avg: {np.nanmean(CD):.3f}")
-        dprint(f"  Thrust avg: {np.nanmean(T_available):.1f} lbs")
-        dprint(f"  Drag avg: {np.nanmean(D):.1f} lbs")
-        dprint(f"  Ps min: {np.nanmin(Ps):.2f}, Ps max: {np.nanmax(Ps):.2f} knots/sec")
-        dprint(f"  Flight Path Angle (γ): {pitch_angle}°")
-        dprint("[THRUST DECAY DEBUG]")
-        dprint(f"  V_max_kts: {V_max_kts}")
-        dprint(f"  T_static: {T_static:.1f} lbs")
-        dprint(f"  T_available avg: {np.nanmean(T_available):.1f} lbs")
-        dprint(f"  Drag avg: {np.nanmean(D):.1f} lbs")
-
-   
-# --- AOB HEATMAP: 10° to 90°, clipped to envelope ---
-
-    if "aob" in overlay_toggle:
-        # --- AOB HEATMAP (Valid Points Only) ---
-        IAS_vals = np.arange(ias_start, max_speed + 1, aob_ias_step)
-        IAS_vals_display = convert_display_airspeed(IAS_vals, unit)
-        ias_vals_display = convert_display_airspeed(ias_vals, unit)
-        TR_vals = np.arange(0.1, 100, aob_tr_step)  # Start near 0 for full coverage
-        IAS, TR = np.meshgrid(IAS_vals, TR_vals)
-        V = IAS * KTS_TO_FPS
-        omega_rad = TR * (np.pi / 180)
-
-        # Compute angle of bank at each point
-        AOB_rad = np.arctan(omega_rad * V / g)
-        AOB_deg = np.degrees(AOB_rad)
-
-        # Mask: only show valid points (stall + G-limit + Vne)
-        n = np.sqrt(1 + (V * omega_rad / g) ** 2)
-        n = np.maximum(n, 1.001)  # Enforce minimum 1 G load factor
-
-        stall_v = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
-        stall_IAS = stall_v * FPS_TO_KTS
-        tr_limit = g * np.sqrt(g_limit**2 - 1) / V * 180 / pi
-
-        mask = (IAS >= stall_IAS) & (TR <= tr_limit) & (IAS <= max_speed)
-
-        # Add DVmc masking when active
-        if dvmc_active:
-            dvmc_ias_at_tr = np.interp(TR, turn_rates_early, vmca_vals_kias_early)
-            dvmc_mask = IAS >= dvmc_ias_at_tr
-            mask = mask & dvmc_mask
-
-        AOB_masked = np.where(mask, AOB_deg, np.nan)
-
-        # Plot AOB heatmap
-        fig.add_trace(go.Heatmap(
-            x=IAS_vals_display,
-            y=TR_vals,
-            z=AOB_masked,
-            colorscale="Turbo",
-            zmin=0,
-            zmax=90,
-            opacity=0.5,
-            zsmooth="fast",
-            hoverinfo="skip",
-            colorbar=dict(
-                title="AOB (deg)",
-                x=1.02,              # slightly beyond the plot area
-                xanchor="left",
-                y=0.25,
-                len=0.6,            # scale down so it doesn’t dominate
-                thickness=15,                
-            )
-            
-        ))
-        # --- AOB HEATMAP (Negative Turn Rates) ---
-        if "aob" in overlay_toggle and "negative_g" in overlay_toggle:
-            TR_vals_neg = np.arange(-100, -0.1, aob_tr_step)  # End near 0 for full coverage
-            IAS_vals_neg = np.arange(ias_start, max_speed + 1, aob_ias_step)
-            IAS_neg, TR_neg = np.meshgrid(IAS_vals_neg, TR_vals_neg)
-            V_neg = IAS_neg * KTS_TO_FPS
-            omega_rad_neg = np.abs(TR_neg) * (np.pi / 180)  # use absolute to mirror
-
-            AOB_rad_neg = np.arctan(omega_rad_neg * V_neg / g)
-            AOB_deg_neg = np.degrees(AOB_rad_neg)  # keep positive AOB for mirror color scale
-
-            n_neg = np.sqrt(1 + (V_neg * omega_rad_neg / g) ** 2)
-            n_neg = np.maximum(n_neg, 1.001)
-            stall_v_neg = np.sqrt((2 * weight * n_neg) / (rho * wing_area * cl_max))
-            stall_IAS_neg = stall_v_neg * FPS_TO_KTS
-            tr_limit_neg = g * np.sqrt(g_limit_neg**2 - 1) / V_neg * 180 / pi
-
-            mask_neg = (IAS_neg >= stall_IAS_neg) & (np.abs(TR_neg) <= tr_limit_neg) & (IAS_neg <= max_speed)
-            AOB_masked_neg = np.where(mask_neg, AOB_deg_neg, np.nan)
-
-            fig.add_trace(go.Heatmap(
-                x=convert_display_airspeed(IAS_vals_neg, unit),
-                y=TR_vals_neg,
-                z=AOB_masked_neg,
-                colorscale="Turbo",
-                zmin=0,
-                zmax=90,
-                opacity=0.5,
-                zsmooth="fast",
-                hoverinfo="skip",
-                showscale=False  # share scale with positive AOB
-            ))
-        
-
-    if "radius" in overlay_toggle:
-        ias_range = np.arange(ias_start, max_speed + 1, 2)
-        min_radius = None
-        max_radius = 0
-
-        # --- Step 1a: Dynamically find smallest valid turn radius inside envelope
-        min_radius = None
-        for ias in np.arange(ias_start, max_speed + 1, 0.5):  # fine IAS sweep
-            v_fts = ias * KTS_TO_FPS
-            for tr_candidate in np.arange(60, 1, -0.5):  # from tightest turns down
-                omega_rad = tr_candidate * (np.pi / 180)
-                r = v_fts / omega_rad
-
-                n = np.sqrt(1 + (v_fts * omega_rad / g) ** 2)
-                stall_v_fts = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
-                stall_ias = stall_v_fts * FPS_TO_KTS
-                tr_limit = g * np.sqrt(g_limit**2 - 1) / v_fts * 180 / np.pi
-
-                if ias >= stall_ias and tr_candidate <= tr_limit and ias <= max_speed:
-                    if min_radius is None or r < min_radius:
-                        min_radius = r * 1.017
-                    break  # first valid tightest radius is enough for this IAS
-
-        # --- Step 1b: Compute max radius using 3 deg/sec
-        max_radius = 0
-        for ias in ias_range:
-            v_fts = ias * KTS_TO_FPS
-            omega_3deg = 3 * (np.pi / 180)
-            r = v_fts / omega_3deg
-
-            n = np.sqrt(1 + (v_fts * omega_3deg / g) ** 2)
-            stall_v_fts = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
-            stall_ias = stall_v_fts * FPS_TO_KTS
-            tr_limit = g * np.sqrt(g_limit ** 2 - 1) / v_fts * 180 / np.pi
-
-            if ias >= stall_ias and 3 <= tr_limit and ias <= max_speed:
-                max_radius = max(max_radius, r)
-
-        span = max_radius - min_radius
-
-        # Step 2: Visually spaced radius levels (5 total)
-        mid1 = min_radius + 0.04 * span
-        mid2 = min_radius + 0.12 * span
-        mid3 = min_radius + 0.3 * span
-        r1 = int(round(min_radius / 100.0)) * 100
-        r2 = int(round(mid1 / 100.0)) * 100
-        r3 = int(round(mid2 / 100.0)) * 100
-        r4 = int(round(mid3 / 100.0)) * 100
-        r5 = int(round(max_radius / 100.0)) * 100
-        radius_levels = sorted(set([r1, r2, r3, r4, r5]))
-
-        # Step 3: Plot radius lines
-        for radius in radius_levels:
-            valid_x = []
-            valid_y = []
-
-            for ias in ias_range:
-                v_fts = ias * KTS_TO_FPS
-                omega_rad = v_fts / radius
-                tr_deg = omega_rad * 180 / pi
-
-                n = np.sqrt(1 + (v_fts * omega_rad / g) ** 2)
-                stall_v_fts = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
-                stall_ias = stall_v_fts * FPS_TO_KTS
-                tr_limit = g * np.sqrt(g_limit**2 - 1) / v_fts * 180 / pi
-
-                # Check DVmc limit when active
-                dvmc_ok = True
-                if dvmc_active:
-                    dvmc_at_tr = np.interp(tr_deg, turn_rates_early, vmca_vals_kias_early)
-                    dvmc_ok = ias >= dvmc_at_tr
-
-                if ias >= stall_ias and tr_deg <= tr_limit and ias <= max_speed and dvmc_ok:
-                    valid_x.append(convert_display_airspeed(ias, unit))
-                    valid_y.append(tr_deg)
-
-            if len(valid_x) > 5:
-                fig.add_trace(go.Scatter(
-                    x=valid_x,
-                    y=valid_y,
-                    mode="lines",
-                    line=dict(color="blue", width=1, dash="dash"),
-                    showlegend=False,
-                    hoverinfo="skip",
-                ))
-                mid = len(valid_x) // 2
-                fig.add_annotation(
-                    x=valid_x[mid],
-                    y=valid_y[mid],
-                    text=f"{radius} ft",
-                    showarrow=False,
-                    font=dict(color="blue", size=10),
-                    bgcolor="rgba(255,255,255,0.5)",
-                    borderpad=1,
-                )
-        x_min = ias_start
-        x_max = max_speed * 1.1
-        y_max = (
-            max(stall_clipped_y + g_clipped_y) * 1.1
-            if stall_clipped_y and g_clipped_y
-            else 100
-        )
-        # --- Add Turn Radius Legend Entry ---
-        fig.add_trace(go.Scatter(
-            x=[None], y=[None], mode="lines",
-            name="Turn Radius",
-            line=dict(color="blue", width=1, dash="dash"),
-            showlegend=True
-        ))
-
-        # --- NEGATIVE TURN RADIUS LINES ---
-        if "negative_g" in overlay_toggle:
-            neg_min_radius = None
-            neg_max_radius = 0
-
-            # Step 1a: Find tightest valid negative radius
-            for ias in np.arange(ias_start, max_speed + 1, 0.5):
-                v_fts = ias * KTS_TO_FPS
-                for tr_candidate in np.arange(60, 1, -0.5):
-                    omega_rad = tr_candidate * (np.pi / 180)
-                    r = v_fts / omega_rad
-
-                    n = np.sqrt(1 + (v_fts * omega_rad / g) ** 2)
-                    stall_v_fts = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
-                    stall_ias = stall_v_fts * FPS_TO_KTS
-                    tr_limit = g * np.sqrt(g_limit_neg**2 - 1) / v_fts * 180 / np.pi
-
-                    if ias >= stall_ias and tr_candidate <= tr_limit and ias <= max_speed:
-                        neg_min_radius = round(r * 1.017 / 100.0) * 100
-                        break
-                if neg_min_radius:
-                    break
-
-            # Step 1b: Max radius using 3 deg/sec
-            for ias in ias_vals:
-                v_fts = ias * KTS_TO_FPS
-                omega_3deg = 3 * (np.pi / 180)
-                r = v_fts / omega_3deg
-
-                n = np.sqrt(1 + (v_fts * omega_3deg / g) ** 2)
-                stall_v_fts = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
-                stall_ias = stall_v_fts * FPS_TO_KTS
-                tr_limit = g * np.sqrt(g_limit_neg**2 - 1) / v_fts * 180 / np.pi
-
-                if ias >= stall_ias and 3 <= tr_limit and ias <= max_speed:
-                    neg_max_radius = max(neg_max_radius, r)
-
-            neg_max_radius = round(neg_max_radius / 100.0) * 100
-
-            # Step 2: Plot both radii
-            for radius in [neg_min_radius, neg_max_radius]:
-                if not radius:
-                    continue
-                neg_valid_x, neg_valid_y = [], []
-
-                for ias in ias_vals:
-                    v_fts = ias * KTS_TO_FPS
-                    omega_rad = v_fts / radius
-                    tr_deg = -omega_rad * 180 / pi
-
-                    n = np.sqrt(1 + (v_fts * omega_rad / g) ** 2)
-                    stall_v = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
-                    stall_ias = stall_v * FPS_TO_KTS
-                    tr_limit = g * np.sqrt(g_limit_neg**2 - 1) / v_fts * 180 / pi
-
-                    if ias >= stall_ias and abs(tr_deg) <= tr_limit and ias <= max_speed:
-                        neg_valid_x.append(convert_display_airspeed(ias, unit))
-                        neg_valid_y.append(tr_deg)
-
-                if len(neg_valid_x) > 5:
-                    fig.add_trace(go.Scatter(
-                        x=neg_valid_x,
-                        y=neg_valid_y,
-                        mode="lines",
-                        line=dict(color="blue", width=1.5, dash="dot"),
-                        showlegend=False,
-                        hoverinfo="skip"
-                    ))
-                    mid = len(neg_valid_x) // 2
-                    fig.add_annotation(
-                        x=neg_valid_x[mid],
-                        y=neg_valid_y[mid],
-                        text=f"{radius} ft",
-                        showarrow=False,
-                        font=dict(color="blue", size=10),
-                        bgcolor="rgba(255,255,255,0.5)",
-                        borderpad=1,
-                    )
-    
-
-    
-     # --- Dynamic Vmca Curve (bank angle vs adjusted Vmca + turn rate) ---
-    if "vmca" in all_overlays and ac.get("engine_count", 1) > 1 and oei_active:
-        published_vmca = ac.get("single_engine_limits", {}).get("Vmca", 70)
-        reference_weight = ac.get("max_weight", 3600)
-        cg_range = ac.get("cg_range", [10, 20])
-
-        # Sweep bank angle from 5° to 90°
-        bank_angles = np.linspace(5, 90, 150)
-
-        _, vmca_vals_kias = calculate_vmca(
-            published_vmca=published_vmca,
-            power_fraction=power_fraction,
-            total_weight=weight,
-            reference_weight=reference_weight,
-            cg=cg,
-            cg_range=cg_range,
-            prop_condition=prop_mode,
-            pressure_altitude=pressure_altitude,
-            oat_c=oat_c,
-            bank_angles_deg=bank_angles
-        )
-
-        vmca_vals_display_full = convert_display_airspeed(vmca_vals_kias, unit)
-
-        # Convert bank angle to turn rate
-        v_fts = vmca_vals_kias * KTS_TO_FPS
-        bank_rad = np.radians(bank_angles)
-        omega_rad = g * np.tan(bank_rad) / v_fts
-        turn_rates_full = np.degrees(omega_rad)
-
-        # Save first point for label (before clipping)
-        dvmc_label_value = vmca_vals_display_full[0]
-        dvmc_label_tr = turn_rates_full[0]
-
-        # ✅ Clip to envelope before plotting - must be within lift limit (stall boundary)
-        stall_tr_limit = np.interp(vmca_vals_kias, stall_clipped_x, stall_clipped_y)
-        valid_mask = (turn_rates_full >= y_min) & (turn_rates_full <= y_max) & (turn_rates_full <= stall_tr_limit)
-        vmca_vals_display = vmca_vals_display_full[valid_mask]
-        turn_rates = turn_rates_full[valid_mask]
-
-        # Build hover text with bank angle info
-        bank_angles_masked = bank_angles[valid_mask]
-        vmca_hover = [
-            f"<b>DVmc</b><br>Bank: {bank:.0f}°<br>Vmca: {spd:.0f} {unit}<br>Turn Rate: {tr:.1f}°/s"
-            for bank, spd, tr in zip(bank_angles_masked, vmca_vals_display, turn_rates)
-        ]
-
-        # Plot DVmc line (clipped portion only)
-        if len(vmca_vals_display) > 0:
-            fig.add_trace(go.Scatter(
-                x=vmca_vals_display,
-                y=turn_rates,
-                mode="lines",
-                name="DVmc",
-                line=dict(color="#DC143C", width=2.5, dash="dash"),
-                hoverinfo="text",
-                hovertext=vmca_hover,
-                showlegend=True
-            ))
-
-        # Always show DVmc label with calculated value (even if off scale)
-        # Position at edge of graph if value is beyond visible range
-        estimated_x_max = max_speed * 1.1 if unit == "KIAS" else max_speed * KTS_TO_MPH * 1.1
-
-        if dvmc_label_value > estimated_x_max:
-            # DVmc is off scale - position label at right edge with actual value
-            label_x_pos = estimated_x_max * 0.95
-            label_text = f"<b>DVmc {dvmc_label_value:.0f}</b> →"
-            arrow_x = 30  # Point arrow to the right
-        else:
-            label_x_pos = dvmc_label_value
-            label_text = f"<b>DVmc</b> {dvmc_label_value:.0f}"
-            arrow_x = -45
-
-        fig.add_annotation(
-            x=label_x_pos,
-            y=min(dvmc_label_tr, y_max * 0.95),  # Keep label visible within plot
-            text=label_text,
-            showarrow=True,
-            arrowhead=2,
-            ax=arrow_x,
-            ay=15,
-            font=dict(size=10, color="#DC143C"),
-            bgcolor="rgba(255,255,255,0.9)",
-            borderpad=3
-        )
-
-    # === Dynamic Vyse Marker and Curve ===
-    if "dynamic_vyse" in all_overlays and ac.get("engine_count", 1) > 1 and oei_active:
-        vyse_block = ac.get("single_engine_limits", {}).get("Vyse", {})
-        if isinstance(vyse_block, dict):
-            published_vyse = vyse_block.get("clean_up") or next(iter(vyse_block.values()), 100)
-        else:
-            published_vyse = vyse_block if isinstance(vyse_block, (int, float)) else 100
-        reference_weight = ac.get("max_weight", 3600)
-
-        # --- Sweep bank angle to visualize how Vyse performance changes with AOB
-        bank_angles = np.linspace(5, 60, 120)
-        vyse_curve = []
-
-        for angle in bank_angles:
-            angle_penalty = 1.0 + 0.003 * (angle - 5)
-            vyse_val = calculate_dynamic_vyse(
-                published_vyse=published_vyse,
-                total_weight=weight,
-                reference_weight=reference_weight,
-                pressure_altitude=pressure_altitude,
-                oat_c=oat_c,
-                gear_position=gear,
-                flap_config=config,
-                prop_condition=prop_mode
-            )
-            vyse_curve.append(vyse_val * angle_penalty)
-
-        vyse_curve = np.clip(vyse_curve, min(g_curve_x), max(g_curve_x))
-        vyse_display_curve_full = convert_display_airspeed(np.array(vyse_curve), unit)
-
-        v_fts = np.array(vyse_curve) * KTS_TO_FPS
-        bank_rad = np.radians(bank_angles)
-        omega_rad = g * np.tan(bank_rad) / v_fts
-        turn_rates_full = np.degrees(omega_rad)
-
-        # Save first point for label (before clipping)
-        dvyse_label_value = vyse_display_curve_full[0]
-        dvyse_label_tr = turn_rates_full[0]
-
-        # ✅ Clip to envelope - must be within lift limit (stall boundary)
-        vyse_curve_arr = np.array(vyse_curve)
-        stall_tr_limit = np.interp(vyse_curve_arr, stall_clipped_x, stall_clipped_y)
-
-        valid_mask = (turn_rates_full >= y_min) & (turn_rates_full <= y_max) & (turn_rates_full <= stall_tr_limit)
-        bank_angles_masked = bank_angles[valid_mask]
-        vyse_display_curve = vyse_display_curve_full[valid_mask]
-        turn_rates = turn_rates_full[valid_mask]
-
-        # Build hover text
-        vyse_hover = [
-            f"<b>DVyse</b><br>Bank: {bank:.0f}°<br>Vyse: {spd:.0f} {unit}<br>Turn Rate: {tr:.1f}°/s"
-            for bank, spd, tr in zip(bank_angles_masked, vyse_display_curve, turn_rates)
-        ]
-
-        # --- Plot DVyse line (clipped portion only)
-        if len(vyse_display_curve) > 0:
-            fig.add_trace(go.Scatter(
-                x=vyse_display_curve,
-                y=turn_rates,
-                mode="lines",
-                name="DVyse",
-                line=dict(color="#00BFFF", width=2.5, dash="dot"),
-                hoverinfo="text",
-                hovertext=vyse_hover,
-                showlegend=True
-            ))
-
-            x_max = max(x_max, vyse_display_curve[0] * 1.05)
-            y_max = max(y_max, turn_rates[0] * 1.05)
-
-        # Always show DVyse label at calculated value (even if clipped)
-        fig.add_annotation(
-            x=dvyse_label_value,
-            y=min(dvyse_label_tr, y_max * 0.90),
-            text=f"<b>DVyse</b> {dvyse_label_value:.0f}",
-            showarrow=True,
-            arrowhead=2,
-            ax=-45,
-            ay=15,
-            font=dict(size=10, color="#00BFFF"),
-            bgcolor="rgba(255,255,255,0.9)",
-            borderpad=3
-        )    
-
-    # --- Published Vyse Line (Static Reference) ---
-        if oei_active and published_vyse:
-            vyse_display = convert_display_airspeed(published_vyse, unit)
-            vyse_y_top = np.interp(published_vyse, g_clipped_x, g_clipped_y) if g_clipped_x else 0
-
-            fig.add_trace(go.Scatter(
-                x=[vyse_display, vyse_display],
-                y=[0, vyse_y_top],
-                mode="lines",
-                name="Vyse",
-                line=dict(color="#87CEEB", width=2, dash="dashdot"),
-                hoverinfo="text",
-                hovertext=f"<b>Vyse</b><br>{vyse_display:.0f} {unit}<br>(Best rate SE climb)"
-            ))
-
-            # Annotation offset to the right to avoid overlap
-            fig.add_annotation(
-                x=vyse_display,
-                y=vyse_y_top,
-                text=f"<b>Vyse</b> {vyse_display:.0f}",
-                showarrow=True,
-                arrowhead=2,
-                ax=35,
-                ay=-15,
-                font=dict(size=9, color="#87CEEB"),
-                bgcolor="rgba(255,255,255,0.9)",
-                borderpad=2
-            )
-
-    # --- Published Vxse Line (Static Reference) ---
-        vxse_block = ac.get("single_engine_limits", {}).get("Vxse", {})
-        if isinstance(vxse_block, dict):
-            published_vxse = vxse_block.get("clean_up") or next(iter(vxse_block.values()), None)
-        else:
-            published_vxse = vxse_block if isinstance(vxse_block, (int, float)) else None
-        if oei_active and published_vxse:
-            vxse_display = convert_display_airspeed(published_vxse, unit)
-            vxse_y_top = np.interp(published_vxse, g_clipped_x, g_clipped_y) if g_clipped_x else 0
-
-            fig.add_trace(go.Scatter(
-                x=[vxse_display, vxse_display],
-                y=[0, vxse_y_top],
-                mode="lines",
-                name="Vxse",
-                line=dict(color="#00CC66", width=2, dash="dash"),
-                hoverinfo="text",
-                hovertext=f"<b>Vxse</b><br>{vxse_display:.0f} {unit}<br>(Best angle SE climb)"
-            ))
-
-            # Annotation offset to the left to avoid overlap
-            fig.add_annotation(
-                x=vxse_display,
-                y=vxse_y_top,
-                text=f"<b>Vxse</b> {vxse_display:.0f}",
-                showarrow=True,
-                arrowhead=2,
-                ax=-35,
-                ay=-15,
-                font=dict(size=9, color="#00CC66"),
-                bgcolor="rgba(255,255,255,0.9)",
-                borderpad=2
-            )
-        
-    # --- Enhanced Hover Grid (Always Present) ---
-    # Generate hover data grid covering the flight envelope
-    hover_ias_step = 5  # IAS increment for hover grid
-    hover_tr_step = 2   # Turn rate increment for hover grid
-
-    # Create grid spanning the envelope
-    hover_ias_range = np.arange(ias_start, max_speed_internal + 1, hover_ias_step)
-    hover_tr_range = np.arange(0, 50, hover_tr_step)  # Positive turn rates
-
-    hover_ias_list = []
-    hover_tr_list = []
-    hover_data = []  # Will hold [AOB, G, Ps, Radius] for each point
-
-    for ias in hover_ias_range:
-        for tr in hover_tr_range:
-            v_fps = ias * KTS_TO_FPS
-            omega_rad = tr * (np.pi / 180)
-
-            # Calculate AOB from turn rate
-            aob_deg = np.degrees(np.arctan(omega_rad * v_fps / g))
-
-            # Calculate load factor (G)
-            n = np.sqrt(1 + (v_fps * omega_rad / g) ** 2)
-
-            # Calculate turn radius (ft -> nm for display)
-            if omega_rad > 0.001:
-                radius_ft = (v_fps ** 2) / (g * np.tan(np.radians(aob_deg))) if aob_deg > 0.5 else float('inf')
-                radius_nm = radius_ft / 6076.12 if radius_ft < 1e6 else float('inf')
-            else:
-                radius_ft = float('inf')
-                radius_nm = float('inf')
-
-            # Calculate Ps at this point
-            q = 0.5 * rho * v_fps ** 2
-            CL_hover = weight * n / (q * wing_area) if q > 0 else 0
-            CL_hover = min(CL_hover, cl_max)
-            CD_hover = (CD0 + (CL_hover ** 2) / (np.pi * e * AR)) * cg_drag_factor * gear_drag_factor
-            D_hover = q * wing_area * CD_hover
-
-            V_max_kts = ac.get("prop_thrust_decay", {}).get("V_max_kts", 160)
-            T_static = ac.get("prop_thrust_decay", {}).get("T_static_factor", 2.6) * hp
-            V_fraction = np.clip(ias / V_max_kts, 0, 1)
-            T_hover = T_static * (1 - V_fraction ** 2)
-
-            Ps_hover = ((T_hover - D_hover) * v_fps / weight) * FPS_TO_KTS
-
-            # Check if point is within envelope (above stall, below G limit)
-            stall_n = (0.5 * rho * v_fps**2 * wing_area * cl_max) / weight
-            n_limit = g_limit
-
-            if n <= min(stall_n, n_limit) and n >= 1.0 and ias <= max_speed_internal:
-                display_ias = convert_display_airspeed(ias, unit)
-                hover_ias_list.append(display_ias)
-                hover_tr_list.append(tr)
-                hover_data.append([aob_deg, n, Ps_hover, radius_nm])
-
-    # Add hover trace with enhanced tooltip
-    if hover_ias_list:
-        hover_customdata = np.array(hover_data)
-
-        fig.add_trace(go.Scatter(
-            x=hover_ias_list,
-            y=hover_tr_list,
-            customdata=hover_customdata,
-            mode="markers",
-            marker=dict(size=8, color="rgba(0,0,0,0)"),
-            hovertemplate=(
-                f"<b>IAS:</b> %{{x:.0f}} {unit}<br>"
-                f"<b>Turn Rate:</b> %{{y:.1f}}°/s<br>"
-                f"<b>Bank:</b> %{{customdata[0]:.0f}}°<br>"
-                f"<b>Load Factor:</b> %{{customdata[1]:.2f}} G<br>"
-                f"<b>Ps:</b> %{{customdata[2]:.1f}} kts/s<br>"
-                f"<b>Turn Radius:</b> %{{customdata[3]:.2f}} nm"
-                f"<extra></extra>"
-            ),
-            name="",
-            showlegend=False
-        ))
-
-    # --- Ps Plotting (Toggle Controlled) ---
-
-    if "ps" in overlay_toggle:
+    Falls back to rebuilding it from the stored state when this worker has
+    not rendered (or has evicted) that figure. The cache key is always
+    hashed from that state here: the store comes from the browser, so its
+    "key" is never trusted.
+    """
+    if not figure_state or not isinstance(figure_state.get("state"), dict):
+        return None
+    key = (state_hash(figure_state["state"]), aircraft_revision(figure_state["state"].get("ac_name")))
+    fig = FIGURE_CACHE.get(key)
+    annotate(figure_cache="miss" if fig is None else "hit")
+    if fig is None:
         try:
-            ps_min = int(np.floor(np.nanmin(Ps_masked) / 10.0)) * 10
-            ps_max = int(np.ceil(np.nanmax(Ps_masked) / 10.0)) * 10
-            ps_levels = list(range(ps_min, ps_max + 1, 10))
-        
-            fig.add_trace(go.Contour(
-                x=ias_vals_ps_display,
-                y=tr_vals_ps,
-                z=Ps_masked,
-                contours=dict(
-                    coloring="none", showlabels=False,
-                    start=ps_min, end=ps_max, size=10
-                ),
-                line=dict(width=1, color="gray", dash="dot"),
-                connectgaps=False,
-                showscale=False,
-                hoverinfo="skip",
-                name="Ps"
-            ))
-
-            # Bold Ps = 0 overlay
-            if 0 in ps_levels:
-                fig.add_trace(go.Contour(
-                    x=ias_vals_ps_display,
-                    y=tr_vals_ps,
-                    z=Ps_masked,
-                    contours=dict(
-                        coloring="none", showlabels=False,
-                        start=0, end=0, size=1
-                    ),
-                    line=dict(width=3, color="gray", dash="dot"),
-                    connectgaps=False,
-                    showscale=False,
-                    hoverinfo="skip",
-                    showlegend=False
-                ))
-
-            # Ps labels (anchor left side of envelope)
-            for level in ps_levels:
-                found = False
-                for j in range(len(ias_vals_ps_display)):
-                    for i in range(len(tr_vals_ps)):
-                        ps_val = Ps_masked[i, j]
-                        if np.isnan(ps_val):
-                            continue
-                        if np.isclose(ps_val, level, atol=2):
-                            fig.add_annotation(
-                                x=ias_vals_ps_display[j] + 3,
-                                y=tr_vals_ps[i],
-                                text=f"{level}",
-                                showarrow=False,
-                                font=dict(color="gray", size=10),
-                                bgcolor="rgba(255,255,255,0.6)",
-                                borderpad=1,
-                            )
-                            found = True
-                            break
-                    if found:
-                        break
-        except Exception as e:
-            dprint(f"[DEBUG] Ps toggle failed: {e}")
-
-
-        ###---Vmc published line----###
-
-        if ac.get("engine_count", 1) > 1 and "enabled" in oei_toggle:
-            vmca = ac.get("single_engine_limits", {}).get("Vmca", None)
-
-            # Handle new-style dict Vmca format
-            if isinstance(vmca, dict):
-                # Choose the config to display (default to "clean_up" if available)
-                selected_config = "clean_up" if "clean_up" in vmca else next(iter(vmca), None)
-                vmca_value = vmca.get(selected_config)
-            else:
-                # Fallback if older float-style Vmca
-                vmca_value = vmca
-
-            if isinstance(vmca_value, (int, float)):
-                vmca_converted = convert_display_airspeed(vmca_value, unit)
-                # Clip to envelope top
-                vmca_y_top = np.interp(vmca_value, g_clipped_x, g_clipped_y) if g_clipped_x else y_max
-
-                fig.add_trace(go.Scatter(
-                    x=[vmca_converted, vmca_converted],
-                    y=[0, vmca_y_top],
-                    mode="lines",
-                    name="Published Vmca",
-                    line=dict(color="#FF6B6B", width=2, dash="dash"),
-                    hoverinfo="text",
-                    hovertext=f"<b>Published Vmca</b><br>{vmca_converted:.0f} {unit}<br>(Minimum controllable airspeed)"
-                ))
-
-                fig.add_annotation(
-                    x=vmca_converted,
-                    y=vmca_y_top,
-                    text=f"<b>Vmca</b> {vmca_converted:.0f}",
-                    showarrow=False,
-                    yshift=12,
-                    font=dict(size=9, color="#FF6B6B"),
-                    bgcolor="rgba(255,255,255,0.9)",
-                    xanchor="center"
-                )
- 
-    
-    # Final layout and return (outside toggle block!)
-    x_min = max(0, min(ias_vals_display) - 2)  # two knot padding below ias_start
-    x_max = max_speed_display * 1.1
-
-# ✅ Final Y-Axis Limits Based on All Plotted TR Values
-    turn_rate_values = []
-    if stall_clipped_y: turn_rate_values += stall_clipped_y
-    if g_clipped_y: turn_rate_values += g_clipped_y
-    if "negative_g" in overlay_toggle:
-        if 'neg_stall_y_clip' in locals(): turn_rate_values += neg_stall_y_clip
-        if 'neg_g_y_clip' in locals(): turn_rate_values += neg_g_y_clip
-    if "dynamic_vyse" in all_overlays and 'turn_rates' in locals():
-        turn_rate_values += list(turn_rates)
-
-    if turn_rate_values:
-        y_max = max(turn_rate_values) * 1.1
-        y_min = min(turn_rate_values) * 1.1 if min(turn_rate_values) < 0 else 0
-    else:
-        y_max = 100
-        y_min = 0
-
-    is_mobile = screen_width and screen_width < 768
+            with span("rebuild_figure"):
+                fig = build_em_figure(**figure_state["state"])
+        except PreventUpdate:
+            return None
+        FIGURE_CACHE.put(key, fig, tag=figure_state["state"].get("ac_name"))
+    # Exports decorate the figure, so never hand out the cached instance
+    return go.Figure(fig)
 
-    legend_font_size = 10 if is_mobile else 12
-    
-        # Format into title (HTML-style for multi-line)
-    fig.update_layout(
-        title=dict(
-            text=f"<b>{ac_name}</b>" if not is_mobile else ac_name,
-            font=dict(size=22 if not is_mobile else 14, color="#005F8C"),
-            x=0.5,
-            y=0.95,
-            xanchor="center",
-            yanchor="top"
-        ),
-        xaxis=dict(
-            title=f"Indicated Airspeed ({unit})",
-            title_font=dict(size=14 if not is_mobile else 10),
-            tickfont=dict(size=12 if not is_mobile else 9),
-            dtick=10,
-            range=[x_min, x_max],
-            showgrid=True,
-            showspikes=False,
-            spikemode="across",
-            spikesnap="cursor"
-        ),
-        yaxis=dict(
-            title="Turn Rate (deg/sec)",
-            title_font=dict(size=14 if not is_mobile else 10),
-            tickfont=dict(size=12 if not is_mobile else 9),
-            dtick=5,
-            range=[y_min, y_max],
-            showgrid=True,
-            showspikes=False,
-            spikemode="across",
-            spikesnap="cursor"
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=-0.25,  # Push legend below x-axis
-            xanchor="center",
-            x=0.5,
-            font=dict(size=legend_font_size)
-        ),
-        margin=dict(
-            t=60 if is_mobile else 100,
-            b=100 if is_mobile else 80,
-            l=40,
-            r=40
-        ),
-        paper_bgcolor="#f7f9fc",
-        plot_bgcolor="#f7f9fc",
-        font=dict(color="#1b1e23"),
-        hovermode="closest"
-    )
-    # === STEEP TURN MANEUVER TRACE ===
-    if aob_values and ias_values and len(aob_values) > 0 and len(ias_values) > 0:
-        aob_input = aob_values[0]
-        ias_input = ias_values[0]
-
-        # Guard against None values
-        if ias_input is None or aob_input is None:
-            ias_input = 110  # default
-            aob_input = 45   # default
-
-        v_fts = ias_input * KTS_TO_FPS
-        bank_rad = np.radians(aob_input)
-        tr_deg = np.degrees(G_FT_S2 * np.tan(bank_rad) / v_fts)
-
-        # --- Energy Rate (Ps) at this point ---
-        n = 1 / np.cos(bank_rad)  # load factor for level constant altitude turn
-        q = 0.5 * rho * v_fts ** 2
-        CL = weight * n / (q * wing_area)
-        CL = min(CL, cl_max)  # Clip to CL_max like Ps grid does
-        CD = (CD0 + (CL ** 2) / (np.pi * e * AR)) * cg_drag_factor * gear_drag_factor
-        D = q * wing_area * CD
-
-        # Apply prop thrust model (same as Ps logic)
-        V_max_kts = ac.get("prop_thrust_decay", {}).get("V_max_kts", 160)
-        T_static = ac.get("prop_thrust_decay", {}).get("T_static_factor", 2.6) * hp
-        V_fraction = np.clip(ias_input / V_max_kts, 0, 1)
-        T_avail = T_static * (1 - V_fraction**2)
-
-        gamma_rad = np.radians(pitch_angle)
-        Ps_steep = ((T_avail - D) * v_fts / weight - v_fts * np.sin(gamma_rad)) * FPS_TO_KTS
-
-        dprint("[STEEP TURN DEBUG]")
-        dprint(f"  IAS: {ias_input} KIAS, AOB: {aob_input}°")
-        dprint(f"  Turn Rate: {tr_deg:.1f}°/s")
-        dprint(f"  Ps: {Ps_steep:.2f} knots/sec")
-
-        # Simplified steep turn trace: vertical line from 0 to operating point
-        arc_tr = [0.0, tr_deg]
-        arc_ias = [ias_input, ias_input]
-        arc_ias_display = [ias * KTS_TO_MPH if unit == "MPH" else ias for ias in arc_ias]
-
-        # Contextual hover text for each point
-        steep_hover = [
-            f"<b>Roll In (Wings Level)</b><br>AOB: 0°<br>IAS: {arc_ias_display[0]:.0f} {unit}<br>Turn Rate: 0°/s<br>G: 1.00",
-            f"<b>Operating Point</b><br>AOB: {aob_input}°<br>IAS: {arc_ias_display[1]:.0f} {unit}<br>Turn Rate: {tr_deg:.1f}°/s<br>G: {n:.2f}<br>Ps: {Ps_steep:.1f} kts/s"
-        ]
-
-        fig.add_trace(go.Scatter(
-            x=arc_ias_display,
-            y=arc_tr,
-            mode="lines+markers",
-            line=dict(color="darkgreen", width=3),
-            marker=dict(size=8, symbol=["circle", "diamond"]),
-            name="Steep Turn",
-            hoverinfo="text",
-            hovertext=steep_hover,
-            showlegend=True
-        ))
-
-        # Annotation at operating point showing key values
-        fig.add_annotation(
-            x=arc_ias_display[1],
-            y=tr_deg,
-            text=f"<b>{aob_input}° AOB</b><br>{n:.1f}G | Ps: {Ps_steep:.1f}",
-            showarrow=True,
-            arrowhead=2,
-            ax=50,
-            ay=-25,
-            font=dict(size=10, color="darkgreen"),
-            bgcolor="rgba(255,255,255,0.85)",
-            borderpad=3
-        )
-
-        # Annotation at wings level
-        fig.add_annotation(
-            x=arc_ias_display[0],
-            y=0,
-            text="Wings Level",
-            showarrow=False,
-            yshift=-15,
-            font=dict(size=9, color="darkgreen"),
-            bgcolor="rgba(255,255,255,0.7)",
-            borderpad=2
-        )
-    #------Ghost Trace------#
-# === GHOST TRACE (Ideal AOB based on ACS Standard)
-    # Check if ghost trace is enabled and a standard is selected
-    # Handle both boolean (from Switch) and list (from Checklist)
-    ghost_val = steepturn_ghost_values[0] if steepturn_ghost_values else False
-    ghost_enabled = ghost_val is True or (isinstance(ghost_val, list) and "on" in ghost_val)
-    standard_selected = steepturn_standard_values and len(steepturn_standard_values[0]) > 0
-
-    if ghost_enabled and standard_selected:
-        # Determine AOB based on selected standard(s) - use first selection
-        selected_standard = steepturn_standard_values[0][0]  # "private" or "commercial"
-        ghost_aob = 45 if selected_standard == "private" else 50
-        ghost_ias = ias_values[0] if ias_values else 110  # fallback if none provided
-
-        v_fts = ghost_ias * KTS_TO_FPS
-        bank_rad = np.radians(ghost_aob)
-        ghost_tr = np.degrees(G_FT_S2 * np.tan(bank_rad) / v_fts)
-
-        ghost_tr_array = [0.0, ghost_tr, ghost_tr, 0.0, 0.0]
-        ghost_ias_array = [ghost_ias] * len(ghost_tr_array)
-        ghost_ias_display = [ias * KTS_TO_MPH if unit == "MPH" else ias for ias in ghost_ias_array]
-
-        standard_label = "Private" if selected_standard == "private" else "Commercial"
-        fig.add_trace(go.Scatter(
-            x=ghost_ias_display,
-            y=ghost_tr_array,
-            mode="lines",
-            line=dict(color="white", width=2, dash="dot"),
-            name=f"{standard_label} ({ghost_aob}°)",
-            hoverinfo="skip",
-            showlegend=True
-        ))
-        fig.add_trace(go.Scatter(
-            x=[ghost_ias_display[1]],
-            y=[ghost_tr_array[1]],
-            mode="markers",
-            marker=dict(color="white", size=7, symbol="circle"),
-            name="",
-            hoverinfo="skip",
-            showlegend=False
-        ))
-        
-# === CHANDELLE MANEUVER TRACE ===
-    def plot_chandelle(
-        fig,
-        chandelle_ias_start,
-        chandelle_bank,
-        stall_ias_kias,
-        unit,
-        color="darkgreen",
-        dash="solid",
-        label="Chandelle",
-        show_annotations=True
-    ):
-        from plotly.graph_objects import Scatter
-        from math import radians, tan, degrees, cos
-
-        v_start = chandelle_ias_start * KTS_TO_FPS  # ft/s
-        v_end = (stall_ias_kias + 5) * KTS_TO_FPS   # ft/s
-        delta_v = v_start - v_end
-
-        # Airspeed lost more aggressively with higher AOB
-        energy_bias = min(0.8, max(0.5, chandelle_bank / 60))  # realistic range: 0.5–0.8
-        v_90 = v_start - (delta_v * energy_bias)
-
-        dt = 0.1
-        max_turn_deg = 180.0
-        angle = 0.0
-        steps = 0
-        max_steps = 1000
-
-        airspeeds = []
-        turn_rates = []
-        aob_list = []
-        heading_list = []
-
-        while angle < max_turn_deg and steps < max_steps:
-            if angle <= 90:
-                # First half: lose 'energy_bias' fraction of Δv by 90°
-                v = v_start - ((angle / 90.0) * (delta_v * energy_bias))
-                aob_deg = chandelle_bank
-            else:
-                # Second half: lose remaining Δv after 90°, reduce AOB 1° per 3° turn
-                v = v_90 - (((angle - 90) / 90.0) * (delta_v * (1 - energy_bias)))
-                aob_deg = max(0, chandelle_bank - ((angle - 90) / 3.0))
-
-            v = max(v, v_end)  # Never dip below final airspeed
-            aob_rad = radians(aob_deg)
-            omega_rad = G_FT_S2 * tan(aob_rad) / v
-            tr = degrees(omega_rad)
-
-            airspeeds.append(v * FPS_TO_KTS)
-            turn_rates.append(tr)
-            aob_list.append(aob_deg)
-            heading_list.append(angle)
-
-            angle += tr * dt
-            steps += 1
-
-        if not airspeeds:
-            dprint("[WARN] No chandelle points generated.")
-            return fig
-
-        airspeeds_display = [ias * KTS_TO_MPH if unit == "MPH" else ias for ias in airspeeds]
-
-        # Build contextual hover text with G load factor and heading progress
-        hover_texts = []
-        for i, (ias, tr, aob, hdg) in enumerate(zip(airspeeds_display, turn_rates, aob_list, heading_list)):
-            g_load = 1 / cos(radians(aob)) if aob > 0 else 1.0
-            if i == 0:
-                phase = "<b>START</b>"
-            elif hdg >= 175:
-                phase = "<b>END</b>"
-            elif hdg < 90:
-                phase = f"First Half ({hdg:.0f}°)"
-            else:
-                phase = f"Second Half ({hdg:.0f}°)"
-            hover_texts.append(
-                f"{phase}<br>IAS: {ias:.0f} {unit}<br>Turn Rate: {tr:.1f}°/s<br>AOB: {aob:.0f}°<br>G: {g_load:.2f}<br>Heading: {hdg:.0f}°"
-            )
-
-        fig.add_trace(Scatter(
-            x=airspeeds_display,
-            y=turn_rates,
-            mode="lines+markers",
-            line=dict(color=color, width=3, dash=dash),
-            marker=dict(size=4),
-            name=label,
-            hoverinfo="text",
-            hovertext=hover_texts
-        ))
-
-        # Add START and END annotations (only for main trace, not ghost)
-        if show_annotations and len(airspeeds_display) > 1:
-            # START annotation (right side - high airspeed)
-            fig.add_annotation(
-                x=airspeeds_display[0],
-                y=turn_rates[0],
-                text="<b>START</b>",
-                showarrow=True,
-                arrowhead=2,
-                ax=30,
-                ay=-20,
-                font=dict(size=10, color=color),
-                bgcolor="rgba(255,255,255,0.85)",
-                borderpad=2
-            )
-            # END annotation (left side - low airspeed)
-            fig.add_annotation(
-                x=airspeeds_display[-1],
-                y=turn_rates[-1],
-                text="<b>END</b>",
-                showarrow=True,
-                arrowhead=2,
-                ax=-30,
-                ay=-20,
-                font=dict(size=10, color=color),
-                bgcolor="rgba(255,255,255,0.85)",
-                borderpad=2
-            )
-            # Direction indicator in middle
-            mid_idx = len(airspeeds_display) // 2
-            fig.add_annotation(
-                x=airspeeds_display[mid_idx],
-                y=turn_rates[mid_idx] + 1.5,
-                text="← Energy Flow →",
-                showarrow=False,
-                font=dict(size=9, color="gray"),
-                bgcolor="rgba(255,255,255,0.7)",
-                borderpad=2
-            )
-
-        return fig
-
-    if maneuver == "chandelle" and chandelle_ias_values and chandelle_bank_values:
-        chandelle_ias = chandelle_ias_values[0]
-        chandelle_bank = chandelle_bank_values[0]
-        # Compute dynamic stall speed at 1G level turn
-        v_stall_1g = np.sqrt((2 * weight) / (rho * wing_area * cl_max)) * FPS_TO_KTS
-        stall_ias_kias = v_stall_1g
-
-        fig = plot_chandelle(
-            fig,
-            chandelle_ias_start=chandelle_ias,
-            chandelle_bank=chandelle_bank,
-            stall_ias_kias=stall_ias_kias,
-            unit=unit,
-            color="darkgreen",
-            dash="solid",
-            label="Chandelle"
-        )
-
-        # Handle both boolean (from Switch) and list (from Checklist)
-        chandelle_ghost_val = chandelle_ghost_values[0] if chandelle_ghost_values else False
-        chandelle_ghost_on = chandelle_ghost_val is True or (isinstance(chandelle_ghost_val, list) and "on" in chandelle_ghost_val)
-        if chandelle_ghost_on:
-            fig = plot_chandelle(
-                fig,
-                chandelle_ias_start=chandelle_ias,
-                chandelle_bank=30,
-                stall_ias_kias=stall_ias_kias,
-                unit=unit,
-                color="white",
-                dash="dot",
-                label="Chandelle Ghost",
-                show_annotations=False
-            )
-
-    t_end = time.perf_counter()
-    dprint(f"[PERF] update_graph total: {(t_end - t_start):.3f} sec")
-    
-    return fig
-
-import tempfile
-import plotly.io as pio
 from dash import ctx, State
 from dash.dcc import send_file
 import re
 
 @app.callback(
     Output("maneuver-options-container", "children"),
+    Output("maneuver-state", "data"),
     Input("maneuver-select", "value")
 )
 def render_maneuver_options(maneuver):
+    """Maneuver inputs, and the maneuver itself for update_graph (see there)."""
+    return _maneuver_options(maneuver), maneuver
+
+
+def _maneuver_options(maneuver):
     if maneuver == "steep_turn":
         return html.Div([
             # Row 1: Airspeed input
@@ -3518,12 +1762,61 @@ def get_summary_text(ac_name, engine_name, config, gear, occupants, fuel, total_
 
 
 
+###----Shared export helpers-----####
+
+# Rendered PNG/PDF bytes, content-addressed on disk and shared across workers
+EXPORT_CACHE = ExportCache()
+
+
+def export_figure_file(kind, figure_state, summary_lines, width, height, scale=1):
+    """
+    Return the path of the rendered export, rendering only on a cache miss.
+
+    The cache key covers the figure state (hashed here, never the client's
+    key), the aircraft revision, the summary text and the export date, so
+    the "Generated" stamp never shows a previous day.
+    """
+    from datetime import datetime
+    now = datetime.now()
+    state = (figure_state or {}).get("state")
+    if not isinstance(state, dict):
+        return None
+    content_key = state_hash({
+        "figure": state_hash(state),
+        "aircraft": aircraft_revision(state.get("ac_name")),
+        "summary": summary_lines,
+        "date": now.strftime("%Y-%m-%d"),
+    })
+    key = EXPORT_CACHE.make_key(content_key, kind, width, height, scale)
+
+    path = EXPORT_CACHE.get(key, kind)
+    annotate(export_cache="miss" if path is None else "hit")
+    if path is not None:
+        return path
+
+    fig = get_cached_figure(figure_state)
+    if fig is None:
+        return None
+    with span("decorate"):
+        decorate_export_figure(fig, summary_lines, now.strftime("%Y-%m-%d %H:%M"))
+
+    EXPORTS_IN_PROGRESS.inc()
+    try:
+        with span("to_image"):
+            import plotly.io as pio  # export stack (kaleido) loads on the first export
+            data = pio.to_image(fig, format=kind, width=width, height=height, scale=scale)
+    finally:
+        EXPORTS_IN_PROGRESS.dec()
+    with span("export_cache_write"):
+        return EXPORT_CACHE.put(key, kind, data)
+
+
 ###----Generate PDF-----####
 
 @app.callback(
     Output("pdf-download", "data"),
     Input("pdf-button", "n_clicks"),
-    Input("em-graph", "figure"),
+    State("em-figure-state", "data"),
     State("aircraft-select", "value"),
     State("engine-select", "value"),
     State("config-select", "value"),
@@ -3544,7 +1837,7 @@ def get_summary_text(ac_name, engine_name, config, gear, occupants, fuel, total_
     State("overlay-toggle", "data"),
     prevent_initial_call=True
 )
-def generate_pdf(n_clicks, fig_data, ac_name, engine_name, config, gear, occupants, pax_weight, fuel, total_weight,
+def generate_pdf(n_clicks, figure_state, ac_name, engine_name, config, gear, occupants, pax_weight, fuel, total_weight,
                  power_fraction, altitude, pitch, oei_toggle, prop_condition, maneuver,
                  oat_c, speed_unit, cg_position, active_overlays):
     if ctx.triggered_id != "pdf-button":
@@ -3559,98 +1852,18 @@ def generate_pdf(n_clicks, fig_data, ac_name, engine_name, config, gear, occupan
         'maneuver': maneuver
     })
 
-    fig = go.Figure(fig_data)
-
-    # Generate timestamp
-    from datetime import datetime
-    export_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    
-
-
-    # ✅ Add Logo (logo2.png in top-left)
-    try:
-        logo_path = os.path.join("assets", "logo2.png")
-        if os.path.exists(logo_path):
-            from PIL import Image
-            logo_img = Image.open(logo_path)
-            fig.add_layout_image(
-                dict(
-                    source=logo_img,
-                    xref="paper", yref="paper",
-                    x=-0.05, y=1.25,
-                    sizex=0.25, sizey=0.25,
-                    xanchor="left", yanchor="top",
-                    layer="above"
-                )
-            )
-    except Exception as e:
-        dprint(f"[LOGO WARNING] Failed to add logo2.png: {e}")
-
-    # ✅ Summary Text
-    oei_status = "YES" if oei_toggle and "enabled" in oei_toggle else "NO"
-
-    # Convert OAT to Fahrenheit for display
-    oat_f = round(oat_c * 9/5 + 32) if oat_c is not None else "N/A"
-    oat_display = f"{oat_c}°C / {oat_f}°F" if oat_c is not None else "N/A"
-
-    # Calculate CG in inches from slider position and aircraft CG range
-    cg_display = "N/A"
-    if cg_position is not None and ac_name and ac_name in aircraft_data:
-        ac = aircraft_data[ac_name]
-        cg_range = ac.get("cg_range", [0, 100])
-        cg_inches = cg_range[0] + cg_position * (cg_range[1] - cg_range[0])
-        cg_display = f"{cg_inches:.1f} in"
-
-    # Format active overlays
-    overlay_names = {
-        "ps": "Ps Contours",
-        "radius": "Turn Radius",
-        "g": "G-Lines",
-        "aob": "AOB Shading",
-        "negative_g": "Neg-G Envelope",
-        "vmca": "Dynamic Vmc",
-        "vyse": "Dynamic Vyse"
-    }
-    active_overlay_list = [overlay_names.get(o, o) for o in (active_overlays or [])]
-    overlays_display = ", ".join(active_overlay_list) if active_overlay_list else "None"
-
-    summary_lines = [
-        f"Engine: {engine_name} | {config} | Gear: {gear}",
-        f"Weight: {int(total_weight) if total_weight else 'N/A'} lbs | Occupants: {occupants} x {pax_weight or 180} lbs | Fuel: {fuel} gal | CG: {cg_display}",
-        f"Altitude: {altitude or 0} ft | OAT: {oat_display} | Power: {int(power_fraction * 100)}%",
-        f"Speed Unit: {speed_unit or 'KIAS'} | OEI: {oei_status}" + (f" ({prop_condition})" if oei_status == "YES" else ""),
-        f"Overlays: {overlays_display}" + (f" | Maneuver: {maneuver}" if maneuver else ""),
-        f"<i>Generated: {export_timestamp}</i>"
-    ]
-
-    fig.add_annotation(
-        text="<br>".join(summary_lines),
-        xref="paper", yref="paper",
-        x=0.5, y=1.01,
-        xanchor="center", yanchor="bottom",
-        showarrow=False,
-        font=dict(size=10, color="#1b1e23"),
-        align="center"
-    )
-
-    # ✅ Footer for exports
-    fig.add_annotation(
-        text="© 2025 Nicholas Len, AEROEDGE. All rights reserved. | Not FAA-approved. For educational and reference use only.",
-        xref="paper", yref="paper",
-        x=0.5, y=-0.12,
-        xanchor="center", yanchor="top",
-        showarrow=False,
-        font=dict(size=9, color="gray"),
-        align="center"
+    summary_lines = get_export_summary_lines(
+        ac_name, engine_name, config, gear, occupants, pax_weight, fuel, total_weight,
+        power_fraction, altitude, oei_toggle, prop_condition, maneuver,
+        oat_c, speed_unit, cg_position, active_overlays
     )
 
-    # ✅ Clean layout margin (increased top margin for additional info lines)
-    fig.update_layout(margin=dict(t=180, b=80))
-
-    # ✅ Save PDF to temp and return
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        pio.write_image(fig, tmp.name, format="pdf", width=1100, height=800)
-        return send_file(tmp.name, filename="EMdiagram.pdf")
+    # ✅ Render (or reuse) the PDF and return
+    with trace("export_pdf", {"figure": (figure_state or {}).get("key"), "summary": summary_lines}):
+        path = export_figure_file("pdf", figure_state, summary_lines, width=1100, height=800)
+    if path is None:
+        return dash.no_update
+    return send_file(path, filename="EMdiagram.pdf")
 
 
 ###----Generate PNG-----####
@@ -3658,7 +1871,7 @@ def generate_pdf(n_clicks, fig_data, ac_name, engine_name, config, gear, occupan
 @app.callback(
     Output("png-download", "data"),
     Input("png-button", "n_clicks"),
-    Input("em-graph", "figure"),
+    State("em-figure-state", "data"),
     State("aircraft-select", "value"),
     State("engine-select", "value"),
     State("config-select", "value"),
@@ -3679,7 +1892,7 @@ def generate_pdf(n_clicks, fig_data, ac_name, engine_name, config, gear, occupan
     State("overlay-toggle", "data"),
     prevent_initial_call=True
 )
-def generate_png(n_clicks, fig_data, ac_name, engine_name, config, gear, occupants, pax_weight, fuel, total_weight,
+def generate_png(n_clicks, figure_state, ac_name, engine_name, config, gear, occupants, pax_weight, fuel, total_weight,
                  power_fraction, altitude, pitch, oei_toggle, prop_condition, maneuver,
                  oat_c, speed_unit, cg_position, active_overlays):
     if ctx.triggered_id != "png-button":
@@ -3694,96 +1907,18 @@ def generate_png(n_clicks, fig_data, ac_name, engine_name, config, gear, occupan
         'maneuver': maneuver
     })
 
-    fig = go.Figure(fig_data)
-
-    # Generate timestamp
-    from datetime import datetime
-    export_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-
-    # ✅ Add Logo (logo2.png in top-left)
-    try:
-        logo_path = os.path.join("assets", "logo2.png")
-        if os.path.exists(logo_path):
-            from PIL import Image
-            logo_img = Image.open(logo_path)
-            fig.add_layout_image(
-                dict(
-                    source=logo_img,
-                    xref="paper", yref="paper",
-                    x=-0.05, y=1.25,
-                    sizex=0.25, sizey=0.25,
-                    xanchor="left", yanchor="top",
-                    layer="above"
-                )
-            )
-    except Exception as e:
-        dprint(f"[LOGO WARNING] Failed to add logo2.png: {e}")
-
-    # ✅ Summary Text
-    oei_status = "YES" if oei_toggle and "enabled" in oei_toggle else "NO"
-
-    # Convert OAT to Fahrenheit for display
-    oat_f = round(oat_c * 9/5 + 32) if oat_c is not None else "N/A"
-    oat_display = f"{oat_c}°C / {oat_f}°F" if oat_c is not None else "N/A"
-
-    # Calculate CG in inches from slider position and aircraft CG range
-    cg_display = "N/A"
-    if cg_position is not None and ac_name and ac_name in aircraft_data:
-        ac = aircraft_data[ac_name]
-        cg_range = ac.get("cg_range", [0, 100])
-        cg_inches = cg_range[0] + cg_position * (cg_range[1] - cg_range[0])
-        cg_display = f"{cg_inches:.1f} in"
-
-    # Format active overlays
-    overlay_names = {
-        "ps": "Ps Contours",
-        "radius": "Turn Radius",
-        "g": "G-Lines",
-        "aob": "AOB Shading",
-        "negative_g": "Neg-G Envelope",
-        "vmca": "Dynamic Vmc",
-        "vyse": "Dynamic Vyse"
-    }
-    active_overlay_list = [overlay_names.get(o, o) for o in (active_overlays or [])]
-    overlays_display = ", ".join(active_overlay_list) if active_overlay_list else "None"
-
-    summary_lines = [
-        f"Engine: {engine_name} | {config} | Gear: {gear}",
-        f"Weight: {int(total_weight) if total_weight else 'N/A'} lbs | Occupants: {occupants} x {pax_weight or 180} lbs | Fuel: {fuel} gal | CG: {cg_display}",
-        f"Altitude: {altitude or 0} ft | OAT: {oat_display} | Power: {int(power_fraction * 100)}%",
-        f"Speed Unit: {speed_unit or 'KIAS'} | OEI: {oei_status}" + (f" ({prop_condition})" if oei_status == "YES" else ""),
-        f"Overlays: {overlays_display}" + (f" | Maneuver: {maneuver}" if maneuver else ""),
-        f"<i>Generated: {export_timestamp}</i>"
-    ]
-
-    fig.add_annotation(
-        text="<br>".join(summary_lines),
-        xref="paper", yref="paper",
-        x=0.5, y=1.01,
-        xanchor="center", yanchor="bottom",
-        showarrow=False,
-        font=dict(size=10, color="#1b1e23"),
-        align="center"
-    )
-
-    # ✅ Footer for exports
-    fig.add_annotation(
-        text="© 2025 Nicholas Len, AEROEDGE. All rights reserved. | Not FAA-approved. For educational and reference use only.",
-        xref="paper", yref="paper",
-        x=0.5, y=-0.12,
-        xanchor="center", yanchor="top",
-        showarrow=False,
-        font=dict(size=9, color="gray"),
-        align="center"
+    summary_lines = get_export_summary_lines(
+        ac_name, engine_name, config, gear, occupants, pax_weight, fuel, total_weight,
+        power_fraction, altitude, oei_toggle, prop_condition, maneuver,
+        oat_c, speed_unit, cg_position, active_overlays
     )
 
-    # ✅ Clean layout margin (increased top margin for additional info lines)
-    fig.update_layout(margin=dict(t=180, b=80))
-
-    # ✅ Save PNG to temp and return
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-        pio.write_image(fig, tmp.name, format="png", width=1200, height=900, scale=2)
-        return send_file(tmp.name, filename="EMdiagram.png")
+    # ✅ Render (or reuse) the PNG and return
+    with trace("export_png", {"figure": (figure_state or {}).get("key"), "summary": summary_lines}):
+        path = export_figure_file("png", figure_state, summary_lines, width=1200, height=900, scale=2)
+    if path is None:
+        return dash.no_update
+    return send_file(path, filename="EMdiagram.png")
 
 
 # When you click "Edit / Create Aircraft"
@@ -5438,8 +3573,12 @@ def save_aircraft_to_file(
                 dash.no_update,
             )
 
-        with open(filepath, "w") as f:
-            json.dump(ac_dict, f, indent=2)
+        # Atomic, so the reload pollers never read a partial file
+        write_aircraft_file(filepath, ac_dict)
+
+        # Serve the new aircraft from this worker right away; other workers
+        # pick it up on their next poll
+        AIRCRAFT_RELOADER.check()
 
         # --- Update in-memory data store instead of reloading from folder ---
         current_data = current_data or {}
@@ -5951,6 +4090,220 @@ def serve_sitemap():
     return send_from_directory('.', 'sitemap.xml')
 
 
+# =============================================================================
+# ENVELOPE API
+# =============================================================================
+ENVELOPE_API_VERSION = 1
+ENVELOPE_API_DECIMALS = 3
+
+
+def _rounded(values):
+    """Round for a compact payload; NaN (outside the envelope) becomes null."""
+    arr = np.round(np.asarray(values, dtype=float), ENVELOPE_API_DECIMALS)
+    return np.where(np.isfinite(arr), arr, None).tolist()
+
+
+def envelope_payload(result, state_key):
+    """Compact JSON view of an EMResult for /api/envelope."""
+    payload = {
+        "version": ENVELOPE_API_VERSION,
+        "state_key": state_key,
+        "aircraft": result.ac_name,
+        "unit": result.unit,
+        "g_limits": {"positive": result.g_limit, "negative": -result.g_limit_neg},
+        "corner": {"ias": _rounded(result.corner_ias), "turn_rate": _rounded(result.corner_tr)},
+        "key_speeds": {k: (None if v is None else _rounded(v)) for k, v in result.key_speeds().items()},
+        "boundaries": {
+            "lift_limit": {"ias": _rounded(result.lift_limit_x), "turn_rate": _rounded(result.lift_limit_y)},
+            "load_limit": {"ias": _rounded(result.load_limit_x), "turn_rate": _rounded(result.load_limit_y)},
+            "max_speed": {"label": result.max_speed_label, "ias": _rounded(result.vne_x),
+                          "turn_rate": _rounded(result.vne_y)},
+        },
+        "axes": {"ias": _rounded(result.x_range), "turn_rate": _rounded(result.y_range)},
+    }
+    if result.neg_lift_limit is not None:
+        payload["boundaries"]["neg_lift_limit"] = {
+            "ias": _rounded(result.neg_lift_limit[0]), "turn_rate": _rounded(result.neg_lift_limit[1])}
+        payload["boundaries"]["neg_load_limit"] = {
+            "ias": _rounded(result.neg_load_limit[0]), "turn_rate": _rounded(result.neg_load_limit[1])}
+    if result.ps_grid is not None:
+        ias, tr, ps = result.ps_grid
+        payload["ps"] = {"ias": _rounded(ias), "turn_rate": _rounded(tr), "knots_per_sec": _rounded(ps)}
+    return payload
+
+
+@app.server.route("/api/envelope")
+def serve_envelope():
+    """
+    Envelope numbers for a flight state given as query parameters.
+
+    Only ac_name is required; other update_graph inputs default to what the
+    UI shows after selecting the aircraft (overlay_toggle defaults to ps).
+    Add format=npz for a binary NumPy archive instead of JSON.
+    """
+    from flask import Response, request
+
+    fmt = request.args.get("format", "json")
+    if fmt not in ("json", "npz"):
+        return Response(json.dumps({"error": "format must be json or npz"}), status=400,
+                        mimetype="application/json")
+
+    params = {k: request.args.getlist(k) for k in request.args}
+    params.setdefault("overlay_toggle", ["ps"])
+    try:
+        state = resolve_state(parse_state_params(params))
+    except (EMInputError, ValueError, TypeError) as e:
+        return Response(json.dumps({"error": str(e)}), status=400, mimetype="application/json")
+
+    state_key = state_hash(state)
+    ac_key = aircraft_data.revision(state["ac_name"])
+    etag = f"{ENVELOPE_API_VERSION}-{fmt}-{state_key}-{ac_key}"
+    headers = {
+        "ETag": f'"{etag}"',  # strong: same state and aircraft data -> same bytes
+        "Cache-Control": f"public, max-age={ENVELOPE_API_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+
+    try:
+        result = get_envelope(state, key=state_key, revision=ac_key)
+    except EMInputError as e:  # e.g. an engine the aircraft doesn't have
+        return Response(json.dumps({"error": str(e)}), status=400, mimetype="application/json")
+    except Exception:
+        # A compute bug, not the caller's input: log it, don't echo internals
+        log.error("/api/envelope failed for %s:\n%s", request.query_string.decode(errors="replace"),
+                  traceback.format_exc())
+        return Response(json.dumps({"error": "internal error computing the envelope"}), status=500,
+                        mimetype="application/json")
+
+    if fmt == "npz":
+        buf = io.BytesIO()
+        write_npz(buf, result.to_arrays())
+        headers["Content-Disposition"] = f'attachment; filename="envelope_{state_key}.npz"'
+        return Response(buf.getvalue(), mimetype="application/octet-stream", headers=headers)
+
+    body = json.dumps(envelope_payload(result, state_key), separators=(",", ":"))
+    return Response(body, mimetype="application/json", headers=headers)
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+from flask import Response, g as flask_g, request  # g is gravity in this module
+
+CACHE_REQUESTS = METRICS.counter("app_cache_requests_total", "Cache lookups, by cache and result")
+CACHE_HIT_RATIO = METRICS.gauge("app_cache_hit_ratio", "Cache hit ratio since worker start, by cache")
+TRACKER_QUEUE_DEPTH = METRICS.gauge("tracker_queue_depth", "Tracking events waiting to be sent")
+TRACKER_EVENTS = METRICS.counter("tracker_events_total", "Tracking events, by outcome")
+PROCESS_RSS = METRICS.gauge("process_resident_memory_bytes", "Worker resident set size")
+
+
+@METRICS.add_collector
+def collect_process_metrics():
+    for name, cache in (("envelope", ENVELOPE_CACHE), ("figure", FIGURE_CACHE), ("export", EXPORT_CACHE),
+                        ("layout", LAYOUT_CACHE)):
+        CACHE_REQUESTS.set_total(cache.hits, cache=name, result="hit")
+        CACHE_REQUESTS.set_total(cache.misses, cache=name, result="miss")
+        lookups = cache.hits + cache.misses
+        CACHE_HIT_RATIO.set(cache.hits / lookups if lookups else 0.0, cache=name)
+    stats = get_sender().stats()
+    TRACKER_QUEUE_DEPTH.set(stats.pop("queue_depth"))
+    for outcome, count in stats.items():
+        TRACKER_EVENTS.set_total(count, outcome=outcome)
+    PROCESS_RSS.set(process_rss_bytes())
+
+
+@app.server.before_request
+def start_callback_timer():
+    if request.path.endswith("/_dash-update-component"):
+        flask_g.callback_start = time.perf_counter()
+
+
+@app.server.after_request
+def record_callback_metrics(response):
+    start = flask_g.pop("callback_start", None)
+    if start is not None:
+        payload = request.get_json(silent=True) or {}  # already parsed by Dash, so cached
+        output = payload.get("output")
+        if output not in app.callback_map:
+            output = "unknown"  # keep label cardinality bounded to registered callbacks
+        CALLBACK_SECONDS.observe(time.perf_counter() - start, output=output)
+        if response.content_length is not None:
+            CALLBACK_BYTES.observe(response.content_length, output=output)
+        if response.status_code >= 400:
+            CALLBACK_ERRORS.inc(output=output)
+        METRICS.flush()
+    return response
+
+
+@app.server.route("/metrics")
+def serve_metrics():
+    return Response(METRICS.render(), mimetype="text/plain; version=0.0.4")
+
+
+# =============================================================================
+# PERF TRACES
+# =============================================================================
+from markupsafe import escape
+
+
+def format_trace_html(rank, t):
+    """One traced request: total, stage bars (indented by nesting) and input state."""
+    rows = []
+    for s in t.breakdown():
+        share = 100 * s["duration_ms"] / (t.duration * 1000) if t.duration else 0
+        rows.append(
+            f'<tr><td style="padding-left:{8 + 16 * s["depth"]}px">{escape(s["name"])}</td>'
+            f'<td align="right">{s["duration_ms"]:.1f}</td>'
+            f'<td><div style="background:#4a90d9;height:10px;width:{share:.1f}%"></div></td></tr>'
+        )
+    started = time.strftime("%H:%M:%S", time.localtime(t.started_at))
+    error = f' <b style="color:#c00">{escape(t.error)}</b>' if t.error else ""
+    meta = escape(json.dumps(t.meta, indent=1, default=str))
+    return (
+        f"<h3>#{rank} {escape(t.name)}: {t.duration * 1000:.1f} ms at {started}{error}</h3>"
+        f'<table style="width:700px"><tr><th align="left">stage</th><th>ms</th><th></th></tr>{"".join(rows)}</table>'
+        f"<details><summary>input state</summary><pre>{meta}</pre></details>"
+    )
+
+
+# Traces show request input state, so the page is only served when tracing
+# is on, and only to loopback clients (e.g. through an SSH tunnel)
+PERF_PAGE_CLIENTS = ("127.0.0.1", "::1")
+
+
+@app.server.route("/debug/perf")
+def serve_perf_traces():
+    """Slowest recent traced requests in this worker (?limit=N, ?name=update_graph)."""
+    if not PERF_TRACE_ENABLED or request.remote_addr not in PERF_PAGE_CLIENTS:
+        return Response("Not Found", status=404, mimetype="text/plain")
+    limit = request.args.get("limit", 20, type=int)
+    traces = PERF_TRACES.slowest(limit, name=request.args.get("name") or None)
+    body = "".join(format_trace_html(i + 1, t) for i, t in enumerate(traces)) or "<p>No traces recorded yet.</p>"
+    page = (
+        f"<html><head><title>EM perf traces</title></head><body style=\"font-family:sans-serif\">"
+        f"<h2>Slowest of the last {len(PERF_TRACES.recent())} traced requests (worker {os.getpid()})</h2>"
+        f"{body}</body></html>"
+    )
+    return Response(page, mimetype="text/html")
+
+
+# Record callback request bodies for replay by benchmarks/load_test.py
+DASH_PAYLOAD_LOG = os.environ.get("DASH_PAYLOAD_LOG")
+if DASH_PAYLOAD_LOG:
+    _payload_log_lock = threading.Lock()
+
+    @app.server.before_request
+    def record_callback_payload():
+        if request.path.endswith("/_dash-update-component"):
+            body = request.get_json(silent=True)  # cached for Dash's own read
+            if body is not None:
+                line = json.dumps({"t": time.time(), "body": body}, separators=(",", ":"))
+                with _payload_log_lock, open(DASH_PAYLOAD_LOG, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+
 
 import os
 
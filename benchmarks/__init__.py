@@ -0,0 +1,8 @@
+# benchmarks/__init__.py
+
+"""
+Timing harnesses for the EM Diagram application.
+
+Not collected by the default test run; invoke a benchmark file directly
+with pytest or as a script (see each module's docstring).
+"""
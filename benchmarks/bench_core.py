@@ -0,0 +1,285 @@
+# benchmarks/bench_core.py
+
+"""
+Microbenchmarks for core.calculations and the multi-engine kernels.
+
+Every core.calculations function plus calculate_vmca and
+calculate_dynamic_vyse is timed:
+  - scalar: one call with scalar inputs;
+  - array:  one call over a grid of N points, when the function accepts
+            NumPy arrays;
+  - loop:   N scalar calls, for functions that don't (what a caller has to
+            do today), up to LOOP_MAX_POINTS.
+
+Each time is the best of several repeats, divided by a fixed calibration
+workload measured right before it, so results from different machines can
+be compared. compare() flags any case slower than the committed baseline by
+more than the tolerance; cases under GATE_MIN_SECONDS are timed and
+reported but not gated, since their ratios swing by more than that on
+unchanged code.
+
+Usage:
+    python benchmarks/bench_core.py                      # run and compare
+    python benchmarks/bench_core.py --out core.json      # also save results
+    python benchmarks/bench_core.py --update-baseline    # accept new timings
+    python -m pytest benchmarks/bench_core.py -q         # fail on regression
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import timeit
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from core import calculations
+from core.multi_engine import calculate_vmca, calculate_dynamic_vyse
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_core.json")
+GRID_SIZES = (100, 10_000, 250_000)
+LOOP_MAX_POINTS = 10_000
+TOLERANCE = 0.75  # fail when a case is more than 75% slower than baseline
+# Scalar and small-N cases run in microseconds and can swing 2x between runs
+# of unchanged code; a slower kernel still shows up in its loop:10000 and
+# array:250000 cases, which take milliseconds
+GATE_MIN_SECONDS = 0.001  # baseline time on this machine (normalized x calibration)
+MIN_TIME = 0.02   # seconds per timing repeat
+REPEAT = 5
+SMALL_REPEAT = 25  # repeats for cases faster than GATE_MIN_SECONDS per call
+
+
+class Grid:
+    """An argument swept over [lo, hi]: its midpoint for scalar runs."""
+
+    def __init__(self, lo, hi, always_array=False):
+        self.lo = lo
+        self.hi = hi
+        self.always_array = always_array
+
+    def scalar(self):
+        mid = (self.lo + self.hi) / 2
+        return np.array([mid]) if self.always_array else mid
+
+    def array(self, n):
+        return np.linspace(self.lo, self.hi, n)
+
+
+STALL_DATA = {"weights": [1600, 2000, 2450], "speeds": [44, 48, 53]}
+
+# name -> (function, positional args); Grid args are swept
+CASES = {
+    "compute_dynamic_pressure": (calculations.compute_dynamic_pressure, (0.00238, Grid(50, 350))),
+    "compute_cl": (calculations.compute_cl, (2400, 1.0, Grid(5, 150), 174, 1.6)),
+    "compute_cd": (calculations.compute_cd, (0.027, Grid(0.1, 1.6), 7.4, 0.8, 1.0, 1.0)),
+    "compute_drag": (calculations.compute_drag, (Grid(5, 150), 174, 0.05)),
+    "compute_thrust_available": (calculations.compute_thrust_available, (180, Grid(40, 160), 140, 2.6)),
+    "compute_ps_knots_per_sec": (calculations.compute_ps_knots_per_sec, (450, 300, Grid(70, 270), 2400, 0)),
+    "compute_air_density": (calculations.compute_air_density, (Grid(0, 14000), 15)),
+    "compute_density_altitude": (calculations.compute_density_altitude, (Grid(0, 14000), 25)),
+    "compute_pressure_altitude": (calculations.compute_pressure_altitude, (Grid(0, 9000), 29.92)),
+    "compute_true_airspeed": (calculations.compute_true_airspeed, (Grid(40, 160), 5000)),
+    "compute_load_factor": (calculations.compute_load_factor, (Grid(0, 80),)),
+    "compute_turn_rate_from_bank": (calculations.compute_turn_rate_from_bank, (110, Grid(0, 80))),
+    "compute_turn_rate_from_load_factor": (calculations.compute_turn_rate_from_load_factor, (110, Grid(1, 6))),
+    "compute_turn_radius": (calculations.compute_turn_radius, (110, Grid(5, 80))),
+    "compute_bank_from_turn_rate": (calculations.compute_bank_from_turn_rate, (110, Grid(0.5, 40))),
+    "compute_stall_speed_at_load_factor": (calculations.compute_stall_speed_at_load_factor, (48, Grid(1, 6))),
+    "interpolate_stall_speed": (calculations.interpolate_stall_speed, (STALL_DATA, Grid(1500, 2500))),
+    "compute_stall_ias_at_turn_rate": (calculations.compute_stall_ias_at_turn_rate,
+                                       (2400, 0.00238, 174, 1.6, Grid(0, 40))),
+    "calculate_vmca": (calculate_vmca, (76, 0.8, 5000, 5500, 80, (75, 85), "windmilling", 2000, 15, "KIAS",
+                                        Grid(-5, 10, always_array=True))),
+    "calculate_dynamic_vyse": (calculate_dynamic_vyse, (101, Grid(4000, 5500), 5500, 3000, 20, "up", "clean",
+                                                        "feathered")),
+}
+
+
+def _args(spec, n=None):
+    return tuple(
+        (a.scalar() if n is None else a.array(n)) if isinstance(a, Grid) else a
+        for a in spec
+    )
+
+
+def _vectorizes(fn, spec):
+    """True when fn accepts the Grid args as arrays and returns per-point results."""
+    try:
+        result = fn(*_args(spec, 7))
+    except Exception:
+        return False
+    results = result if isinstance(result, tuple) else (result,)
+    return any(np.shape(r) == (7,) for r in results)
+
+
+def time_call(fn, min_time=MIN_TIME, repeat=None):
+    """
+    Best seconds per call of fn() over `repeat` runs of at least min_time
+    (default REPEAT, or SMALL_REPEAT for calls under GATE_MIN_SECONDS).
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+    if repeat is None:
+        repeat = SMALL_REPEAT if elapsed / number < GATE_MIN_SECONDS else REPEAT
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def calibrate(repeat=REPEAT):
+    """Seconds for a fixed mixed Python/NumPy workload, the unit results are scaled by."""
+    values = np.linspace(1.0, 2.0, 200_000)
+
+    def workload():
+        total = 0.0
+        for i in range(20_000):
+            total += math.sqrt(i) * 1.0001
+        total += float(np.sum(np.sqrt(values) * np.sin(values)))
+        return total
+
+    return time_call(workload, repeat=repeat)
+
+
+def iter_cases(names=None, sizes=GRID_SIZES):
+    """Yield (case name, mode, n, zero-arg callable)."""
+    for name, (fn, spec) in CASES.items():
+        if names and not any(pattern in name for pattern in names):
+            continue
+        scalar_args = _args(spec)
+        yield f"{name}[scalar]", "scalar", 1, lambda fn=fn, a=scalar_args: fn(*a)
+        vectorized = _vectorizes(fn, spec)
+        for n in sizes:
+            array_args = _args(spec, n)
+            if vectorized:
+                yield f"{name}[array:{n}]", "array", n, lambda fn=fn, a=array_args: fn(*a)
+            elif n <= LOOP_MAX_POINTS:
+                # Element-wise calls, unpacking the grids once up front
+                rows = list(zip(*(
+                    a.array(n).tolist() if isinstance(a, Grid) else [a] * n for a in spec
+                )))
+                yield f"{name}[loop:{n}]", "loop", n, lambda fn=fn, rows=rows: [fn(*r) for r in rows]
+
+
+def run(names=None, sizes=GRID_SIZES, verbose=True):
+    """
+    Time every case.
+
+    Returns:
+        Dict with "meta" (versions, calibration seconds) and "cases"
+        ({case: {"mode", "n", "seconds", "normalized"}})
+    """
+    cases = {}
+    calibrations = []
+    for case, mode, n, fn in iter_cases(names, sizes):
+        # Calibrate next to each case so CPU frequency drift during the run
+        # scales both the same way
+        calibration = calibrate()
+        calibrations.append(calibration)
+        seconds = time_call(fn)
+        cases[case] = {"mode": mode, "n": n, "seconds": seconds, "normalized": seconds / calibration}
+        if verbose:
+            print(f"  {case:<48} {seconds * 1e6:>12.2f} µs  {seconds / calibration:>10.5f} cal")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "calibration_s": float(np.median(calibrations)) if calibrations else None,
+        },
+        "cases": cases,
+    }
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Cases slower than baseline * (1 + tolerance), by normalized time.
+
+    Only gated cases count: those whose baseline time, scaled by this run's
+    calibration, is at least GATE_MIN_SECONDS.
+
+    Returns:
+        List of (case, baseline_normalized, current_normalized, ratio),
+        worst first; cases missing from either side are ignored
+    """
+    regressions = []
+    for case, current in results["cases"].items():
+        base = baseline.get("cases", {}).get(case)
+        if base is None or base["mode"] != current["mode"] or not is_gated(base, results):
+            continue
+        ratio = current["normalized"] / base["normalized"]
+        if ratio > 1 + tolerance:
+            regressions.append((case, base["normalized"], current["normalized"], ratio))
+    return sorted(regressions, key=lambda r: r[3], reverse=True)
+
+
+def is_gated(case, results):
+    """True when a case (baseline entry) is slow enough to compare reliably."""
+    calibration = results["meta"]["calibration_s"] or 0.0
+    return case["normalized"] * calibration >= GATE_MIN_SECONDS
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def test_core_benchmarks_within_baseline():
+    baseline = load_baseline()
+    assert baseline is not None, f"No baseline at {BASELINE_PATH}; run with --update-baseline"
+    regressions = compare(run(verbose=False), baseline)
+    assert not regressions, "Slower than baseline:\n" + "\n".join(
+        f"  {case}: {ratio:.2f}x" for case, _, _, ratio in regressions
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark core.calculations and the multi-engine kernels.")
+    parser.add_argument("--out", help="Write results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="Allowed slowdown as a fraction (default %(default)s)")
+    parser.add_argument("--only", nargs="+", help="Only cases whose name contains one of these")
+    args = parser.parse_args(argv)
+
+    results = run(args.only)
+    if args.out:
+        write_json(args.out, results)
+    if args.update_baseline:
+        write_json(args.baseline, results)
+        print(f"[BENCH] Baseline written to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"[BENCH] No baseline at {args.baseline}; run with --update-baseline")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for case, base, current, ratio in regressions:
+        print(f"[REGRESSION] {case}: {ratio:.2f}x baseline ({base:.5f} -> {current:.5f} cal)")
+    gated = sum(1 for case, base in baseline.get("cases", {}).items()
+                if case in results["cases"] and is_gated(base, results))
+    print(f"[BENCH] {len(results['cases'])} cases ({gated} gated), {len(regressions)} regressions "
+          f"(tolerance {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
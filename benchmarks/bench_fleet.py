@@ -0,0 +1,227 @@
+# benchmarks/bench_fleet.py
+
+"""
+End-to-end render benchmark across the whole fleet.
+
+For every aircraft x flap config x overlay/maneuver combination (COMBOS),
+runs what update_graph does per request: compute_em, render_em_figure and
+the JSON serialization Dash sends to the browser. Each case reports:
+  - p50 / p95 / max wall time over --repeats runs
+  - peak Python allocation during one extra run (tracemalloc; slow, since
+    compute_em makes many small scalar allocations; skip with --no-memory)
+  - serialized figure size
+  - the slowest stage: a compute_em section (core.perf stages), figure
+    assembly or serialization
+
+Usage:
+    python benchmarks/bench_fleet.py                         # whole fleet
+    python benchmarks/bench_fleet.py --aircraft "Diamond DA42-NG" --repeats 10
+    python benchmarks/bench_fleet.py --combos all oei --sort peak_kb --top 20
+    python benchmarks/bench_fleet.py --workers 4 --csv fleet.csv --json fleet.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+ALL_OVERLAYS = ["g", "radius", "aob", "ps", "negative_g"]
+
+# name -> (state overrides, twins only)
+COMBOS = {
+    "default": ({}, False),
+    "bare": ({"overlay_toggle": []}, False),
+    "ps": ({"overlay_toggle": ["g", "radius", "aob", "ps"]}, False),
+    "all": ({"overlay_toggle": ALL_OVERLAYS}, False),
+    "steep_turn": ({"overlay_toggle": ALL_OVERLAYS, "maneuver": "steep_turn",
+                    "ias_values": [100], "aob_values": [45], "steepturn_ghost_values": [True]}, False),
+    "chandelle": ({"overlay_toggle": ALL_OVERLAYS, "maneuver": "chandelle",
+                   "chandelle_ias_values": [110], "chandelle_bank_values": [30],
+                   "chandelle_ghost_values": [True]}, False),
+    "oei": ({"overlay_toggle": ALL_OVERLAYS, "oei_toggle": ["enabled"], "prop_condition": "windmilling",
+             "multi_engine_toggle_options": ["vmca", "dynamic_vyse"]}, True),
+}
+
+COLUMNS = ["aircraft", "config", "combo", "p50_ms", "p95_ms", "max_ms", "peak_kb", "figure_kb",
+           "top_stage", "top_stage_ms", "error"]
+
+
+def iter_cases(aircraft, names=None, combos=None):
+    """Yield (ac_name, config, combo, state) for the selected matrix."""
+    from core.em import default_state
+
+    for ac_name in sorted(names or aircraft.keys()):
+        ac = aircraft.get(ac_name)
+        if ac is None:
+            print(f"[WARNING] Unknown aircraft: {ac_name}")
+            continue
+        twin = ac.get("engine_count", 1) > 1
+        for config in ac.get("configuration_options", {}).get("flaps", []):
+            for combo, (overrides, twins_only) in COMBOS.items():
+                if (combos and combo not in combos) or (twins_only and not twin):
+                    continue
+                try:
+                    state = default_state(ac_name, ac, config, **overrides)
+                except (KeyError, TypeError, ValueError) as e:
+                    state = {"ac_name": ac_name, "config": config, "error": f"{type(e).__name__}: {e}"}
+                yield ac_name, config, combo, state
+
+
+def render_once(state):
+    """One update_graph-equivalent render; returns (figure JSON, Trace)."""
+    from core.em import compute_em
+    from core.perf import TraceBuffer, span, trace
+    from ui.em_figure import render_em_figure
+
+    buffer = TraceBuffer(capacity=1)
+    with trace("update_graph", buffer=buffer, enabled=True):
+        with span("compute_em"):
+            result = compute_em(state)
+        with span("figure_assembly"):
+            fig = render_em_figure(result)
+        with span("serialize"):
+            payload = fig.to_json()
+    return payload, buffer.recent()[0]
+
+
+def bench_case(case, repeats=5, memory=True):
+    """Time one case; returns a row dict keyed by COLUMNS."""
+    ac_name, config, combo, state = case
+    row = {"aircraft": ac_name, "config": config, "combo": combo, "error": state.get("error")}
+    if row["error"]:
+        return row
+    try:
+        payload, _ = render_once(state)  # warm-up (lazy models, imports)
+
+        peak = None
+        if memory:
+            tracemalloc.start()
+            try:
+                render_once(state)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        times, stages = [], {}
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _, t = render_once(state)
+            times.append(time.perf_counter() - start)
+            for s in t.breakdown():
+                # compute_em's sections, plus figure assembly and serialization
+                if s["depth"] == 1 or s["name"] != "compute_em":
+                    stages.setdefault(s["name"], []).append(s["duration_ms"])
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+        return row
+
+    times_ms = np.array(times) * 1000
+    top_stage, top_ms = max(((name, float(np.median(ms))) for name, ms in stages.items()),
+                            key=lambda s: s[1], default=(None, None))
+    row.update({
+        "p50_ms": float(np.percentile(times_ms, 50)),
+        "p95_ms": float(np.percentile(times_ms, 95)),
+        "max_ms": float(times_ms.max()),
+        "peak_kb": None if peak is None else peak / 1024,
+        "figure_kb": len(payload.encode("utf-8")) / 1024,
+        "top_stage": top_stage,
+        "top_stage_ms": top_ms,
+    })
+    return row
+
+
+def _bench_case_job(args):
+    return bench_case(*args)
+
+
+def run(cases, repeats=5, workers=1, memory=True, progress=True):
+    """Benchmark cases (in parallel when workers > 1); returns rows in case order."""
+    jobs = [(case, repeats, memory) for case in cases]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_bench_case_job, jobs)
+            rows = []
+            for i, row in enumerate(results, 1):
+                rows.append(row)
+                if progress:
+                    print(f"\r[BENCH] {i}/{len(jobs)}", end="", file=sys.stderr)
+    else:
+        rows = []
+        for i, job in enumerate(jobs, 1):
+            rows.append(_bench_case_job(job))
+            if progress:
+                print(f"\r[BENCH] {i}/{len(jobs)}", end="", file=sys.stderr)
+    if progress:
+        print(file=sys.stderr)
+    return rows
+
+
+def sort_rows(rows, column="p95_ms", ascending=False):
+    """Sort rows by a column; errored rows and missing values go last."""
+    ok = [r for r in rows if r.get(column) is not None]
+    missing = [r for r in rows if r.get(column) is None]
+    return sorted(ok, key=lambda r: r[column], reverse=not ascending) + missing
+
+
+def format_table(rows):
+    """Fixed-width text table of COLUMNS."""
+    def cell(value):
+        if value is None:
+            return "-"
+        return f"{value:.1f}" if isinstance(value, float) else str(value)
+
+    table = [COLUMNS] + [[cell(r.get(c)) for c in COLUMNS] for r in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(COLUMNS))]
+    lines = ["  ".join(v.ljust(w) for v, w in zip(line, widths)).rstrip() for line in table]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark EM renders across the fleet.")
+    parser.add_argument("--aircraft", nargs="+", help="Only these aircraft (default: all)")
+    parser.add_argument("--combos", nargs="+", choices=sorted(COMBOS), help="Only these combinations")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per case (default 5)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes (default 1; more is faster but noisier)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the tracemalloc run (it is ~100x slower than a plain render)")
+    parser.add_argument("--sort", default="p95_ms", choices=COLUMNS, help="Sort column (default p95_ms)")
+    parser.add_argument("--ascending", action="store_true", help="Sort ascending")
+    parser.add_argument("--top", type=int, help="Only print the first N rows")
+    parser.add_argument("--csv", help="Also write all rows as CSV")
+    parser.add_argument("--json", help="Also write all rows as JSON")
+    args = parser.parse_args(argv)
+
+    from core import aircraft_data
+
+    cases = list(iter_cases(aircraft_data, args.aircraft, args.combos))
+    print(f"[BENCH] {len(cases)} cases x {args.repeats} runs")
+    rows = sort_rows(run(cases, args.repeats, args.workers, not args.no_memory), args.sort, args.ascending)
+    print(format_table(rows[:args.top] if args.top else rows))
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    errors = sum(1 for r in rows if r.get("error"))
+    if errors:
+        print(f"[WARNING] {errors} cases failed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# benchmarks/bench_startup.py
+
+"""
+Cold-start benchmark: how long a fresh process takes to import the app.
+
+Each run is a new interpreter (no warm module cache), so this is what a
+gunicorn worker or an autoscaled instance pays before serving. Reports the
+median `import app` time and, with --profile, the slowest top-level imports
+from `python -X importtime`.
+
+tests/test_startup.py enforces STARTUP_BUDGET_S in the default test run,
+together with LAZY_MODULES: modules that must not be imported until used.
+
+Usage:
+    python benchmarks/bench_startup.py                   # median of 5 runs
+    python benchmarks/bench_startup.py --profile --top 15
+    python benchmarks/bench_startup.py --module core --budget 0.5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET_S = float(os.environ.get("STARTUP_BUDGET_S", 3.0))
+RUNS = 5
+
+# Export / launch stack, loaded on first use
+LAZY_MODULES = ("webbrowser", "requests", "kaleido", "plotly.io._kaleido")
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print("elapsed", elapsed)
+print("loaded", *(m for m in {lazy!r} if m in sys.modules))
+"""
+
+
+def measure_once(module="app"):
+    """
+    Import module in a fresh interpreter.
+
+    Returns:
+        (import seconds, list of LAZY_MODULES that got imported)
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, lazy=LAZY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    fields = dict(line.partition(" ")[::2] for line in result.stdout.splitlines()
+                  if line.startswith(("elapsed", "loaded")))
+    return float(fields["elapsed"]), fields["loaded"].split()
+
+
+def measure(module="app", runs=RUNS):
+    """Median import seconds over `runs` fresh processes, plus eagerly loaded LAZY_MODULES."""
+    times, eager = [], set()
+    for _ in range(runs):
+        seconds, loaded = measure_once(module)
+        times.append(seconds)
+        eager.update(loaded)
+    return float(np.median(times)), sorted(eager)
+
+
+def import_profile(module="app", top=10):
+    """
+    Slowest direct imports of module, from -X importtime.
+
+    Returns:
+        List of (cumulative seconds, self seconds, module name), slowest first
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows, children = [], []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header
+        depth = (len(name) - len(name.lstrip())) // 2  # two spaces per nesting level, after one
+        self_s, cumulative_s, name = int(self_us) / 1e6, int(cumulative_us) / 1e6, name.strip()
+        # Post-order: a module's imports are listed right before it
+        if depth == 1:
+            children.append((cumulative_s, self_s, name))
+        elif depth == 0:
+            if name == module:
+                rows = children + [(self_s, self_s, f"{module} (own code)")]
+            children = []
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import time.")
+    parser.add_argument("--module", default="app", help="Module to import (default app)")
+    parser.add_argument("--runs", type=int, default=RUNS, help="Fresh processes to time (default %(default)s)")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_S,
+                        help="Fail above this many seconds (default %(default)s, or $STARTUP_BUDGET_S)")
+    parser.add_argument("--profile", action="store_true", help="Also list the slowest imports")
+    parser.add_argument("--top", type=int, default=10, help="Imports listed by --profile (default 10)")
+    args = parser.parse_args(argv)
+
+    seconds, eager = measure(args.module, args.runs)
+    print(f"[BENCH] import {args.module}: {seconds * 1000:.0f} ms median of {args.runs} "
+          f"(budget {args.budget * 1000:.0f} ms)")
+    if args.profile:
+        for cumulative, own, name in import_profile(args.module, args.top):
+            print(f"  {name:<40} {cumulative * 1000:>8.1f} ms  (self {own * 1000:.1f} ms)")
+    if eager:
+        print(f"[REGRESSION] Imported at startup: {', '.join(eager)}")
+    if seconds > args.budget:
+        print(f"[REGRESSION] Over budget by {(seconds - args.budget) * 1000:.0f} ms")
+    return 1 if eager or seconds > args.budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,366 @@
+# benchmarks/load_test.py
+
+"""
+Concurrent load generator for the Dash callback endpoint.
+
+Virtual users replay /_dash-update-component request bodies against a
+running server, each on its own keep-alive connection, pausing a think time
+between requests. Results are reported per callback: throughput, latency
+percentiles and error rate.
+
+Payload sources:
+  - recorded: start the app with DASH_PAYLOAD_LOG=/path/payloads.jsonl, click
+    around (slider drags, aircraft switches, exports), then replay the file
+    with --payloads;
+  - synthesized (default): aircraft switches, altitude/power slider drags and
+    PNG exports, built from the server's /_dash-dependencies and the default
+    flight state of each aircraft.
+
+Compare deployments by launching the server from the harness and saving JSON:
+    python benchmarks/load_test.py --launch "gunicorn -w 2 --threads 4 -b 127.0.0.1:8050 app:server" \\
+        --users 16 --duration 60 --label w2t4 --json w2t4.json
+    python benchmarks/load_test.py --launch "gunicorn -w 4 -b 127.0.0.1:8050 app:server" \\
+        --env PROMETHEUS_MULTIPROC_DIR=/tmp/prom --users 16 --duration 60 --label w4 --json w4.json
+    python benchmarks/load_test.py --compare w2t4.json w4.json
+
+Against an already running server:
+    python benchmarks/load_test.py --url http://127.0.0.1:8050 --users 8 --think 0.5
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+UPDATE_PATH = "/_dash-update-component"
+DEFAULT_URL = "http://127.0.0.1:8050"
+GRAPH_OUTPUT = "em-graph.figure"
+EXPORT_OUTPUT = "png-download.data"
+ALTITUDE_DRAG = range(0, 10001, 1000)
+POWER_DRAG = (0.4, 0.5, 0.6, 0.7, 0.8)
+
+
+def callback_label(output):
+    """Readable name for a Dash output key ("..a.b...c.d.." -> "a.b+c.d")."""
+    return "+".join(part for part in output.strip(".").split("...") if part)
+
+
+# =============================================================================
+# PAYLOADS
+# =============================================================================
+def load_payloads(path):
+    """Request bodies from a JSONL file (raw bodies or {"body": ...} records)."""
+    bodies = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                bodies.append(record.get("body", record))
+    return bodies
+
+
+def _split_output(output):
+    if output.startswith(".."):
+        return [part for part in output[2:-2].split("...") if part]
+    return [output]
+
+
+def build_body(dependency, values, changed):
+    """
+    A /_dash-update-component body for one callback.
+
+    Args:
+        dependency: Entry from /_dash-dependencies
+        values: {"component-id.property": value}; wildcard (ALL) inputs
+            are sent with no matching components
+        changed: "component-id.property" that triggered the call
+    """
+    def prop(item):
+        if item["id"].startswith("{"):
+            return []
+        return {"id": item["id"], "property": item["property"],
+                "value": values.get(f"{item['id']}.{item['property']}")}
+
+    outputs = []
+    for part in _split_output(dependency["output"]):
+        component_id, property_name = part.rsplit(".", 1)
+        outputs.append({"id": component_id, "property": property_name})
+    return {
+        "output": dependency["output"],
+        "outputs": outputs if dependency["output"].startswith("..") else outputs[0],
+        "inputs": [prop(item) for item in dependency["inputs"]],
+        "state": [prop(item) for item in dependency["state"]],
+        "changedPropIds": [changed],
+    }
+
+
+def synthesize_payloads(dependencies, aircraft, names):
+    """
+    One session script: per aircraft, a switch, an altitude drag, a power
+    drag and a PNG export.
+    """
+    from core.em import EM_STATE_FIELDS, DEFAULT_STATE_PAX_WEIGHT, default_state
+
+    graph = next(d for d in dependencies if GRAPH_OUTPUT in d["output"])
+    export = next((d for d in dependencies if d["output"] == EXPORT_OUTPUT), None)
+    graph_keys = [f"{item['id']}.{item['property']}" for item in graph["inputs"]]
+    field_key = dict(zip(EM_STATE_FIELDS, graph_keys))
+
+    def values_for(state):
+        values = {field_key[field]: state[field] for field in EM_STATE_FIELDS}
+        values["passenger-weight-input.value"] = DEFAULT_STATE_PAX_WEIGHT
+        values["em-figure-state.data"] = {"state": state}
+        values["png-button.n_clicks"] = 1
+        return values
+
+    bodies = []
+    for ac_name in names:
+        state = default_state(ac_name, aircraft[ac_name])
+        bodies.append(build_body(graph, values_for(state), field_key["ac_name"]))
+        for altitude in ALTITUDE_DRAG:
+            state = {**state, "altitude_ft": altitude}
+            bodies.append(build_body(graph, values_for(state), field_key["altitude_ft"]))
+        for power in POWER_DRAG:
+            state = {**state, "power_fraction": power}
+            bodies.append(build_body(graph, values_for(state), field_key["power_fraction"]))
+        if export is not None:
+            bodies.append(build_body(export, values_for(state), "png-button.n_clicks"))
+    return bodies
+
+
+# =============================================================================
+# LOAD GENERATION
+# =============================================================================
+class VirtualUser(threading.Thread):
+    """Replays bodies in order (from a per-user offset) until stopped."""
+
+    def __init__(self, url, bodies, offset, think, stop, results, timeout=120):
+        super().__init__(daemon=True)
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = (parts.path.rstrip("/") or "") + UPDATE_PATH
+        self.bodies = bodies
+        self.index = offset
+        self.think = think
+        self.stop = stop
+        self.results = results
+        self.timeout = timeout
+        self.rng = random.Random(offset)
+
+    def _connect(self):
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def run(self):
+        conn = self._connect()
+        while not self.stop.is_set():
+            body = self.bodies[self.index % len(self.bodies)]
+            self.index += 1
+            data = json.dumps(body).encode("utf-8")
+            start = time.perf_counter()
+            try:
+                conn.request("POST", self.path, body=data, headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                size = len(response.read())
+                status = response.status
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                conn = self._connect()
+                size, status = 0, type(e).__name__
+            self.results.append((body["output"], time.perf_counter() - start, status, size))
+            if self.think:
+                # Uniform +/-50% jitter so users don't move in lockstep
+                self.stop.wait(self.think * self.rng.uniform(0.5, 1.5))
+        conn.close()
+
+
+def run_load(url, bodies, users=4, duration=30.0, think=0.0, warmup=0.0):
+    """
+    Drive the server with `users` concurrent virtual users.
+
+    Returns:
+        (results, elapsed) - results are (output, seconds, status, bytes)
+        tuples recorded after the warm-up
+    """
+    results = []
+    stop = threading.Event()
+    spread = max(1, len(bodies) // max(users, 1))
+    threads = [VirtualUser(url, bodies, i * spread, think, stop, results) for i in range(users)]
+    for t in threads:
+        t.start()
+    if warmup:
+        time.sleep(warmup)
+        results.clear()
+    start = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    elapsed = time.perf_counter() - start
+    for t in threads:
+        t.join(timeout=30)
+    return list(results), elapsed
+
+
+def summarize(results, elapsed):
+    """Per-callback and overall throughput, latency percentiles and error rate."""
+    by_output = {}
+    for output, seconds, status, size in results:
+        by_output.setdefault(output, []).append((seconds, status, size))
+    by_output["TOTAL"] = [(s, st, b) for _, s, st, b in results]
+
+    summary = {}
+    for output, rows in by_output.items():
+        latencies = np.array([s for s, _, _ in rows]) * 1000
+        errors = sum(1 for _, status, _ in rows if not isinstance(status, int) or status >= 400)
+        summary[output if output == "TOTAL" else callback_label(output)] = {
+            "requests": len(rows),
+            "rps": len(rows) / elapsed if elapsed else 0.0,
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "max_ms": float(latencies.max()),
+            "error_rate": errors / len(rows),
+            "mean_kb": float(np.mean([b for _, _, b in rows])) / 1024,
+        }
+    return summary
+
+
+def format_summary(summary):
+    columns = ["requests", "rps", "p50_ms", "p95_ms", "p99_ms", "max_ms", "error_rate", "mean_kb"]
+    names = sorted((n for n in summary if n != "TOTAL"), key=lambda n: -summary[n]["requests"]) + ["TOTAL"]
+    width = max(len(n) for n in names)
+    lines = [f"{'callback':<{width}}  " + "  ".join(f"{c:>10}" for c in columns)]
+    for name in names:
+        row = summary[name]
+        cells = [f"{row[c]:>10d}" if c == "requests" else
+                 f"{row[c]:>10.1%}" if c == "error_rate" else f"{row[c]:>10.1f}" for c in columns]
+        lines.append(f"{name:<{width}}  " + "  ".join(cells))
+    return "\n".join(lines)
+
+
+def format_comparison(runs):
+    """p95 latency and throughput per callback across saved runs."""
+    labels = [run["label"] for run in runs]
+    names = sorted({name for run in runs for name in run["summary"]} - {"TOTAL"}) + ["TOTAL"]
+    width = max(len(n) for n in names)
+    header = f"{'callback':<{width}}  " + "  ".join(f"{label[:20]:>22}" for label in labels)
+    lines = [header, f"{'':<{width}}  " + "  ".join(f"{'rps / p95 ms':>22}" for _ in labels)]
+    for name in names:
+        cells = []
+        for run in runs:
+            row = run["summary"].get(name)
+            cells.append(f"{row['rps']:>9.1f} / {row['p95_ms']:>9.1f}" if row else f"{'-':>22}")
+        lines.append(f"{name:<{width}}  " + "  ".join(cells))
+    return "\n".join(lines)
+
+
+# =============================================================================
+# SERVER UNDER TEST
+# =============================================================================
+def wait_until_ready(url, timeout=120.0):
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=5)
+            conn.request("GET", "/_dash-dependencies")
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def fetch_dependencies(url):
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    conn.request("GET", (parts.path.rstrip("/") or "") + "/_dash-dependencies")
+    return json.loads(conn.getresponse().read())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Dash callback endpoint.")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Server base URL (default %(default)s)")
+    parser.add_argument("--payloads", help="Recorded JSONL payloads (DASH_PAYLOAD_LOG); default: synthesize")
+    parser.add_argument("--aircraft", nargs="+", help="Aircraft for synthesized sessions (default: 5 random)")
+    parser.add_argument("--users", type=int, default=4, help="Concurrent virtual users (default 4)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds (default 30)")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds first (default 5)")
+    parser.add_argument("--think", type=float, default=0.0, help="Mean think time per user, seconds")
+    parser.add_argument("--launch", help="Command that starts the server under test (stopped afterwards)")
+    parser.add_argument("--env", nargs="+", default=[], metavar="KEY=VALUE", help="Environment for --launch")
+    parser.add_argument("--label", help="Name for this run in --json/--compare output")
+    parser.add_argument("--json", help="Write the summary as JSON")
+    parser.add_argument("--compare", nargs="+", metavar="RUN.json", help="Compare saved runs and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        runs = []
+        for path in args.compare:
+            with open(path, "r", encoding="utf-8") as f:
+                runs.append(json.load(f))
+        print(format_comparison(runs))
+        return 0
+
+    server = None
+    if args.launch:
+        env = dict(os.environ, **dict(item.split("=", 1) for item in args.env))
+        server = subprocess.Popen(shlex.split(args.launch), env=env)
+    try:
+        if not wait_until_ready(args.url):
+            print(f"[ERROR] Server at {args.url} did not become ready")
+            return 1
+
+        if args.payloads:
+            bodies = load_payloads(args.payloads)
+        else:
+            from core import aircraft_data
+            names = args.aircraft or random.Random(0).sample(sorted(aircraft_data.keys()), 5)
+            bodies = synthesize_payloads(fetch_dependencies(args.url), aircraft_data, names)
+        if not bodies:
+            print("[ERROR] No payloads to replay")
+            return 1
+
+        print(f"[LOAD] {len(bodies)} payloads, {args.users} users, {args.duration:.0f}s "
+              f"(+{args.warmup:.0f}s warm-up), think {args.think}s")
+        results, elapsed = run_load(args.url, bodies, args.users, args.duration, args.think, args.warmup)
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    if not results:
+        print("[ERROR] No requests completed")
+        return 1
+    summary = summarize(results, elapsed)
+    print(format_summary(summary))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "label": args.label or args.launch or args.url,
+                "users": args.users,
+                "think": args.think,
+                "duration": elapsed,
+                "summary": summary,
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+# benchmarks/parity.py
+
+"""
+Golden-figure parity harness for EM render rewrites.
+
+Records a fingerprint of the EM figure for a fixed matrix of states (every
+aircraft and flap config x the COMBOS below) and compares a render engine
+against the committed goldens with numeric tolerances. Use it to prove that
+a faster compute_em / render_em_figure still draws the same diagram, down
+to the corner-speed search, the turn-radius fudge factor and the dynamic
+Vmc boundary clipping.
+
+Each figure is reduced to:
+  - per trace: name, type, mode and, for x / y / z, the array shape, NaN
+    count, finite min / max / sum and SAMPLES evenly spaced values
+  - annotations: text and x / y position
+  - shapes: type and x0 / x1 / y0 / y1
+  - axis ranges
+
+An engine is any callable state -> figure (plotly Figure or its JSON dict).
+The candidate and the reference engine (compute_em + render_em_figure) are
+timed in the same run, so the report shows the speedup next to any diffs.
+
+Usage:
+    python benchmarks/parity.py --record                     # rewrite goldens
+    python benchmarks/parity.py                              # check reference
+    python benchmarks/parity.py --engine mymodule:fast_render --repeats 3
+    python benchmarks/parity.py --aircraft "Diamond DA42-NG" --combos oei
+"""
+
+import argparse
+import base64
+import gzip
+import importlib
+import json
+import math
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from benchmarks.bench_fleet import ALL_OVERLAYS, COMBOS as FLEET_COMBOS
+
+GOLDENS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "goldens_em.json.gz")
+SAMPLES = 12
+RTOL = 1e-6
+ATOL = 1e-9
+ARRAY_KEYS = ("x", "y", "z")
+
+# name -> (state overrides, twins only, every flap config or only the first)
+COMBOS = {
+    **{name: (overrides, twins_only, name == "all") for name, (overrides, twins_only) in FLEET_COMBOS.items()},
+    "mph_altitude": ({"overlay_toggle": ALL_OVERLAYS, "unit": "MPH", "altitude_ft": 8000}, False, False),
+    "oei_vmca": ({"overlay_toggle": ["g", "aob"], "oei_toggle": ["enabled"],
+                  "multi_engine_toggle_options": ["vmca"]}, True, False),
+}
+
+
+def iter_states(aircraft, names=None, combos=None):
+    """Yield (case id, state) for the parity matrix, in a stable order."""
+    from core.em import default_state
+
+    for ac_name in sorted(names or aircraft.keys()):
+        ac = aircraft.get(ac_name)
+        if ac is None:
+            print(f"[WARNING] Unknown aircraft: {ac_name}")
+            continue
+        twin = ac.get("engine_count", 1) > 1
+        flaps = ac.get("configuration_options", {}).get("flaps", [])
+        for combo, (overrides, twins_only, all_configs) in COMBOS.items():
+            if (combos and combo not in combos) or (twins_only and not twin):
+                continue
+            for config in (flaps if all_configs else flaps[:1]):
+                case = f"{ac_name}|{config}|{combo}"
+                try:
+                    yield case, default_state(ac_name, ac, config, **overrides)
+                except (KeyError, TypeError, ValueError) as e:
+                    yield case, {"ac_name": ac_name, "error": f"{type(e).__name__}: {e}"}
+
+
+def reference_engine(state):
+    """What update_graph draws today."""
+    from core.em import compute_em
+    from ui.em_figure import render_em_figure
+
+    return render_em_figure(compute_em(state))
+
+
+def load_engine(spec):
+    """Resolve "module:function" (or "module.function") to a callable."""
+    if spec in (None, "", "reference"):
+        return reference_engine
+    module, _, name = spec.rpartition(":") if ":" in spec else spec.rpartition(".")
+    return getattr(importlib.import_module(module), name)
+
+
+# =========================
+# FINGERPRINTS
+# =========================
+
+def _number(value):
+    """JSON-safe float with ~10 significant digits; NaN / inf become None."""
+    value = float(value)
+    return float(f"{value:.10g}") if math.isfinite(value) else None
+
+
+def _as_array(value):
+    """Trace data (list, ndarray or plotly's base64 typed array) as a float ndarray."""
+    if isinstance(value, dict) and "bdata" in value:
+        array = np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"])
+        shape = value.get("shape")
+        if shape:
+            array = array.reshape([int(n) for n in str(shape).split(",")])
+        return array.astype(float)
+    try:
+        return np.array(value, dtype=float)
+    except (TypeError, ValueError):
+        return None  # categorical / text data
+
+
+def _array_fingerprint(value):
+    array = _as_array(value)
+    if array is None:
+        return {"values": [str(v) for v in value]}
+    flat = array.ravel()
+    finite = flat[np.isfinite(flat)]
+    idx = np.unique(np.linspace(0, flat.size - 1, min(SAMPLES, flat.size)).round().astype(int))
+    return {
+        "shape": list(array.shape),
+        "nan": int(flat.size - finite.size),
+        "min": _number(finite.min()) if finite.size else None,
+        "max": _number(finite.max()) if finite.size else None,
+        "sum": _number(finite.sum()) if finite.size else None,
+        "samples": [_number(v) for v in flat[idx]],
+    }
+
+
+def fingerprint(fig):
+    """Reduce a figure (plotly Figure or JSON dict) to comparable numbers."""
+    if hasattr(fig, "to_plotly_json"):
+        fig = fig.to_plotly_json()
+    layout = fig.get("layout", {})
+    traces = []
+    for trace in fig.get("data", []):
+        entry = {key: trace.get(key) for key in ("name", "type", "mode")}
+        for key in ARRAY_KEYS:
+            if trace.get(key) is not None:
+                entry[key] = _array_fingerprint(trace[key])
+        traces.append(entry)
+    return {
+        "traces": traces,
+        "annotations": [
+            {"text": a.get("text"), "x": a.get("x"), "y": a.get("y")} for a in layout.get("annotations", [])
+        ],
+        "shapes": [
+            {key: s.get(key) for key in ("type", "x0", "x1", "y0", "y1")} for s in layout.get("shapes", [])
+        ],
+        "ranges": {
+            axis: list(layout[axis]["range"]) if layout.get(axis, {}).get("range") is not None else None
+            for axis in ("xaxis", "yaxis")
+        },
+    }
+
+
+def _normalize(value):
+    """Make a fingerprint JSON-round-trippable (numpy scalars, NaN)."""
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (float, np.floating, np.integer)) and not isinstance(value, bool):
+        return _number(value) if isinstance(value, (float, np.floating)) else int(value)
+    return value
+
+
+# =========================
+# COMPARISON
+# =========================
+
+def _close(a, b, rtol, atol):
+    if a is None or b is None:
+        return a is b
+    return math.isclose(a, b, rel_tol=rtol, abs_tol=atol)
+
+
+def _diff(golden, current, path, rtol, atol, out):
+    if isinstance(golden, dict) and isinstance(current, dict):
+        for key in sorted(set(golden) | set(current)):
+            if key not in golden or key not in current:
+                out.append(f"{path}/{key}: {'missing' if key not in current else 'unexpected'}")
+            else:
+                _diff(golden[key], current[key], f"{path}/{key}", rtol, atol, out)
+    elif isinstance(golden, list) and isinstance(current, list):
+        if len(golden) != len(current):
+            out.append(f"{path}: length {len(golden)} != {len(current)}")
+            return
+        for i, (g, c) in enumerate(zip(golden, current)):
+            _diff(g, c, f"{path}[{i}]", rtol, atol, out)
+    elif isinstance(golden, (int, float)) and isinstance(current, (int, float)) \
+            and not isinstance(golden, bool) and not isinstance(current, bool):
+        if not _close(float(golden), float(current), rtol, atol):
+            out.append(f"{path}: {golden} != {current}")
+    elif golden != current:
+        out.append(f"{path}: {golden!r} != {current!r}")
+
+
+def compare(golden, current, rtol=RTOL, atol=ATOL):
+    """
+    Differences between two fingerprints (or recorded error strings).
+
+    Returns:
+        List of "path: golden != current" strings; empty when equivalent
+    """
+    out = []
+    _diff(golden, current, "", rtol, atol, out)
+    return out
+
+
+# =========================
+# RECORD / CHECK
+# =========================
+
+def load_goldens(path=GOLDENS_PATH):
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_goldens(path, goldens):
+    # mtime=0 keeps the file byte-identical across identical recordings
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+        gz.write(json.dumps(goldens, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+
+
+def render_case(engine, state, repeats=1):
+    """Render state `repeats` times; returns (fingerprint or {"error"}, median seconds)."""
+    if state.get("error"):
+        return {"error": state["error"]}, None
+    times = []
+    try:
+        for _ in range(max(1, repeats)):
+            start = time.perf_counter()
+            fig = engine(state)
+            times.append(time.perf_counter() - start)
+    except Exception as e:
+        return {"error": type(e).__name__}, None
+    return _normalize(fingerprint(fig)), float(np.median(times))
+
+
+def record(cases, engine=reference_engine, progress=True):
+    """Goldens dict {"meta", "cases": {case: fingerprint}} for (case, state) pairs."""
+    cases = list(cases)
+    goldens = {}
+    for i, (case, state) in enumerate(cases, 1):
+        goldens[case], _ = render_case(engine, state)
+        if progress:
+            print(f"\r[PARITY] {i}/{len(cases)}", end="", file=sys.stderr)
+    if progress:
+        print(file=sys.stderr)
+    return {"meta": {"numpy": np.__version__, "samples": SAMPLES}, "cases": goldens}
+
+
+def check(cases, goldens, engine=reference_engine, repeats=1, rtol=RTOL, atol=ATOL,
+          time_reference=True, progress=True):
+    """
+    Compare engine against goldens, timing it next to the reference engine.
+
+    Returns:
+        List of row dicts: case, diffs (list), candidate_ms, reference_ms
+        (None when not timed); cases missing from goldens have diffs None
+    """
+    cases = list(cases)
+    time_reference = time_reference and engine is not reference_engine
+    rows = []
+    for i, (case, state) in enumerate(cases, 1):
+        current, seconds = render_case(engine, state, repeats)
+        golden = goldens["cases"].get(case)
+        row = {
+            "case": case,
+            "diffs": None if golden is None else compare(golden, current, rtol, atol),
+            "candidate_ms": None if seconds is None else seconds * 1000,
+            "reference_ms": None,
+        }
+        if time_reference:
+            _, ref_seconds = render_case(reference_engine, state, repeats)
+            row["reference_ms"] = None if ref_seconds is None else ref_seconds * 1000
+        else:
+            row["reference_ms"] = row["candidate_ms"]
+        rows.append(row)
+        if progress:
+            print(f"\r[PARITY] {i}/{len(cases)}", end="", file=sys.stderr)
+    if progress:
+        print(file=sys.stderr)
+    return rows
+
+
+def format_report(rows, max_diffs=5, top=10):
+    """Diffs per failing case, then the timing summary and the largest per-case deltas."""
+    lines = []
+    for row in rows:
+        if row["diffs"] is None:
+            lines.append(f"[PARITY] {row['case']}: no golden")
+        elif row["diffs"]:
+            lines.append(f"[MISMATCH] {row['case']}: {len(row['diffs'])} diffs")
+            lines.extend(f"    {d}" for d in row["diffs"][:max_diffs])
+
+    timed = [r for r in rows if r["candidate_ms"] is not None and r["reference_ms"] is not None]
+    if timed:
+        candidate = sum(r["candidate_ms"] for r in timed)
+        reference = sum(r["reference_ms"] for r in timed)
+        lines.append(f"[PARITY] Reference {reference:.0f} ms, candidate {candidate:.0f} ms "
+                     f"({reference / candidate:.2f}x) over {len(timed)} cases")
+        deltas = sorted(timed, key=lambda r: r["candidate_ms"] - r["reference_ms"], reverse=True)
+        if any(r["candidate_ms"] != r["reference_ms"] for r in timed):
+            for r in deltas[:top]:
+                lines.append(f"    {r['case']:<56} {r['reference_ms']:>8.1f} -> {r['candidate_ms']:>8.1f} ms "
+                             f"({r['candidate_ms'] - r['reference_ms']:+.1f})")
+    failed = sum(1 for r in rows if r["diffs"])
+    missing = sum(1 for r in rows if r["diffs"] is None)
+    lines.append(f"[PARITY] {len(rows)} cases, {failed} mismatches, {missing} without goldens")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check EM figures against the recorded goldens.")
+    parser.add_argument("--engine", default="reference",
+                        help='Candidate engine as "module:function" (default: compute_em + render_em_figure)')
+    parser.add_argument("--record", action="store_true", help="Rewrite the goldens with --engine's output")
+    parser.add_argument("--goldens", default=GOLDENS_PATH, help="Goldens file (gzipped JSON)")
+    parser.add_argument("--aircraft", nargs="+", help="Only these aircraft (default: all)")
+    parser.add_argument("--combos", nargs="+", choices=sorted(COMBOS), help="Only these combinations")
+    parser.add_argument("--repeats", type=int, default=1, help="Timed renders per case and engine (default 1)")
+    parser.add_argument("--rtol", type=float, default=RTOL, help="Relative tolerance (default %(default)s)")
+    parser.add_argument("--atol", type=float, default=ATOL, help="Absolute tolerance (default %(default)s)")
+    parser.add_argument("--no-reference-timing", action="store_true",
+                        help="Don't time the reference engine next to the candidate")
+    args = parser.parse_args(argv)
+
+    from core import aircraft_data
+
+    engine = load_engine(args.engine)
+    cases = list(iter_states(aircraft_data, args.aircraft, args.combos))
+
+    if args.record:
+        if args.aircraft or args.combos:
+            print("[PARITY] --record covers the full matrix; drop --aircraft / --combos")
+            return 2
+        write_goldens(args.goldens, record(cases, engine))
+        print(f"[PARITY] {len(cases)} goldens written to {args.goldens}")
+        return 0
+
+    goldens = load_goldens(args.goldens)
+    if goldens is None:
+        print(f"[PARITY] No goldens at {args.goldens}; run with --record")
+        return 2
+    rows = check(cases, goldens, engine, args.repeats, args.rtol, args.atol,
+                 time_reference=not args.no_reference_timing)
+    print(format_report(rows))
+    return 1 if any(r["diffs"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+# benchmarks/render_cascade.py
+
+"""
+Count update_graph executions for a page load, an aircraft selection and
+picking maneuvers.
+
+There is no browser here, so this replays the callback chain the way the
+Dash renderer runs it, against the Flask test client:
+  - the root layout and /_dash-dependencies define the components and graph;
+  - callbacks fire initially unless prevent_initial_call, when their inputs
+    (and outputs) exist; new children fire the callbacks they contain;
+  - a triggered callback waits while any other pending callback can still
+    change one of its inputs (not its state: getReadyCallbacks only checks
+    inputs), then runs once with all changed props; all ready callbacks are
+    sent together (a wave) and see the same props;
+  - every prop in a response (no_update excluded) triggers its listeners;
+  - clientside callbacks are emulated in Python (CLIENTSIDE).
+
+It is a model, not the renderer: responses within a wave are applied in
+callback order rather than arrival order.
+
+Usage:
+    python benchmarks/render_cascade.py
+    python benchmarks/render_cascade.py --aircraft "Diamond DA42-NG" --width 600 -v
+    python benchmarks/render_cascade.py --app-dir /tmp/older-checkout   # compare a revision
+"""
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GRAPH_OUTPUT = "em-graph.figure"
+NO_UPDATE = object()
+WILDCARDS = ("ALL", "MATCH", "ALLSMALLER")
+
+
+def _is_mobile(width, current):
+    mobile = width is not None and width < 768
+    return NO_UPDATE if mobile == current else mobile
+
+
+def _next_render_seq(*values):
+    current = values[-1] or {}
+    return {"session": current.get("session", "replay"), "seq": current.get("seq", 0) + 1}
+
+
+# Python versions of the app's clientside callbacks, by output; called with
+# input values then state values. `width` is bound by CascadeReplay.
+CLIENTSIDE = {
+    "screen-width.data": lambda width: (lambda pathname: width),
+    "is-mobile.data": lambda width: _is_mobile,
+    "render-seq.data": lambda width: _next_render_seq,
+}
+
+
+def _key(component_id):
+    """Component id as Dash stringifies it (dict ids as sorted compact JSON)."""
+    if isinstance(component_id, dict):
+        return json.dumps(component_id, sort_keys=True, separators=(",", ":"))
+    return component_id
+
+
+def _parse_id(raw):
+    return json.loads(raw) if raw.startswith("{") else raw
+
+
+def _split_outputs(output):
+    """'..a.x...b.y..' or 'a.x' -> [(id, property)], property may carry @hash."""
+    parts = output[2:-2].split("...") if output.startswith("..") else [output]
+    return [(_parse_id(part.rsplit(".", 1)[0]), part.rsplit(".", 1)[1]) for part in parts]
+
+
+def _matches(pattern, component_id):
+    """Does a (possibly wildcard) dict id pattern match a concrete id?"""
+    if not isinstance(pattern, dict):
+        return pattern == component_id
+    if not isinstance(component_id, dict) or set(pattern) != set(component_id):
+        return False
+    return all(isinstance(v, list) and v and v[0] in WILDCARDS or v == component_id[k]
+               for k, v in pattern.items())
+
+
+def _wildcard(pattern):
+    return isinstance(pattern, dict) and any(isinstance(v, list) for v in pattern.values())
+
+
+class Callback:
+    def __init__(self, index, dep):
+        self.index = index
+        self.output = dep["output"]
+        self.outputs = _split_outputs(dep["output"])
+        self.inputs = [(_parse_id(i["id"]), i["property"]) for i in dep["inputs"]]
+        self.state = [(_parse_id(s["id"]), s["property"]) for s in dep["state"]]
+        self.clientside = bool(dep.get("clientside_function"))
+        self.prevent_initial_call = bool(dep.get("prevent_initial_call"))
+
+    def listens_to(self, component_id, prop):
+        return any(p == prop and _matches(pattern, component_id) for pattern, p in self.inputs)
+
+    def __repr__(self):
+        return self.output
+
+
+class CascadeReplay:
+    """
+    Drive an imported app module through the renderer's callback rules.
+
+    Args:
+        app_module: The imported app (needs .app and .server)
+        width: window.innerWidth reported by the screen-width callback
+        verbose: Print each callback as it runs
+    """
+    def __init__(self, app_module, width=1400, verbose=False):
+        self.client = app_module.server.test_client()
+        self.verbose = verbose
+        self.clientside = {output: make(width) for output, make in CLIENTSIDE.items()}
+        deps = json.loads(self.client.get("/_dash-dependencies").data)
+        self.callbacks = [Callback(i, dep) for i, dep in enumerate(deps)]
+        self.props = {}     # component key -> props dict
+        self.children = {}  # component key -> keys of components inside it
+        self.pending = {}   # Callback -> set of changed prop ids
+        self.runs = []      # (callback output, updated: bool)
+        self._downstream = {cb: self._reachable(cb) for cb in self.callbacks}
+        self._touches = {cb: [(cid, prop.split("@")[0]) for other in self._downstream[cb] | {cb}
+                              for cid, prop in other.outputs] for cb in self.callbacks}
+
+        from plotly.io.json import to_json_plotly
+        self._to_json = lambda component: json.loads(to_json_plotly(component))
+        layout = app_module.app.layout
+        self._index(self._to_json(layout() if callable(layout) else layout), None)
+
+    # ---------- layout ----------
+
+    def _index(self, node, parent):
+        """Record ids and props of a serialized component tree; returns the keys added."""
+        added = []
+        if isinstance(node, list):
+            for child in node:
+                added += self._index(child, parent)
+        elif isinstance(node, dict) and "props" in node:
+            props = dict(node["props"])
+            component_id = props.get("id")
+            owner = parent
+            if component_id is not None:
+                key = _key(component_id)
+                self.props[key] = props
+                added.append(key)
+                owner = key
+            for name, value in node["props"].items():
+                if isinstance(value, (dict, list)):
+                    inner = self._index(value, owner)
+                    if component_id is not None and name == "children":
+                        self.children[_key(component_id)] = inner
+                    added += inner
+        return added
+
+    def _drop(self, key):
+        for inner in self.children.pop(key, []):
+            self.props.pop(inner, None)
+            self._drop(inner)
+
+    def _ids(self):
+        return [_parse_id(key) for key in self.props]
+
+    def _resolve(self, pattern):
+        if _wildcard(pattern):
+            return [cid for cid in self._ids() if _matches(pattern, cid)]
+        return [pattern] if _key(pattern) in self.props else []
+
+    def _value(self, component_id, prop):
+        return self.props.get(_key(component_id), {}).get(prop)
+
+    # ---------- graph ----------
+
+    def _reachable(self, start):
+        """Callbacks whose inputs start's outputs can (transitively) change."""
+        seen, stack = set(), [start]
+        while stack:
+            cb = stack.pop()
+            for component_id, prop in cb.outputs:
+                prop = prop.split("@")[0]
+                for other in self.callbacks:
+                    if other not in seen and any(
+                        p == prop and (_matches(pattern, component_id) or _matches(component_id, pattern))
+                        for pattern, p in other.inputs
+                    ):
+                        seen.add(other)
+                        stack.append(other)
+        return seen
+
+    def _waits_for(self, cb, other):
+        """Could other, or what it triggers, still change one of cb's inputs?"""
+        if other is cb or other in self._downstream[cb]:
+            return False
+        return any(p == prop and (_matches(pattern, cid) or _matches(cid, pattern))
+                   for pattern, p in cb.inputs for cid, prop in self._touches[other])
+
+    def _can_fire(self, cb):
+        inputs_ok = all(_wildcard(pattern) or self._resolve(pattern) for pattern, _ in cb.inputs)
+        outputs_ok = all(_wildcard(pattern) or self._resolve(pattern) for pattern, _ in cb.outputs)
+        return inputs_ok and outputs_ok
+
+    def _queue_initial(self, keys=None):
+        """Initial calls for the whole layout, or for callbacks touching new components."""
+        for cb in self.callbacks:
+            if cb.prevent_initial_call or not self._can_fire(cb):
+                continue
+            if keys is not None:
+                touched = [cid for pattern, _ in cb.inputs + cb.outputs for cid in self._resolve(pattern)]
+                if not any(_key(cid) in keys for cid in touched):
+                    continue
+            self.pending.setdefault(cb, set())
+
+    def _trigger(self, component_id, prop):
+        for cb in self.callbacks:
+            if cb.listens_to(component_id, prop) and self._can_fire(cb):
+                self.pending.setdefault(cb, set()).add(f"{_key(component_id)}.{prop}")
+
+    # ---------- execution ----------
+
+    def _spec(self, pattern, prop, with_value=True):
+        def one(cid):
+            spec = {"id": cid, "property": prop}
+            if with_value:
+                spec["value"] = self._value(cid, prop.split("@")[0])
+            return spec
+        if _wildcard(pattern):
+            return [one(cid) for cid in self._resolve(pattern)]
+        return one(pattern)
+
+    def _run(self, cb, changed):
+        inputs = [self._spec(p, prop) for p, prop in cb.inputs]
+        state = [self._spec(p, prop) for p, prop in cb.state]
+        if cb.clientside:
+            fn = self.clientside.get(cb.output)
+            if fn is None:
+                print(f"[WARNING] No Python version of clientside callback {cb.output}; skipped")
+                return None
+            value = fn(*(spec["value"] for spec in inputs + state))
+            (component_id, prop), = cb.outputs
+            return {} if value is NO_UPDATE else {_key(component_id): {prop: value}}
+
+        outputs = [self._spec(p, prop, with_value=False) for p, prop in cb.outputs]
+        body = {
+            "output": cb.output,
+            "outputs": outputs if len(outputs) > 1 or cb.output.startswith("..") else outputs[0],
+            "inputs": inputs,
+            "state": state,
+            "changedPropIds": sorted(changed),
+        }
+        r = self.client.post("/_dash-update-component", json=body)
+        if r.status_code == 204:  # PreventUpdate
+            return {}
+        if r.status_code != 200:
+            print(f"[WARNING] {cb.output}: HTTP {r.status_code}")
+            return {}
+        return json.loads(r.data).get("response", {})
+
+    def _apply(self, response):
+        for key, props in response.items():
+            for prop, value in props.items():
+                if prop == "children" and key in self.props:
+                    self._drop(key)
+                    self.props[key][prop] = value
+                    added = self._index(value, key)
+                    self.children[key] = added
+                    self._queue_initial(set(added))
+                else:
+                    self.props.setdefault(key, {})[prop] = value
+                self._trigger(_parse_id(key), prop)
+
+    def settle(self, max_waves=100):
+        """Run pending callbacks, a wave of ready ones at a time, until nothing is left."""
+        for _ in range(max_waves):
+            if not self.pending:
+                return
+            ready = [cb for cb in self.pending
+                     if not any(self._waits_for(cb, other) for other in self.pending)] or list(self.pending)
+            # Sent together, so every request in a wave sees the same props
+            wave = [(cb, self.pending.pop(cb)) for cb in sorted(ready, key=lambda c: c.index)]
+            responses = [(cb, changed, self._run(cb, changed)) for cb, changed in wave]
+            for cb, changed, response in responses:
+                if response is None:
+                    continue
+                if GRAPH_OUTPUT in cb.output:
+                    self.runs.append((cb.output, "em-graph" in response))
+                if self.verbose:
+                    print(f"  {cb.output[:70]:<70} {sorted(changed)[:3]} -> {sorted(response)[:4]}")
+                self._apply(response)
+        raise RuntimeError("Callbacks did not settle")
+
+    def load(self, pathname="/"):
+        """Page load: Location reports the path, then initial callbacks run."""
+        self.props.setdefault("url", {}).update({"pathname": pathname, "search": "", "hash": ""})
+        self._queue_initial()
+        self.settle()
+
+    def set_prop(self, component_id, prop, value):
+        """A user interaction (e.g. picking an aircraft)."""
+        self.props.setdefault(_key(component_id), {})[prop] = value
+        self._trigger(component_id, prop)
+        self.settle()
+
+    def graph_counts(self):
+        """(update_graph executions, of which returned a figure) since the last reset."""
+        return len(self.runs), sum(1 for _, updated in self.runs if updated)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count update_graph runs per page load / selection.")
+    parser.add_argument("--aircraft", default="Cessna 172S", help="Aircraft selected after the load")
+    parser.add_argument("--then", help="A second aircraft selected afterwards")
+    parser.add_argument("--maneuvers", default="steep_turn,chandelle",
+                        help="Maneuvers picked in turn after the selections (comma-separated, default %(default)s)")
+    parser.add_argument("--width", type=int, default=1400, help="Reported window width (default 1400)")
+    parser.add_argument("--app-dir", default=ROOT, help="Checkout whose app.py to drive (default: this one)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print each callback as it runs")
+    args = parser.parse_args(argv)
+
+    os.chdir(args.app_dir)
+    sys.path.insert(0, args.app_dir)
+    import app as app_module
+
+    replay = CascadeReplay(app_module, args.width, args.verbose)
+    steps = [("page load", lambda: replay.load("/")),
+             (f"select {args.aircraft}", lambda: replay.set_prop("aircraft-select", "value", args.aircraft))]
+    if args.then:
+        steps.append((f"select {args.then}", lambda: replay.set_prop("aircraft-select", "value", args.then)))
+    for maneuver in filter(None, args.maneuvers.split(",")):
+        steps.append((f"maneuver {maneuver}",
+                      lambda m=maneuver: replay.set_prop("maneuver-select", "value", m)))
+    for label, step in steps:
+        replay.runs = []
+        step()
+        runs, rendered = replay.graph_counts()
+        print(f"[CASCADE] {label}: update_graph ran {runs}x, sent a figure {rendered}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
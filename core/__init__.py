@@ -6,6 +6,7 @@ Core module containing physics calculations, constants, and data loading.
 
 from .constants import (
     DEBUG_LOG,
+    LOG_LEVEL,
     DEFAULT_PASSENGER_WEIGHT,
     DEFAULT_FUEL_WEIGHT_PER_GAL,
     DEFAULT_POWER_SETTING,
@@ -25,6 +26,17 @@ from .constants import (
     CHANDELLE_DEFAULT_BANK,
     CHANDELLE_DEFAULT_IAS,
     PROP_DRAG_FACTORS,
+    FIGURE_CACHE_MAX_ENTRIES,
+    EXPORT_CACHE_MAX_BYTES,
+    ENVELOPE_CACHE_MAX_ENTRIES,
+    LAYOUT_CACHE_MAX_ENTRIES,
+    AIRCRAFT_UI_CACHE_MAX_ENTRIES,
+    RENDER_SEQUENCER_MAX_SESSIONS,
+    DRAG_UPDATES_PER_SECOND,
+    ENVELOPE_API_MAX_AGE,
+    AIRCRAFT_RELOAD_INTERVAL,
+    AIRPORT_SEARCH_LIMIT,
+    PERF_TRACE_ENABLED,
 )
 
 from .calculations import (
@@ -54,16 +66,70 @@ from .calculations import (
     compute_stall_ias_at_turn_rate,
 )
 
+from .cache import (
+    LRUCache,
+    state_hash,
+)
+
+from .export_cache import ExportCache
+
+from .sequencing import RenderSequencer
+
+from .log import DEBUG, INFO, WARNING, ERROR, Logger, get_logger, set_level
+
+from .perf import PERF_TRACES, Trace, TraceBuffer, annotate, span, stage, trace
+
+from .metrics import (
+    MetricsRegistry,
+    DEFAULT_BYTES_BUCKETS,
+    DEFAULT_LATENCY_BUCKETS,
+    process_rss_bytes,
+)
+
+from .catalog import (
+    AircraftCatalog,
+    load_catalog,
+    write_aircraft_file,
+)
+
+from .aircraft_model import (
+    AircraftModel,
+    EngineModel,
+)
+
 from .aircraft_loader import (
+    AIRCRAFT_CATALOG,
     AIRCRAFT_DATA,
+    AIRCRAFT_ARRAYS,
     aircraft_data,
     load_aircraft_data_from_folder,
+    load_aircraft_catalog,
     extract_vmca_value,
     resource_path,
     DynamicAircraftData,
     dprint,
     # Airport data
-    AIRPORT_DATA,
-    AIRPORT_OPTIONS,
+    AIRPORT_INDEX,
     get_airport_by_id,
 )
+
+from .airports import AirportIndex, LazyAirportIndex
+
+from .hot_reload import AircraftReloader
+
+from .multi_engine import (
+    calculate_vmca,
+    calculate_dynamic_vyse,
+)
+
+from .em import (
+    EM_STATE_FIELDS,
+    EMInputError,
+    EMResult,
+    compute_em,
+    default_state,
+    parse_state_params,
+    resolve_state,
+    validate_state,
+    write_npz,
+)
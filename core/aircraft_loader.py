@@ -9,12 +9,20 @@ access to the cached data.
 import os
 import json
 import sys
-from .constants import DEBUG_LOG
+from .catalog import AircraftCatalog, load_catalog, normalize_arrays
+from .aircraft_model import AircraftModel
+from .cache import state_hash
+from .airports import AirportIndex, LazyAirportIndex, load_airport_index
+from .log import DEBUG, get_level, get_logger
 
 
 def dprint(*args, **kwargs):
-    """Debug print that can be globally toggled."""
-    if DEBUG_LOG:
+    """
+    Debug print that can be globally toggled.
+
+    Arguments are built before the check; in hot paths use core.log instead.
+    """
+    if get_level() <= DEBUG:
         print(*args, **kwargs)
 
 
@@ -59,6 +67,33 @@ def load_aircraft_data_from_folder(folder_name="aircraft_data"):
     return aircraft_data
 
 
+def load_aircraft_catalog(folder_name="aircraft_data", catalog_path=None):
+    """
+    Load aircraft data through the compiled catalog (see core.catalog).
+
+    Same data as load_aircraft_data_from_folder(), but JSON files are only
+    parsed when they changed since the catalog was last built.
+
+    Args:
+        folder_name: Name of the folder containing aircraft JSON files
+        catalog_path: Bundle file (default: .cache/aircraft_catalog.pkl)
+
+    Returns:
+        AircraftCatalog
+    """
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    folder_path = os.path.join(base_dir, folder_name)
+
+    if not os.path.exists(folder_path):
+        print(f"[WARNING] Aircraft data folder not found: {folder_path}")
+        return AircraftCatalog(folder=folder_path)
+
+    catalog = load_catalog(folder_path, catalog_path)
+    for filename, message in catalog.errors:
+        dprint(f"[ERROR] Failed to load {filename}: {message}")
+    return catalog
+
+
 def extract_vmca_value(ac, preferred="clean_up"):
     """
     Extract Vmca value from aircraft data with preference handling.
@@ -76,42 +111,115 @@ def extract_vmca_value(ac, preferred="clean_up"):
     return vmca if isinstance(vmca, (int, float)) else None
 
 
+class _AircraftSnapshot:
+    """One consistent generation of aircraft data, arrays and derived models."""
+    __slots__ = ("data", "arrays", "models", "revisions", "version")
+
+    def __init__(self, data, arrays, version=None):
+        self.data = data
+        self.arrays = arrays
+        self.models = {}
+        self.revisions = {}
+        self.version = version
+
+
 class DynamicAircraftData:
     """
     Wrapper around the boot-time AIRCRAFT_DATA dict.
     Provides dict-like access without disk I/O on access.
+
+    Item access returns the raw JSON dicts (editor, dcc.Store); physics code
+    uses get_model() for the resolved AircraftModel.
+
+    replace() swaps in a freshly loaded catalog as a single attribute
+    assignment, so a request never sees one aircraft's data next to another
+    generation's arrays or models.
     """
-    def __init__(self, data_dict):
-        self._data = data_dict
+    def __init__(self, data_dict, arrays=None, version=None):
+        self._snapshot = _AircraftSnapshot(data_dict, arrays if arrays is not None else {}, version)
 
     def __getitem__(self, key):
-        return self._data[key]
+        return self._snapshot.data[key]
 
     def get(self, key, default=None):
-        return self._data.get(key, default)
+        return self._snapshot.data.get(key, default)
 
     def __contains__(self, key):
-        return key in self._data
+        return key in self._snapshot.data
 
     def keys(self):
-        return self._data.keys()
+        return self._snapshot.data.keys()
 
     def values(self):
-        return self._data.values()
+        return self._snapshot.data.values()
 
     def items(self):
-        return self._data.items()
+        return self._snapshot.data.items()
 
     def __len__(self):
-        return len(self._data)
+        return len(self._snapshot.data)
+
+    @property
+    def version(self):
+        """Catalog version of the current data (None after runtime edits)."""
+        return self._snapshot.version
 
     def update_aircraft(self, name, data):
         """Update or add aircraft data (for runtime additions)."""
-        self._data[name] = data
+        snapshot = self._snapshot
+        snapshot.data[name] = data
+        snapshot.arrays[name] = normalize_arrays(data)
+        snapshot.models.pop(name, None)
+        snapshot.revisions.pop(name, None)
+        snapshot.version = None
+
+    def replace(self, data_dict, arrays, version=None, changed=None):
+        """
+        Atomically switch to a new generation of aircraft data.
+
+        Args:
+            data_dict: name -> raw JSON dict
+            arrays: name -> normalize_arrays() tables
+            version: Catalog version of the new data
+            changed: Names whose data changed; models of all other aircraft
+                are carried over (None rebuilds everything lazily)
+        """
+        old = self._snapshot
+        snapshot = _AircraftSnapshot(data_dict, arrays, version)
+        if changed is not None:
+            for name, model in old.models.items():
+                if name not in changed and name in data_dict:
+                    snapshot.models[name] = model
+            for name, revision in old.revisions.items():
+                if name not in changed and name in data_dict:
+                    snapshot.revisions[name] = revision
+        self._snapshot = snapshot
 
     def get_raw_dict(self):
         """Get the underlying dict (for dcc.Store)."""
-        return self._data
+        return self._snapshot.data
+
+    def get_arrays(self, name):
+        """Pre-normalized numeric tables for an aircraft (see core.catalog), or None."""
+        return self._snapshot.arrays.get(name)
+
+    def get_model(self, name):
+        """AircraftModel for an aircraft, built on first use and then reused."""
+        snapshot = self._snapshot
+        model = snapshot.models.get(name)
+        if model is None:
+            model = AircraftModel.from_dict(name, snapshot.data[name], snapshot.arrays.get(name))
+            snapshot.models[name] = model
+        return model
+
+    def revision(self, name):
+        """Content hash of one aircraft's data; changes whenever it is edited."""
+        snapshot = self._snapshot
+        revision = snapshot.revisions.get(name)
+        if revision is None:
+            revision = state_hash(snapshot.data[name])
+            snapshot.revisions[name] = revision
+        return revision
 
 
 # =============================================================================
@@ -162,12 +270,14 @@ def get_airport_by_id(airports, airport_id):
     Find airport by ID.
 
     Args:
-        airports: List of airport dicts
+        airports: AirportIndex (O(1) lookup) or list of airport dicts
         airport_id: Airport identifier (e.g., "KJFK")
 
     Returns:
         Airport dict or None
     """
+    if isinstance(airports, AirportIndex):
+        return airports.get(airport_id)
     for ap in airports:
         if ap["id"] == airport_id:
             return ap
@@ -177,14 +287,28 @@ def get_airport_by_id(airports, airport_id):
 # =============================================================================
 # BOOT-TIME LOADING
 # =============================================================================
-print("[BOOT] Loading aircraft data from folder once...")
-AIRCRAFT_DATA = load_aircraft_data_from_folder()
-print(f"[BOOT] Loaded {len(AIRCRAFT_DATA)} aircraft")
+# The aircraft catalog is one read of the compiled bundle and every page
+# needs it, so it loads at import (under gunicorn --preload, once before
+# fork). Airports load on the first lookup. Boot messages are INFO level.
+_boot_log = get_logger("boot")
+
+AIRCRAFT_CATALOG = load_aircraft_catalog()
+AIRCRAFT_DATA = AIRCRAFT_CATALOG.aircraft
+AIRCRAFT_ARRAYS = AIRCRAFT_CATALOG.arrays
+_boot_log.info("Loaded %d aircraft (%d files parsed)", len(AIRCRAFT_DATA), len(AIRCRAFT_CATALOG.reparsed))
+
+
+def _load_boot_airports():
+    index = load_airport_index(
+        load_airport_data,
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "airports", "airports.json"),
+        os.environ.get("AIRPORT_COLUMNAR_DIR"),
+    )
+    _boot_log.info("Loaded %d airports", len(index))
+    return index
+
 
-print("[BOOT] Loading airport data...")
-AIRPORT_DATA = load_airport_data()
-AIRPORT_OPTIONS = get_airport_options(AIRPORT_DATA)
-print(f"[BOOT] Loaded {len(AIRPORT_DATA)} airports")
+AIRPORT_INDEX = LazyAirportIndex(_load_boot_airports)
 
 # Create the dynamic wrapper
-aircraft_data = DynamicAircraftData(AIRCRAFT_DATA)
+aircraft_data = DynamicAircraftData(AIRCRAFT_DATA, AIRCRAFT_ARRAYS, AIRCRAFT_CATALOG.version())
@@ -0,0 +1,176 @@
+# core/aircraft_model.py
+
+"""
+Typed, read-only view of one aircraft for the physics code.
+
+AircraftModel is built once per aircraft at load time. It resolves the nested
+JSON (G limits per category/config, thrust decay, single-engine speeds, stall
+tables) into flat attributes, so hot paths such as compute_em's grids do
+plain attribute reads instead of chained dict lookups. The raw JSON dicts are
+kept by DynamicAircraftData for the editor.
+"""
+
+from dataclasses import dataclass, field
+from math import pi
+from typing import Optional
+
+import numpy as np
+
+from .catalog import normalize_arrays
+
+# Fallbacks used when a field is missing from the aircraft JSON
+DEFAULT_G_LIMITS = (3.8, 1.5)          # (positive, |negative|)
+DEFAULT_STALL_SPEED = 30               # kts, no stall table for the config
+DEFAULT_VNE = 200
+DEFAULT_VFE = 120
+DEFAULT_T_STATIC_FACTOR = 2.6
+DEFAULT_V_MAX_KTS = 160
+
+
+@dataclass(slots=True, frozen=True)
+class EngineModel:
+    """One engine option with its altitude power curve resolved."""
+    name: str
+    horsepower: float
+    sea_level_max: float
+    max_altitude: float
+    derate_per_1000ft: float
+    oei_performance: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, name, data):
+        power_curve = data.get("power_curve", {})
+        return cls(
+            name=name,
+            horsepower=data["horsepower"],
+            sea_level_max=power_curve.get("sea_level_max", data["horsepower"]),
+            max_altitude=power_curve.get("max_altitude", 12000),
+            derate_per_1000ft=power_curve.get("derate_per_1000ft", 0.03),
+            oei_performance=data.get("oei_performance", {}),
+        )
+
+
+def _resolve_g_block(block):
+    """(positive, |negative|) for one G_limits[category][config] entry."""
+    if isinstance(block, dict):
+        neg = block.get("negative", -1.5)
+        return (block.get("positive", 3.8), abs(neg) if isinstance(neg, (int, float)) else 1.5)
+    if isinstance(block, (int, float)):
+        return (block, 1.5)
+    return DEFAULT_G_LIMITS
+
+
+def _resolve_speed(block, default):
+    """Single-engine speed stored as a number or as {"clean_up": ..., ...}."""
+    if isinstance(block, dict):
+        return block.get("clean_up") or next(iter(block.values()), default)
+    return block if isinstance(block, (int, float)) else default
+
+
+@dataclass(slots=True, frozen=True)
+class AircraftModel:
+    """Resolved aircraft parameters (speeds in KIAS, weights in lbs)."""
+    name: str
+    engine_count: int
+    wing_area: float
+    aspect_ratio: float
+    CD0: float
+    e: float
+    pi_ar_e: float                      # π·AR·e, induced drag denominator
+    configs: tuple
+    cl_max: dict                        # config -> CL_max
+    stall_tables: dict                  # config -> (weights, speeds) arrays
+    g_limits: dict                      # (category, config) -> (positive, |negative|)
+    categories: tuple
+    vne: float
+    vfe: dict
+    empty_weight: float
+    max_weight: float
+    cg_range: tuple
+    seats: int
+    fuel_capacity_gal: float
+    fuel_weight_per_gal: float
+    gear_type: Optional[str]
+    t_static_factor: float
+    v_max_kts: float
+    vmca: Optional[float]               # published, resolved like extract_vmca_value
+    vyse: float
+    vxse: Optional[float]
+    engines: dict                       # name -> EngineModel
+
+    @classmethod
+    def from_dict(cls, name, ac, arrays=None):
+        """
+        Build a model from raw aircraft JSON.
+
+        Args:
+            name: Aircraft name
+            ac: Raw aircraft data dict
+            arrays: Pre-normalized tables from the catalog (computed if omitted)
+        """
+        arrays = arrays if arrays is not None else normalize_arrays(ac)
+        raw_stall = ac.get("stall_speeds", {})
+        g_limits = {
+            (category, config): _resolve_g_block(block)
+            for category, per_config in ac.get("G_limits", {}).items()
+            for config, block in per_config.items()
+        }
+        thrust = ac.get("prop_thrust_decay", {})
+        limits = ac.get("single_engine_limits", {})
+        AR = ac.get("aspect_ratio", 7.5)
+        e = ac.get("e", 0.8)
+        return cls(
+            name=name,
+            engine_count=ac.get("engine_count", 1),
+            wing_area=ac.get("wing_area"),
+            aspect_ratio=AR,
+            CD0=ac.get("CD0", 0.025),
+            e=e,
+            pi_ar_e=pi * e * AR,
+            configs=tuple(ac.get("configuration_options", {}).get("flaps", [])),
+            cl_max=dict(ac.get("CL_max", {})),
+            # Empty tables fall back like a missing table does
+            stall_tables={c: t for c, t in arrays["stall_speeds"].items() if raw_stall.get(c)},
+            g_limits=g_limits,
+            categories=tuple(ac.get("G_limits", {}).keys()),
+            vne=ac.get("Vne", DEFAULT_VNE),
+            vfe=dict(ac.get("Vfe", {})),
+            empty_weight=ac.get("empty_weight"),
+            max_weight=ac.get("max_weight", 3600),
+            cg_range=tuple(ac.get("cg_range", [10, 20])),
+            seats=ac.get("seats", 2),
+            fuel_capacity_gal=ac.get("fuel_capacity_gal"),
+            fuel_weight_per_gal=ac.get("fuel_weight_per_gal", 6.0),
+            gear_type=ac.get("gear_type"),
+            t_static_factor=thrust.get("T_static_factor", DEFAULT_T_STATIC_FACTOR),
+            v_max_kts=thrust.get("V_max_kts", DEFAULT_V_MAX_KTS),
+            vmca=_resolve_speed(limits.get("Vmca", {}), None),
+            vyse=_resolve_speed(limits.get("Vyse", {}), 100),
+            vxse=_resolve_speed(limits.get("Vxse", {}), None),
+            engines={en: EngineModel.from_dict(en, data) for en, data in ac.get("engine_options", {}).items()},
+        )
+
+    def g_limit(self, category, config):
+        """(positive, |negative|) G limits; defaults when not listed."""
+        return self.g_limits.get((category, config), DEFAULT_G_LIMITS)
+
+    def stall_speed(self, config, weight):
+        """
+        1-G stall speed (KIAS) at a weight, interpolated from the stall table.
+
+        Matches interpolate_stall_speed(), with DEFAULT_STALL_SPEED when the
+        config has no table.
+        """
+        table = self.stall_tables.get(config)
+        if table is None:
+            return DEFAULT_STALL_SPEED
+        weights, speeds = table
+        if not len(weights) or len(weights) != len(speeds):
+            return speeds[0] if len(speeds) else 50.0
+        return float(np.interp(weight, weights, speeds))
+
+    def max_speed(self, config):
+        """(max speed KIAS, label): Vne clean, else Vfe for the flap config."""
+        if config == "clean":
+            return self.vne, "Vne"
+        return self.vfe.get(config, DEFAULT_VFE), f"Vfe ({config})"
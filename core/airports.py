@@ -0,0 +1,257 @@
+# core/airports.py
+
+"""
+Indexed airport store.
+
+AirportIndex keeps airports as parallel columns with:
+  - a dict from ID to row for O(1) lookups,
+  - a sorted ID list for prefix search (bisect),
+  - a trigram index over IDs and names for substring search.
+
+search() returns at most `limit` matches, so the airport dropdown can filter
+server-side and only ever ship a screenful of options.
+
+For large datasets the columns can be saved as .npy files and loaded on
+later boots (save_columnar / from_columnar), which skips parsing the JSON.
+Only the numeric columns stay memory-mapped: the ID/name strings and the
+lookup, prefix and trigram indices are rebuilt as Python objects in the
+loading process. Workers share them by loading the index before gunicorn
+forks (see gunicorn.conf.py), not through the .npy pages.
+
+LazyAirportIndex defers all of that to the first lookup, so importing core
+(scripts, tests, the CLI) never touches the airport files.
+"""
+
+import bisect
+import os
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+from .constants import AIRPORT_SEARCH_LIMIT
+
+COLUMNAR_FIELDS = ("id", "name", "elevation_ft", "lat", "lon")
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def airport_label(airport_id, name, elevation_ft):
+    """Dropdown label: "ICAO - Name (elev ft)"."""
+    return f"{airport_id} - {name} ({elevation_ft} ft)"
+
+
+class AirportIndex:
+    """
+    Read-only airport lookup and search.
+
+    Args:
+        ids, names: Sequences of str
+        elevation_ft, lat, lon: Numeric sequences (lists or NumPy arrays)
+    """
+    def __init__(self, ids, names, elevation_ft, lat, lon):
+        self._ids = [str(i) for i in ids]
+        self._names = [str(n) for n in names]
+        self._elevation = elevation_ft
+        self._lat = lat
+        self._lon = lon
+
+        self._row = {}
+        for row, airport_id in enumerate(self._ids):
+            self._row.setdefault(airport_id.upper(), row)
+
+        # (upper ID, row) sorted for bisect prefix search
+        self._sorted_ids = sorted((airport_id.upper(), row) for row, airport_id in enumerate(self._ids))
+        self._sorted_keys = [key for key, _ in self._sorted_ids]
+
+        self._trigram_rows = defaultdict(list)
+        for row, (airport_id, name) in enumerate(zip(self._ids, self._names)):
+            for gram in _trigrams(f"{airport_id} {name}".upper()):
+                self._trigram_rows[gram].append(row)
+
+    @classmethod
+    def from_records(cls, airports):
+        """Build from a list of {"id", "name", "elevation_ft", "lat", "lon"} dicts."""
+        return cls(
+            [ap["id"] for ap in airports],
+            [ap.get("name", "") for ap in airports],
+            [ap.get("elevation_ft", 0) for ap in airports],
+            [ap.get("lat") for ap in airports],
+            [ap.get("lon") for ap in airports],
+        )
+
+    @classmethod
+    def from_columnar(cls, directory, mmap=True):
+        """
+        Load columns written by save_columnar(). With mmap, the numeric
+        columns are memory-mapped; IDs and names are decoded into lists.
+        """
+        mode = "r" if mmap else None
+        columns = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+            for name in COLUMNAR_FIELDS
+        }
+        return cls(
+            np.char.decode(columns["id"], "utf-8"),
+            np.char.decode(columns["name"], "utf-8"),
+            columns["elevation_ft"], columns["lat"], columns["lon"],
+        )
+
+    def save_columnar(self, directory):
+        """Write one .npy file per column (strings as fixed-width UTF-8)."""
+        os.makedirs(directory, exist_ok=True)
+        columns = {
+            "id": np.char.encode(np.asarray(self._ids, dtype=str), "utf-8"),
+            "name": np.char.encode(np.asarray(self._names, dtype=str), "utf-8"),
+            "elevation_ft": np.asarray(self._elevation, dtype=float),
+            "lat": np.asarray([np.nan if v is None else v for v in self._lat], dtype=float),
+            "lon": np.asarray([np.nan if v is None else v for v in self._lon], dtype=float),
+        }
+        for name, values in columns.items():
+            np.save(os.path.join(directory, f"{name}.npy"), values)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, airport_id):
+        return bool(airport_id) and airport_id.upper() in self._row
+
+    def _record(self, row):
+        elevation = self._elevation[row] or 0
+        lat, lon = self._lat[row], self._lon[row]
+        return {
+            "id": self._ids[row],
+            "name": self._names[row],
+            "elevation_ft": int(elevation) if float(elevation).is_integer() else float(elevation),
+            "lat": None if lat is None or np.isnan(lat) else float(lat),
+            "lon": None if lon is None or np.isnan(lon) else float(lon),
+        }
+
+    def get(self, airport_id):
+        """Airport dict for an ID (case-insensitive), or None."""
+        if not airport_id:
+            return None
+        row = self._row.get(airport_id.upper())
+        return None if row is None else self._record(row)
+
+    def _prefix_rows(self, prefix):
+        start = bisect.bisect_left(self._sorted_keys, prefix)
+        for i in range(start, len(self._sorted_ids)):
+            key, row = self._sorted_ids[i]
+            if not key.startswith(prefix):
+                break
+            yield row
+
+    def _substring_rows(self, query):
+        grams = _trigrams(query)
+        if grams:
+            postings = sorted((self._trigram_rows.get(g, ()) for g in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            rows = sorted(candidates)
+        else:
+            rows = range(len(self._ids))
+        for row in rows:
+            if query in f"{self._ids[row]} {self._names[row]}".upper():
+                yield row
+
+    def search(self, query, limit=AIRPORT_SEARCH_LIMIT):
+        """
+        Find airports by ID prefix, then by ID/name substring.
+
+        Args:
+            query: Text typed into the dropdown
+            limit: Maximum number of rows returned
+
+        Returns:
+            List of airport dicts, exact ID match first
+        """
+        query = (query or "").strip().upper()
+        if not query:
+            return []
+        rows, seen = [], set()
+        for source in (self._prefix_rows(query), self._substring_rows(query)):
+            for row in source:
+                if row not in seen:
+                    seen.add(row)
+                    rows.append(row)
+                    if len(rows) >= limit:
+                        return [self._record(r) for r in rows]
+        return [self._record(r) for r in rows]
+
+    def options(self, airports):
+        """Dropdown options for a list of airport dicts."""
+        return [
+            {"label": airport_label(ap["id"], ap["name"], ap["elevation_ft"]), "value": ap["id"]}
+            for ap in airports
+        ]
+
+    def search_options(self, query, selected=None, limit=AIRPORT_SEARCH_LIMIT):
+        """
+        Options for a dropdown search, always keeping the selected airport
+        so Dash can still render its label.
+        """
+        matches = self.search(query, limit)
+        selected_ap = self.get(selected)
+        if selected_ap and all(ap["id"] != selected_ap["id"] for ap in matches):
+            matches = [selected_ap] + matches
+        return self.options(matches)
+
+
+class LazyAirportIndex(AirportIndex):
+    """
+    AirportIndex built on first use.
+
+    Args:
+        loader: Zero-argument callable returning an AirportIndex
+    """
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def load(self):
+        """Build the index now (e.g. before gunicorn forks); idempotent."""
+        with self._lock:
+            if not self.loaded:
+                self.__dict__.update(self._loader().__dict__)
+                self.loaded = True
+        return self
+
+    def __getattr__(self, name):
+        # Only reached for the index columns, which exist once loaded
+        if name.startswith("__") or self.__dict__.get("loaded", True):
+            raise AttributeError(name)
+        self.load()
+        return getattr(self, name)
+
+
+def load_airport_index(records_loader, json_path, columnar_dir=None):
+    """
+    Build the airport index, preferring the columnar copy over the JSON.
+
+    Args:
+        records_loader: Callable returning the airport list from json_path
+        json_path: Source airports JSON file
+        columnar_dir: Optional directory of .npy columns; used when it is
+            newer than the JSON, otherwise (re)written from it
+
+    Returns:
+        AirportIndex
+    """
+    if columnar_dir:
+        marker = os.path.join(columnar_dir, "id.npy")
+        try:
+            if os.path.getmtime(marker) >= os.path.getmtime(json_path):
+                return AirportIndex.from_columnar(columnar_dir)
+        except (OSError, ValueError):
+            pass
+
+    index = AirportIndex.from_records(records_loader())
+    if columnar_dir and len(index):
+        try:
+            index.save_columnar(columnar_dir)
+        except OSError as e:
+            print(f"[WARNING] Could not write airport columns to {columnar_dir}: {e}")
+    return index
@@ -0,0 +1,88 @@
+# core/cache.py
+
+"""
+In-process caching helpers.
+Provides a small thread-safe LRU cache and a stable hash for flight states,
+so callbacks can hand the browser a compact key instead of a full payload.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+def state_hash(state):
+    """
+    Compute a short, stable hash of a JSON-serializable state dict.
+
+    Args:
+        state: Dict of callback inputs (values must be JSON-serializable)
+
+    Returns:
+        16-character hex digest
+    """
+    payload = json.dumps(state, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe least-recently-used cache.
+
+    Each worker process keeps its own instance; a miss is always recoverable
+    by recomputing the value from the state that produced the key.
+
+    Entries can carry a tag (e.g. the aircraft name) so everything derived
+    from one input can be dropped with invalidate(tag).
+    """
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, tag=None):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if tag is not None:
+                self._tags[key] = tag
+            else:
+                self._tags.pop(key, None)
+            while len(self._data) > self.max_entries:
+                old_key, _ = self._data.popitem(last=False)
+                self._tags.pop(old_key, None)
+
+    def invalidate(self, tag):
+        """Drop every entry stored with this tag; returns how many were dropped."""
+        with self._lock:
+            keys = [key for key, t in self._tags.items() if t == tag]
+            for key in keys:
+                del self._data[key]
+                del self._tags[key]
+            return len(keys)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
@@ -0,0 +1,230 @@
+# core/catalog.py
+
+"""
+Compiled aircraft catalog.
+
+All aircraft JSON files are parsed once into a single pickle bundle, with a
+manifest of each file's mtime, size and content hash. Later boots stat the
+folder and, if nothing changed, load the whole catalog with one read. When
+files do change, only those files are re-read and re-parsed.
+
+The bundle also carries pre-normalized NumPy arrays (stall tables, CG range,
+CL_max per config) so consumers never re-convert list data at request time.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+
+import numpy as np
+
+CATALOG_FORMAT = 1  # bump when the bundle layout or normalization changes
+
+
+def default_catalog_path(folder_path):
+    """
+    Bundle location, overridable with the AIRCRAFT_CATALOG_PATH env var.
+
+    Defaults to a .cache directory next to the aircraft folder (not a shared
+    temp dir, since the bundle is unpickled at boot).
+    """
+    return os.environ.get(
+        "AIRCRAFT_CATALOG_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(folder_path)), ".cache", "aircraft_catalog.pkl"),
+    )
+
+
+def aircraft_name_from_filename(filename):
+    return os.path.splitext(filename)[0].replace("_", " ")
+
+
+def scan_folder(folder_path):
+    """Return {filename: (mtime_ns, size)} for every .json file, in directory order."""
+    stats = {}
+    for entry in os.scandir(folder_path):
+        if entry.name.endswith(".json") and entry.is_file():
+            st = entry.stat()
+            stats[entry.name] = (st.st_mtime_ns, st.st_size)
+    return stats
+
+
+def normalize_arrays(data):
+    """
+    Pre-normalize the numeric tables of one aircraft.
+
+    Returns:
+        Dict with "stall_speeds" {config: (weights, speeds)} float arrays
+        sorted by weight, "cg_range" array and "CL_max" {config: float}
+    """
+    arrays = {"stall_speeds": {}, "CL_max": {}}
+    for config, table in (data.get("stall_speeds") or {}).items():
+        weights = np.asarray(table.get("weights", []), dtype=float)
+        speeds = np.asarray(table.get("speeds", []), dtype=float)
+        if len(weights) == len(speeds) and len(weights) > 1:
+            order = np.argsort(weights, kind="stable")
+            weights, speeds = weights[order], speeds[order]
+        arrays["stall_speeds"][config] = (weights, speeds)
+    for config, value in (data.get("CL_max") or {}).items():
+        if isinstance(value, (int, float)):
+            arrays["CL_max"][config] = float(value)
+    if "cg_range" in data:
+        arrays["cg_range"] = np.asarray(data["cg_range"], dtype=float)
+    return arrays
+
+
+@dataclass
+class AircraftCatalog:
+    """Parsed aircraft files plus the manifest they were built from."""
+    folder: str
+    aircraft: dict = field(default_factory=dict)   # name -> raw JSON dict
+    arrays: dict = field(default_factory=dict)     # name -> normalize_arrays()
+    manifest: dict = field(default_factory=dict)   # filename -> {mtime_ns, size, sha256, name}
+    errors: list = field(default_factory=list)     # (filename, message) for files that failed to parse
+    reparsed: list = field(default_factory=list)   # filenames parsed during this load
+
+    def version(self):
+        """Short hash of the manifest; changes whenever any file's content does."""
+        digest = hashlib.sha256()
+        for filename in sorted(self.manifest):
+            digest.update(f"{filename}:{self.manifest[filename]['sha256']};".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+
+def _read_bundle(catalog_path, folder_path):
+    try:
+        with open(catalog_path, "rb") as f:
+            bundle = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(bundle, dict) or bundle.get("format") != CATALOG_FORMAT:
+        return None
+    if bundle.get("folder") != os.path.abspath(folder_path):
+        return None
+    return bundle
+
+
+def _write_bundle(catalog_path, catalog):
+    bundle = {
+        "format": CATALOG_FORMAT,
+        "folder": catalog.folder,
+        "aircraft": catalog.aircraft,
+        "arrays": catalog.arrays,
+        "manifest": catalog.manifest,
+    }
+    directory = os.path.dirname(catalog_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, catalog_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _file_mode():
+    """Mode a plain open() would give a new file (0666 minus the umask)."""
+    umask = os.umask(0)  # only readable by setting it
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Read at import, before server threads start: os.umask() is process-wide
+AIRCRAFT_FILE_MODE = _file_mode()
+
+
+def write_aircraft_file(path, data):
+    """
+    Write one aircraft JSON file atomically, so the reload pollers never
+    read a partial file. The file gets the usual umask-derived mode (not
+    mkstemp's 0600), and the temp file is removed if anything fails.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            os.fchmod(f.fileno(), AIRCRAFT_FILE_MODE)
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_catalog(folder_path, catalog_path=None, previous=None):
+    """
+    Load the aircraft catalog, re-parsing only files that changed.
+
+    Args:
+        folder_path: Folder of aircraft JSON files
+        catalog_path: Bundle file (default: default_catalog_path())
+        previous: An AircraftCatalog already in memory to diff against
+            instead of reading the bundle from disk
+
+    Returns:
+        AircraftCatalog
+    """
+    folder_path = os.path.abspath(folder_path)
+    catalog_path = catalog_path or default_catalog_path(folder_path)
+    stats = scan_folder(folder_path)
+
+    if previous is not None:
+        old = {"aircraft": previous.aircraft, "arrays": previous.arrays, "manifest": previous.manifest}
+    else:
+        old = _read_bundle(catalog_path, folder_path) or {"aircraft": {}, "arrays": {}, "manifest": {}}
+    old_manifest = old["manifest"]
+
+    catalog = AircraftCatalog(folder=folder_path)
+    changed = set(stats) != set(old_manifest)
+
+    for filename, (mtime_ns, size) in stats.items():
+        entry = old_manifest.get(filename)
+        name = aircraft_name_from_filename(filename)
+        if entry and (entry["mtime_ns"], entry["size"]) == (mtime_ns, size):
+            catalog.manifest[filename] = entry
+            if entry["name"] is not None:
+                catalog.aircraft[name] = old["aircraft"][name]
+                catalog.arrays[name] = old["arrays"][name]
+            else:
+                catalog.errors.append((filename, entry.get("error", "parse error")))
+            continue
+
+        changed = True
+        path = os.path.join(folder_path, filename)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError as e:
+            catalog.errors.append((filename, str(e)))
+            continue
+        sha = hashlib.sha256(raw).hexdigest()
+        new_entry = {"mtime_ns": mtime_ns, "size": size, "sha256": sha, "name": name}
+
+        if entry and entry["sha256"] == sha and entry["name"] is not None:
+            # Touched but identical content: keep the parsed data
+            catalog.aircraft[name] = old["aircraft"][name]
+            catalog.arrays[name] = old["arrays"][name]
+        else:
+            catalog.reparsed.append(filename)
+            try:
+                data = json.loads(raw.decode("utf-8"))
+                catalog.aircraft[name] = data
+                catalog.arrays[name] = normalize_arrays(data)
+            except Exception as e:
+                new_entry["name"] = None
+                new_entry["error"] = str(e)
+                catalog.errors.append((filename, str(e)))
+        catalog.manifest[filename] = new_entry
+
+    if changed:
+        try:
+            _write_bundle(catalog_path, catalog)
+        except OSError as e:
+            print(f"[WARNING] Could not write aircraft catalog {catalog_path}: {e}")
+
+    return catalog
@@ -0,0 +1,106 @@
+# core/cli.py
+
+"""
+Batch EM computation without the web stack.
+
+Reads flight states from a CSV or JSONL file and streams one result per state,
+either as JSON lines or as one .npz file per state.
+
+Each input row only needs "ac_name"; every other EM_STATE_FIELDS value falls
+back to what the UI shows right after selecting the aircraft. In CSV files,
+list-valued fields (e.g. overlay_toggle) are written as JSON (["ps","g"])
+or comma-separated (ps,g).
+
+Usage:
+    python -m core.cli states.csv --out results.jsonl
+    python -m core.cli states.jsonl --format npz --out results/
+    python -m core.cli states.csv --out -            # JSON lines on stdout
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from .em import compute_em, parse_state_params, resolve_state, write_npz
+
+
+def iter_states(path):
+    """
+    Yield raw state dicts from a .csv or .jsonl file, one row at a time.
+
+    CSV cells are decoded with parse_state_params; empty cells are dropped
+    so defaults apply.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            for row in csv.DictReader(f):
+                yield parse_state_params(row)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def run_batch(rows, aircraft=None):
+    """
+    Compute EM results for an iterable of rows.
+
+    Yields:
+        (index, state, result, error) - result is None when error is set
+    """
+    for i, row in enumerate(rows):
+        try:
+            state = resolve_state(row, aircraft)
+            yield i, state, compute_em(state, aircraft), None
+        except Exception as e:
+            yield i, row, None, f"{type(e).__name__}: {e}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute EM diagrams for a batch of flight states.")
+    parser.add_argument("input", help="States file (.csv or .jsonl)")
+    parser.add_argument("--out", default="-", help="JSONL file, '-' for stdout, or directory for --format npz")
+    parser.add_argument("--format", choices=["json", "npz"], default="json")
+    args = parser.parse_args(argv)
+
+    if args.format == "npz":
+        if args.out == "-":
+            parser.error("--format npz needs an output directory")
+        os.makedirs(args.out, exist_ok=True)
+        sink = None
+    else:
+        sink = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+
+    t_start = time.perf_counter()
+    count = failures = 0
+    try:
+        for i, state, result, error in run_batch(iter_states(args.input)):
+            count += 1
+            if error:
+                failures += 1
+                print(f"[EM] row {i} failed: {error}", file=sys.stderr)
+            if sink is not None:
+                record = {"index": i, "state": state}
+                if error:
+                    record["error"] = error
+                else:
+                    record["result"] = result.to_dict()
+                sink.write(json.dumps(record) + "\n")
+            elif not error:
+                write_npz(os.path.join(args.out, f"{i:06d}.npz"), result.to_arrays())
+    finally:
+        if sink is not None and sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - t_start
+    print(f"[EM] {count} states in {elapsed:.1f} s ({count / elapsed if elapsed else 0:.1f} states/s), "
+          f"{failures} failed", file=sys.stderr)
+    return 0 if not failures else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ Physics constants are in calculations.py - this file is for app config constants
 # DEBUG SETTINGS
 # =============================================================================
 DEBUG_LOG = False  # Set to False before deploying to Render
+LOG_LEVEL = "WARNING"  # core.log level when DEBUG_LOG is off (DEBUG, INFO, WARNING, ERROR)
 
 # =============================================================================
 # DEFAULT VALUES
@@ -37,6 +38,30 @@ DEFAULT_SCREEN_WIDTH = 1400  # fallback for server-side calls
 PS_CONTOUR_LEVELS = [-20, -15, -10, -5, 0, 5, 10, 15, 20]
 PS_GRID_POINTS = 100  # Number of grid points for Ps calculations
 
+# =============================================================================
+# CACHE SETTINGS
+# =============================================================================
+FIGURE_CACHE_MAX_ENTRIES = 32  # rendered EM figures kept per worker for export
+EXPORT_CACHE_MAX_BYTES = 256 * 1024 * 1024  # on-disk PNG/PDF export cache cap
+ENVELOPE_CACHE_MAX_ENTRIES = 128  # computed EMResults kept per worker (UI + API)
+AIRCRAFT_UI_CACHE_MAX_ENTRIES = 256  # per-aircraft sidebar descriptors (options, slider marks)
+LAYOUT_CACHE_MAX_ENTRIES = 8  # serialized page layouts kept per worker (page x mobile x catalog version)
+ENVELOPE_API_MAX_AGE = 3600  # seconds; Cache-Control max-age for /api/envelope
+AIRCRAFT_RELOAD_INTERVAL = 2.0  # seconds between aircraft_data scans; 0 disables hot reload
+AIRPORT_SEARCH_LIMIT = 20  # airport dropdown options returned per search
+
+# =============================================================================
+# SLIDER DRAGS
+# =============================================================================
+DRAG_UPDATES_PER_SECOND = 4  # graph updates sent while dragging a slider; 0 = only on release
+RENDER_SEQUENCER_MAX_SESSIONS = 1024  # browser sessions whose latest render seq a worker tracks
+
+# =============================================================================
+# PERFORMANCE TRACING
+# =============================================================================
+PERF_TRACE_ENABLED = False  # per-stage timings of graph updates/exports, shown at /debug/perf (loopback only)
+PERF_TRACE_BUFFER_SIZE = 200  # finished traces kept per worker
+
 # =============================================================================
 # STYLING CONSTANTS
 # =============================================================================
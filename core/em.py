@@ -0,0 +1,1527 @@
+# core/em.py
+
+"""
+Headless Energy-Maneuverability computation.
+
+compute_em() turns a flight state (the inputs of the update_graph callback)
+into plain numbers and NumPy arrays: envelope boundaries, overlays, maneuver
+traces, hover grid and axis ranges. Nothing here imports Dash or Plotly, so
+the same results can feed the web figure, batch jobs, APIs and tests.
+
+Speeds in EMResult are in the state's display unit (KIAS or MPH) unless a
+field says otherwise; turn rates are deg/s.
+"""
+
+import io
+import json
+import zipfile
+from dataclasses import asdict, dataclass, field
+from math import pi, radians, tan, degrees
+from typing import Optional
+
+import numpy as np
+
+from .calculations import (
+    g, G_FT_S2, KTS_TO_FPS, FPS_TO_KTS, KTS_TO_MPH,
+    compute_air_density,
+    compute_density_altitude,
+    compute_pressure_altitude,
+)
+from .aircraft_model import AircraftModel
+from .multi_engine import calculate_vmca, calculate_dynamic_vyse
+from .aircraft_loader import aircraft_data
+from .perf import stage
+from .log import DEBUG, get_logger
+
+log = get_logger("em")
+
+# Flight state fields, in update_graph callback input order
+EM_STATE_FIELDS = [
+    "ac_name", "config", "engine_name", "occupants", "fuel", "altitude_ft",
+    "total_weight", "power_fraction", "overlay_toggle", "gear", "oei_toggle",
+    "prop_condition", "cg", "selected_category", "unit", "multi_engine_toggle_options",
+    "maneuver", "aob_values", "ias_values", "steepturn_standard_values",
+    "steepturn_ghost_values", "chandelle_ias_values", "chandelle_bank_values",
+    "chandelle_ghost_values", "pitch_angle", "screen_width", "oat_c", "altimeter_inhg",
+]
+
+# UI defaults mirrored from the main page controls
+DEFAULT_STATE_OVERLAYS = ["g", "radius", "aob"]
+DEFAULT_STATE_FUEL_GAL = 20
+DEFAULT_STATE_PAX_WEIGHT = 180
+DEFAULT_STATE_POWER = 0.50
+DEFAULT_STATE_SCREEN_WIDTH = 1400
+
+
+# Accepted ranges for numeric state values (min, max), inclusive; None is
+# open-ended. Wider than the UI controls so scripted states still pass.
+STATE_NUMERIC_LIMITS = {
+    "occupants": (0, None),
+    "fuel": (0, None),
+    "altitude_ft": (-2000, 60000),
+    "total_weight": (1, None),
+    "power_fraction": (0, 1),
+    "pitch_angle": (-90, 90),
+    "screen_width": (1, None),
+    "oat_c": (-90, 60),
+    "altimeter_inhg": (25, 35),
+}
+STATE_UNITS = ("KIAS", "MPH")
+CG_TOLERANCE = 0.01  # the UI rounds the CG range to 2 decimals
+
+
+class EMInputError(ValueError):
+    """Raised when a state names an unknown aircraft or engine, or holds an invalid value."""
+
+
+@dataclass
+class EMResult:
+    """Everything needed to draw (or export) one EM diagram."""
+    ac_name: str
+    unit: str
+    is_mobile: bool
+
+    # --- Envelope ---
+    g_limit: float
+    g_limit_neg: float
+    vs_1g: float                    # KIAS
+    max_speed: float                # KIAS (Vne, or Vfe for the flap config)
+    max_speed_label: str
+    corner_ias: float
+    corner_tr: float
+    lift_limit_x: np.ndarray
+    lift_limit_y: list
+    load_limit_x: np.ndarray
+    load_limit_y: list
+    vne_x: float
+    vne_y: tuple                    # (bottom, top)
+    dvmc_active: bool = False
+    neg_lift_limit: Optional[tuple] = None      # (x, y)
+    neg_load_limit: Optional[tuple] = None      # (x, y)
+
+    # --- Overlays ---
+    g_lines: list = field(default_factory=list)         # (g, x, y, negative)
+    aob_heatmap: Optional[tuple] = None                 # (x, y, z)
+    aob_heatmap_neg: Optional[tuple] = None             # (x, y, z)
+    radius_lines: list = field(default_factory=list)    # (radius_ft, x, y)
+    radius_lines_neg: list = field(default_factory=list)
+    show_radius_legend: bool = False
+    ps_grid: Optional[tuple] = None                     # (x, y, Ps masked to envelope)
+    ps_contours: Optional[dict] = None                  # min, max, levels, labels
+
+    # --- Multi-engine ---
+    dvmc: Optional[dict] = None
+    dvyse: Optional[dict] = None
+    vyse_published: Optional[tuple] = None              # (x, top)
+    vxse_published: Optional[tuple] = None              # (x, top)
+    vmca_published: Optional[tuple] = None              # (x, top)
+
+    # --- Hover grid ---
+    hover_x: list = field(default_factory=list)
+    hover_y: list = field(default_factory=list)
+    hover_data: Optional[np.ndarray] = None             # [AOB, G, Ps, radius_nm]
+
+    # --- Maneuvers ---
+    steep_turn: Optional[dict] = None
+    steep_turn_ghost: Optional[dict] = None
+    chandelles: list = field(default_factory=list)
+
+    # --- Axes ---
+    x_range: tuple = (0, 100)
+    y_range: tuple = (0, 100)
+
+    def key_speeds(self):
+        """Named reference speeds in the display unit (None when not shown)."""
+        factor = KTS_TO_MPH if self.unit == "MPH" else 1.0
+        return {
+            "vs_1g": self.vs_1g * factor,
+            "corner": self.corner_ias,
+            "max_speed": self.vne_x,
+            "vyse": self.vyse_published[0] if self.vyse_published else None,
+            "vxse": self.vxse_published[0] if self.vxse_published else None,
+            "vmca": self.vmca_published[0] if self.vmca_published else None,
+        }
+
+    def to_dict(self):
+        """JSON-serializable view (arrays become lists, NaN becomes None)."""
+        return _jsonable(asdict(self))
+
+    def to_arrays(self):
+        """
+        Flatten the numeric content into named NumPy arrays for np.savez.
+
+        Nested fields are joined with "__", e.g. "ps_grid__z" or "g_lines__2__x".
+        """
+        arrays = {}
+
+        def put(name, value):
+            if value is None:
+                return
+            if isinstance(value, str):
+                arrays[name] = np.array(value)
+            elif isinstance(value, dict):
+                for k, v in value.items():
+                    put(f"{name}__{k}", v)
+            else:
+                arrays[name] = np.asarray(value, dtype=float)
+
+        for name in ("g_limit", "g_limit_neg", "vs_1g", "max_speed", "corner_ias", "corner_tr",
+                     "vne_x", "vne_y", "x_range", "y_range", "hover_x", "hover_y", "hover_data"):
+            put(name, getattr(self, name))
+        put("unit", self.unit)
+        put("lift_limit", {"x": self.lift_limit_x, "y": self.lift_limit_y})
+        put("load_limit", {"x": self.load_limit_x, "y": self.load_limit_y})
+        for name in ("neg_lift_limit", "neg_load_limit", "vyse_published", "vxse_published",
+                     "vmca_published"):
+            value = getattr(self, name)
+            if value is not None:
+                put(name, {"x": value[0], "y": value[1]})
+        for name in ("aob_heatmap", "aob_heatmap_neg", "ps_grid"):
+            value = getattr(self, name)
+            if value is not None:
+                put(name, {"x": value[0], "y": value[1], "z": value[2]})
+        for i, (g_val, x, y, _) in enumerate(self.g_lines):
+            put(f"g_lines__{i}", {"g": g_val, "x": x, "y": y})
+        for i, (radius, x, y) in enumerate(self.radius_lines + self.radius_lines_neg):
+            put(f"radius_lines__{i}", {"radius_ft": radius, "x": x, "y": y})
+        for name in ("dvmc", "dvyse"):
+            value = getattr(self, name)
+            if value is not None:
+                put(name, {k: value[k] for k in ("x", "y", "bank")})
+        for i, path in enumerate(self.chandelles):
+            put(f"chandelles__{i}", {k: path[k] for k in ("x", "y", "aob", "heading")})
+        if self.steep_turn is not None:
+            put("steep_turn", {k: self.steep_turn[k] for k in ("x", "y")})
+        return arrays
+
+
+def _jsonable(value):
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _jsonable(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def default_state(ac_name, ac, config=None, category=None, overlays=None,
+                  power_fraction=DEFAULT_STATE_POWER, altitude_ft=0, unit="KIAS", **overrides):
+    """
+    Build the state the UI holds right after selecting an aircraft.
+
+    Args:
+        ac_name: Aircraft name (key in the aircraft data)
+        ac: Aircraft data dict
+        config: Flap configuration (default: first listed)
+        category: G-limit category (default: first listed)
+        overlays: Overlay keys (default: G lines, radius, AOB)
+        **overrides: Any other EM_STATE_FIELDS values
+
+    Returns:
+        Dict keyed by EM_STATE_FIELDS
+    """
+    seats = ac.get("seats", 2)
+    occupants = min(2, seats)
+    fuel = min(DEFAULT_STATE_FUEL_GAL, ac.get("fuel_capacity_gal", DEFAULT_STATE_FUEL_GAL))
+    total_weight = (
+        ac["empty_weight"]
+        + fuel * ac.get("fuel_weight_per_gal", 6.0)
+        + occupants * DEFAULT_STATE_PAX_WEIGHT
+    )
+    cg_min, cg_max = ac["cg_range"]
+    cg = round((round(float(cg_min), 2) + round(float(cg_max), 2)) / 2, 2)
+
+    state = {
+        "ac_name": ac_name,
+        "config": config or ac["configuration_options"]["flaps"][0],
+        "engine_name": next(iter(ac["engine_options"])),
+        "occupants": occupants,
+        "fuel": fuel,
+        "altitude_ft": altitude_ft,
+        "total_weight": total_weight,
+        "power_fraction": power_fraction,
+        "overlay_toggle": list(overlays if overlays is not None else DEFAULT_STATE_OVERLAYS),
+        "gear": "up" if ac.get("gear_type") == "retractable" else None,
+        "oei_toggle": [],
+        "prop_condition": "feathered",
+        "cg": cg,
+        "selected_category": category or next(iter(ac.get("G_limits", {})), None),
+        "unit": unit,
+        "multi_engine_toggle_options": [],
+        "maneuver": None,
+        "aob_values": [],
+        "ias_values": [],
+        "steepturn_standard_values": [],
+        "steepturn_ghost_values": [],
+        "chandelle_ias_values": [],
+        "chandelle_bank_values": [],
+        "chandelle_ghost_values": [],
+        "pitch_angle": 0,
+        "screen_width": DEFAULT_STATE_SCREEN_WIDTH,
+        "oat_c": 15,
+        "altimeter_inhg": 29.92,
+    }
+    state.update(overrides)
+    return state
+
+
+# State fields that hold lists (checklists and pattern-matched inputs)
+LIST_STATE_FIELDS = {
+    "overlay_toggle", "oei_toggle", "multi_engine_toggle_options", "aob_values", "ias_values",
+    "steepturn_standard_values", "steepturn_ghost_values", "chandelle_ias_values",
+    "chandelle_bank_values", "chandelle_ghost_values",
+}
+# List fields holding maneuver speeds / bank angles
+NUMERIC_LIST_STATE_FIELDS = {"aob_values", "ias_values", "chandelle_ias_values", "chandelle_bank_values"}
+
+
+def _parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text  # plain strings such as aircraft names
+
+
+def parse_state_params(params):
+    """
+    Decode text state values (query string, CSV row) into typed values.
+
+    Numbers and JSON literals are decoded; anything else stays a string.
+    List fields accept a JSON list, a comma-separated string or repeated
+    values. Empty values and unknown keys are dropped so defaults apply.
+
+    Args:
+        params: Mapping of field name -> str or list of str
+
+    Returns:
+        Dict of typed EM_STATE_FIELDS values
+    """
+    state = {}
+    for name, raw in params.items():
+        if name not in EM_STATE_FIELDS:
+            continue
+        values = [v for v in (raw if isinstance(raw, (list, tuple)) else [raw]) if v not in ("", None)]
+        if not values:
+            continue
+        if name in LIST_STATE_FIELDS:
+            if len(values) == 1 and values[0].lstrip().startswith("["):
+                state[name] = json.loads(values[0])
+            else:
+                state[name] = [_parse_value(p) for v in values for p in v.split(",") if p != ""]
+        else:
+            state[name] = _parse_value(values[-1]) if name != "ac_name" else values[-1]
+    return state
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and np.isfinite(value)
+
+
+def validate_state(state, ac):
+    """
+    Check a full state's values before computing it.
+
+    Args:
+        state: Dict keyed by EM_STATE_FIELDS
+        ac: Data dict of the state's aircraft
+
+    Raises:
+        EMInputError: A value of the wrong type, out of range, non-finite
+            or not among the aircraft's options
+    """
+    for name, (low, high) in STATE_NUMERIC_LIMITS.items():
+        value = state.get(name)
+        if value is None:
+            continue
+        if not _is_number(value):
+            raise EMInputError(f"{name} must be a finite number, got {value!r}")
+        if low is not None and value < low:
+            raise EMInputError(f"{name} must be at least {low}, got {value!r}")
+        if high is not None and value > high:
+            raise EMInputError(f"{name} must be at most {high}, got {value!r}")
+
+    cg = state.get("cg")
+    if cg is not None:
+        cg_min, cg_max = (float(v) for v in ac["cg_range"])
+        if not _is_number(cg) or not cg_min - CG_TOLERANCE <= cg <= cg_max + CG_TOLERANCE:
+            raise EMInputError(f"cg must be between {cg_min} and {cg_max}, got {cg!r}")
+
+    if state.get("config") not in ac["configuration_options"]["flaps"]:
+        raise EMInputError(f"Unknown config for {state.get('ac_name')}: {state.get('config')!r}")
+    if state.get("engine_name") not in ac["engine_options"]:
+        raise EMInputError(f"Unknown engine for {state.get('ac_name')}: {state.get('engine_name')!r}")
+    if state.get("unit") not in STATE_UNITS:
+        raise EMInputError(f"unit must be one of {', '.join(STATE_UNITS)}, got {state.get('unit')!r}")
+    category = state.get("selected_category")
+    if category is not None and category not in ac.get("G_limits", {}):
+        raise EMInputError(f"Unknown category for {state.get('ac_name')}: {category!r}")
+
+    for name in LIST_STATE_FIELDS:
+        value = state.get(name)
+        if value is not None and not isinstance(value, list):
+            raise EMInputError(f"{name} must be a list, got {value!r}")
+        if name in NUMERIC_LIST_STATE_FIELDS and any(v is not None and not _is_number(v) for v in value or ()):
+            raise EMInputError(f"{name} must hold finite numbers, got {value!r}")
+
+
+def resolve_state(row, aircraft=None):
+    """
+    Fill in UI defaults for any EM_STATE_FIELDS missing from a row, then
+    validate the result (EMInputError on a bad value).
+    """
+    aircraft = aircraft if aircraft is not None else aircraft_data
+    ac_name = row.get("ac_name")
+    if ac_name not in aircraft:
+        raise EMInputError(f"Unknown aircraft: {ac_name!r}")
+    overrides = {k: v for k, v in row.items() if k in EM_STATE_FIELDS and k != "ac_name"}
+    state = default_state(ac_name, aircraft[ac_name], **overrides)
+    validate_state(state, aircraft[ac_name])
+    return state
+
+
+def write_npz(file, arrays):
+    """
+    Write arrays as a compressed .npz archive with fixed zip timestamps.
+
+    Unlike np.savez_compressed, the same arrays always produce the same bytes,
+    so the output can be content-addressed and served with a strong ETag.
+
+    Args:
+        file: Path or binary file object
+        arrays: Mapping of name -> array-like
+    """
+    with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name in sorted(arrays):
+            buf = io.BytesIO()
+            np.lib.format.write_array(buf, np.asanyarray(arrays[name]), allow_pickle=False)
+            info = zipfile.ZipInfo(f"{name}.npy", date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, buf.getvalue())
+
+
+def _chandelle_path(chandelle_ias_start, chandelle_bank, stall_ias_kias, unit):
+    """Integrate a chandelle: constant bank to 90°, then roll out 1° per 3° of turn."""
+    v_start = chandelle_ias_start * KTS_TO_FPS  # ft/s
+    v_end = (stall_ias_kias + 5) * KTS_TO_FPS   # ft/s
+    delta_v = v_start - v_end
+
+    # Airspeed lost more aggressively with higher AOB
+    energy_bias = min(0.8, max(0.5, chandelle_bank / 60))  # realistic range: 0.5–0.8
+    v_90 = v_start - (delta_v * energy_bias)
+
+    dt = 0.1
+    max_turn_deg = 180.0
+    angle = 0.0
+    steps = 0
+    max_steps = 1000
+
+    airspeeds = []
+    turn_rates = []
+    aob_list = []
+    heading_list = []
+
+    while angle < max_turn_deg and steps < max_steps:
+        if angle <= 90:
+            # First half: lose 'energy_bias' fraction of Δv by 90°
+            v = v_start - ((angle / 90.0) * (delta_v * energy_bias))
+            aob_deg = chandelle_bank
+        else:
+            # Second half: lose remaining Δv after 90°, reduce AOB 1° per 3° turn
+            v = v_90 - (((angle - 90) / 90.0) * (delta_v * (1 - energy_bias)))
+            aob_deg = max(0, chandelle_bank - ((angle - 90) / 3.0))
+
+        v = max(v, v_end)  # Never dip below final airspeed
+        aob_rad = radians(aob_deg)
+        omega_rad = G_FT_S2 * tan(aob_rad) / v
+        tr = degrees(omega_rad)
+
+        airspeeds.append(v * FPS_TO_KTS)
+        turn_rates.append(tr)
+        aob_list.append(aob_deg)
+        heading_list.append(angle)
+
+        angle += tr * dt
+        steps += 1
+
+    if not airspeeds:
+        log.warning("No chandelle points generated.")
+        return None
+
+    airspeeds_display = [ias * KTS_TO_MPH if unit == "MPH" else ias for ias in airspeeds]
+    return {
+        "x": airspeeds_display,
+        "y": turn_rates,
+        "aob": aob_list,
+        "heading": heading_list,
+    }
+
+
+def get_model(aircraft, ac_name):
+    """
+    AircraftModel for an aircraft, reusing the one DynamicAircraftData built
+    at load time; plain dicts (tests, batch jobs) get a fresh model.
+    """
+    if hasattr(aircraft, "get_model"):
+        return aircraft.get_model(ac_name)
+    return AircraftModel.from_dict(ac_name, aircraft[ac_name])
+
+
+def compute_em(state, aircraft=None):
+    """
+    Compute the EM diagram for one flight state.
+
+    Args:
+        state: Dict keyed by EM_STATE_FIELDS (see default_state)
+        aircraft: Mapping of aircraft name -> data (default: loaded aircraft_data)
+
+    Returns:
+        EMResult
+
+    Raises:
+        EMInputError: Unknown aircraft or engine
+    """
+    aircraft = aircraft if aircraft is not None else aircraft_data
+
+    ac_name = state.get("ac_name")
+    config = state.get("config")
+    engine_name = state.get("engine_name")
+    altitude_ft = state.get("altitude_ft")
+    total_weight = state.get("total_weight")
+    power_fraction = state.get("power_fraction")
+    overlay_toggle = state.get("overlay_toggle")
+    gear = state.get("gear")
+    oei_toggle = state.get("oei_toggle")
+    prop_condition = state.get("prop_condition")
+    cg = state.get("cg")
+    selected_category = state.get("selected_category")
+    unit = state.get("unit")
+    multi_engine_toggle_options = state.get("multi_engine_toggle_options")
+    maneuver = state.get("maneuver")
+    aob_values = state.get("aob_values") or []
+    ias_values = state.get("ias_values") or []
+    steepturn_standard_values = state.get("steepturn_standard_values") or []
+    steepturn_ghost_values = state.get("steepturn_ghost_values") or []
+    chandelle_ias_values = state.get("chandelle_ias_values") or []
+    chandelle_bank_values = state.get("chandelle_bank_values") or []
+    chandelle_ghost_values = state.get("chandelle_ghost_values") or []
+    pitch_angle = state.get("pitch_angle")
+    screen_width = state.get("screen_width")
+    oat_c = state.get("oat_c")
+    altimeter_inhg = state.get("altimeter_inhg")
+
+    if not ac_name or ac_name not in aircraft:
+        raise EMInputError(f"Unknown aircraft: {ac_name!r}")
+
+    # === Resolution tuning based on screen width ===
+    stage("setup")
+    if screen_width is None:
+        screen_width = 1400  # fallback for server-side calls
+
+    if screen_width < 1200:
+        aob_ias_step = 1.0     # 1 kt increments
+        aob_tr_step = 1.0      # 1 deg/s increments
+    else:
+        aob_ias_step = 0.5     # 0.5 kt increments
+        aob_tr_step = 0.5      # 0.5 deg/s increments
+
+    # Handle None values for overlay lists
+    overlay_toggle = overlay_toggle if overlay_toggle is not None else []
+    multi_engine_toggle_options = multi_engine_toggle_options if multi_engine_toggle_options is not None else []
+
+    all_overlays = overlay_toggle + multi_engine_toggle_options
+
+    if engine_name is None or engine_name not in aircraft[ac_name]["engine_options"]:
+        raise EMInputError(f"Unknown engine for {ac_name}: {engine_name!r}")
+
+    def convert_display_airspeed(ias_vals, unit):
+        return ias_vals * KTS_TO_MPH if unit == "MPH" else ias_vals
+
+    if oei_toggle is None:
+        oei_toggle = []
+    if prop_condition is None:
+        prop_condition = "feathered"
+
+    oei_active = "enabled" in oei_toggle
+    prop_mode = prop_condition if oei_active else None
+
+    model = get_model(aircraft, ac_name)
+    engine = model.engines[engine_name]
+
+    # --- Power Derating Based on Altitude ---
+    sea_level_max = engine.sea_level_max
+    max_altitude = engine.max_altitude
+    derate_per_1000ft = engine.derate_per_1000ft
+
+    alt_frac = min(altitude_ft / 1000.0, max_altitude / 1000.0)
+    alt_derate = max(0.0, 1 - derate_per_1000ft * alt_frac)
+    derated_hp = sea_level_max * alt_derate
+
+    g_limit, g_limit_neg = model.g_limit(selected_category, config)
+
+    # --- Gear Drag & Lift Modifiers ---
+    gear_drag_factor = 1.0
+    gear_lift_factor = 1.0
+
+    if gear == "down":
+        gear_drag_factor = 1.15  # +15% drag when gear down
+        gear_lift_factor = 0.98  # -2% CLmax when gear down
+
+    # --- Determine Final Power Based on OEI Toggle ---
+    oei_config_key = f"{config}_{gear or 'up'}"
+    oei_data = (
+        engine.oei_performance
+        .get(oei_config_key, {})
+        .get(prop_mode, {})
+    )
+    # If OEI config lookup failed, try defaulting to "clean_up"
+    if oei_active and not oei_data:
+        oei_data = (
+            engine.oei_performance
+            .get("clean_up", {})
+            .get(prop_mode, {})
+        )
+
+    if oei_active and oei_data:
+        hp = sea_level_max * oei_data.get("max_power_fraction", 1.0) * alt_derate
+    else:
+        hp = derated_hp * power_fraction
+
+    if log.is_enabled(DEBUG):
+        log.debug("ENGINE: %s", {
+            "ac": ac_name,
+            "engine": engine_name,
+            "oei_active": oei_active,
+            "prop_mode": prop_mode,
+            "config_key": oei_config_key,
+            "hp": hp,
+        })
+
+    weight = total_weight
+
+    # --- CG Effects ---
+    cl_base = model.cl_max[config]
+    cg_min_val, cg_max_val = model.cg_range
+    cg_span = cg_max_val - cg_min_val
+    cg_fraction = (cg - cg_min_val) / cg_span if cg_span else 0.5  # Avoid div by zero
+
+    # Apply simple linear model: more forward = lower CL_max, more drag
+    cl_max = cl_base * (1 - 0.05 * (1 - cg_fraction))  # up to 5% penalty at full forward CG
+    cl_max *= gear_lift_factor
+    cg_drag_factor = 1 + 0.04 * (0.5 - cg_fraction)     # up to 4% added drag for FWD CG
+
+    if log.is_enabled(DEBUG):
+        log.debug("CG INFLUENCE: %s", {
+            "cg": cg,
+            "cl_base": cl_base,
+            "cl_max_adj": cl_max,
+            "cg_fraction": cg_fraction,
+            "cg_drag_factor": cg_drag_factor
+        })
+
+    wing_area = model.wing_area
+    # Aircraft drag/lift parameters
+    CD0 = model.CD0
+    pi_ar_e = model.pi_ar_e
+    # Prop thrust decay: T = T_static * (1 - (V / V_max)^2)
+    V_max_kts = model.v_max_kts
+    T_static = model.t_static_factor * hp
+
+    # === Environment calculations using OAT and altimeter ===
+    oat_c = oat_c if oat_c is not None else 15
+    altimeter_inhg = altimeter_inhg if altimeter_inhg is not None else 29.92
+
+    # Calculate pressure altitude from field elevation and altimeter
+    pressure_altitude = compute_pressure_altitude(altitude_ft, altimeter_inhg)
+
+    # Use centralized air density calculation with OAT for accurate density
+    rho = compute_air_density(pressure_altitude, oat_c)
+
+    if log.is_enabled(DEBUG):
+        log.debug("ENVIRONMENT: %s", {
+            "field_elev_ft": altitude_ft,
+            "oat_c": oat_c,
+            "altimeter_inhg": altimeter_inhg,
+            "pressure_altitude": pressure_altitude,
+            "density_altitude": compute_density_altitude(pressure_altitude, oat_c),
+            "rho": rho
+        })
+
+    # Use weight-interpolated stall speed instead of just minimum
+    vs_1g = model.stall_speed(config, weight)
+    max_speed, label = model.max_speed(config)
+
+    max_speed_internal = max_speed  # always in KIAS for physics
+    max_speed_display = convert_display_airspeed(max_speed, unit)
+
+    ias_start = max(0, int(vs_1g * 0.8))  # Add dynamic padding (20% below Vs)
+    ias_vals = np.arange(ias_start, max_speed + 1, 1)
+
+    # === Positive envelope: load limit and lift (stall) limit ===
+    stage("envelope")
+    g_curve_x, g_curve_y = [], []
+    for ias in ias_vals:
+        v = ias * KTS_TO_FPS
+        omega = g * ((g_limit**2 - 1) ** 0.5) / v
+        tr = omega * 180 / pi
+        g_curve_x.append(ias)
+        g_curve_y.append(tr)
+
+    stall_x, stall_y = [], []
+    # Use finer steps near stall speed for smoother curve, coarser elsewhere
+    stall_ias_fine = np.concatenate([
+        np.arange(ias_start, vs_1g + 15, 0.5),  # Fine steps near stall
+        np.arange(vs_1g + 15, max_speed + 1, 2)  # Coarser steps elsewhere
+    ])
+    for ias in stall_ias_fine:
+        v = ias * KTS_TO_FPS
+        n_stall = (0.5 * rho * v**2 * wing_area * cl_max) / weight
+        if n_stall >= 1:
+            omega = g * ((n_stall**2 - 1) ** 0.5) / v
+            tr = omega * 180 / pi
+            if not stall_x:
+                stall_x.append(ias)
+                stall_y.append(0)
+            stall_x.append(ias)
+            stall_y.append(tr)
+
+    # --- Corner speed: first IAS where lift and load limits meet ---
+    corner_ias, corner_tr = None, None
+    min_diff = float("inf")
+    for ias in ias_vals:
+        stall_tr = np.interp(ias, stall_x, stall_y)
+        g_tr = np.interp(ias, g_curve_x, g_curve_y)
+        diff = abs(stall_tr - g_tr)
+        if diff < min_diff:
+            min_diff = diff
+            corner_ias = ias
+            corner_tr = stall_tr
+        if diff < 0.5:
+            break
+
+    if corner_ias is None:
+        corner_ias = ias_vals[0]
+        corner_tr = 0
+
+    stall_clipped_x = [x for x in stall_x if x <= corner_ias]
+    stall_clipped_y = stall_y[:len(stall_clipped_x)]
+    g_clipped_x = [x for x in g_curve_x if x >= corner_ias]
+    g_clipped_y = g_curve_y[-len(g_clipped_x):]
+
+    # === Early DVmc calculation to modify flight envelope ===
+    dvmc_active = False
+    if "vmca" in all_overlays and model.engine_count > 1 and oei_active:
+        dvmc_active = True
+        published_vmca_early = model.vmca if model.vmca is not None else 70
+        reference_weight_early = model.max_weight
+        cg_range_early = model.cg_range
+
+        # Calculate DVmc curve
+        bank_angles_early = np.linspace(5, 90, 150)
+        _, vmca_vals_kias_early = calculate_vmca(
+            published_vmca=published_vmca_early,
+            power_fraction=power_fraction,
+            total_weight=weight,
+            reference_weight=reference_weight_early,
+            cg=cg,
+            cg_range=cg_range_early,
+            prop_condition=prop_mode,
+            pressure_altitude=pressure_altitude,
+            oat_c=oat_c,
+            bank_angles_deg=bank_angles_early
+        )
+
+        # Convert to turn rates
+        v_fts_early = vmca_vals_kias_early * KTS_TO_FPS
+        bank_rad_early = np.radians(bank_angles_early)
+        omega_rad_early = g * np.tan(bank_rad_early) / v_fts_early
+        turn_rates_early = np.degrees(omega_rad_early)
+
+        # Modify stall boundary where DVmc is more restrictive
+        stall_clipped_x_modified = []
+        stall_clipped_y_modified = []
+
+        for ias_stall, tr_stall in zip(stall_clipped_x, stall_clipped_y):
+            # Interpolate DVmc speed at this turn rate
+            if tr_stall >= min(turn_rates_early) and tr_stall <= max(turn_rates_early):
+                dvmc_at_tr = np.interp(tr_stall, turn_rates_early, vmca_vals_kias_early)
+                # Use max(stall, dvmc) as the effective boundary
+                effective_ias = max(ias_stall, dvmc_at_tr)
+            else:
+                effective_ias = ias_stall
+            stall_clipped_x_modified.append(effective_ias)
+            stall_clipped_y_modified.append(tr_stall)
+
+        # Replace stall boundary with modified version
+        stall_clipped_x = stall_clipped_x_modified
+        stall_clipped_y = stall_clipped_y_modified
+
+    stall_clipped_x_display = convert_display_airspeed(np.array(stall_clipped_x), unit)
+    g_clipped_x_display = convert_display_airspeed(np.array(g_clipped_x), unit)
+    corner_ias_display = convert_display_airspeed(corner_ias, unit)
+
+    neg_lift_limit = None
+    neg_load_limit = None
+    neg_stall_y_clip = None
+    neg_g_x_clip = None
+    neg_g_y_clip = None
+    if "negative_g" in overlay_toggle:
+        # === Negative Lift Limit Curve ===
+        # Use same fine steps near stall as positive boundary for consistency
+        neg_stall_x, neg_stall_y = [], []
+        for ias in stall_ias_fine:
+            v = ias * KTS_TO_FPS
+            n_stall = (0.5 * rho * v**2 * wing_area * -cl_max) / weight
+            if n_stall <= -1:
+                # Compute turn rate, limit to G envelope
+                try:
+                    tr_limit_neg = g * np.sqrt(abs(g_limit_neg)**2 - 1) / v
+                    omega = g * np.sqrt(n_stall**2 - 1) / v
+                    tr = -min(omega * 180 / pi, tr_limit_neg * 180 / pi)
+                except Exception:
+                    continue  # Skip invalid values (e.g. sqrt of negative)
+                if not neg_stall_x:
+                    neg_stall_x.append(ias)
+                    neg_stall_y.append(0)
+                neg_stall_x.append(ias)
+                neg_stall_y.append(tr)
+
+        neg_corner_idx = np.argmin(np.abs(np.array(neg_stall_y) - (-corner_tr)))
+        neg_stall_x_clip = neg_stall_x[:neg_corner_idx + 1]
+        neg_stall_y_clip = neg_stall_y[:neg_corner_idx + 1]
+        neg_stall_x_display = convert_display_airspeed(np.array(neg_stall_x_clip), unit)
+
+        # === Negative G-Limit Curve ===
+        neg_g_x, neg_g_y = [], []
+        for ias in ias_vals:
+            v = ias * KTS_TO_FPS
+            try:
+                omega = g * np.sqrt(g_limit_neg**2 - 1) / v
+                tr = -omega * 180 / pi
+                neg_g_x.append(ias)
+                neg_g_y.append(tr)
+            except Exception:
+                continue
+
+        neg_g_x_clip = [x for x in neg_g_x if x >= neg_stall_x_clip[-1]]
+        neg_g_y_clip = neg_g_y[-len(neg_g_x_clip):]
+        neg_g_x_display = convert_display_airspeed(np.array(neg_g_x_clip), unit)
+
+        neg_lift_limit = (neg_stall_x_display, neg_stall_y_clip)
+        neg_load_limit = (neg_g_x_display, neg_g_y_clip)
+
+        # Adjust y_max/y_min to show full envelope
+        y_span = max(
+            abs(min(neg_g_y_clip)) if neg_g_y_clip else 0,
+            max(g_clipped_y) if g_clipped_y else 0
+        )
+        y_max = y_span * 1.1
+        y_min = -y_span * 1.1
+    else:
+        y_max = max(g_clipped_y) * 1.1 if g_clipped_y else 100
+        y_min = 0
+
+    # --- Vne Y-positions (always present) ---
+    vne_y_top = np.interp(max_speed, g_clipped_x, g_clipped_y) if g_clipped_x and g_clipped_y else 0
+    vne_y_bot = 0  # Default if negative_g not shown
+
+    # If negative G envelope is enabled and valid, interpolate bottom of Vne line
+    if "negative_g" in overlay_toggle and neg_g_x_clip and neg_g_y_clip:
+        vne_y_bot = np.interp(max_speed, neg_g_x_clip, neg_g_y_clip)
+
+    result = EMResult(
+        ac_name=ac_name,
+        unit=unit,
+        is_mobile=bool(screen_width and screen_width < 768),
+        g_limit=g_limit,
+        g_limit_neg=g_limit_neg,
+        vs_1g=vs_1g,
+        max_speed=max_speed,
+        max_speed_label=label,
+        corner_ias=corner_ias_display,
+        corner_tr=corner_tr,
+        lift_limit_x=stall_clipped_x_display,
+        lift_limit_y=stall_clipped_y,
+        load_limit_x=g_clipped_x_display,
+        load_limit_y=g_clipped_y,
+        vne_x=convert_display_airspeed(max_speed, unit),
+        vne_y=(vne_y_bot, vne_y_top),
+        dvmc_active=dvmc_active,
+        neg_lift_limit=neg_lift_limit,
+        neg_load_limit=neg_load_limit,
+    )
+
+    # --- INTERMEDIATE G CURVES (toggle controlled) ---
+    stage("g_curves")
+    if "g" in overlay_toggle:
+        intermediate_gs = [round(g_val, 1) for g_val in np.arange(1.5, g_limit, 0.5)]
+        for g_inter in intermediate_gs:
+            gx, gy = [], []
+            for ias in ias_vals:
+                v = ias * KTS_TO_FPS
+                stall_v = np.sqrt((2 * weight * g_inter) / (rho * wing_area * cl_max))
+                if v < stall_v:
+                    continue
+                omega = g * np.sqrt(g_inter**2 - 1) / v
+                tr = omega * 180 / pi
+
+                # Check DVmc limit when active
+                dvmc_ok = True
+                if dvmc_active:
+                    dvmc_at_tr = np.interp(tr, turn_rates_early, vmca_vals_kias_early)
+                    dvmc_ok = ias >= dvmc_at_tr
+
+                if dvmc_ok:
+                    gx.append(ias)
+                    gy.append(tr)
+
+            if len(gx) > 5:
+                result.g_lines.append((g_inter, convert_display_airspeed(np.array(gx), unit), gy, False))
+
+        # === Negative G Lines ===
+        neg_intermediate_gs = [
+            round(g_val, 1)
+            for g_val in np.arange(-1.0, g_limit_neg, -0.5)
+            if abs(g_val) >= 1.5 and abs(g_val - g_limit_neg) > 0.2
+        ]
+        for g_inter in neg_intermediate_gs:
+            gx, gy = [], []
+            for ias in ias_vals:
+                v = ias * KTS_TO_FPS
+                stall_v = np.sqrt((2 * weight * abs(g_inter)) / (rho * wing_area * cl_max))
+                if v < stall_v:
+                    continue
+                omega = g * np.sqrt(g_inter**2 - 1) / v
+                tr = -omega * 180 / pi  # negative turn rate
+                gx.append(ias)
+                gy.append(tr)
+            if len(gx) > 5:
+                result.g_lines.append((g_inter, convert_display_airspeed(np.array(gx), unit), gy, True))
+
+    # --- Ps GRID CALCULATION (only if Ps overlay enabled) ---
+    stage("ps_grid")
+    if "ps" in overlay_toggle:
+        ias_vals_ps_internal = np.arange(ias_start, max_speed_internal + 1, 1)
+        ias_vals_ps_display = convert_display_airspeed(ias_vals_ps_internal, unit)
+
+        # Detect steep turn override
+        steep_turn_override = maneuver == "steep_turn" and ias_values and aob_values
+        if steep_turn_override:
+            aob_deg = aob_values[0]
+            aob_rad = np.radians(aob_deg)
+            V = ias_vals_ps_internal * KTS_TO_FPS
+            TR_fixed = np.degrees(g * np.tan(aob_rad) / V)  # TR as a function of IAS
+            TR = np.tile(TR_fixed, (len(ias_vals_ps_internal), 1)).T  # 2D grid shape
+            IAS = np.tile(ias_vals_ps_internal, (len(TR), 1))
+            tr_vals_ps = TR[:, 0]  # save for mask / plotting
+        else:
+            tr_vals_ps = np.arange(-100, 100, 1)
+            IAS, TR = np.meshgrid(ias_vals_ps_internal, tr_vals_ps)
+
+        V = IAS * KTS_TO_FPS  # convert to ft/s
+        omega_rad = TR * (np.pi / 180)
+        n = np.sqrt(1 + (V * omega_rad / g) ** 2)
+
+        q = 0.5 * rho * V**2
+        CL = weight * n / (q * wing_area)
+        CL_clipped = np.minimum(CL, cl_max)
+        CD = (CD0 + (CL_clipped**2) / pi_ar_e) * cg_drag_factor * gear_drag_factor
+        D = q * wing_area * CD
+
+        # === Propeller Thrust Decay ===
+        V_kts = IAS
+        V_fraction = np.clip(V_kts / V_max_kts, 0, 1)
+        T_available = T_static * (1 - V_fraction**2)
+        T_available = np.maximum(T_available, 0)
+
+        gamma_rad = np.radians(pitch_angle)
+
+        # Vertical speed term (ft/s); for gamma=0 this is just 0
+        V_vertical = V * np.sin(gamma_rad)
+
+        # Ps in knots per second
+        Ps = ((T_available - D) * V / weight - V_vertical) * FPS_TO_KTS
+
+        # Envelope mask (vectorized)
+        v_fts_env = IAS * KTS_TO_FPS
+        omega_rad_env = TR * (np.pi / 180)
+
+        n_env = np.sqrt(1 + (v_fts_env * omega_rad_env / g) ** 2)
+        stall_v_fts_env = np.sqrt((2 * weight * n_env) / (rho * wing_area * cl_max))
+        stall_ias_env = stall_v_fts_env * FPS_TO_KTS
+
+        tr_limit_pos_env = g * np.sqrt(g_limit**2 - 1) / v_fts_env * 180 / np.pi
+        tr_limit_neg_env = g * np.sqrt(g_limit_neg**2 - 1) / v_fts_env * 180 / np.pi
+
+        valid_pos = (TR >= 0) & (TR <= tr_limit_pos_env)
+        valid_neg = (TR < 0) & (TR >= -tr_limit_neg_env)  # Negate limit for negative TR region
+
+        # Base envelope mask
+        within_env = (
+            (IAS >= stall_ias_env) &
+            (IAS <= max_speed_internal) &
+            (valid_pos | valid_neg)
+        )
+
+        # Add DVmc masking when active
+        if dvmc_active:
+            # For each point, check if IAS >= DVmc at that turn rate
+            dvmc_ias_at_tr = np.interp(TR, turn_rates_early, vmca_vals_kias_early)
+            dvmc_mask = IAS >= dvmc_ias_at_tr
+            within_env = within_env & dvmc_mask
+
+        # Ps_masked = usable Ps; outside envelope = NaN
+        Ps_masked = np.where(within_env, Ps, np.nan)
+        result.ps_grid = (ias_vals_ps_display, tr_vals_ps, Ps_masked)
+
+        # Full-grid reductions: only run when someone is reading them
+        if log.is_enabled(DEBUG):
+            log.debug("Ps grid: rho %.5f slugs/ft³, CL avg %.2f, CD avg %.3f, flight path angle %s°",
+                      rho, np.nanmean(CL), np.nanmean(CD), pitch_angle)
+            log.debug("Ps grid: thrust avg %.1f lbs, drag avg %.1f lbs, Ps %.2f..%.2f knots/sec",
+                      np.nanmean(T_available), np.nanmean(D), np.nanmin(Ps), np.nanmax(Ps))
+            log.debug("Thrust decay: V_max_kts %s, T_static %.1f lbs", V_max_kts, T_static)
+
+    # --- AOB HEATMAP: 10° to 90°, clipped to envelope ---
+    stage("aob_heatmap")
+    if "aob" in overlay_toggle:
+        IAS_vals = np.arange(ias_start, max_speed + 1, aob_ias_step)
+        IAS_vals_display = convert_display_airspeed(IAS_vals, unit)
+        TR_vals = np.arange(0.1, 100, aob_tr_step)  # Start near 0 for full coverage
+        IAS, TR = np.meshgrid(IAS_vals, TR_vals)
+        V = IAS * KTS_TO_FPS
+        omega_rad = TR * (np.pi / 180)
+
+        # Compute angle of bank at each point
+        AOB_rad = np.arctan(omega_rad * V / g)
+        AOB_deg = np.degrees(AOB_rad)
+
+        # Mask: only show valid points (stall + G-limit + Vne)
+        n = np.sqrt(1 + (V * omega_rad / g) ** 2)
+        n = np.maximum(n, 1.001)  # Enforce minimum 1 G load factor
+
+        stall_v = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
+        stall_IAS = stall_v * FPS_TO_KTS
+        tr_limit = g * np.sqrt(g_limit**2 - 1) / V * 180 / pi
+
+        mask = (IAS >= stall_IAS) & (TR <= tr_limit) & (IAS <= max_speed)
+
+        # Add DVmc masking when active
+        if dvmc_active:
+            dvmc_ias_at_tr = np.interp(TR, turn_rates_early, vmca_vals_kias_early)
+            dvmc_mask = IAS >= dvmc_ias_at_tr
+            mask = mask & dvmc_mask
+
+        AOB_masked = np.where(mask, AOB_deg, np.nan)
+        result.aob_heatmap = (IAS_vals_display, TR_vals, AOB_masked)
+
+        # --- AOB HEATMAP (Negative Turn Rates) ---
+        if "negative_g" in overlay_toggle:
+            TR_vals_neg = np.arange(-100, -0.1, aob_tr_step)  # End near 0 for full coverage
+            IAS_vals_neg = np.arange(ias_start, max_speed + 1, aob_ias_step)
+            IAS_neg, TR_neg = np.meshgrid(IAS_vals_neg, TR_vals_neg)
+            V_neg = IAS_neg * KTS_TO_FPS
+            omega_rad_neg = np.abs(TR_neg) * (np.pi / 180)  # use absolute to mirror
+
+            AOB_rad_neg = np.arctan(omega_rad_neg * V_neg / g)
+            AOB_deg_neg = np.degrees(AOB_rad_neg)  # keep positive AOB for mirror color scale
+
+            n_neg = np.sqrt(1 + (V_neg * omega_rad_neg / g) ** 2)
+            n_neg = np.maximum(n_neg, 1.001)
+            stall_v_neg = np.sqrt((2 * weight * n_neg) / (rho * wing_area * cl_max))
+            stall_IAS_neg = stall_v_neg * FPS_TO_KTS
+            tr_limit_neg = g * np.sqrt(g_limit_neg**2 - 1) / V_neg * 180 / pi
+
+            mask_neg = (IAS_neg >= stall_IAS_neg) & (np.abs(TR_neg) <= tr_limit_neg) & (IAS_neg <= max_speed)
+            AOB_masked_neg = np.where(mask_neg, AOB_deg_neg, np.nan)
+            result.aob_heatmap_neg = (convert_display_airspeed(IAS_vals_neg, unit), TR_vals_neg, AOB_masked_neg)
+
+    # --- TURN RADIUS LINES ---
+    stage("turn_radius")
+    if "radius" in overlay_toggle:
+        ias_range = np.arange(ias_start, max_speed + 1, 2)
+
+        # --- Step 1a: Dynamically find smallest valid turn radius inside envelope
+        min_radius = None
+        for ias in np.arange(ias_start, max_speed + 1, 0.5):  # fine IAS sweep
+            v_fts = ias * KTS_TO_FPS
+            for tr_candidate in np.arange(60, 1, -0.5):  # from tightest turns down
+                omega_rad = tr_candidate * (np.pi / 180)
+                r = v_fts / omega_rad
+
+                n = np.sqrt(1 + (v_fts * omega_rad / g) ** 2)
+                stall_v_fts = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
+                stall_ias = stall_v_fts * FPS_TO_KTS
+                tr_limit = g * np.sqrt(g_limit**2 - 1) / v_fts * 180 / np.pi
+
+                if ias >= stall_ias and tr_candidate <= tr_limit and ias <= max_speed:
+                    if min_radius is None or r < min_radius:
+                        min_radius = r * 1.017
+                    break  # first valid tightest radius is enough for this IAS
+
+        # --- Step 1b: Compute max radius using 3 deg/sec
+        max_radius = 0
+        for ias in ias_range:
+            v_fts = ias * KTS_TO_FPS
+            omega_3deg = 3 * (np.pi / 180)
+            r = v_fts / omega_3deg
+
+            n = np.sqrt(1 + (v_fts * omega_3deg / g) ** 2)
+            stall_v_fts = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
+            stall_ias = stall_v_fts * FPS_TO_KTS
+            tr_limit = g * np.sqrt(g_limit ** 2 - 1) / v_fts * 180 / np.pi
+
+            if ias >= stall_ias and 3 <= tr_limit and ias <= max_speed:
+                max_radius = max(max_radius, r)
+
+        span = max_radius - min_radius
+
+        # Step 2: Visually spaced radius levels (5 total)
+        mid1 = min_radius + 0.04 * span
+        mid2 = min_radius + 0.12 * span
+        mid3 = min_radius + 0.3 * span
+        r1 = int(round(min_radius / 100.0)) * 100
+        r2 = int(round(mid1 / 100.0)) * 100
+        r3 = int(round(mid2 / 100.0)) * 100
+        r4 = int(round(mid3 / 100.0)) * 100
+        r5 = int(round(max_radius / 100.0)) * 100
+        radius_levels = sorted(set([r1, r2, r3, r4, r5]))
+
+        # Step 3: Trace radius lines
+        for radius in radius_levels:
+            valid_x = []
+            valid_y = []
+
+            for ias in ias_range:
+                v_fts = ias * KTS_TO_FPS
+                omega_rad = v_fts / radius
+                tr_deg = omega_rad * 180 / pi
+
+                n = np.sqrt(1 + (v_fts * omega_rad / g) ** 2)
+                stall_v_fts = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
+                stall_ias = stall_v_fts * FPS_TO_KTS
+                tr_limit = g * np.sqrt(g_limit**2 - 1) / v_fts * 180 / pi
+
+                # Check DVmc limit when active
+                dvmc_ok = True
+                if dvmc_active:
+                    dvmc_at_tr = np.interp(tr_deg, turn_rates_early, vmca_vals_kias_early)
+                    dvmc_ok = ias >= dvmc_at_tr
+
+                if ias >= stall_ias and tr_deg <= tr_limit and ias <= max_speed and dvmc_ok:
+                    valid_x.append(convert_display_airspeed(ias, unit))
+                    valid_y.append(tr_deg)
+
+            if len(valid_x) > 5:
+                result.radius_lines.append((radius, valid_x, valid_y))
+
+        y_max = (
+            max(stall_clipped_y + g_clipped_y) * 1.1
+            if stall_clipped_y and g_clipped_y
+            else 100
+        )
+        result.show_radius_legend = True
+
+        # --- NEGATIVE TURN RADIUS LINES ---
+        if "negative_g" in overlay_toggle:
+            neg_min_radius = None
+            neg_max_radius = 0
+
+            # Step 1a: Find tightest valid negative radius
+            for ias in np.arange(ias_start, max_speed + 1, 0.5):
+                v_fts = ias * KTS_TO_FPS
+                for tr_candidate in np.arange(60, 1, -0.5):
+                    omega_rad = tr_candidate * (np.pi / 180)
+                    r = v_fts / omega_rad
+
+                    n = np.sqrt(1 + (v_fts * omega_rad / g) ** 2)
+                    stall_v_fts = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
+                    stall_ias = stall_v_fts * FPS_TO_KTS
+                    tr_limit = g * np.sqrt(g_limit_neg**2 - 1) / v_fts * 180 / np.pi
+
+                    if ias >= stall_ias and tr_candidate <= tr_limit and ias <= max_speed:
+                        neg_min_radius = round(r * 1.017 / 100.0) * 100
+                        break
+                if neg_min_radius:
+                    break
+
+            # Step 1b: Max radius using 3 deg/sec
+            for ias in ias_vals:
+                v_fts = ias * KTS_TO_FPS
+                omega_3deg = 3 * (np.pi / 180)
+                r = v_fts / omega_3deg
+
+                n = np.sqrt(1 + (v_fts * omega_3deg / g) ** 2)
+                stall_v_fts = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
+                stall_ias = stall_v_fts * FPS_TO_KTS
+                tr_limit = g * np.sqrt(g_limit_neg**2 - 1) / v_fts * 180 / np.pi
+
+                if ias >= stall_ias and 3 <= tr_limit and ias <= max_speed:
+                    neg_max_radius = max(neg_max_radius, r)
+
+            neg_max_radius = round(neg_max_radius / 100.0) * 100
+
+            # Step 2: Trace both radii
+            for radius in [neg_min_radius, neg_max_radius]:
+                if not radius:
+                    continue
+                neg_valid_x, neg_valid_y = [], []
+
+                for ias in ias_vals:
+                    v_fts = ias * KTS_TO_FPS
+                    omega_rad = v_fts / radius
+                    tr_deg = -omega_rad * 180 / pi
+
+                    n = np.sqrt(1 + (v_fts * omega_rad / g) ** 2)
+                    stall_v = np.sqrt((2 * weight * n) / (rho * wing_area * cl_max))
+                    stall_ias = stall_v * FPS_TO_KTS
+                    tr_limit = g * np.sqrt(g_limit_neg**2 - 1) / v_fts * 180 / pi
+
+                    if ias >= stall_ias and abs(tr_deg) <= tr_limit and ias <= max_speed:
+                        neg_valid_x.append(convert_display_airspeed(ias, unit))
+                        neg_valid_y.append(tr_deg)
+
+                if len(neg_valid_x) > 5:
+                    result.radius_lines_neg.append((radius, neg_valid_x, neg_valid_y))
+
+    # --- Dynamic Vmca Curve (bank angle vs adjusted Vmca + turn rate) ---
+    stage("dynamic_vmca")
+    if "vmca" in all_overlays and model.engine_count > 1 and oei_active:
+        published_vmca = model.vmca if model.vmca is not None else 70
+        reference_weight = model.max_weight
+        cg_range = model.cg_range
+
+        # Sweep bank angle from 5° to 90°
+        bank_angles = np.linspace(5, 90, 150)
+
+        _, vmca_vals_kias = calculate_vmca(
+            published_vmca=published_vmca,
+            power_fraction=power_fraction,
+            total_weight=weight,
+            reference_weight=reference_weight,
+            cg=cg,
+            cg_range=cg_range,
+            prop_condition=prop_mode,
+            pressure_altitude=pressure_altitude,
+            oat_c=oat_c,
+            bank_angles_deg=bank_angles
+        )
+
+        vmca_vals_display_full = convert_display_airspeed(vmca_vals_kias, unit)
+
+        # Convert bank angle to turn rate
+        v_fts = vmca_vals_kias * KTS_TO_FPS
+        bank_rad = np.radians(bank_angles)
+        omega_rad = g * np.tan(bank_rad) / v_fts
+        turn_rates_full = np.degrees(omega_rad)
+
+        # Save first point for label (before clipping)
+        dvmc_label_value = vmca_vals_display_full[0]
+        dvmc_label_tr = turn_rates_full[0]
+
+        # ✅ Clip to envelope - must be within lift limit (stall boundary)
+        stall_tr_limit = np.interp(vmca_vals_kias, stall_clipped_x, stall_clipped_y)
+        valid_mask = (turn_rates_full >= y_min) & (turn_rates_full <= y_max) & (turn_rates_full <= stall_tr_limit)
+
+        # Always show DVmc label with calculated value (even if off scale);
+        # position at edge of graph if value is beyond visible range
+        estimated_x_max = max_speed * 1.1 if unit == "KIAS" else max_speed * KTS_TO_MPH * 1.1
+        result.dvmc = {
+            "x": vmca_vals_display_full[valid_mask],
+            "y": turn_rates_full[valid_mask],
+            "bank": bank_angles[valid_mask],
+            "label_value": dvmc_label_value,
+            "label_y": min(dvmc_label_tr, y_max * 0.95),  # Keep label visible within plot
+            "label_off_scale": dvmc_label_value > estimated_x_max,
+            "label_x": estimated_x_max * 0.95 if dvmc_label_value > estimated_x_max else dvmc_label_value,
+        }
+
+    # === Dynamic Vyse Marker and Curve ===
+    stage("dynamic_vyse")
+    turn_rates = None
+    if "dynamic_vyse" in all_overlays and model.engine_count > 1 and oei_active:
+        published_vyse = model.vyse
+        reference_weight = model.max_weight
+
+        # --- Sweep bank angle to visualize how Vyse performance changes with AOB
+        bank_angles = np.linspace(5, 60, 120)
+        vyse_curve = []
+
+        for angle in bank_angles:
+            angle_penalty = 1.0 + 0.003 * (angle - 5)
+            vyse_val = calculate_dynamic_vyse(
+                published_vyse=published_vyse,
+                total_weight=weight,
+                reference_weight=reference_weight,
+                pressure_altitude=pressure_altitude,
+                oat_c=oat_c,
+                gear_position=gear,
+                flap_config=config,
+                prop_condition=prop_mode
+            )
+            vyse_curve.append(vyse_val * angle_penalty)
+
+        vyse_curve = np.clip(vyse_curve, min(g_curve_x), max(g_curve_x))
+        vyse_display_curve_full = convert_display_airspeed(np.array(vyse_curve), unit)
+
+        v_fts = np.array(vyse_curve) * KTS_TO_FPS
+        bank_rad = np.radians(bank_angles)
+        omega_rad = g * np.tan(bank_rad) / v_fts
+        turn_rates_full = np.degrees(omega_rad)
+
+        # Save first point for label (before clipping)
+        dvyse_label_value = vyse_display_curve_full[0]
+        dvyse_label_tr = turn_rates_full[0]
+
+        # ✅ Clip to envelope - must be within lift limit (stall boundary)
+        vyse_curve_arr = np.array(vyse_curve)
+        stall_tr_limit = np.interp(vyse_curve_arr, stall_clipped_x, stall_clipped_y)
+
+        valid_mask = (turn_rates_full >= y_min) & (turn_rates_full <= y_max) & (turn_rates_full <= stall_tr_limit)
+        bank_angles_masked = bank_angles[valid_mask]
+        vyse_display_curve = vyse_display_curve_full[valid_mask]
+        turn_rates = turn_rates_full[valid_mask]
+
+        if len(vyse_display_curve) > 0:
+            y_max = max(y_max, turn_rates[0] * 1.05)
+
+        result.dvyse = {
+            "x": vyse_display_curve,
+            "y": turn_rates,
+            "bank": bank_angles_masked,
+            "label_value": dvyse_label_value,
+            "label_y": min(dvyse_label_tr, y_max * 0.90),
+        }
+
+        # --- Published Vyse Line (Static Reference) ---
+        if oei_active and published_vyse:
+            vyse_display = convert_display_airspeed(published_vyse, unit)
+            vyse_y_top = np.interp(published_vyse, g_clipped_x, g_clipped_y) if g_clipped_x else 0
+            result.vyse_published = (vyse_display, vyse_y_top)
+
+        # --- Published Vxse Line (Static Reference) ---
+        published_vxse = model.vxse
+        if oei_active and published_vxse:
+            vxse_display = convert_display_airspeed(published_vxse, unit)
+            vxse_y_top = np.interp(published_vxse, g_clipped_x, g_clipped_y) if g_clipped_x else 0
+            result.vxse_published = (vxse_display, vxse_y_top)
+
+    # --- Enhanced Hover Grid (Always Present) ---
+    stage("hover_grid")
+    hover_ias_step = 5  # IAS increment for hover grid
+    hover_tr_step = 2   # Turn rate increment for hover grid
+
+    # Create grid spanning the envelope
+    hover_ias_range = np.arange(ias_start, max_speed_internal + 1, hover_ias_step)
+    hover_tr_range = np.arange(0, 50, hover_tr_step)  # Positive turn rates
+
+    hover_data = []  # Will hold [AOB, G, Ps, Radius] for each point
+
+    for ias in hover_ias_range:
+        for tr in hover_tr_range:
+            v_fps = ias * KTS_TO_FPS
+            omega_rad = tr * (np.pi / 180)
+
+            # Calculate AOB from turn rate
+            aob_deg = np.degrees(np.arctan(omega_rad * v_fps / g))
+
+            # Calculate load factor (G)
+            n = np.sqrt(1 + (v_fps * omega_rad / g) ** 2)
+
+            # Calculate turn radius (ft -> nm for display)
+            if omega_rad > 0.001:
+                radius_ft = (v_fps ** 2) / (g * np.tan(np.radians(aob_deg))) if aob_deg > 0.5 else float('inf')
+                radius_nm = radius_ft / 6076.12 if radius_ft < 1e6 else float('inf')
+            else:
+                radius_ft = float('inf')
+                radius_nm = float('inf')
+
+            # Calculate Ps at this point
+            q = 0.5 * rho * v_fps ** 2
+            CL_hover = weight * n / (q * wing_area) if q > 0 else 0
+            CL_hover = min(CL_hover, cl_max)
+            CD_hover = (CD0 + (CL_hover ** 2) / pi_ar_e) * cg_drag_factor * gear_drag_factor
+            D_hover = q * wing_area * CD_hover
+
+            V_fraction = np.clip(ias / V_max_kts, 0, 1)
+            T_hover = T_static * (1 - V_fraction ** 2)
+
+            Ps_hover = ((T_hover - D_hover) * v_fps / weight) * FPS_TO_KTS
+
+            # Check if point is within envelope (above stall, below G limit)
+            stall_n = (0.5 * rho * v_fps**2 * wing_area * cl_max) / weight
+            n_limit = g_limit
+
+            if n <= min(stall_n, n_limit) and n >= 1.0 and ias <= max_speed_internal:
+                result.hover_x.append(convert_display_airspeed(ias, unit))
+                result.hover_y.append(tr)
+                hover_data.append([aob_deg, n, Ps_hover, radius_nm])
+
+    if hover_data:
+        result.hover_data = np.array(hover_data)
+
+    # --- Ps contour levels and labels ---
+    stage("ps_contours")
+    if "ps" in overlay_toggle:
+        try:
+            ps_min = int(np.floor(np.nanmin(Ps_masked) / 10.0)) * 10
+            ps_max = int(np.ceil(np.nanmax(Ps_masked) / 10.0)) * 10
+            ps_levels = list(range(ps_min, ps_max + 1, 10))
+
+            # Ps labels (anchor left side of envelope)
+            ps_labels = []
+            for level in ps_levels:
+                found = False
+                for j in range(len(ias_vals_ps_display)):
+                    for i in range(len(tr_vals_ps)):
+                        ps_val = Ps_masked[i, j]
+                        if np.isnan(ps_val):
+                            continue
+                        if np.isclose(ps_val, level, atol=2):
+                            ps_labels.append((ias_vals_ps_display[j] + 3, tr_vals_ps[i], level))
+                            found = True
+                            break
+                    if found:
+                        break
+
+            result.ps_contours = {
+                "min": ps_min,
+                "max": ps_max,
+                "levels": ps_levels,
+                "labels": ps_labels,
+            }
+        except Exception as e:
+            log.debug("Ps toggle failed: %s", e)
+
+        ###---Vmc published line----###
+        if model.engine_count > 1 and "enabled" in oei_toggle:
+            vmca_value = model.vmca
+
+            if isinstance(vmca_value, (int, float)):
+                vmca_converted = convert_display_airspeed(vmca_value, unit)
+                # Clip to envelope top
+                vmca_y_top = np.interp(vmca_value, g_clipped_x, g_clipped_y) if g_clipped_x else y_max
+                result.vmca_published = (vmca_converted, vmca_y_top)
+
+    # --- Final axis ranges ---
+    stage("axes")
+    ias_vals_display = convert_display_airspeed(ias_vals, unit)
+    x_min = max(0, min(ias_vals_display) - 2)  # two knot padding below ias_start
+    x_max = max_speed_display * 1.1
+
+    # Y-axis limits based on all plotted turn rate values
+    turn_rate_values = []
+    if stall_clipped_y: turn_rate_values += stall_clipped_y
+    if g_clipped_y: turn_rate_values += g_clipped_y
+    if "negative_g" in overlay_toggle:
+        turn_rate_values += neg_stall_y_clip
+        turn_rate_values += neg_g_y_clip
+    if "dynamic_vyse" in all_overlays and turn_rates is not None:
+        turn_rate_values += list(turn_rates)
+
+    if turn_rate_values:
+        y_max = max(turn_rate_values) * 1.1
+        y_min = min(turn_rate_values) * 1.1 if min(turn_rate_values) < 0 else 0
+    else:
+        y_max = 100
+        y_min = 0
+
+    result.x_range = (x_min, x_max)
+    result.y_range = (y_min, y_max)
+
+    # === STEEP TURN MANEUVER TRACE ===
+    stage("maneuvers")
+    if aob_values and ias_values and len(aob_values) > 0 and len(ias_values) > 0:
+        aob_input = aob_values[0]
+        ias_input = ias_values[0]
+
+        # Guard against None values
+        if ias_input is None or aob_input is None:
+            ias_input = 110  # default
+            aob_input = 45   # default
+
+        v_fts = ias_input * KTS_TO_FPS
+        bank_rad = np.radians(aob_input)
+        tr_deg = np.degrees(G_FT_S2 * np.tan(bank_rad) / v_fts)
+
+        # --- Energy Rate (Ps) at this point ---
+        n = 1 / np.cos(bank_rad)  # load factor for level constant altitude turn
+        q = 0.5 * rho * v_fts ** 2
+        CL = weight * n / (q * wing_area)
+        CL = min(CL, cl_max)  # Clip to CL_max like Ps grid does
+        CD = (CD0 + (CL ** 2) / pi_ar_e) * cg_drag_factor * gear_drag_factor
+        D = q * wing_area * CD
+
+        # Apply prop thrust model (same as Ps logic)
+        V_fraction = np.clip(ias_input / V_max_kts, 0, 1)
+        T_avail = T_static * (1 - V_fraction**2)
+
+        gamma_rad = np.radians(pitch_angle)
+        Ps_steep = ((T_avail - D) * v_fts / weight - v_fts * np.sin(gamma_rad)) * FPS_TO_KTS
+
+        log.debug("Steep turn: IAS %s KIAS, AOB %s°, turn rate %.1f°/s, Ps %.2f knots/sec",
+                  ias_input, aob_input, tr_deg, Ps_steep)
+
+        # Simplified steep turn trace: vertical line from 0 to operating point
+        arc_ias = [ias_input, ias_input]
+        result.steep_turn = {
+            "x": [ias * KTS_TO_MPH if unit == "MPH" else ias for ias in arc_ias],
+            "y": [0.0, tr_deg],
+            "aob": aob_input,
+            "turn_rate": tr_deg,
+            "load_factor": n,
+            "ps": Ps_steep,
+        }
+
+    # === GHOST TRACE (Ideal AOB based on ACS Standard) ===
+    # Handle both boolean (from Switch) and list (from Checklist)
+    ghost_val = steepturn_ghost_values[0] if steepturn_ghost_values else False
+    ghost_enabled = ghost_val is True or (isinstance(ghost_val, list) and "on" in ghost_val)
+    standard_selected = steepturn_standard_values and len(steepturn_standard_values[0]) > 0
+
+    if ghost_enabled and standard_selected:
+        # Determine AOB based on selected standard(s) - use first selection
+        selected_standard = steepturn_standard_values[0][0]  # "private" or "commercial"
+        ghost_aob = 45 if selected_standard == "private" else 50
+        ghost_ias = ias_values[0] if ias_values else 110  # fallback if none provided
+
+        v_fts = ghost_ias * KTS_TO_FPS
+        bank_rad = np.radians(ghost_aob)
+        ghost_tr = np.degrees(G_FT_S2 * np.tan(bank_rad) / v_fts)
+
+        ghost_tr_array = [0.0, ghost_tr, ghost_tr, 0.0, 0.0]
+        ghost_ias_array = [ghost_ias] * len(ghost_tr_array)
+        result.steep_turn_ghost = {
+            "x": [ias * KTS_TO_MPH if unit == "MPH" else ias for ias in ghost_ias_array],
+            "y": ghost_tr_array,
+            "aob": ghost_aob,
+            "standard": "Private" if selected_standard == "private" else "Commercial",
+        }
+
+    # === CHANDELLE MANEUVER TRACE ===
+    if maneuver == "chandelle" and chandelle_ias_values and chandelle_bank_values:
+        chandelle_ias = chandelle_ias_values[0]
+        chandelle_bank = chandelle_bank_values[0]
+        # Compute dynamic stall speed at 1G level turn
+        v_stall_1g = np.sqrt((2 * weight) / (rho * wing_area * cl_max)) * FPS_TO_KTS
+        stall_ias_kias = v_stall_1g
+
+        path = _chandelle_path(chandelle_ias, chandelle_bank, stall_ias_kias, unit)
+        if path is not None:
+            path["ghost"] = False
+            result.chandelles.append(path)
+
+        # Handle both boolean (from Switch) and list (from Checklist)
+        chandelle_ghost_val = chandelle_ghost_values[0] if chandelle_ghost_values else False
+        chandelle_ghost_on = chandelle_ghost_val is True or (isinstance(chandelle_ghost_val, list) and "on" in chandelle_ghost_val)
+        if chandelle_ghost_on:
+            path = _chandelle_path(chandelle_ias, 30, stall_ias_kias, unit)
+            if path is not None:
+                path["ghost"] = True
+                result.chandelles.append(path)
+
+    return result
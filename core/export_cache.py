@@ -0,0 +1,120 @@
+# core/export_cache.py
+
+"""
+Content-addressed on-disk cache for exported PNG/PDF bytes.
+Files are named by a hash of everything that affects the rendered output,
+so a repeat export is a file send instead of a renderer invocation.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+
+from .constants import EXPORT_CACHE_MAX_BYTES
+
+
+def default_export_cache_dir():
+    """Cache directory, overridable with the EXPORT_CACHE_DIR env var."""
+    return os.environ.get(
+        "EXPORT_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "aeroedge_export_cache"),
+    )
+
+
+class ExportCache:
+    """
+    Size-capped directory of rendered exports.
+
+    Least-recently-used files (by mtime, refreshed on every hit) are evicted
+    once the directory grows past max_bytes. Writes are atomic, so several
+    gunicorn workers can share one directory; the directory itself is
+    created on the first put(), not at import.
+    """
+    def __init__(self, directory=None, max_bytes=EXPORT_CACHE_MAX_BYTES):
+        self.directory = directory or default_export_cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._directory_ready = False
+
+    @staticmethod
+    def make_key(state_key, kind, width, height, scale=1):
+        """
+        Build the content address for an export.
+
+        Args:
+            state_key: Hash of the figure state (and any export-only inputs)
+            kind: "png" or "pdf"
+            width, height: Output size in pixels
+            scale: Renderer scale factor
+
+        Returns:
+            Hex digest used as the file name
+        """
+        raw = f"{state_key}|{kind}|{width}x{height}|{scale}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def path_for(self, key, kind):
+        return os.path.join(self.directory, f"{key}.{kind}")
+
+    def get(self, key, kind):
+        """Return the cached file path, or None on a miss."""
+        path = self.path_for(key, kind)
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put(self, key, kind, data):
+        """Store rendered bytes and return the cached file path."""
+        path = self.path_for(key, kind)
+        if not self._directory_ready:
+            os.makedirs(self.directory, exist_ok=True)
+            self._directory_ready = True
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._evict(keep=path)
+        return path
+
+    def _evict(self, keep=None):
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if not entry.is_file() or entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()  # oldest first
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue  # never evict the file about to be sent
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
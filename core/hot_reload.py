@@ -0,0 +1,124 @@
+# core/hot_reload.py
+
+"""
+Hot reload of the aircraft_data folder.
+
+A daemon thread polls the folder (one os.scandir per interval). When any
+file's mtime or size changes, the catalog is reloaded incrementally with
+load_catalog(previous=...), so only changed files are re-parsed. The new
+data is swapped into DynamicAircraftData atomically, and listeners are told
+which aircraft changed so they can drop derived cache entries.
+
+Every worker process runs its own poller against the shared folder, so a
+file written by one gunicorn worker reaches the others within one interval.
+The writing worker can call check() right away to see its own change.
+"""
+
+import os
+import threading
+
+from .catalog import load_catalog, scan_folder
+from .constants import AIRCRAFT_RELOAD_INTERVAL
+
+
+def changed_aircraft(old_manifest, new_manifest):
+    """Names of aircraft added, removed or modified between two manifests."""
+    old = {e["name"]: e["sha256"] for e in old_manifest.values() if e.get("name")}
+    new = {e["name"]: e["sha256"] for e in new_manifest.values() if e.get("name")}
+    return {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+
+
+class AircraftReloader:
+    """
+    Polls an aircraft folder and keeps a DynamicAircraftData current.
+
+    Args:
+        data: DynamicAircraftData to update
+        catalog: AircraftCatalog the data was loaded from
+        catalog_path: Bundle file passed through to load_catalog
+        interval: Seconds between scans
+    """
+    def __init__(self, data, catalog, catalog_path=None, interval=AIRCRAFT_RELOAD_INTERVAL):
+        self.data = data
+        self.catalog = catalog
+        self.catalog_path = catalog_path
+        self.interval = interval
+        self.reloads = 0
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def add_listener(self, callback):
+        """Register callback(changed_names) to run after each swap."""
+        self._listeners.append(callback)
+        return callback
+
+    def _stats_changed(self):
+        try:
+            stats = scan_folder(self.catalog.folder)
+        except OSError:
+            return False
+        manifest = self.catalog.manifest
+        if stats.keys() != manifest.keys():
+            return True
+        return any((manifest[f]["mtime_ns"], manifest[f]["size"]) != st for f, st in stats.items())
+
+    def check(self):
+        """
+        Reload now if any file changed.
+
+        Returns:
+            Set of aircraft names that changed (empty if nothing did)
+        """
+        with self._lock:
+            if not self._stats_changed():
+                return set()
+            previous = self.catalog
+            catalog = load_catalog(previous.folder, self.catalog_path, previous=previous)
+            changed = changed_aircraft(previous.manifest, catalog.manifest)
+            self.catalog = catalog
+            if not changed:
+                return set()
+            self.data.replace(catalog.aircraft, catalog.arrays, catalog.version(), changed)
+            self.reloads += 1
+        for filename, message in catalog.errors:
+            if filename in catalog.reparsed:
+                print(f"[RELOAD] Failed to load {filename}: {message}")
+        print(f"[RELOAD] Aircraft changed: {', '.join(sorted(changed))}")
+        for callback in self._listeners:
+            try:
+                callback(changed)
+            except Exception as e:
+                print(f"[RELOAD] Listener failed: {e}")
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"[RELOAD] Check failed: {e}")
+
+    def ensure_started(self):
+        """
+        Start the poller in this process if it is not running.
+
+        Threads do not survive fork, so this is safe to call on every request:
+        a worker forked from a preloaded master starts its own poller here.
+        """
+        if self.interval <= 0 or (self._pid == os.getpid() and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="aircraft-reload", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=self.interval + 1)
@@ -0,0 +1,82 @@
+# core/log.py
+
+"""
+Leveled logging whose disabled calls cost (almost) nothing.
+
+The message is only built once the level check passes:
+    log.debug("Ps min: %.2f", ps_min)            # %-args formatted lazily
+    log.debug(lambda: f"CL avg: {np.nanmean(CL):.2f}")  # callable evaluated lazily
+    if log.is_enabled(DEBUG):                     # guard a block of reductions
+        ...
+
+Unlike the stdlib logging module there are no handlers or propagation: one
+global level (LOG_LEVEL, or DEBUG when DEBUG_LOG is on) and print() output,
+matching the rest of the app's console messages.
+"""
+
+from .constants import DEBUG_LOG, LOG_LEVEL
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+_LEVELS_BY_NAME = {name: level for level, name in LEVEL_NAMES.items()}
+
+_level = DEBUG if DEBUG_LOG else _LEVELS_BY_NAME[LOG_LEVEL]
+_loggers = {}
+
+
+def set_level(level):
+    """Set the global level (number or name such as "DEBUG")."""
+    global _level
+    _level = _LEVELS_BY_NAME[level.upper()] if isinstance(level, str) else level
+
+
+def get_level():
+    return _level
+
+
+class Logger:
+    """Named logger; see get_logger()."""
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def is_enabled(self, level):
+        return level >= _level
+
+    def log(self, level, msg, *args):
+        if level < _level:
+            return
+        if callable(msg):
+            msg = msg()
+        if args:
+            msg = msg % args
+        print(f"[{LEVEL_NAMES.get(level, level)}] {self.name}: {msg}")
+
+    def debug(self, msg, *args):
+        if DEBUG >= _level:
+            self.log(DEBUG, msg, *args)
+
+    def info(self, msg, *args):
+        if INFO >= _level:
+            self.log(INFO, msg, *args)
+
+    def warning(self, msg, *args):
+        if WARNING >= _level:
+            self.log(WARNING, msg, *args)
+
+    def error(self, msg, *args):
+        if ERROR >= _level:
+            self.log(ERROR, msg, *args)
+
+
+def get_logger(name):
+    """Logger for a module, e.g. get_logger("em")."""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = Logger(name)
+    return logger
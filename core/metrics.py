@@ -0,0 +1,362 @@
+# core/metrics.py
+
+"""
+Minimal in-process metrics registry with Prometheus text exposition.
+
+Counters, gauges and histograms live in plain dicts guarded by one lock.
+render() produces the text format that Prometheus scrapes.
+
+Multi-process (gunicorn): when a shared directory is configured, every
+worker periodically writes its own snapshot there as "<pid>.json" (atomic
+replace). A scrape, served by any worker, merges all snapshots:
+  - counters and histograms are summed, including exited workers, so totals
+    never go backwards;
+  - gauges are reported per worker with a "pid" label, and only for workers
+    that are still running.
+
+An exited worker's counters and histograms are folded into one
+"exited.json" snapshot and its own file is deleted, either by gunicorn's
+child_exit hook (mark_process_dead) or at the next scrape. The directory
+stays at one file per live worker, and a reused PID never inherits stale
+counters.
+"""
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # no cross-process lock; fine for a single process
+    fcntl = None
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_BYTES_BUCKETS = tuple(1024 * 4 ** i for i in range(9))  # 1 KB .. 64 MB
+EXITED_SNAPSHOT = "exited.json"  # counters and histograms of exited workers
+
+
+def _label_key(labels):
+    return json.dumps(sorted(labels.items()), separators=(",", ":"))
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    escaped = (
+        f'{k}="' + str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') + '"'
+        for k, v in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _snapshot_pid(filename):
+    """Worker PID of a "<pid>.json" snapshot file, else None."""
+    name, ext = os.path.splitext(filename)
+    return int(name) if ext == ".json" and name.isdigit() else None
+
+
+def _merge_snapshot(merged, snap, gauges=True, pid_label=None):
+    """
+    Add one snapshot's samples into merged (name -> metric): counters and
+    histograms are summed; gauges are kept only when `gauges`, with a "pid"
+    label when pid_label is given.
+    """
+    for name, metric in snap["metrics"].items():
+        target = merged.setdefault(name, {**metric, "samples": {}})
+        for key, value in metric["samples"].items():
+            if metric["type"] == "gauge":
+                if not gauges:
+                    continue
+                if pid_label is not None:
+                    key = _label_key(dict(json.loads(key) + [["pid", pid_label]]))
+                target["samples"][key] = value
+            elif metric["type"] == "histogram":
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = {"counts": list(value["counts"]), "sum": value["sum"]}
+                else:
+                    current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+                    current["sum"] += value["sum"]
+            else:
+                target["samples"][key] = target["samples"].get(key, 0) + value
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name, help_text):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.samples = {}  # label key -> value
+
+    def snapshot(self):
+        with self.registry.lock:
+            return {"type": self.kind, "help": self.help, "samples": dict(self.samples)}
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self.registry.lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+
+    def set_total(self, value, **labels):
+        """Mirror a cumulative count kept elsewhere (e.g. LRUCache.hits)."""
+        with self.registry.lock:
+            self.samples[_label_key(labels)] = value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self.registry.lock:
+            self.samples[_label_key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self.registry.lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(registry, name, help_text)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self.registry.lock:
+            sample = self.samples.get(key)
+            if sample is None:
+                sample = self.samples[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    sample["counts"][i] += 1
+                    break
+            else:
+                sample["counts"][-1] += 1
+            sample["sum"] += value
+
+    def snapshot(self):
+        with self.registry.lock:
+            samples = {k: {"counts": list(v["counts"]), "sum": v["sum"]} for k, v in self.samples.items()}
+        return {"type": self.kind, "help": self.help, "buckets": list(self.buckets), "samples": samples}
+
+
+class MetricsRegistry:
+    """
+    Holds this process's metrics.
+
+    Args:
+        shared_dir: Directory for multi-process snapshots (None = this process only)
+        flush_interval: Minimum seconds between snapshot writes
+    """
+    def __init__(self, shared_dir=None, flush_interval=1.0):
+        self.shared_dir = shared_dir
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self._metrics = {}
+        self._collectors = []
+        self._last_flush = 0.0
+        self._shared_thread_lock = threading.Lock()
+        if shared_dir:
+            os.makedirs(shared_dir, exist_ok=True)
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text):
+        return self._register(Counter(self, name, help_text))
+
+    def gauge(self, name, help_text):
+        return self._register(Gauge(self, name, help_text))
+
+    def histogram(self, name, help_text, buckets=DEFAULT_LATENCY_BUCKETS):
+        return self._register(Histogram(self, name, help_text, buckets))
+
+    def add_collector(self, collect):
+        """
+        Register collect() to refresh gauges right before a snapshot, for
+        values that are cheaper to read on demand (RSS, queue depths).
+        """
+        self._collectors.append(collect)
+        return collect
+
+    def snapshot(self):
+        for collect in self._collectors:
+            try:
+                collect()
+            except Exception:
+                pass
+        return {"pid": os.getpid(), "metrics": {name: m.snapshot() for name, m in self._metrics.items()}}
+
+    def flush(self, force=False):
+        """Write this process's snapshot to the shared directory (throttled)."""
+        if not self.shared_dir:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        self._write_shared(f"{os.getpid()}.json", self.snapshot())
+
+    def _write_shared(self, filename, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.shared_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, os.path.join(self.shared_dir, filename))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @contextmanager
+    def _shared_lock(self):
+        """Serialize folding and reading snapshots across threads and workers."""
+        with self._shared_thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.shared_dir, ".lock"), "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _fold_exited(self, pid):
+        """Move a worker's counters and histograms into EXITED_SNAPSHOT (lock held)."""
+        path = os.path.join(self.shared_dir, f"{pid}.json")
+        try:
+            with open(path) as f:
+                snap = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            snap = None
+        if snap is not None:
+            merged = {}
+            try:
+                with open(os.path.join(self.shared_dir, EXITED_SNAPSHOT)) as f:
+                    _merge_snapshot(merged, json.load(f))
+            except (OSError, ValueError):
+                pass
+            _merge_snapshot(merged, snap, gauges=False)
+            self._write_shared(EXITED_SNAPSHOT, {"pid": None, "metrics": merged})
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def mark_process_dead(self, pid):
+        """
+        Fold an exited worker's snapshot into EXITED_SNAPSHOT and delete its
+        file; call from gunicorn's child_exit hook. Scrapes also do this for
+        any snapshot whose process is gone.
+        """
+        if not self.shared_dir:
+            return
+        with self._shared_lock():
+            self._fold_exited(pid)
+
+    def _snapshots(self):
+        if not self.shared_dir:
+            return [self.snapshot()]
+        self.flush(force=True)
+        snapshots = []
+        with self._shared_lock():
+            for filename in os.listdir(self.shared_dir):
+                pid = _snapshot_pid(filename)
+                if pid is not None and pid != os.getpid() and not _pid_alive(pid):
+                    self._fold_exited(pid)
+            for filename in os.listdir(self.shared_dir):
+                if not filename.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(self.shared_dir, filename)) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue  # replaced mid-read; next scrape picks it up
+        return snapshots
+
+    def render(self):
+        """Prometheus text exposition of all processes' metrics."""
+        merged = {}
+        multiprocess = bool(self.shared_dir)
+        for snap in self._snapshots():
+            pid = snap["pid"]
+            if not multiprocess:
+                _merge_snapshot(merged, snap)
+                continue
+            alive = pid is not None and (pid == os.getpid() or _pid_alive(pid))
+            _merge_snapshot(merged, snap, gauges=alive, pid_label=str(pid))
+
+        lines = []
+        for name in sorted(merged):
+            metric = merged[name]
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            for key, value in sorted(metric["samples"].items()):
+                pairs = [tuple(p) for p in json.loads(key)]
+                if metric["type"] != "histogram":
+                    lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(metric["buckets"]) + [math.inf], value["counts"]):
+                    cumulative += count
+                    le = _format_labels(pairs + [("le", _format_value(float(bound)))])
+                    lines.append(f"{name}_bucket{le} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(pairs)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def process_rss_bytes():
+    """Resident set size of this process, or 0 where it can't be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        import sys
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # peak, not current
+        return rss if sys.platform == "darwin" else rss * 1024
+    except (ImportError, OSError):
+        return 0
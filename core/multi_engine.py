@@ -0,0 +1,242 @@
+# core/multi_engine.py
+
+"""
+Multi-engine (OEI) speed models.
+Dynamic Vmca and dynamic Vyse as functions of power, weight, CG, prop
+condition, configuration and density altitude.
+"""
+
+import numpy as np
+
+from .calculations import KTS_TO_MPH, TEMP_SL_C, LAPSE_RATE_K_FT
+
+
+def calculate_vmca(
+    published_vmca,
+    power_fraction,
+    total_weight,
+    reference_weight,
+    cg,
+    cg_range,
+    prop_condition,
+    pressure_altitude=0,
+    oat_c=15,
+    unit="KIAS",
+    bank_angles_deg=np.linspace(-5, 10, 50)
+):
+    """
+    Returns Vmca values across a range of bank angles based on power, weight, CG,
+    prop condition, and density altitude.
+
+    Physics basis:
+    - Vmc is the minimum speed at which directional control can be maintained with
+      critical engine inoperative and max power on the operating engine
+    - Published Vmc is typically at: max gross weight, most aft CG, sea level,
+      5° bank into dead engine, critical engine windmilling/feathered
+
+    Args:
+        published_vmca: Published Vmca speed (KIAS) - typically at max weight, aft CG
+        power_fraction: Power setting on operating engine (0-1)
+        total_weight: Current aircraft weight (lbs)
+        reference_weight: Weight at which Vmca was published (typically max gross)
+        cg: Current CG position
+        cg_range: [forward_limit, aft_limit] CG range
+        prop_condition: "feathered", "stationary", or "windmilling"
+        pressure_altitude: Pressure altitude in feet
+        oat_c: Outside air temperature in Celsius
+        unit: Output unit ("KIAS" or "MPH")
+        bank_angles_deg: Array of bank angles to compute Vmca for
+
+    Returns:
+        (bank_angles_deg, vmca_vals): Tuple of bank angles and corresponding Vmca values
+    """
+    # --- Extract usable numeric Vmca if a dict was passed ---
+    if isinstance(published_vmca, dict):
+        published_vmca = published_vmca.get("clean_up") or next(iter(published_vmca.values()), None)
+
+    if not isinstance(published_vmca, (int, float)):
+        return bank_angles_deg, np.full_like(bank_angles_deg, np.nan)
+
+    # --- Calculate density altitude for altitude effects ---
+    isa_temp_c = TEMP_SL_C - (pressure_altitude * LAPSE_RATE_K_FT)
+    temp_dev_c = oat_c - isa_temp_c
+    density_altitude = pressure_altitude + (120 * temp_dev_c)
+
+    # --- Base modifier (1.0 = no change from published) ---
+    modifiers = np.ones_like(bank_angles_deg, dtype=float)
+
+    # --- Power effect ---
+    # Lower power = less asymmetric thrust = lower Vmc
+    # At full power: modifier = 1.0 (published condition)
+    # At 50% power: modifier ≈ 0.85
+    # At idle: modifier ≈ 0.70
+    power_mod = 0.70 + 0.30 * power_fraction
+    modifiers *= np.clip(power_mod, 0.70, 1.05)
+
+    # --- Weight effect ---
+    # Lighter weight = less inertia to resist yaw = higher Vmc
+    # Published Vmc is at max gross, so lighter = higher Vmc
+    # Typical effect: ~1 kt per 100 lbs from max gross
+    weight_ratio = total_weight / reference_weight
+    # Invert: lighter (ratio < 1) should increase Vmc
+    weight_factor = 1.0 + 0.15 * (1.0 - weight_ratio)
+    modifiers *= np.clip(weight_factor, 0.90, 1.15)
+
+    # --- CG effect ---
+    # Aft CG = shorter moment arm for rudder = higher Vmc
+    # Published Vmc is typically at aft CG limit
+    # Forward CG improves directional control (lower Vmc)
+    cg_span = cg_range[1] - cg_range[0]
+    if cg_span > 0:
+        # cg_percent: 0 = forward limit, 1 = aft limit
+        cg_percent = (cg - cg_range[0]) / cg_span
+        # At forward CG: slight reduction; at aft CG: baseline (published condition)
+        cg_factor = 0.96 + 0.04 * cg_percent
+    else:
+        cg_factor = 1.0
+    modifiers *= cg_factor
+
+    # --- Density altitude effect ---
+    # Higher DA = less power available from operating engine = lower Vmc
+    # Also less rudder effectiveness, but power effect dominates
+    # Typical: ~1% reduction per 3,000 ft DA
+    da_factor = 1.0 - (density_altitude / 30000.0) * 0.10
+    modifiers *= np.clip(da_factor, 0.85, 1.0)
+
+    # --- Prop condition effect ---
+    # Windmilling: max drag/yaw from dead engine = highest Vmc
+    # Feathered: minimum drag = lowest Vmc
+    prop_factors = {
+        "windmilling": 1.08,   # +8% - significant yaw from windmilling prop
+        "stationary": 1.03,    # +3% - some drag, no rotation
+        "feathered": 0.92      # -8% - minimum drag, best case
+    }
+    modifiers *= prop_factors.get(prop_condition, 1.0)
+
+    # --- Bank angle effect (refined model) ---
+    # The relationship between bank and Vmc is nonlinear:
+    # - Wings level (0°): High sideslip needed, moderate Vmc
+    # - 5° into dead engine: Optimal - sideslip eliminated, lowest Vmc
+    # - Bank away from dead engine (negative): Dramatically increases Vmc
+    # - Excessive bank into dead engine (>5°): Increases Vmc due to increased
+    #   load factor and loss of vertical lift component
+    bank_mod = np.ones_like(bank_angles_deg, dtype=float)
+    for i, bank in enumerate(bank_angles_deg):
+        if bank < 0:
+            # Banking away from dead engine - significant Vmc increase
+            # Up to +15% at -5° bank
+            bank_mod[i] = 1.0 + 0.03 * abs(bank)
+        elif 0 <= bank <= 5:
+            # Optimal range - Vmc decreases as bank approaches 5°
+            # Minimum at 5° (published condition)
+            bank_mod[i] = 1.0 - 0.04 * (bank / 5.0)
+        else:
+            # Beyond optimal bank - Vmc increases due to load factor
+            # Gradual increase: ~0.5% per degree beyond 5°
+            bank_mod[i] = 0.96 + 0.005 * (bank - 5)
+
+    modifiers *= bank_mod
+
+    # --- Final Vmca array ---
+    vmca_vals = published_vmca * modifiers
+
+    # Convert to MPH if needed
+    if unit == "MPH":
+        vmca_vals = vmca_vals * KTS_TO_MPH
+
+    return bank_angles_deg, vmca_vals
+
+
+def calculate_dynamic_vyse(
+    published_vyse,
+    total_weight,
+    reference_weight,
+    pressure_altitude=0,
+    oat_c=15,
+    gear_position="up",
+    flap_config="clean",
+    prop_condition="feathered"
+):
+    """
+    Compute dynamic Vyse (best single-engine rate of climb speed) based on weight,
+    density altitude, configuration, and prop condition.
+
+    Physics basis:
+    - Vyse is the speed that provides best rate of climb with one engine inoperative
+    - It's determined by the point where excess thrust power is maximum
+    - Weight affects required lift and thus optimal L/D point
+    - Density altitude affects available power from operating engine
+    - Configuration (gear, flaps) affects drag and optimal speed
+
+    Args:
+        published_vyse: Baseline Vyse (KIAS) - typically at max gross, sea level
+        total_weight: Current aircraft weight (lbs)
+        reference_weight: Weight at which Vyse is published (typically max gross)
+        pressure_altitude: Pressure altitude in feet
+        oat_c: Outside air temperature in Celsius
+        gear_position: "up" or "down"
+        flap_config: "clean", "takeoff", or "landing"
+        prop_condition: "feathered", "stationary", or "windmilling"
+
+    Returns:
+        Adjusted Vyse in KIAS
+    """
+    # --- Calculate density altitude ---
+    isa_temp_c = TEMP_SL_C - (pressure_altitude * LAPSE_RATE_K_FT)
+    temp_dev_c = oat_c - isa_temp_c
+    density_altitude = pressure_altitude + (120 * temp_dev_c)
+
+    # --- Weight effect ---
+    # Heavier aircraft needs to fly faster for optimal L/D
+    # Vyse scales approximately with sqrt(weight ratio) for constant L/D
+    # Simplified: ~5% change for 10% weight change
+    weight_ratio = total_weight / reference_weight
+    weight_factor = 1.0 + 0.5 * (weight_ratio - 1.0)
+    weight_factor = np.clip(weight_factor, 0.92, 1.08)
+
+    # --- Density altitude effect (refined) ---
+    # At higher DA, TAS increases for same IAS, but available power decreases
+    # The optimal IAS actually decreases slightly at altitude because:
+    # - Less power available means flying at lower speed for best L/D
+    # - But also less margin, so slightly higher IAS for safety
+    # Net effect: very small change, approximately +0.5% per 5,000 ft DA
+    # This is much less than the original 2% per 10,000 ft
+    da_factor = 1.0 + (density_altitude / 50000.0) * 0.05
+    da_factor = np.clip(da_factor, 1.0, 1.03)
+
+    # --- Gear effect ---
+    # Gear down = more drag = shifts L/D curve right = higher Vyse
+    # Typical effect: +3-5% with gear down
+    gear_factor = 1.04 if gear_position == "down" else 1.0
+
+    # --- Flap effect ---
+    # Flaps increase both lift and drag, shifting optimal speed
+    # More flaps = more drag penalty = higher optimal speed
+    flap_factors = {
+        "clean": 1.00,
+        "takeoff": 1.02,    # Small increase
+        "landing": 1.05     # Larger increase due to more drag
+    }
+    config_factor = flap_factors.get(flap_config, 1.00)
+
+    # --- Prop condition effect ---
+    # Dead engine prop condition affects total drag
+    # More drag from dead engine = need to fly slightly faster
+    prop_factors = {
+        "feathered": 0.98,    # Minimum drag - can fly slightly slower
+        "stationary": 1.02,   # Moderate drag
+        "windmilling": 1.05   # Maximum drag - need more speed
+    }
+    prop_factor = prop_factors.get(prop_condition, 1.0)
+
+    # --- Final dynamic Vyse ---
+    adjusted_vyse = (
+        published_vyse
+        * weight_factor
+        * da_factor
+        * gear_factor
+        * config_factor
+        * prop_factor
+    )
+
+    return adjusted_vyse
@@ -0,0 +1,185 @@
+# core/perf.py
+
+"""
+Lightweight request tracing for finding slow renders.
+
+A trace covers one request (a graph update, an export). Inside it:
+  - span(name) is a context manager timing a nested block;
+  - stage(name) marks the start of the next section of a long function
+    (compute_em), closing the previous stage, so the sections need no
+    re-indenting.
+
+Outside an active trace both are a single context-variable lookup, so the
+calls can stay in hot code permanently. Finished traces go into a bounded
+per-process ring buffer (PERF_TRACES) that /debug/perf reads.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .constants import PERF_TRACE_ENABLED, PERF_TRACE_BUFFER_SIZE
+
+_current = ContextVar("em_perf_trace", default=None)
+
+
+class Trace:
+    """
+    One traced request.
+
+    spans holds (name, depth, offset_s, duration_s) tuples in completion
+    order; sort by offset for a timeline.
+    """
+    __slots__ = ("name", "meta", "started_at", "duration", "spans", "error", "_t0", "_stack")
+
+    def __init__(self, name, meta=None):
+        self.name = name
+        self.meta = dict(meta or {})
+        self.started_at = time.time()
+        self.duration = None
+        self.spans = []
+        self.error = None
+        self._t0 = time.perf_counter()
+        self._stack = []  # open frames: [name, start, is_stage]
+
+    def _pop(self, now):
+        name, start, _ = self._stack.pop()
+        self.spans.append((name, len(self._stack), start - self._t0, now - start))
+
+    def _open_span(self, name):
+        self._stack.append([name, time.perf_counter(), False])
+        return len(self._stack)
+
+    def _close_span(self, level):
+        now = time.perf_counter()
+        while len(self._stack) >= level:
+            self._pop(now)
+
+    def _stage(self, name):
+        now = time.perf_counter()
+        if self._stack and self._stack[-1][2]:
+            self._pop(now)
+        self._stack.append([name, now, True])
+
+    def _finish(self):
+        now = time.perf_counter()
+        while self._stack:
+            self._pop(now)
+        self.duration = now - self._t0
+
+    def breakdown(self):
+        """Spans sorted by start time, as dicts for display."""
+        return [
+            {"name": name, "depth": depth, "offset_ms": offset * 1000, "duration_ms": duration * 1000}
+            for name, depth, offset, duration in sorted(self.spans, key=lambda s: (s[2], s[1]))
+        ]
+
+
+class TraceBuffer:
+    """Bounded, thread-safe store of the most recent finished traces."""
+
+    def __init__(self, capacity=PERF_TRACE_BUFFER_SIZE):
+        self._traces = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def record(self, trace):
+        with self._lock:
+            self._traces.append(trace)
+
+    def recent(self):
+        with self._lock:
+            return list(self._traces)
+
+    def slowest(self, limit=20, name=None):
+        traces = [t for t in self.recent() if name is None or t.name == name]
+        return sorted(traces, key=lambda t: t.duration, reverse=True)[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+
+PERF_TRACES = TraceBuffer()
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("trace", "name", "level")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.level = self.trace._open_span(self.name)
+        return self.trace
+
+    def __exit__(self, *exc):
+        self.trace._close_span(self.level)
+        return False
+
+
+def span(name):
+    """Time a block as a child of the current trace (no-op without one)."""
+    current = _current.get()
+    if current is None:
+        return _NOOP
+    return _Span(current, name)
+
+
+def stage(name):
+    """End the current stage (if any) and start the next one."""
+    current = _current.get()
+    if current is not None:
+        current._stage(name)
+
+
+def annotate(**meta):
+    """Attach extra fields (cache hits, sizes) to the current trace."""
+    current = _current.get()
+    if current is not None:
+        current.meta.update(meta)
+
+
+@contextmanager
+def trace(name, meta=None, buffer=None, enabled=None):
+    """
+    Trace one request and record it when the block exits.
+
+    Args:
+        name: Request kind, e.g. "update_graph"
+        meta: Input state to show next to the timings
+        buffer: TraceBuffer to record into (default PERF_TRACES)
+        enabled: Override PERF_TRACE_ENABLED
+
+    Yields:
+        The Trace, or None when tracing is off or a trace is already active
+    """
+    if not (PERF_TRACE_ENABLED if enabled is None else enabled) or _current.get() is not None:
+        yield None
+        return
+    current = Trace(name, meta)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        _current.reset(token)
+        current._finish()
+        (buffer if buffer is not None else PERF_TRACES).record(current)
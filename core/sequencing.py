@@ -0,0 +1,101 @@
+# core/sequencing.py
+
+"""
+Per-session ordering of render requests.
+
+The browser tags each graph request with a token {"session": id, "seq": n},
+n increasing within the session. A worker keeps the newest seq it has seen
+per session, lets one render per session run at a time, and drops requests
+that are older than the newest: a slider burst that queues up behind a
+running render coalesces to its last value.
+
+State is per worker process. A burst spread across workers is only
+coalesced within each one; the browser discards stale responses anyway.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+def _parse_token(token):
+    """(session, seq) from a client token, or None when missing / malformed."""
+    if not isinstance(token, dict):
+        return None
+    session, seq = token.get("session"), token.get("seq")
+    if not isinstance(session, str) or not isinstance(seq, int) or isinstance(seq, bool):
+        return None
+    return session, seq
+
+
+class _Session:
+    __slots__ = ("latest", "lock")
+
+    def __init__(self, seq):
+        self.latest = seq
+        self.lock = threading.Lock()
+
+
+class RenderSequencer:
+    """
+    Drop superseded render requests and serialize renders per session.
+
+    Usage:
+        with sequencer.turn(token) as current:
+            if not current:
+                return no_update   # a newer request from this session exists
+            ...render...
+
+    Requests without a (valid) token are never dropped or serialized.
+    """
+    def __init__(self, max_sessions=1024):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _register(self, session, seq):
+        with self._lock:
+            entry = self._sessions.get(session)
+            if entry is None:
+                entry = self._sessions[session] = _Session(seq)
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                entry.latest = max(entry.latest, seq)
+                self._sessions.move_to_end(session)
+            return entry
+
+    @contextmanager
+    def turn(self, token):
+        """
+        Yield whether the request is still the newest one seen for its
+        session; a current request first waits for the session's previous
+        render, a superseded one is answered at once.
+        """
+        parsed = _parse_token(token)
+        if parsed is None:
+            yield True
+            return
+        session, seq = parsed
+        entry = self._register(session, seq)
+        if seq < entry.latest:
+            # Already superseded: answer now instead of holding a server
+            # thread until this tab's running render finishes
+            yield False
+            return
+        with entry.lock:
+            yield seq >= entry.latest
+
+    def superseded(self, token):
+        """True when a newer request from the token's session has arrived."""
+        parsed = _parse_token(token)
+        if parsed is None:
+            return False
+        session, seq = parsed
+        with self._lock:
+            entry = self._sessions.get(session)
+            return entry is not None and seq < entry.latest
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
@@ -0,0 +1,204 @@
+# =============================================================================
+# EM Diagram Generator - Batch Fleet Report
+# =============================================================================
+"""
+Render EM sheets for many aircraft in one command (an "EM book").
+
+Each sheet uses the same physics as the update_graph callback and the same
+summary header/footer as the PDF export. Work is fanned out over a process
+pool and pages are streamed to disk as they complete, in a stable order.
+
+Usage:
+    python fleet_report.py --out em_book.pdf
+    python fleet_report.py --format png --out em_sheets/ --workers 8
+    python fleet_report.py --aircraft "Cessna 172S" "Piper PA-28-181" --configs clean
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.em import DEFAULT_STATE_OVERLAYS, DEFAULT_STATE_PAX_WEIGHT, DEFAULT_STATE_POWER, compute_em, default_state
+from ui.em_figure import render_em_figure
+from ui.export import decorate_export_figure, get_export_summary_lines
+
+PAGE_WIDTH = 1100
+PAGE_HEIGHT = 800
+
+
+def default_graph_state(ac_name, ac, config, category, overlays=None, power_fraction=DEFAULT_STATE_POWER,
+                        altitude_ft=0, unit="KIAS"):
+    """
+    Build the update_graph inputs the UI would hold right after selecting
+    this aircraft, config and category.
+
+    Returns:
+        (state, summary_kwargs) - update_graph state dict and the extra
+        fields needed for the export summary header
+    """
+    state = default_state(ac_name, ac, config, category, overlays=overlays,
+                          power_fraction=power_fraction, altitude_ft=altitude_ft, unit=unit)
+    summary_kwargs = {"pax_weight": DEFAULT_STATE_PAX_WEIGHT}
+    return state, summary_kwargs
+
+
+def iter_jobs(aircraft, names=None, configs=None, categories=None, **state_kwargs):
+    """Yield (title, state, summary_kwargs) for every aircraft x config x category."""
+    for ac_name in sorted(names or aircraft.keys()):
+        ac = aircraft.get(ac_name)
+        if ac is None:
+            print(f"[WARNING] Unknown aircraft: {ac_name}")
+            continue
+        ac_configs = ac.get("configuration_options", {}).get("flaps", [])
+        ac_categories = list(ac.get("G_limits", {}).keys())
+        for config in ac_configs:
+            if configs and config not in configs:
+                continue
+            for category in ac_categories:
+                if categories and category not in categories:
+                    continue
+                g_block = ac["G_limits"][category].get(config)
+                if isinstance(g_block, dict) and (g_block.get("positive") or 0) <= 1.0:
+                    continue  # category not approved in this config
+                state, summary_kwargs = default_graph_state(ac_name, ac, config, category, **state_kwargs)
+                yield f"{ac_name} - {config} - {category}", state, summary_kwargs
+
+
+# =============================================================================
+# WORKER PROCESS
+# =============================================================================
+# Workers only need core (physics, aircraft data) and ui (Plotly rendering),
+# not the Dash app with its layouts and callbacks.
+def build_sheet(state, summary_kwargs):
+    """Decorated EM figure for one sheet, as the PDF export draws it."""
+    from datetime import datetime
+
+    fig = render_em_figure(compute_em(state))
+    summary_lines = get_export_summary_lines(
+        state["ac_name"], state["engine_name"], state["config"], state["gear"],
+        state["occupants"], summary_kwargs["pax_weight"], state["fuel"], state["total_weight"],
+        state["power_fraction"], state["altitude_ft"], state["oei_toggle"], state["prop_condition"],
+        state["maneuver"], state["oat_c"], state["unit"], state["cg"], state["overlay_toggle"],
+    )
+    summary_lines.insert(0, f"Category: {state['selected_category'].capitalize()}")
+    return decorate_export_figure(fig, summary_lines, datetime.now().strftime("%Y-%m-%d %H:%M"))
+
+
+def render_sheet(job):
+    """
+    Render one EM sheet to PNG bytes.
+
+    Returns:
+        (title, png_bytes, error) - error is None on success
+    """
+    title, state, summary_kwargs, scale = job
+    try:
+        import plotly.io as pio
+
+        fig = build_sheet(state, summary_kwargs)
+        png = pio.to_image(fig, format="png", width=PAGE_WIDTH, height=PAGE_HEIGHT, scale=scale)
+        return title, png, None
+    except Exception as e:
+        return title, None, f"{type(e).__name__}: {e}"
+
+
+# =============================================================================
+# OUTPUT SINKS
+# =============================================================================
+class PdfBookWriter:
+    """Append rendered pages to a single multi-page PDF as they arrive."""
+    def __init__(self, path, resolution=150.0):
+        self.path = path
+        self.resolution = resolution
+        self.pages = 0
+
+    def add(self, title, png):
+        from io import BytesIO
+        from PIL import Image
+
+        img = Image.open(BytesIO(png)).convert("RGB")
+        img.save(self.path, "PDF", resolution=self.resolution, append=self.pages > 0, title="EM Book")
+        self.pages += 1
+
+    def close(self):
+        pass
+
+
+class PngDirectoryWriter:
+    """Write each rendered page to its own PNG file."""
+    def __init__(self, directory):
+        self.directory = directory
+        self.pages = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def add(self, title, png):
+        self.pages += 1
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in title)
+        with open(os.path.join(self.directory, f"{self.pages:04d}_{safe}.png"), "wb") as f:
+            f.write(png)
+
+    def close(self):
+        pass
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render EM sheets for a fleet of aircraft.")
+    parser.add_argument("--out", default="em_book.pdf", help="Output PDF file, or directory for --format png")
+    parser.add_argument("--format", choices=["pdf", "png"], default="pdf")
+    parser.add_argument("--aircraft", nargs="*", help="Aircraft names (default: all in aircraft_data/)")
+    parser.add_argument("--configs", nargs="*", help="Flap configs to include (default: all)")
+    parser.add_argument("--categories", nargs="*", help="Categories to include (default: all)")
+    parser.add_argument("--overlays", default=",".join(DEFAULT_STATE_OVERLAYS),
+                        help="Comma-separated overlays (ps,g,radius,aob,negative_g)")
+    parser.add_argument("--power", type=float, default=DEFAULT_STATE_POWER, help="Power fraction (0.05-1.0)")
+    parser.add_argument("--altitude", type=int, default=0, help="Altitude in ft MSL")
+    parser.add_argument("--unit", choices=["KIAS", "MPH"], default="KIAS")
+    parser.add_argument("--scale", type=float, default=2, help="Renderer scale factor per page")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    from core import AIRCRAFT_DATA
+
+    overlays = [o for o in args.overlays.split(",") if o]
+    jobs = [
+        (title, state, summary_kwargs, args.scale)
+        for title, state, summary_kwargs in iter_jobs(
+            AIRCRAFT_DATA, args.aircraft, args.configs, args.categories,
+            overlays=overlays, power_fraction=args.power, altitude_ft=args.altitude, unit=args.unit,
+        )
+    ]
+    if not jobs:
+        print("[FLEET] Nothing to render.")
+        return 1
+
+    writer = PdfBookWriter(args.out) if args.format == "pdf" else PngDirectoryWriter(args.out)
+    print(f"[FLEET] Rendering {len(jobs)} sheets with {args.workers} workers -> {args.out}")
+
+    t_start = time.perf_counter()
+    failures = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # map() yields in submission order, so pages stream out in book order
+        for i, (title, png, error) in enumerate(pool.map(render_sheet, jobs, chunksize=1), start=1):
+            if error:
+                failures.append((title, error))
+                print(f"[FLEET] {i}/{len(jobs)} FAILED {title}: {error}")
+                continue
+            writer.add(title, png)
+            if i % 10 == 0 or i == len(jobs):
+                elapsed = time.perf_counter() - t_start
+                print(f"[FLEET] {i}/{len(jobs)} sheets ({i / elapsed:.2f} sheets/s)")
+    writer.close()
+
+    elapsed = time.perf_counter() - t_start
+    print(f"[FLEET] Wrote {writer.pages} sheets in {elapsed:.1f} s "
+          f"({writer.pages / elapsed:.2f} sheets/s, {args.workers} workers), {len(failures)} failed")
+    return 0 if not failures else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
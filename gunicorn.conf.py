@@ -0,0 +1,29 @@
+# gunicorn.conf.py
+#
+# Picked up automatically by `gunicorn app:server` run from this directory.
+
+import os
+
+# Import the app (Dash, the aircraft catalog) once in the master and fork
+# workers from it: workers start without re-importing anything and share the
+# loaded pages copy-on-write. Background threads (tracking sender, aircraft
+# reloader, metrics flush) start per worker on first use, so this is safe.
+preload_app = True
+
+# Threads per worker. A tab's burst of slider requests then reaches the
+# worker together, and the ones a newer request supersedes are dropped
+# before rendering (see core.sequencing).
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+
+def when_ready(server):
+    # Airports otherwise load on the first lookup in each worker
+    from core import AIRPORT_INDEX
+    AIRPORT_INDEX.load()
+
+
+def child_exit(server, worker):
+    # Fold the worker's counters into the shared exited snapshot before its
+    # PID can be reused (no-op without PROMETHEUS_MULTIPROC_DIR)
+    from app import METRICS
+    METRICS.mark_process_dead(worker.pid)
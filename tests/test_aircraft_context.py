@@ -0,0 +1,65 @@
+# test_aircraft_context.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+import app as em_app
+from core import aircraft_data
+from ui.aircraft_context import aircraft_ui_descriptor, total_weight
+
+TWIN = next(n for n in sorted(aircraft_data.keys()) if aircraft_data[n].get("engine_count", 1) > 1)
+
+
+def test_descriptor_for_every_aircraft():
+    for name in aircraft_data.keys():
+        ac = aircraft_data[name]
+        ui = aircraft_ui_descriptor(ac)
+        assert ui["config"] == ac["configuration_options"]["flaps"][0]
+        assert ui["engine"] in ac["engine_options"]
+        assert ui["cg_min"] <= ui["cg"] <= ui["cg_max"]
+        assert ui["cg_marks"][ui["cg_min"]] == "FWD" and ui["cg_marks"][ui["cg_max"]] == "AFT"
+        assert ui["fuel_marks"][ui["fuel_max"]] == str(ui["fuel_max"])
+        assert (ui["gear"] == "up") == ui["retractable"]
+        json.dumps(ui)
+
+    ui = aircraft_ui_descriptor(aircraft_data[TWIN])
+    assert ui["multi_engine"]
+    assert total_weight(ui, 10, 2, 170) == ui["empty_weight"] + 10 * ui["fuel_weight_per_gal"] + 340
+
+
+def test_one_response_per_selection():
+    client = em_app.server.test_client()
+    deps = json.loads(client.get("/_dash-dependencies").data)
+    dep = next(d for d in deps if d["output"].startswith("..category-select.options"))
+    outputs = [dict(zip(("id", "property"), o.split("."))) for o in dep["output"].strip(".").split("...")]
+
+    ui = em_app.get_aircraft_ui(TWIN)
+    current = {"occupants-select": ui["occupants"], "config-select": ui["config"], "oei-toggle": ["enabled"]}
+    body = {
+        "output": dep["output"],
+        "outputs": outputs,
+        "inputs": [{"id": "aircraft-select", "property": "value", "value": TWIN}],
+        "state": [dict(s, value=current.get(s["id"])) for s in dep["state"]],
+        "changedPropIds": ["aircraft-select.value"],
+    }
+    r = client.post("/_dash-update-component", json=body)
+    assert r.status_code == 200
+    response = json.loads(r.data)["response"]
+
+    # Unchanged values are not re-sent (they would re-trigger update_graph)
+    assert "value" not in response["occupants-select"] and "value" not in response["config-select"]
+    assert response["engine-select"]["value"] == ui["engine"]
+    assert response["cg-slider"]["value"] == ui["cg"]
+    assert response["multi-engine-toggles"]["style"] == {"display": "block"}
+    assert response["stored-total-weight"]["data"] == total_weight(ui, None, ui["occupants"], None)
+    assert em_app.get_aircraft_ui(TWIN) is ui
+
+
+if __name__ == "__main__":
+    test_descriptor_for_every_aircraft()
+    test_one_response_per_selection()
+    print("ALL AIRCRAFT CONTEXT TESTS PASSED!")
@@ -0,0 +1,69 @@
+# test_aircraft_model.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+from math import pi
+
+from core import aircraft_data, extract_vmca_value, interpolate_stall_speed
+from core.aircraft_model import AircraftModel
+from core.em import compute_em, default_state
+
+AC_NAME = "Cessna 172S" if "Cessna 172S" in aircraft_data else sorted(aircraft_data.keys())[0]
+
+
+def test_model_matches_raw_data():
+    for name in aircraft_data.keys():
+        ac = aircraft_data[name]
+        model = aircraft_data.get_model(name)
+        assert model is aircraft_data.get_model(name)  # built once
+        assert model.pi_ar_e == pi * ac.get("e", 0.8) * ac.get("aspect_ratio", 7.5)
+        assert model.vmca == extract_vmca_value(ac)
+        for config, table in ac.get("stall_speeds", {}).items():
+            for weight in (ac["empty_weight"], ac.get("max_weight", 3600)):
+                assert abs(model.stall_speed(config, weight) - interpolate_stall_speed(table, weight)) < 1e-9
+
+
+def test_g_limit_resolution():
+    ac = {
+        "engine_options": {"E": {"horsepower": 180}},
+        "G_limits": {
+            "normal": {"clean": {"positive": 3.8, "negative": -1.52}, "full": 2.0},
+            "utility": {"clean": {"positive": 4.4, "negative": "n/a"}},
+        },
+        "single_engine_limits": {"Vmca": {"gear_down": 61, "clean_up": 65}, "Vyse": 88},
+    }
+    model = AircraftModel.from_dict("Test", ac)
+    assert model.g_limit("normal", "clean") == (3.8, 1.52)
+    assert model.g_limit("normal", "full") == (2.0, 1.5)
+    assert model.g_limit("utility", "clean") == (4.4, 1.5)
+    assert model.g_limit("acrobatic", "clean") == (3.8, 1.5)
+    assert (model.vmca, model.vyse, model.vxse) == (65, 88, None)
+    assert model.stall_speed("clean", 2000) == 30  # no table
+    assert model.engines["E"].sea_level_max == 180
+
+
+def test_update_aircraft_rebuilds_model():
+    ac = aircraft_data[AC_NAME]
+    state = default_state(AC_NAME, ac)
+    before = compute_em(state)
+
+    edited = copy.deepcopy(ac)
+    edited["Vne"] = ac.get("Vne", 200) + 10
+    try:
+        aircraft_data.update_aircraft(AC_NAME, edited)
+        assert aircraft_data.get_model(AC_NAME).vne == edited["Vne"]
+        assert compute_em(state).max_speed == before.max_speed + 10
+    finally:
+        aircraft_data.update_aircraft(AC_NAME, ac)
+    assert compute_em(state).max_speed == before.max_speed
+
+
+if __name__ == "__main__":
+    test_model_matches_raw_data()
+    test_g_limit_resolution()
+    test_update_aircraft_rebuilds_model()
+    print("ALL AIRCRAFT MODEL TESTS PASSED!")
@@ -0,0 +1,87 @@
+# test_airports.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import tempfile
+
+from core.airports import AirportIndex, LazyAirportIndex, load_airport_index
+from core.aircraft_loader import get_airport_by_id
+
+AIRPORTS = [
+    {"id": "KJFK", "name": "John F Kennedy Intl", "elevation_ft": 13, "lat": 40.64, "lon": -73.78},
+    {"id": "KJFX", "name": "Jefferson Field", "elevation_ft": 540, "lat": 39.1, "lon": -80.2},
+    {"id": "KDEN", "name": "Denver Intl", "elevation_ft": 5434, "lat": 39.86, "lon": -104.67},
+    {"id": "KAPA", "name": "Centennial", "elevation_ft": 5885, "lat": 39.57, "lon": -104.85},
+    {"id": "EGLL", "name": "London Heathrow", "elevation_ft": 83, "lat": 51.47, "lon": -0.45},
+]
+
+
+def test_lookup_and_search():
+    index = AirportIndex.from_records(AIRPORTS)
+    assert index.get("kden")["elevation_ft"] == 5434
+    assert get_airport_by_id(index, "KAPA")["name"] == "Centennial"
+    assert index.get("XXXX") is None
+
+    # ID prefix matches come first, in ID order
+    assert [ap["id"] for ap in index.search("kjf")] == ["KJFK", "KJFX"]
+    assert [ap["id"] for ap in index.search("KJFK")] == ["KJFK"]
+    # Name substrings through the trigram index
+    assert [ap["id"] for ap in index.search("intl")] == ["KJFK", "KDEN"]
+    assert [ap["id"] for ap in index.search("heath")] == ["EGLL"]
+    assert index.search("") == [] and index.search("zzz") == []
+    assert len(index.search("k", limit=2)) == 2
+
+
+def test_search_options_keep_selection():
+    index = AirportIndex.from_records(AIRPORTS)
+    options = index.search_options("heath", selected="KDEN")
+    assert [o["value"] for o in options] == ["KDEN", "EGLL"]
+    assert options[0]["label"] == "KDEN - Denver Intl (5434 ft)"
+    assert index.search_options(None, selected=None) == []
+
+
+def test_columnar_round_trip_is_memory_mapped():
+    tmp = tempfile.mkdtemp()
+    json_path = os.path.join(tmp, "airports.json")
+    with open(json_path, "w") as f:
+        json.dump(AIRPORTS, f)
+    columns = os.path.join(tmp, "columns")
+
+    def loader():
+        with open(json_path) as f:
+            return json.load(f)
+
+    built = load_airport_index(loader, json_path, columns)
+    assert os.path.exists(os.path.join(columns, "id.npy"))
+
+    mapped = load_airport_index(lambda: [], json_path, columns)  # columns are newer than the JSON
+    assert len(mapped) == len(built)
+    assert mapped.get("EGLL") == built.get("EGLL") == AIRPORTS[-1]
+    assert [ap["id"] for ap in mapped.search("intl")] == ["KJFK", "KDEN"]
+
+
+def test_lazy_index_loads_once_on_first_lookup():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return AirportIndex.from_records(AIRPORTS)
+
+    index = LazyAirportIndex(loader)
+    assert not index.loaded and calls == []
+    assert get_airport_by_id(index, "KDEN")["name"] == "Denver Intl"
+    assert index.loaded and len(index) == len(AIRPORTS)
+    assert [ap["id"] for ap in index.search("heath")] == ["EGLL"]
+    assert index.load() is index and calls == [1]
+
+
+if __name__ == "__main__":
+    test_lookup_and_search()
+    test_search_options_keep_selection()
+    test_columnar_round_trip_is_memory_mapped()
+    test_lazy_index_loads_once_on_first_lookup()
+    print("ALL AIRPORT TESTS PASSED!")
@@ -0,0 +1,71 @@
+# test_cache.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import time
+
+from core.cache import LRUCache, state_hash
+from core.export_cache import ExportCache
+
+
+def test_state_hash_is_order_independent():
+    a = {"ac_name": "Cessna 172S", "fuel": 20, "overlay_toggle": ["g", "aob"]}
+    b = {"overlay_toggle": ["g", "aob"], "fuel": 20, "ac_name": "Cessna 172S"}
+    assert state_hash(a) == state_hash(b)
+    assert len(state_hash(a)) == 16
+    assert state_hash(a) != state_hash({**a, "fuel": 21})
+
+
+def test_lru_cache_evicts_least_recent():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1      # "a" is now most recent
+    cache.put("c", 3)               # evicts "b"
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get("b") is None
+    assert cache.hits == 3 and cache.misses == 1
+
+
+def test_lru_cache_invalidates_by_tag():
+    cache = LRUCache(max_entries=3)
+    cache.put("a", 1, tag="Cessna 172S")
+    cache.put("b", 2, tag="Piper PA-28")
+    cache.put("c", 3, tag="Cessna 172S")
+    assert cache.invalidate("Cessna 172S") == 2
+    assert "a" not in cache and "c" not in cache and cache.get("b") == 2
+    assert cache.invalidate("Cessna 172S") == 0
+
+
+def test_export_cache_hits_and_evicts_oldest():
+    directory = os.path.join(tempfile.mkdtemp(), "exports")
+    cache = ExportCache(directory, max_bytes=250)
+    assert not os.path.exists(directory)  # created on the first put
+    k1 = cache.make_key("state-1", "png", 1200, 900, 2)
+    k2 = cache.make_key("state-2", "png", 1200, 900, 2)
+    assert k1 != k2
+    assert k1 != cache.make_key("state-1", "pdf", 1200, 900, 2)
+
+    assert cache.get(k1, "png") is None and not os.path.exists(directory)
+    path = cache.put(k1, "png", b"x" * 200)
+    assert cache.get(k1, "png") == path
+
+    time.sleep(0.01)
+    path2 = cache.put(k2, "png", b"y" * 200)   # over the cap: evicts k1, keeps k2
+    assert cache.get(k1, "png") is None
+    with open(path2, "rb") as f:
+        assert f.read() == b"y" * 200
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+if __name__ == "__main__":
+    test_state_hash_is_order_independent()
+    test_lru_cache_evicts_least_recent()
+    test_lru_cache_invalidates_by_tag()
+    test_export_cache_hits_and_evicts_oldest()
+    print("ALL CACHE TESTS PASSED!")
@@ -0,0 +1,75 @@
+# test_catalog.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import tempfile
+
+from core.catalog import AIRCRAFT_FILE_MODE, load_catalog, write_aircraft_file
+
+
+def _write(folder, filename, data, mtime_ns=None):
+    path = os.path.join(folder, filename)
+    with open(path, "w") as f:
+        f.write(data if isinstance(data, str) else json.dumps(data))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_catalog_rebuilds_only_changed_files():
+    folder = tempfile.mkdtemp()
+    bundle = os.path.join(tempfile.mkdtemp(), "catalog.pkl")
+    stall = {"clean": {"weights": [2300, 2000], "speeds": [50, 47]}}
+    _write(folder, "Plane_A.json", {"stall_speeds": stall, "cg_range": [35, 47]}, 1_000_000_000)
+    _write(folder, "Plane_B.json", {"Vne": 150}, 1_000_000_000)
+
+    first = load_catalog(folder, bundle)
+    assert sorted(first.reparsed) == ["Plane_A.json", "Plane_B.json"]
+    assert sorted(first.aircraft) == ["Plane A", "Plane B"]
+    weights, speeds = first.arrays["Plane A"]["stall_speeds"]["clean"]
+    assert list(weights) == [2000, 2300] and list(speeds) == [47, 50]
+
+    # Nothing changed: one bundle read, no JSON parsing
+    second = load_catalog(folder, bundle)
+    assert second.reparsed == []
+    assert second.aircraft == first.aircraft
+    assert second.version() == first.version()
+
+    # Touched with identical content: hash matches, still not re-parsed
+    _write(folder, "Plane_B.json", {"Vne": 150}, 2_000_000_000)
+    assert load_catalog(folder, bundle).reparsed == []
+
+    # Edited, added, removed and broken files
+    _write(folder, "Plane_B.json", {"Vne": 160}, 3_000_000_000)
+    _write(folder, "Plane_C.json", "{not json")
+    os.remove(os.path.join(folder, "Plane_A.json"))
+    third = load_catalog(folder, bundle)
+    assert sorted(third.reparsed) == ["Plane_B.json", "Plane_C.json"]
+    assert third.aircraft == {"Plane B": {"Vne": 160}}
+    assert [filename for filename, _ in third.errors] == ["Plane_C.json"]
+    assert third.version() != first.version()
+
+
+def test_write_aircraft_file_mode_and_cleanup():
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "Plane_C.json")
+    write_aircraft_file(path, {"Vne": 160})
+    with open(path) as f:
+        assert json.load(f) == {"Vne": 160}
+    assert os.stat(path).st_mode & 0o777 == AIRCRAFT_FILE_MODE != 0o600
+
+    try:
+        write_aircraft_file(os.path.join(folder, "Plane_D.json"), {"bad": object()})
+        assert False, "expected TypeError"
+    except TypeError:
+        pass
+    assert sorted(os.listdir(folder)) == ["Plane_C.json"]  # no .tmp left behind
+
+
+if __name__ == "__main__":
+    test_catalog_rebuilds_only_changed_files()
+    test_write_aircraft_file_mode_and_cleanup()
+    print("ALL CATALOG TESTS PASSED!")
@@ -0,0 +1,79 @@
+# test_em.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import tempfile
+
+import numpy as np
+
+from core import aircraft_data
+from core.em import EMInputError, compute_em, default_state
+from core.cli import main as cli_main
+
+AC_NAME = "Cessna 172S" if "Cessna 172S" in aircraft_data else sorted(aircraft_data)[0]
+
+
+def test_compute_em_envelope():
+    ac = aircraft_data[AC_NAME]
+    result = compute_em(default_state(AC_NAME, ac, overlays=["ps", "g", "radius", "aob"]))
+
+    # Corner speed sits between stall and the max speed line
+    assert result.vs_1g < result.corner_ias < result.max_speed
+    assert result.lift_limit_x[-1] <= result.corner_ias <= result.load_limit_x[0]
+    assert result.vne_y[1] > 0
+
+    ias, tr, ps = result.ps_grid
+    assert ps.shape == (len(tr), len(ias))
+    assert np.isnan(ps).any() and np.isfinite(ps).any()
+    assert result.ps_contours["levels"]
+    assert result.g_lines and result.radius_lines
+
+
+def test_compute_em_units_and_errors():
+    ac = aircraft_data[AC_NAME]
+    kias = compute_em(default_state(AC_NAME, ac))
+    mph = compute_em(default_state(AC_NAME, ac, unit="MPH"))
+    assert abs(mph.corner_ias / kias.corner_ias - 1.15078) < 1e-3
+
+    try:
+        compute_em({**default_state(AC_NAME, ac), "ac_name": "No Such Aircraft"})
+        assert False, "expected EMInputError"
+    except EMInputError:
+        pass
+
+
+def test_cli_streams_json_and_npz():
+    tmp = tempfile.mkdtemp()
+    states = os.path.join(tmp, "states.csv")
+    with open(states, "w") as f:
+        f.write("ac_name,overlay_toggle,altitude_ft\n")
+        f.write(f'{AC_NAME},"[""g""]",0\n')
+        f.write(f"{AC_NAME},,5000\n")
+        f.write("No Such Aircraft,,\n")
+
+    out = os.path.join(tmp, "out.jsonl")
+    assert cli_main([states, "--out", out]) == 2  # one bad row
+    with open(out) as f:
+        records = [json.loads(line) for line in f]
+    assert [r["index"] for r in records] == [0, 1, 2]
+    assert records[0]["state"]["overlay_toggle"] == ["g"]
+    assert records[1]["state"]["altitude_ft"] == 5000
+    assert records[0]["result"]["corner_ias"] > 0
+    assert "error" in records[2]
+
+    npz_dir = os.path.join(tmp, "npz")
+    cli_main([states, "--format", "npz", "--out", npz_dir])
+    with np.load(os.path.join(npz_dir, "000000.npz")) as data:
+        assert data["lift_limit__x"].shape == data["lift_limit__y"].shape
+        assert float(data["corner_ias"]) > 0
+
+
+if __name__ == "__main__":
+    test_compute_em_envelope()
+    test_compute_em_units_and_errors()
+    test_cli_streams_json_and_npz()
+    print("ALL EM TESTS PASSED!")
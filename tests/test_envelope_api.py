@@ -0,0 +1,114 @@
+# test_envelope_api.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+import io
+import json
+
+import numpy as np
+
+import app as em_app
+
+URL = "/api/envelope?ac_name=Cessna 172S&altitude_ft=3000"
+
+
+def test_envelope_json_and_conditional_get():
+    client = em_app.server.test_client()
+    r = client.get(URL)
+    assert r.status_code == 200
+    assert r.headers["Cache-Control"].startswith("public")
+    etag = r.headers["ETag"]
+    assert etag.startswith('"') and not etag.startswith('W/')
+
+    data = json.loads(r.data)
+    assert data["unit"] == "KIAS"
+    assert data["key_speeds"]["vs_1g"] < data["corner"]["ias"] < data["key_speeds"]["max_speed"]
+    assert len(data["ps"]["knots_per_sec"]) == len(data["ps"]["turn_rate"])
+
+    r2 = client.get(URL, headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.headers["ETag"] == etag and not r2.data
+
+    # A different state is a different representation
+    assert client.get(URL + "&unit=MPH").headers["ETag"] != etag
+
+
+def test_envelope_npz_is_deterministic():
+    client = em_app.server.test_client()
+    a = client.get(URL + "&format=npz&overlay_toggle=ps,negative_g")
+    b = client.get(URL + "&format=npz&overlay_toggle=ps,negative_g")
+    assert a.status_code == 200 and a.data == b.data
+    with np.load(io.BytesIO(a.data)) as arrays:
+        assert "neg_lift_limit__x" in arrays.files
+        assert arrays["ps_grid__z"].ndim == 2
+
+
+def test_envelope_rejects_bad_input():
+    client = em_app.server.test_client()
+    assert client.get("/api/envelope?ac_name=No Such Aircraft").status_code == 400
+    assert client.get(URL + "&format=xml").status_code == 400
+
+
+def test_envelope_validates_state_values():
+    client = em_app.server.test_client()
+    base = "/api/envelope?ac_name=Cessna 172S&"
+    for query in ("altitude_ft=abc", "screen_width=abc", "config=nope", "cg=nan", "power_fraction=nan",
+                  "power_fraction=inf", "power_fraction=Infinity", "altitude_ft=inf", "total_weight=-100",
+                  "altitude_ft=1e9", "unit=FOO", "aob_values=x"):
+        r = client.get(base + query)
+        assert r.status_code == 400, query
+        assert "error" in json.loads(r.data), query
+    assert client.get(base + "unit=MPH&altitude_ft=8000&power_fraction=1").status_code == 200
+
+
+def test_cached_results_follow_aircraft_revision():
+    client = em_app.server.test_client()
+    name = "Cessna 172S"
+    original = em_app.aircraft_data[name]
+    snapshot = em_app.aircraft_data._snapshot
+    version = snapshot.version
+    first = client.get(URL)
+    misses = em_app.ENVELOPE_CACHE.misses
+    edited = copy.deepcopy(original)
+    edited["max_weight"] += 1
+    # An edit whose cache invalidation hasn't run yet (or raced a render)
+    em_app.aircraft_data.update_aircraft(name, edited)
+    try:
+        second = client.get(URL)
+        assert second.headers["ETag"] != first.headers["ETag"]
+        assert em_app.ENVELOPE_CACHE.misses == misses + 1
+    finally:
+        em_app.aircraft_data.update_aircraft(name, original)
+        snapshot.version = version  # update_aircraft() clears it
+    assert client.get(URL).headers["ETag"] == first.headers["ETag"]
+
+
+def test_compute_failures_are_server_errors():
+    client = em_app.server.test_client()
+    assert client.get(URL + "&engine_name=No Such Engine").status_code == 400
+
+    def broken(state):
+        raise KeyError("takeoff")
+
+    original = em_app.compute_em
+    em_app.compute_em = broken
+    try:
+        r = client.get("/api/envelope?ac_name=Cessna 172S&altitude_ft=3100")  # not cached
+    finally:
+        em_app.compute_em = original
+    assert r.status_code == 500
+    assert "takeoff" not in r.get_data(as_text=True)
+
+
+if __name__ == "__main__":
+    test_envelope_json_and_conditional_get()
+    test_envelope_npz_is_deterministic()
+    test_envelope_rejects_bad_input()
+    test_envelope_validates_state_values()
+    test_cached_results_follow_aircraft_revision()
+    test_compute_failures_are_server_errors()
+    print("ALL ENVELOPE API TESTS PASSED!")
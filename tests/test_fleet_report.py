@@ -0,0 +1,47 @@
+# test_fleet_report.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import subprocess
+import tempfile
+
+import fleet_report
+from core import AIRCRAFT_DATA, compute_em
+from ui.em_figure import render_em_figure
+from ui.export import load_export_logo
+
+AC_NAME = "Cessna 172S" if "Cessna 172S" in AIRCRAFT_DATA else sorted(AIRCRAFT_DATA)[0]
+
+
+def test_builds_one_sheet_without_the_app():
+    title, state, summary_kwargs = next(fleet_report.iter_jobs(AIRCRAFT_DATA, [AC_NAME]))
+    assert title.startswith(f"{AC_NAME} - {state['config']} - ")
+
+    cwd = os.getcwd()
+    load_export_logo.cache_clear()
+    os.chdir(tempfile.mkdtemp())  # the logo resolves from the package, not the cwd
+    try:
+        fig = fleet_report.build_sheet(state, summary_kwargs)
+    finally:
+        os.chdir(cwd)
+
+    plain = render_em_figure(compute_em(state))
+    assert len(fig.data) == len(plain.data)
+    assert len(fig.layout.images) == len(plain.layout.images) + 1  # the export logo
+    header = fig.layout.annotations[-2].text
+    assert header.startswith(f"Category: {state['selected_category'].capitalize()}<br>Engine: ")
+
+
+def test_workers_do_not_import_the_app():
+    code = "import sys, fleet_report; sys.exit('app' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
+
+
+if __name__ == "__main__":
+    test_builds_one_sheet_without_the_app()
+    test_workers_do_not_import_the_app()
+    print("ALL FLEET REPORT TESTS PASSED!")
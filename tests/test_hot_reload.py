@@ -0,0 +1,72 @@
+# test_hot_reload.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import tempfile
+
+from core.aircraft_loader import DynamicAircraftData
+from core.catalog import load_catalog
+from core.hot_reload import AircraftReloader
+
+
+def _write(folder, filename, data, mtime_ns):
+    path = os.path.join(folder, filename)
+    with open(path, "w") as f:
+        json.dump(data, f)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_reloader_swaps_only_changed_aircraft():
+    folder = tempfile.mkdtemp()
+    bundle = os.path.join(tempfile.mkdtemp(), "catalog.pkl")
+    _write(folder, "Plane_A.json", {"Vne": 150, "engine_options": {}}, 1_000_000_000)
+    _write(folder, "Plane_B.json", {"Vne": 140, "engine_options": {}}, 1_000_000_000)
+
+    catalog = load_catalog(folder, bundle)
+    data = DynamicAircraftData(catalog.aircraft, catalog.arrays, catalog.version())
+    reloader = AircraftReloader(data, catalog, bundle, interval=0)
+    seen = []
+    reloader.add_listener(seen.append)
+
+    model_a = data.get_model("Plane A")
+    model_b = data.get_model("Plane B")
+    assert reloader.check() == set()
+
+    # Edit one file, add another
+    _write(folder, "Plane_B.json", {"Vne": 160, "engine_options": {}}, 2_000_000_000)
+    _write(folder, "Plane_C.json", {"Vne": 120, "engine_options": {}}, 2_000_000_000)
+    assert reloader.check() == {"Plane B", "Plane C"}
+    assert sorted(reloader.catalog.reparsed) == ["Plane_B.json", "Plane_C.json"]
+    assert data["Plane B"]["Vne"] == 160 and "Plane C" in data
+    assert data.get_model("Plane A") is model_a      # untouched model carried over
+    assert data.get_model("Plane B") is not model_b
+    assert data.get_model("Plane B").vne == 160
+    assert data.version == reloader.catalog.version() != catalog.version()
+
+    # Touched without a content change: no swap, no listener call
+    _write(folder, "Plane_A.json", {"Vne": 150, "engine_options": {}}, 3_000_000_000)
+    assert reloader.check() == set()
+
+    os.remove(os.path.join(folder, "Plane_C.json"))
+    assert reloader.check() == {"Plane C"}
+    assert "Plane C" not in data
+    assert seen == [{"Plane B", "Plane C"}, {"Plane C"}]
+
+
+def test_revision_tracks_content():
+    data = DynamicAircraftData({"Plane A": {"Vne": 150}})
+    before = data.revision("Plane A")
+    assert data.revision("Plane A") == before
+    data.update_aircraft("Plane A", {"Vne": 155})
+    assert data.revision("Plane A") != before
+    assert data.version is None
+
+
+if __name__ == "__main__":
+    test_reloader_swaps_only_changed_aircraft()
+    test_revision_tracks_content()
+    print("ALL HOT RELOAD TESTS PASSED!")
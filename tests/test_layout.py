@@ -0,0 +1,72 @@
+# test_layout.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+from plotly.io.json import to_json_plotly
+
+import app as em_app
+
+
+def _update_page(client, pathname, is_mobile):
+    body = {
+        "output": "page-content.children",
+        "outputs": {"id": "page-content", "property": "children"},
+        "inputs": [
+            {"id": "url", "property": "pathname", "value": pathname},
+            {"id": "is-mobile", "property": "data", "value": is_mobile},
+        ],
+        "changedPropIds": ["is-mobile.data"],
+    }
+    r = client.post("/_dash-update-component", json=body)
+    assert r.status_code == 200
+    return json.loads(r.data)["response"]["page-content"]["children"]
+
+
+def test_layouts_are_cached_per_page_and_breakpoint():
+    em_app.LAYOUT_CACHE.clear()
+    snapshot = em_app.aircraft_data._snapshot
+    version = snapshot.version
+    snapshot.version = "test"  # other tests may leave runtime edits (version None) behind
+    try:
+        _check_cached_layouts()
+    finally:
+        snapshot.version = version
+
+
+def _check_cached_layouts():
+    desktop = em_app.display_page("/", False)
+    assert em_app.display_page("/", None) is desktop  # width not reported yet: desktop
+    assert em_app.display_page("/", True) is not desktop
+    assert em_app.display_page("/edit-aircraft", True) is em_app.display_page("/edit-aircraft", False)
+    assert len(em_app.LAYOUT_CACHE) == 3
+
+    # Same JSON the component tree would have produced
+    assert desktop == json.loads(to_json_plotly(em_app.em_diagram_layout(is_mobile=False)))
+
+    client = em_app.server.test_client()
+    assert _update_page(client, "/", False) == desktop
+    assert _update_page(client, "/nowhere", False)["props"]["children"] == "404 - Page not found"
+
+
+def test_runtime_edits_bypass_the_cache():
+    em_app.LAYOUT_CACHE.clear()
+    snapshot = em_app.aircraft_data._snapshot
+    version = snapshot.version
+    try:
+        snapshot.version = None  # what update_aircraft() leaves behind
+        first = em_app.display_page("/", False)
+        assert em_app.display_page("/", False) is not first
+        assert len(em_app.LAYOUT_CACHE) == 0
+    finally:
+        snapshot.version = version
+
+
+if __name__ == "__main__":
+    test_layouts_are_cached_per_page_and_breakpoint()
+    test_runtime_edits_bypass_the_cache()
+    print("ALL LAYOUT TESTS PASSED!")
@@ -0,0 +1,48 @@
+# test_log.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contextlib
+import io
+
+from core import log as core_log
+from core.log import DEBUG, WARNING, get_logger, set_level
+
+
+def test_disabled_levels_build_nothing():
+    log = get_logger("test")
+    calls = []
+
+    def expensive():
+        calls.append(1)
+        return "built"
+
+    previous = core_log.get_level()
+    out = io.StringIO()
+    try:
+        set_level("WARNING")
+        with contextlib.redirect_stdout(out):
+            log.debug(expensive)
+            log.debug("%s", object())  # no formatting happens
+            assert not log.is_enabled(DEBUG)
+            log.warning("Ps %.1f", 2.25)
+        assert calls == []
+        assert out.getvalue() == "[WARNING] test: Ps 2.2\n"
+
+        set_level(DEBUG)
+        with contextlib.redirect_stdout(out):
+            log.debug(expensive)
+        assert calls == [1]
+        assert out.getvalue().endswith("[DEBUG] test: built\n")
+        assert get_logger("test") is log
+    finally:
+        set_level(previous)
+    assert core_log.get_level() == previous and previous >= WARNING
+
+
+if __name__ == "__main__":
+    test_disabled_levels_build_nothing()
+    print("ALL LOG TESTS PASSED!")
@@ -0,0 +1,87 @@
+# test_metrics.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import tempfile
+
+from core.metrics import MetricsRegistry, process_rss_bytes
+
+
+def test_render_text_format():
+    registry = MetricsRegistry()
+    latency = registry.histogram("cb_seconds", "Callback latency", buckets=(0.1, 1.0))
+    requests = registry.counter("cb_total", "Callbacks")
+    depth = registry.gauge("queue_depth", "Queue depth")
+
+    latency.observe(0.05, output="em-graph.figure")
+    latency.observe(0.5, output="em-graph.figure")
+    latency.observe(3.0, output="em-graph.figure")
+    requests.inc(output='a"b')
+    depth.set(4)
+
+    text = registry.render()
+    assert "# TYPE cb_seconds histogram" in text
+    assert 'cb_seconds_bucket{output="em-graph.figure",le="0.1"} 1' in text
+    assert 'cb_seconds_bucket{output="em-graph.figure",le="1"} 2' in text
+    assert 'cb_seconds_bucket{output="em-graph.figure",le="+Inf"} 3' in text
+    assert 'cb_seconds_count{output="em-graph.figure"} 3' in text
+    assert 'cb_seconds_sum{output="em-graph.figure"} 3.55' in text
+    assert 'cb_total{output="a\\"b"} 1' in text
+    assert "queue_depth 4" in text
+    assert process_rss_bytes() > 0
+
+
+def test_multiprocess_merge_keeps_totals_drops_dead_gauges():
+    shared = tempfile.mkdtemp()
+    registry = MetricsRegistry(shared_dir=shared)
+    hits = registry.counter("hits_total", "Hits")
+    rss = registry.gauge("rss_bytes", "RSS")
+    hits.inc(3)
+    rss.set(100)
+
+    # Snapshot left behind by a worker that has since exited
+    dead_pid = 2 ** 22 + 12345
+    with open(os.path.join(shared, f"{dead_pid}.json"), "w") as f:
+        json.dump({"pid": dead_pid, "metrics": {
+            "hits_total": {"type": "counter", "help": "Hits", "samples": {"[]": 5}},
+            "rss_bytes": {"type": "gauge", "help": "RSS", "samples": {"[]": 999}},
+        }}, f)
+
+    text = registry.render()
+    assert "hits_total 8" in text
+    assert f'rss_bytes{{pid="{os.getpid()}"}} 100' in text
+    assert "999" not in text
+    assert os.path.exists(os.path.join(shared, f"{os.getpid()}.json"))
+
+    # The dead worker's file is folded away, and counted once
+    assert not os.path.exists(os.path.join(shared, f"{dead_pid}.json"))
+    assert "hits_total 8" in registry.render()
+
+
+def test_mark_process_dead_removes_snapshot():
+    shared = tempfile.mkdtemp()
+    registry = MetricsRegistry(shared_dir=shared)
+    registry.counter("hits_total", "Hits").inc(2)
+
+    # gunicorn's child_exit runs before the PID can be handed to a new worker
+    exited_pid = os.getppid()
+    with open(os.path.join(shared, f"{exited_pid}.json"), "w") as f:
+        json.dump({"pid": exited_pid, "metrics": {
+            "hits_total": {"type": "counter", "help": "Hits", "samples": {"[]": 5}},
+        }}, f)
+    registry.mark_process_dead(exited_pid)
+    registry.mark_process_dead(exited_pid)  # idempotent
+
+    assert sorted(f for f in os.listdir(shared) if f.endswith(".json")) == ["exited.json"]
+    assert "hits_total 7" in registry.render()
+
+
+if __name__ == "__main__":
+    test_render_text_format()
+    test_multiprocess_merge_keeps_totals_drops_dead_gauges()
+    test_mark_process_dead_removes_snapshot()
+    print("ALL METRICS TESTS PASSED!")
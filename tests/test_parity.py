@@ -0,0 +1,47 @@
+# test_parity.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+
+from core import aircraft_data
+from benchmarks.parity import check, compare, fingerprint, iter_states, load_goldens, reference_engine
+
+AC_NAME = "Cessna 172S" if "Cessna 172S" in aircraft_data else sorted(aircraft_data.keys())[0]
+
+
+def test_reference_matches_goldens():
+    goldens = load_goldens()
+    assert goldens is not None, "run benchmarks/parity.py --record"
+    twin = next(n for n in sorted(aircraft_data.keys()) if aircraft_data[n].get("engine_count", 1) > 1)
+    cases = list(iter_states(aircraft_data, [AC_NAME], ["all", "steep_turn"]))
+    cases += list(iter_states(aircraft_data, [twin], ["oei"]))
+    rows = check(cases, goldens, progress=False)
+    assert all(row["diffs"] == [] for row in rows), rows
+
+
+def test_compare_flags_moved_annotations_and_arrays():
+    case, state = next(iter_states(aircraft_data, [AC_NAME], ["default"]))
+    golden = fingerprint(reference_engine(state))
+    assert compare(golden, copy.deepcopy(golden)) == []
+
+    current = copy.deepcopy(golden)
+    current["annotations"][0]["x"] += 0.5
+    current["traces"][0]["y"]["samples"][-1] *= 1.017
+    diffs = compare(golden, current)
+    assert len(diffs) == 2
+    assert diffs[0].startswith("/annotations[0]/x") and diffs[1].startswith("/traces[0]/y/samples")
+
+    # Within tolerance is equivalent
+    current = copy.deepcopy(golden)
+    current["traces"][0]["y"]["samples"][-1] *= 1 + 1e-9
+    assert compare(golden, current) == []
+
+
+if __name__ == "__main__":
+    test_reference_matches_goldens()
+    test_compare_flags_moved_annotations_and_arrays()
+    print("ALL PARITY TESTS PASSED!")
@@ -0,0 +1,79 @@
+# test_perf.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+from core.perf import TraceBuffer, annotate, span, stage, trace
+
+
+def test_spans_and_stages_nest():
+    buffer = TraceBuffer(capacity=10)
+    with trace("update_graph", {"ac_name": "Plane A"}, buffer=buffer, enabled=True):
+        annotate(envelope_cache="miss")
+        with span("compute_em"):
+            stage("envelope")
+            time.sleep(0.01)
+            stage("ps_grid")
+            with span("contour"):
+                pass
+        with span("figure_assembly"):
+            pass
+
+    (t,) = buffer.recent()
+    assert t.meta == {"ac_name": "Plane A", "envelope_cache": "miss"}
+    steps = [(s["name"], s["depth"]) for s in t.breakdown()]
+    assert steps == [("compute_em", 0), ("envelope", 1), ("ps_grid", 1), ("contour", 2), ("figure_assembly", 0)]
+    envelope = t.breakdown()[1]
+    assert envelope["duration_ms"] >= 10
+    assert t.duration * 1000 >= envelope["duration_ms"]
+
+
+def test_noop_without_trace_and_ring_buffer():
+    # Outside a trace every call is a no-op
+    with span("orphan"):
+        stage("orphan_stage")
+        annotate(x=1)
+    with trace("disabled", enabled=False) as t:
+        assert t is None
+
+    buffer = TraceBuffer(capacity=3)
+    for i in range(5):
+        try:
+            with trace(f"req{i}", buffer=buffer, enabled=True):
+                if i == 4:
+                    raise ValueError("boom")
+        except ValueError:
+            pass
+    names = [t.name for t in buffer.recent()]
+    assert names == ["req2", "req3", "req4"]
+    # Rank on set durations, not on how the scheduler ran the sleeps
+    for t in buffer.recent():
+        t.duration = int(t.name[3:]) * 0.01
+    slowest = buffer.slowest(2)
+    assert [t.name for t in slowest] == ["req4", "req3"]
+    assert slowest[0].error == "ValueError"
+
+
+def test_trace_page_is_off_by_default_and_loopback_only():
+    import app as em_app
+
+    client = em_app.server.test_client()
+    assert client.get("/debug/perf").status_code == 404
+    em_app.PERF_TRACE_ENABLED = True
+    try:
+        assert client.get("/debug/perf").status_code == 200
+        remote = client.get("/debug/perf", environ_base={"REMOTE_ADDR": "203.0.113.5"})
+        assert remote.status_code == 404
+    finally:
+        em_app.PERF_TRACE_ENABLED = False
+
+
+if __name__ == "__main__":
+    test_spans_and_stages_nest()
+    test_noop_without_trace_and_ring_buffer()
+    test_trace_page_is_off_by_default_and_loopback_only()
+    print("ALL PERF TESTS PASSED!")
@@ -0,0 +1,103 @@
+# test_render_cascade.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+
+import plotly.io as pio
+
+import app as em_app
+from core import ExportCache, RenderSequencer, aircraft_data, state_hash
+from benchmarks.render_cascade import CascadeReplay
+
+AC_NAME = "Cessna 172S" if "Cessna 172S" in aircraft_data else sorted(aircraft_data.keys())[0]
+
+
+def _graph_runs(replay, step):
+    replay.runs = []
+    step()
+    return replay.graph_counts()
+
+
+def test_one_render_per_interaction():
+    replay = CascadeReplay(em_app)
+    assert _graph_runs(replay, lambda: replay.load("/")) == (1, 1)
+    assert _graph_runs(replay, lambda: replay.set_prop("aircraft-select", "value", AC_NAME)) == (1, 1)
+    # The maneuver's inputs arrive with it, not in a second render
+    assert _graph_runs(replay, lambda: replay.set_prop("maneuver-select", "value", "steep_turn")) == (1, 1)
+    state = replay.props["em-figure-state"]["data"]["state"]
+    assert state["maneuver"] == "steep_turn" and state["aob_values"] == [45]
+    assert _graph_runs(replay, lambda: replay.set_prop("maneuver-select", "value", "chandelle")) == (1, 1)
+
+
+def test_unchanged_state_is_not_rerendered():
+    replay = CascadeReplay(em_app)
+    replay.load("/")
+    fuel = replay.props["fuel-slider"]["value"]
+    assert _graph_runs(replay, lambda: replay.set_prop("fuel-slider", "value", fuel)) == (1, 0)
+    assert _graph_runs(replay, lambda: replay.set_prop("fuel-slider", "value", (fuel or 0) + 5)) == (1, 1)
+
+
+def test_superseded_requests_are_dropped():
+    sequencer = em_app.RENDER_SEQUENCER
+    em_app.RENDER_SEQUENCER = RenderSequencer()
+    try:
+        replay = CascadeReplay(em_app)
+        replay.load("/")
+        # Power feeds only update_graph, so nothing else delays the render
+        assert _graph_runs(replay, lambda: replay.set_prop("power-setting", "value", 0.8)) == (1, 1)
+        token = replay.props["render-seq"]["data"]
+        # The first slider change already carries its seq (not the previous one)
+        assert token["seq"] == 1 and len(em_app.RENDER_SEQUENCER) == 1
+        # A newer request from this tab reached the server first
+        with em_app.RENDER_SEQUENCER.turn(dict(token, seq=token["seq"] + 5)):
+            pass
+        assert _graph_runs(replay, lambda: replay.set_prop("power-setting", "value", 0.9)) == (1, 0)
+    finally:
+        em_app.RENDER_SEQUENCER = sequencer
+
+
+def test_figure_cache_ignores_client_key():
+    replay = CascadeReplay(em_app)
+    replay.load("/")
+    state = replay.props["em-figure-state"]["data"]["state"]
+    other = dict(state, power_fraction=0.35)
+    revision = em_app.aircraft_revision(state["ac_name"])
+    # A forged store claims the figure for `other` while carrying `state`
+    forged = {"key": state_hash(other), "revision": revision, "state": state}
+    assert em_app.get_cached_figure(forged) is not None
+    assert em_app.FIGURE_CACHE.get((state_hash(other), revision)) is None
+    assert em_app.FIGURE_CACHE.get((state_hash(state), revision)) is not None
+
+
+def test_export_key_ignores_client_key():
+    replay = CascadeReplay(em_app)
+    replay.load("/")
+    state = replay.props["em-figure-state"]["data"]["state"]
+    other = dict(state, power_fraction=0.35)
+    cache, to_image = em_app.EXPORT_CACHE, pio.to_image
+    em_app.EXPORT_CACHE = ExportCache(tempfile.mkdtemp())
+    pio.to_image = lambda fig, **kwargs: repr(fig.layout.title.text).encode()
+    try:
+        def export(figure_state):
+            return em_app.export_figure_file("png", figure_state, ["summary"], width=400, height=300)
+
+        path = export({"key": state_hash(state), "state": state})
+        # Forging the key neither reuses nor overwrites another state's file
+        assert export({"key": state_hash(state), "state": other}) != path
+        assert export({"key": "forged", "state": state}) == path
+        assert export(None) is None
+    finally:
+        em_app.EXPORT_CACHE, pio.to_image = cache, to_image
+
+
+if __name__ == "__main__":
+    test_one_render_per_interaction()
+    test_unchanged_state_is_not_rerendered()
+    test_superseded_requests_are_dropped()
+    test_figure_cache_ignores_client_key()
+    test_export_key_ignores_client_key()
+    print("ALL RENDER CASCADE TESTS PASSED!")
@@ -0,0 +1,82 @@
+# test_sequencing.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+
+from core import RenderSequencer
+
+
+def _token(seq, session="tab"):
+    return {"session": session, "seq": seq}
+
+
+def test_burst_coalesces_to_newest():
+    sequencer = RenderSequencer()
+    results = {}
+
+    def request(seq):
+        with sequencer.turn(_token(seq)) as current:
+            results[seq] = current
+
+    with sequencer.turn(_token(1)) as current:
+        assert current
+        threads = [threading.Thread(target=request, args=(seq,)) for seq in (2, 3)]
+        for t in threads:
+            t.start()
+        deadline = time.monotonic() + 5
+        while not sequencer.superseded(_token(2)) and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert not results  # queued behind the running render
+    for t in threads:
+        t.join(timeout=5)
+
+    assert results == {2: False, 3: True}
+    assert sequencer.superseded(_token(1)) and not sequencer.superseded(_token(3))
+    # Other tabs are independent
+    with sequencer.turn(_token(1, session="other")) as current:
+        assert current
+
+
+def test_stale_request_does_not_wait_for_running_render():
+    sequencer = RenderSequencer()
+    results = {}
+
+    def request(seq):
+        with sequencer.turn(_token(seq)) as current:
+            results[seq] = current
+
+    with sequencer.turn(_token(5)) as current:
+        assert current
+        stale = threading.Thread(target=request, args=(3,))
+        stale.start()
+        stale.join(timeout=5)
+        assert not stale.is_alive()  # answered while the render holds the lock
+        assert results == {3: False}
+
+
+def test_unsequenced_requests_always_run():
+    sequencer = RenderSequencer(max_sessions=2)
+    for token in (None, {}, {"session": "tab", "seq": "7"}, {"session": 1, "seq": 7}, {"session": "tab", "seq": True}):
+        with sequencer.turn(token) as current:
+            assert current
+        assert not sequencer.superseded(token)
+    assert len(sequencer) == 0
+
+    for session in ("a", "b", "c"):
+        with sequencer.turn(_token(5, session)):
+            pass
+    assert len(sequencer) == 2
+    with sequencer.turn(_token(1, "a")) as current:
+        assert current  # "a" was evicted, so nothing newer is known
+
+
+if __name__ == "__main__":
+    test_burst_coalesces_to_newest()
+    test_stale_request_does_not_wait_for_running_render()
+    test_unsequenced_requests_always_run()
+    print("ALL SEQUENCING TESTS PASSED!")
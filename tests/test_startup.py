@@ -0,0 +1,19 @@
+# test_startup.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_startup import STARTUP_BUDGET_S, measure
+
+
+def test_app_import_within_budget_and_lazy():
+    seconds, eager = measure("app", runs=3)
+    assert seconds <= STARTUP_BUDGET_S, f"import app took {seconds:.2f} s (budget {STARTUP_BUDGET_S:.2f} s)"
+    assert not eager, f"Imported at startup: {', '.join(eager)}"
+
+
+if __name__ == "__main__":
+    test_app_import_within_budget_and_lazy()
+    print("ALL STARTUP TESTS PASSED!")
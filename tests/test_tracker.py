@@ -0,0 +1,333 @@
+# test_tracker.py
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from flask import Flask, Response, send_file
+from werkzeug.test import create_environ
+from werkzeug.wsgi import FileWrapper
+
+import aeroedge_tracker
+from aeroedge_tracker import (
+    EventSender, EventSpool, Histogram, UsageAggregator, init_tracking, log_feature, track_feature,
+)
+
+
+class StubCollector:
+    """Local stand-in for the tracking API; records every POST body."""
+
+    def __init__(self, batch_endpoint=True):
+        self.requests = []
+        self.down = False
+        self.failing = set()  # paths answered with 500
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if collector.down:
+                    self.send_response(503)
+                elif self.path in collector.failing:
+                    self.send_response(500)
+                elif self.path == "/track/batch" and not batch_endpoint:
+                    self.send_response(404)
+                else:
+                    collector.requests.append((self.path, json.loads(body)))
+                    self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_sender_batches_and_flushes():
+    collector = StubCollector()
+    sender = EventSender(collector.url, batch_size=3, flush_interval=60)
+    try:
+        for i in range(7):
+            sender.enqueue("feature", {"feature_key": f"f{i}"})
+        assert sender.flush(timeout=5)
+        paths = [path for path, _ in collector.requests]
+        sizes = [len(body["events"]) for _, body in collector.requests]
+        assert set(paths) == {"/track/batch"}
+        assert sizes == [3, 3, 1]
+        keys = [e["data"]["feature_key"] for _, body in collector.requests for e in body["events"]]
+        assert keys == [f"f{i}" for i in range(7)]
+        assert sender.stats()["sent"] == 7 and sender.stats()["queue_depth"] == 0
+    finally:
+        sender.close()
+        collector.close()
+
+
+def test_sender_drops_oldest_and_falls_back_to_single_posts():
+    collector = StubCollector(batch_endpoint=False)
+    sender = EventSender(collector.url, batch_size=10, flush_interval=60, max_queue=2)
+    try:
+        # The sender waits for a full batch (or 60 s), so nothing drains yet
+        for i in range(4):
+            sender.enqueue("event", {"event_name": f"e{i}"})
+        sender.close()
+        names = [body["event_name"] for path, body in collector.requests]
+        assert sender.counters["dropped"] == 2
+        assert names == ["e2", "e3"]
+        assert {path for path, _ in collector.requests} == {"/track/event"}
+        assert sender.batch_supported is False
+    finally:
+        collector.close()
+
+
+def test_spool_rotates_and_caps_segments():
+    spool = EventSpool(tempfile.mkdtemp(), segment_bytes=60, max_bytes=200)
+    for i in range(12):
+        spool.append([{"kind": "event", "data": {"n": i}}])
+    segments = spool._segments()
+    assert len(segments) > 1
+    assert sum(os.path.getsize(p) for p in segments) <= 200
+    assert spool.dropped_segments > 0
+
+    spool.rotate()
+    replayed = []
+    while True:
+        claimed = spool.claim()
+        if claimed is None:
+            break
+        replayed.extend(e["data"]["n"] for e in claimed[1])
+        spool.done(claimed[0])
+    assert replayed == sorted(replayed) and replayed[-1] == 11
+    assert not spool.pending()
+
+
+def test_sender_spools_during_outage_and_replays():
+    collector = StubCollector()
+    collector.down = True
+    spool = EventSpool(tempfile.mkdtemp())
+    sender = EventSender(collector.url, batch_size=2, flush_interval=0.05, spool=spool)
+    try:
+        for i in range(5):
+            sender.enqueue("feature", {"feature_key": f"f{i}"})
+        assert sender.flush(timeout=5)
+        assert sender.counters["spooled"] == 5 and spool.pending()
+        assert collector.requests == []
+
+        collector.down = False
+        deadline = time.monotonic() + 10
+        while sender.counters["replayed"] < 5 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        keys = sorted(e["data"]["feature_key"] for _, body in collector.requests for e in body["events"])
+        assert keys == [f"f{i}" for i in range(5)]
+        assert not spool.pending()
+    finally:
+        sender.close()
+        collector.close()
+
+
+def test_partial_fallback_failure_spools_only_undelivered_events():
+    collector = StubCollector(batch_endpoint=False)
+    collector.failing.add("/track/event")
+    spool = EventSpool(tempfile.mkdtemp())
+    sender = EventSender(collector.url, batch_size=3, flush_interval=0.05, spool=spool)
+    try:
+        sender.enqueue("feature", {"feature_key": "f0"})
+        sender.enqueue("event", {"event_name": "e1"})
+        sender.enqueue("feature", {"feature_key": "f2"})
+        assert sender.flush(timeout=5)
+        assert sender.counters["sent"] == 1 and sender.counters["spooled"] == 2
+
+        collector.failing.clear()
+        deadline = time.monotonic() + 10
+        while sender.counters["replayed"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        posted = [body.get("feature_key") or body.get("event_name") for _, body in collector.requests]
+        assert posted == ["f0", "e1", "f2"]  # f0 was not re-sent
+        assert not spool.pending()
+    finally:
+        sender.close()
+        collector.close()
+
+
+def test_rollups_are_not_retried_without_batch_endpoint():
+    collector = StubCollector(batch_endpoint=False)
+    spool = EventSpool(tempfile.mkdtemp())
+    sender = EventSender(collector.url, batch_size=2, flush_interval=0.05, spool=spool)
+    try:
+        sender.enqueue("rollup", {"rows": []})
+        sender.enqueue("feature", {"feature_key": "f0"})
+        assert sender.flush(timeout=5)
+        assert [path for path, _ in collector.requests] == ["/track/feature"]
+        assert sender.counters["failed"] == 1 and sender.counters["sent"] == 1
+        assert sender.counters["spooled"] == 0 and not spool.pending()
+    finally:
+        sender.close()
+        collector.close()
+
+
+def test_rollups_start_once_batch_endpoint_answers():
+    collector = StubCollector()
+    sender = EventSender(collector.url, batch_size=10, flush_interval=0.05)
+    rollups = []
+    saved = (aeroedge_tracker._sender, aeroedge_tracker._aggregator,
+             aeroedge_tracker.TRACKING_ENABLED, aeroedge_tracker.TRACKING_ROLLUPS)
+    aeroedge_tracker._sender = sender
+    aeroedge_tracker._aggregator = UsageAggregator(lambda kind, data: rollups.append(data))
+    aeroedge_tracker.TRACKING_ENABLED = aeroedge_tracker.TRACKING_ROLLUPS = True
+    try:
+        assert sender.batch_supported is None
+        aeroedge_tracker._enqueue("feature", {"feature_key": "f0"})  # not yet known: sent raw
+        assert sender.flush(timeout=5) and sender.batch_supported is True
+        aeroedge_tracker._enqueue("feature", {"feature_key": "f1"})
+        assert sender.counters["queued"] == 1
+        assert aeroedge_tracker._aggregator.flush(final=True) == 1
+        assert [row["key"] for row in rollups[0]["rows"]] == ["f1"]
+    finally:
+        (aeroedge_tracker._sender, aeroedge_tracker._aggregator,
+         aeroedge_tracker.TRACKING_ENABLED, aeroedge_tracker.TRACKING_ROLLUPS) = saved
+        sender.close()
+        collector.close()
+
+
+def test_histogram_percentiles():
+    hist = Histogram((10, 100, 1000))
+    for value in [5] * 90 + [500] * 10:
+        hist.add(value)
+    summary = hist.summary()
+    assert summary["max"] == 500 and summary["sum"] == 5450
+    assert 0 < summary["p50"] <= 10
+    assert 100 < summary["p95"] <= 500
+
+
+def test_aggregator_rolls_up_per_interval():
+    emitted = []
+    agg = UsageAggregator(lambda kind, data: emitted.append((kind, data)), interval=60)
+    for i in range(50):
+        agg.record("feature", {"feature_key": "aircraft_select", "hashed_ip": f"ip{i % 5}",
+                               "metadata": {"aircraft": "Cessna 172S"}, "duration_ms": 20}, now=1000 + i)
+    agg.record("pageview", {"route": "/", "hashed_ip": "ip0", "response_bytes": 4096, "duration_ms": 80}, now=1010)
+    agg.record("pageview", {"route": "/", "hashed_ip": "ip1", "duration_ms": 40}, now=1070)
+
+    assert agg.flush(now=1015) == 0          # 960-1020 interval still open
+    assert agg.flush(now=1030) == 1
+    kind, rollup = emitted[0]
+    assert kind == "rollup" and rollup["interval_start"] == 960
+    rows = {(r["kind"], r["key"], r["aircraft"]): r for r in rollup["rows"]}
+    select = rows[("feature", "aircraft_select", "Cessna 172S")]
+    assert select["count"] == 20 and select["unique_visitors"] == 5
+    assert rows[("pageview", "/", None)]["response_bytes"]["max"] == 4096
+
+    assert agg.flush(now=1070) == 0
+    assert agg.flush(final=True, now=1070) == 1  # 1020-1080 interval
+    assert sum(r["count"] for _, d in emitted for r in d["rows"]) == 52
+
+
+def test_middleware_counts_streamed_bytes():
+    events = []
+    original = aeroedge_tracker._enqueue
+    aeroedge_tracker._enqueue = lambda kind, data: events.append((kind, data))
+    try:
+        app = Flask(__name__)
+
+        @app.route("/stream")
+        def stream():
+            return Response((b"x" * 1000 for _ in range(5)), mimetype="application/octet-stream")
+
+        @app.route("/export")
+        @track_feature("export")
+        def export():
+            return b"y" * 300
+
+        @app.route("/_dash-update-component", methods=["POST"])
+        def callback():
+            log_feature("aircraft_select", {"aircraft": "C172"})
+            return {"response": {"em-graph": {"figure": {"data": [1, 2, 3]}}}}
+
+        init_tracking(app)
+        client = app.test_client()
+        response = client.get("/stream")
+        assert response.content_length is None  # streamed, no header to read
+        assert len(response.data) == 5000
+        response.close()
+        client.get("/export").close()
+        response = client.post("/_dash-update-component", json={})
+        callback_bytes = len(response.data)
+        response.close()
+        log_feature("cli_run")  # outside a request: size unknown
+    finally:
+        aeroedge_tracker._enqueue = original
+
+    pageviews = {data["route"]: data for kind, data in events if kind == "pageview"}
+    assert pageviews["/stream"]["response_bytes"] == 5000
+    assert pageviews["/export"]["response_bytes"] == 300
+    assert "/_dash-update-component" not in pageviews
+    features = {data["feature_key"]: data for kind, data in events if kind == "feature"}
+    assert features["export"]["response_bytes"] == 300
+    # Callback features get the size of the response that carried them
+    assert features["aircraft_select"]["response_bytes"] == callback_bytes > 0
+    assert features["cli_run"]["response_bytes"] is None
+
+
+def test_middleware_passes_untracked_and_file_responses_through():
+    events = []
+    original = aeroedge_tracker._enqueue
+    aeroedge_tracker._enqueue = lambda kind, data: events.append((kind, data))
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "report.bin")
+    with open(path, "wb") as f:
+        f.write(b"z" * 2048)
+    try:
+        app = Flask(__name__)
+
+        @app.route("/assets/report.bin")
+        @app.route("/report.bin")
+        def report():
+            return send_file(path)
+
+        init_tracking(app)
+
+        def call(route):
+            environ = create_environ(route)
+            environ["wsgi.file_wrapper"] = FileWrapper
+            body = app.wsgi_app(environ, lambda status, headers, exc_info=None: None)
+            assert isinstance(body, FileWrapper)  # left for the server's sendfile
+            assert sum(len(chunk) for chunk in body) == 2048
+            body.close()
+
+        call("/assets/report.bin")
+        assert events == []
+        call("/report.bin")
+    finally:
+        aeroedge_tracker._enqueue = original
+
+    [(kind, data)] = events
+    assert kind == "pageview" and data["route"] == "/report.bin"
+    assert data["response_bytes"] == 2048  # from Content-Length
+
+
+if __name__ == "__main__":
+    test_sender_batches_and_flushes()
+    test_sender_drops_oldest_and_falls_back_to_single_posts()
+    test_spool_rotates_and_caps_segments()
+    test_sender_spools_during_outage_and_replays()
+    test_partial_fallback_failure_spools_only_undelivered_events()
+    test_rollups_are_not_retried_without_batch_endpoint()
+    test_rollups_start_once_batch_endpoint_answers()
+    test_histogram_percentiles()
+    test_aggregator_rolls_up_per_interval()
+    test_middleware_counts_streamed_bytes()
+    test_middleware_passes_untracked_and_file_responses_through()
+    print("ALL TRACKER TESTS PASSED!")
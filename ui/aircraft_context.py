@@ -0,0 +1,123 @@
+# ui/aircraft_context.py
+
+"""
+Per-aircraft UI descriptor.
+
+Everything the sidebar derives from an aircraft's data alone (dropdown
+options and defaults, slider ranges and marks, which controls are shown),
+computed once per aircraft revision so a selection is answered by a single
+callback with a dict lookup.
+"""
+
+import math
+
+
+def _fuel_marks(fuel_max):
+    # Nice even step based on fuel capacity
+    if fuel_max <= 20:
+        step = 5
+    elif fuel_max <= 50:
+        step = 10
+    elif fuel_max <= 100:
+        step = 20
+    elif fuel_max <= 200:
+        step = 25
+    else:
+        step = 50
+
+    marks = {}
+    mark_val = 0
+    while mark_val < fuel_max:
+        marks[mark_val] = str(mark_val)
+        mark_val += step
+    # Always include the max value
+    marks[fuel_max] = str(fuel_max)
+    return marks
+
+
+def _altitude_marks(ceiling):
+    marks = {i: str(i) for i in range(0, ceiling + 1, 5000)}
+    marks[0] = "Sea Level"
+    marks[ceiling] = f"{ceiling} ft"
+    return marks
+
+
+def _cg_marks(cg_min, cg_max):
+    cg_range = cg_max - cg_min
+    if cg_range <= 5:
+        step = 0.5
+    elif cg_range <= 10:
+        step = 1.0
+    else:
+        step = 2.0
+
+    marks = {cg_min: "FWD"}
+    # Intermediate marks from the first even step above cg_min
+    mark_val = math.ceil(cg_min / step) * step
+    while mark_val < cg_max:
+        if mark_val > cg_min:  # Don't duplicate the min
+            marks[round(mark_val, 1)] = f"{mark_val:.1f}"
+        mark_val += step
+    marks[cg_max] = "AFT"
+    return marks
+
+
+def aircraft_ui_descriptor(ac):
+    """
+    Sidebar options and defaults for one aircraft.
+
+    Args:
+        ac: Aircraft data dict
+
+    Returns:
+        Dict of option lists, default values, slider ranges / marks and
+        flags (retractable, multi_engine) plus the weights the total-weight
+        display needs
+    """
+    categories = list(ac.get("G_limits", {}).keys())
+    flaps = ac["configuration_options"]["flaps"]
+    engines = list(ac["engine_options"].keys())
+    seats = ac["seats"]
+    retractable = ac.get("gear_type") == "retractable"
+
+    ceiling = ac.get("mx_altitude") or ac.get("max_altitude")
+    if ceiling is None:
+        ceiling = 15000
+
+    raw_min, raw_max = ac["cg_range"]
+    cg_min = round(float(raw_min), 2)
+    cg_max = round(float(raw_max), 2)
+
+    return {
+        "category_options": [{"label": cat.capitalize(), "value": cat} for cat in categories],
+        "category": categories[0] if categories else None,
+        "engine_options": [{"label": name, "value": name} for name in engines],
+        "engine": engines[0],
+        "occupant_options": [{"label": str(i), "value": i} for i in range(seats + 1)],
+        "occupants": min(2, seats),
+        "fuel_max": ac["fuel_capacity_gal"],
+        "fuel_marks": _fuel_marks(ac["fuel_capacity_gal"]),
+        "altitude_max": ceiling,
+        "altitude_marks": _altitude_marks(ceiling),
+        "cg_min": cg_min,
+        "cg_max": cg_max,
+        "cg": round((cg_min + cg_max) / 2, 2),
+        "cg_marks": _cg_marks(cg_min, cg_max),
+        "config_options": [{"label": flap, "value": flap} for flap in flaps],
+        "config": flaps[0] if flaps else None,
+        "gear_options": [{"label": "Up", "value": "up"}, {"label": "Down", "value": "down"}] if retractable else [],
+        "gear": "up" if retractable else None,
+        "retractable": retractable,
+        "multi_engine": ac.get("engine_count", 1) >= 2,
+        "empty_weight": ac["empty_weight"],
+        "fuel_weight_per_gal": ac["fuel_weight_per_gal"],
+        "max_weight": ac["max_weight"],
+    }
+
+
+def total_weight(descriptor, fuel, occupants, pax_weight):
+    """Ramp weight for the sidebar's fuel / occupant inputs (None -> defaults)."""
+    fuel = fuel if fuel is not None else 0
+    pax_weight = pax_weight if pax_weight is not None else 180
+    occupants = occupants if occupants is not None else 0
+    return descriptor["empty_weight"] + fuel * descriptor["fuel_weight_per_gal"] + occupants * pax_weight
@@ -0,0 +1,632 @@
+# ui/em_figure.py
+
+"""
+Plotly rendering of an EMResult.
+
+All physics lives in core.em; this module only maps the computed arrays to
+traces, annotations and layout, in the order the diagram has always drawn them.
+"""
+
+from math import cos, radians
+
+import plotly.graph_objects as go
+
+
+def _add_chandelle(fig, path, unit, color="darkgreen", dash="solid", label="Chandelle",
+                   show_annotations=True):
+    airspeeds_display = path["x"]
+    turn_rates = path["y"]
+
+    # Build contextual hover text with G load factor and heading progress
+    hover_texts = []
+    for i, (ias, tr, aob, hdg) in enumerate(zip(airspeeds_display, turn_rates, path["aob"], path["heading"])):
+        g_load = 1 / cos(radians(aob)) if aob > 0 else 1.0
+        if i == 0:
+            phase = "<b>START</b>"
+        elif hdg >= 175:
+            phase = "<b>END</b>"
+        elif hdg < 90:
+            phase = f"First Half ({hdg:.0f}°)"
+        else:
+            phase = f"Second Half ({hdg:.0f}°)"
+        hover_texts.append(
+            f"{phase}<br>IAS: {ias:.0f} {unit}<br>Turn Rate: {tr:.1f}°/s<br>AOB: {aob:.0f}°<br>G: {g_load:.2f}<br>Heading: {hdg:.0f}°"
+        )
+
+    fig.add_trace(go.Scatter(
+        x=airspeeds_display,
+        y=turn_rates,
+        mode="lines+markers",
+        line=dict(color=color, width=3, dash=dash),
+        marker=dict(size=4),
+        name=label,
+        hoverinfo="text",
+        hovertext=hover_texts
+    ))
+
+    # Add START and END annotations (only for main trace, not ghost)
+    if show_annotations and len(airspeeds_display) > 1:
+        # START annotation (right side - high airspeed)
+        fig.add_annotation(
+            x=airspeeds_display[0],
+            y=turn_rates[0],
+            text="<b>START</b>",
+            showarrow=True,
+            arrowhead=2,
+            ax=30,
+            ay=-20,
+            font=dict(size=10, color=color),
+            bgcolor="rgba(255,255,255,0.85)",
+            borderpad=2
+        )
+        # END annotation (left side - low airspeed)
+        fig.add_annotation(
+            x=airspeeds_display[-1],
+            y=turn_rates[-1],
+            text="<b>END</b>",
+            showarrow=True,
+            arrowhead=2,
+            ax=-30,
+            ay=-20,
+            font=dict(size=10, color=color),
+            bgcolor="rgba(255,255,255,0.85)",
+            borderpad=2
+        )
+        # Direction indicator in middle
+        mid_idx = len(airspeeds_display) // 2
+        fig.add_annotation(
+            x=airspeeds_display[mid_idx],
+            y=turn_rates[mid_idx] + 1.5,
+            text="← Energy Flow →",
+            showarrow=False,
+            font=dict(size=9, color="gray"),
+            bgcolor="rgba(255,255,255,0.7)",
+            borderpad=2
+        )
+
+
+def render_em_figure(result):
+    """
+    Build the EM diagram figure from a computed EMResult.
+
+    Args:
+        result: core.em.EMResult
+
+    Returns:
+        plotly.graph_objects.Figure
+    """
+    unit = result.unit
+    fig = go.Figure()
+
+    fig.add_layout_image(
+        dict(
+            source="/assets/logo2.png",
+            xref="paper", yref="paper",
+            x=0, y=1,
+            sizex=0.2, sizey=0.2,
+            xanchor="left", yanchor="top",
+            layer="above"
+        )
+    )
+
+    fig.update_layout(
+        paper_bgcolor="#f7f9fc",   # outside the plot
+        plot_bgcolor="#f7f9fc",    # inside the plotting area
+        font=dict(color="#1b1e23"),  # match your UI's text color
+        margin=dict(l=40, r=40, t=40, b=40),
+        xaxis=dict(showgrid=True),
+        yaxis=dict(showgrid=True),
+        dragmode=False,             # ✅ disables box zoom drag
+        hovermode="closest",        # ✅ enables hover tooltips
+        autosize=True               # ✅ responsive sizing
+    )
+
+    # === Negative G Envelope ===
+    if result.neg_lift_limit is not None:
+        neg_x, neg_y = result.neg_lift_limit
+        fig.add_trace(go.Scatter(
+            x=neg_x,
+            y=neg_y,
+            mode="lines",
+            name="Neg Lift Limit",
+            line=dict(color="red", width=3),
+            hoverinfo="skip"
+        ))
+        neg_x, neg_y = result.neg_load_limit
+        fig.add_trace(go.Scatter(
+            x=neg_x,
+            y=neg_y,
+            mode="lines",
+            name=f"Neg Load Limit ({result.g_limit_neg:.1f} G)",
+            line=dict(color="black", width=3, dash="solid"),
+            hoverinfo="skip"
+        ))
+
+    # Lift Limit - color changes when DVmc modifies the boundary
+    lift_limit_color = "#DC143C" if result.dvmc_active else "red"
+    lift_limit_name = "Lift Limit (DVmc)" if result.dvmc_active else "Lift Limit"
+    fig.add_trace(go.Scatter(x=result.lift_limit_x, y=result.lift_limit_y,
+        mode="lines", name=lift_limit_name, line=dict(color=lift_limit_color, width=3), hoverinfo="skip"))
+    fig.add_trace(go.Scatter(x=result.load_limit_x, y=result.load_limit_y,
+        mode="lines", name=f"Load Limit ({result.g_limit:.1f} G)", line=dict(color="black", width=3, dash="solid"), hoverinfo="skip"))
+    fig.add_trace(go.Scatter(x=[result.corner_ias], y=[result.corner_tr],
+        mode="markers", name=f"Corner Speed ({result.corner_ias:.0f} {unit})", marker=dict(color="orange", size=9, symbol="x"), hoverinfo="skip"))
+
+    # Corner speed tick mark on x-axis
+    fig.add_shape(
+        type="line",
+        x0=result.corner_ias, x1=result.corner_ias,
+        y0=0, y1=-0.015,
+        xref="x", yref="paper",
+        line=dict(color="orange", width=1.5)
+    )
+    # Corner speed annotation on x-axis (inline with tick labels)
+    fig.add_annotation(
+        x=result.corner_ias,
+        y=-0.06,
+        yref="paper",
+        xref="x",
+        text=f"<b>{result.corner_ias:.0f}</b>",
+        showarrow=False,
+        font=dict(size=11, color="orange"),
+    )
+
+    # --- Vne line ---
+    vne_y_bot, vne_y_top = result.vne_y
+    fig.add_trace(go.Scatter(
+        x=[result.vne_x, result.vne_x],
+        y=[vne_y_bot, vne_y_top],
+        mode="lines",
+        name=result.max_speed_label,
+        line=dict(color="black", width=3, dash="dash"),
+        hoverinfo="skip"
+    ))
+
+    # --- Intermediate G lines ---
+    for g_inter, gx_display, gy, negative in result.g_lines:
+        fig.add_trace(go.Scatter(
+            x=gx_display, y=gy, mode="lines",
+            line=dict(color="yellow", width=1.2, dash="dot" if negative else "solid"),
+            showlegend=False, hoverinfo="skip"
+        ))
+        fig.add_annotation(
+            x=gx_display[-1] + 4, y=gy[-1], text=f"{g_inter:.1f}G",
+            showarrow=False, font=dict(color="black", size=10),
+            bgcolor="rgba(255,255,255,0.5)", borderpad=1
+        )
+
+    # --- AOB heatmap ---
+    if result.aob_heatmap is not None:
+        x, y, z = result.aob_heatmap
+        fig.add_trace(go.Heatmap(
+            x=x,
+            y=y,
+            z=z,
+            colorscale="Turbo",
+            zmin=0,
+            zmax=90,
+            opacity=0.5,
+            zsmooth="fast",
+            hoverinfo="skip",
+            colorbar=dict(
+                title="AOB (deg)",
+                x=1.02,              # slightly beyond the plot area
+                xanchor="left",
+                y=0.25,
+                len=0.6,            # scale down so it doesn’t dominate
+                thickness=15,
+            )
+        ))
+    if result.aob_heatmap_neg is not None:
+        x, y, z = result.aob_heatmap_neg
+        fig.add_trace(go.Heatmap(
+            x=x,
+            y=y,
+            z=z,
+            colorscale="Turbo",
+            zmin=0,
+            zmax=90,
+            opacity=0.5,
+            zsmooth="fast",
+            hoverinfo="skip",
+            showscale=False  # share scale with positive AOB
+        ))
+
+    # --- Turn radius lines ---
+    for radius, valid_x, valid_y in result.radius_lines:
+        fig.add_trace(go.Scatter(
+            x=valid_x,
+            y=valid_y,
+            mode="lines",
+            line=dict(color="blue", width=1, dash="dash"),
+            showlegend=False,
+            hoverinfo="skip",
+        ))
+        mid = len(valid_x) // 2
+        fig.add_annotation(
+            x=valid_x[mid],
+            y=valid_y[mid],
+            text=f"{radius} ft",
+            showarrow=False,
+            font=dict(color="blue", size=10),
+            bgcolor="rgba(255,255,255,0.5)",
+            borderpad=1,
+        )
+    if result.show_radius_legend:
+        fig.add_trace(go.Scatter(
+            x=[None], y=[None], mode="lines",
+            name="Turn Radius",
+            line=dict(color="blue", width=1, dash="dash"),
+            showlegend=True
+        ))
+    for radius, neg_valid_x, neg_valid_y in result.radius_lines_neg:
+        fig.add_trace(go.Scatter(
+            x=neg_valid_x,
+            y=neg_valid_y,
+            mode="lines",
+            line=dict(color="blue", width=1.5, dash="dot"),
+            showlegend=False,
+            hoverinfo="skip"
+        ))
+        mid = len(neg_valid_x) // 2
+        fig.add_annotation(
+            x=neg_valid_x[mid],
+            y=neg_valid_y[mid],
+            text=f"{radius} ft",
+            showarrow=False,
+            font=dict(color="blue", size=10),
+            bgcolor="rgba(255,255,255,0.5)",
+            borderpad=1,
+        )
+
+    # --- Dynamic Vmca curve ---
+    if result.dvmc is not None:
+        dvmc = result.dvmc
+        if len(dvmc["x"]) > 0:
+            vmca_hover = [
+                f"<b>DVmc</b><br>Bank: {bank:.0f}°<br>Vmca: {spd:.0f} {unit}<br>Turn Rate: {tr:.1f}°/s"
+                for bank, spd, tr in zip(dvmc["bank"], dvmc["x"], dvmc["y"])
+            ]
+            fig.add_trace(go.Scatter(
+                x=dvmc["x"],
+                y=dvmc["y"],
+                mode="lines",
+                name="DVmc",
+                line=dict(color="#DC143C", width=2.5, dash="dash"),
+                hoverinfo="text",
+                hovertext=vmca_hover,
+                showlegend=True
+            ))
+
+        if dvmc["label_off_scale"]:
+            # DVmc is off scale - label at right edge with actual value
+            label_text = f"<b>DVmc {dvmc['label_value']:.0f}</b> →"
+            arrow_x = 30  # Point arrow to the right
+        else:
+            label_text = f"<b>DVmc</b> {dvmc['label_value']:.0f}"
+            arrow_x = -45
+
+        fig.add_annotation(
+            x=dvmc["label_x"],
+            y=dvmc["label_y"],
+            text=label_text,
+            showarrow=True,
+            arrowhead=2,
+            ax=arrow_x,
+            ay=15,
+            font=dict(size=10, color="#DC143C"),
+            bgcolor="rgba(255,255,255,0.9)",
+            borderpad=3
+        )
+
+    # --- Dynamic Vyse curve ---
+    if result.dvyse is not None:
+        dvyse = result.dvyse
+        if len(dvyse["x"]) > 0:
+            vyse_hover = [
+                f"<b>DVyse</b><br>Bank: {bank:.0f}°<br>Vyse: {spd:.0f} {unit}<br>Turn Rate: {tr:.1f}°/s"
+                for bank, spd, tr in zip(dvyse["bank"], dvyse["x"], dvyse["y"])
+            ]
+            fig.add_trace(go.Scatter(
+                x=dvyse["x"],
+                y=dvyse["y"],
+                mode="lines",
+                name="DVyse",
+                line=dict(color="#00BFFF", width=2.5, dash="dot"),
+                hoverinfo="text",
+                hovertext=vyse_hover,
+                showlegend=True
+            ))
+
+        # Always show DVyse label at calculated value (even if clipped)
+        fig.add_annotation(
+            x=dvyse["label_value"],
+            y=dvyse["label_y"],
+            text=f"<b>DVyse</b> {dvyse['label_value']:.0f}",
+            showarrow=True,
+            arrowhead=2,
+            ax=-45,
+            ay=15,
+            font=dict(size=10, color="#00BFFF"),
+            bgcolor="rgba(255,255,255,0.9)",
+            borderpad=3
+        )
+
+    # --- Published Vyse / Vxse lines ---
+    if result.vyse_published is not None:
+        vyse_display, vyse_y_top = result.vyse_published
+        fig.add_trace(go.Scatter(
+            x=[vyse_display, vyse_display],
+            y=[0, vyse_y_top],
+            mode="lines",
+            name="Vyse",
+            line=dict(color="#87CEEB", width=2, dash="dashdot"),
+            hoverinfo="text",
+            hovertext=f"<b>Vyse</b><br>{vyse_display:.0f} {unit}<br>(Best rate SE climb)"
+        ))
+        # Annotation offset to the right to avoid overlap
+        fig.add_annotation(
+            x=vyse_display,
+            y=vyse_y_top,
+            text=f"<b>Vyse</b> {vyse_display:.0f}",
+            showarrow=True,
+            arrowhead=2,
+            ax=35,
+            ay=-15,
+            font=dict(size=9, color="#87CEEB"),
+            bgcolor="rgba(255,255,255,0.9)",
+            borderpad=2
+        )
+    if result.vxse_published is not None:
+        vxse_display, vxse_y_top = result.vxse_published
+        fig.add_trace(go.Scatter(
+            x=[vxse_display, vxse_display],
+            y=[0, vxse_y_top],
+            mode="lines",
+            name="Vxse",
+            line=dict(color="#00CC66", width=2, dash="dash"),
+            hoverinfo="text",
+            hovertext=f"<b>Vxse</b><br>{vxse_display:.0f} {unit}<br>(Best angle SE climb)"
+        ))
+        # Annotation offset to the left to avoid overlap
+        fig.add_annotation(
+            x=vxse_display,
+            y=vxse_y_top,
+            text=f"<b>Vxse</b> {vxse_display:.0f}",
+            showarrow=True,
+            arrowhead=2,
+            ax=-35,
+            ay=-15,
+            font=dict(size=9, color="#00CC66"),
+            bgcolor="rgba(255,255,255,0.9)",
+            borderpad=2
+        )
+
+    # --- Hover grid ---
+    if result.hover_x:
+        fig.add_trace(go.Scatter(
+            x=result.hover_x,
+            y=result.hover_y,
+            customdata=result.hover_data,
+            mode="markers",
+            marker=dict(size=8, color="rgba(0,0,0,0)"),
+            hovertemplate=(
+                f"<b>IAS:</b> %{{x:.0f}} {unit}<br>"
+                f"<b>Turn Rate:</b> %{{y:.1f}}°/s<br>"
+                f"<b>Bank:</b> %{{customdata[0]:.0f}}°<br>"
+                f"<b>Load Factor:</b> %{{customdata[1]:.2f}} G<br>"
+                f"<b>Ps:</b> %{{customdata[2]:.1f}} kts/s<br>"
+                f"<b>Turn Radius:</b> %{{customdata[3]:.2f}} nm"
+                f"<extra></extra>"
+            ),
+            name="",
+            showlegend=False
+        ))
+
+    # --- Ps contours ---
+    if result.ps_contours is not None:
+        ias_vals_ps_display, tr_vals_ps, Ps_masked = result.ps_grid
+        ps = result.ps_contours
+        fig.add_trace(go.Contour(
+            x=ias_vals_ps_display,
+            y=tr_vals_ps,
+            z=Ps_masked,
+            contours=dict(
+                coloring="none", showlabels=False,
+                start=ps["min"], end=ps["max"], size=10
+            ),
+            line=dict(width=1, color="gray", dash="dot"),
+            connectgaps=False,
+            showscale=False,
+            hoverinfo="skip",
+            name="Ps"
+        ))
+
+        # Bold Ps = 0 overlay
+        if 0 in ps["levels"]:
+            fig.add_trace(go.Contour(
+                x=ias_vals_ps_display,
+                y=tr_vals_ps,
+                z=Ps_masked,
+                contours=dict(
+                    coloring="none", showlabels=False,
+                    start=0, end=0, size=1
+                ),
+                line=dict(width=3, color="gray", dash="dot"),
+                connectgaps=False,
+                showscale=False,
+                hoverinfo="skip",
+                showlegend=False
+            ))
+
+        for x, y, level in ps["labels"]:
+            fig.add_annotation(
+                x=x,
+                y=y,
+                text=f"{level}",
+                showarrow=False,
+                font=dict(color="gray", size=10),
+                bgcolor="rgba(255,255,255,0.6)",
+                borderpad=1,
+            )
+
+    # --- Published Vmca line ---
+    if result.vmca_published is not None:
+        vmca_converted, vmca_y_top = result.vmca_published
+        fig.add_trace(go.Scatter(
+            x=[vmca_converted, vmca_converted],
+            y=[0, vmca_y_top],
+            mode="lines",
+            name="Published Vmca",
+            line=dict(color="#FF6B6B", width=2, dash="dash"),
+            hoverinfo="text",
+            hovertext=f"<b>Published Vmca</b><br>{vmca_converted:.0f} {unit}<br>(Minimum controllable airspeed)"
+        ))
+        fig.add_annotation(
+            x=vmca_converted,
+            y=vmca_y_top,
+            text=f"<b>Vmca</b> {vmca_converted:.0f}",
+            showarrow=False,
+            yshift=12,
+            font=dict(size=9, color="#FF6B6B"),
+            bgcolor="rgba(255,255,255,0.9)",
+            xanchor="center"
+        )
+
+    is_mobile = result.is_mobile
+    legend_font_size = 10 if is_mobile else 12
+
+    fig.update_layout(
+        title=dict(
+            text=f"<b>{result.ac_name}</b>" if not is_mobile else result.ac_name,
+            font=dict(size=22 if not is_mobile else 14, color="#005F8C"),
+            x=0.5,
+            y=0.95,
+            xanchor="center",
+            yanchor="top"
+        ),
+        xaxis=dict(
+            title=f"Indicated Airspeed ({unit})",
+            title_font=dict(size=14 if not is_mobile else 10),
+            tickfont=dict(size=12 if not is_mobile else 9),
+            dtick=10,
+            range=list(result.x_range),
+            showgrid=True,
+            showspikes=False,
+            spikemode="across",
+            spikesnap="cursor"
+        ),
+        yaxis=dict(
+            title="Turn Rate (deg/sec)",
+            title_font=dict(size=14 if not is_mobile else 10),
+            tickfont=dict(size=12 if not is_mobile else 9),
+            dtick=5,
+            range=list(result.y_range),
+            showgrid=True,
+            showspikes=False,
+            spikemode="across",
+            spikesnap="cursor"
+        ),
+        legend=dict(
+            orientation="h",
+            yanchor="top",
+            y=-0.25,  # Push legend below x-axis
+            xanchor="center",
+            x=0.5,
+            font=dict(size=legend_font_size)
+        ),
+        margin=dict(
+            t=60 if is_mobile else 100,
+            b=100 if is_mobile else 80,
+            l=40,
+            r=40
+        ),
+        paper_bgcolor="#f7f9fc",
+        plot_bgcolor="#f7f9fc",
+        font=dict(color="#1b1e23"),
+        hovermode="closest"
+    )
+
+    # === Steep turn maneuver trace ===
+    if result.steep_turn is not None:
+        st = result.steep_turn
+        arc_ias_display = st["x"]
+        tr_deg = st["turn_rate"]
+        n = st["load_factor"]
+        aob_input = st["aob"]
+
+        # Contextual hover text for each point
+        steep_hover = [
+            f"<b>Roll In (Wings Level)</b><br>AOB: 0°<br>IAS: {arc_ias_display[0]:.0f} {unit}<br>Turn Rate: 0°/s<br>G: 1.00",
+            f"<b>Operating Point</b><br>AOB: {aob_input}°<br>IAS: {arc_ias_display[1]:.0f} {unit}<br>Turn Rate: {tr_deg:.1f}°/s<br>G: {n:.2f}<br>Ps: {st['ps']:.1f} kts/s"
+        ]
+
+        fig.add_trace(go.Scatter(
+            x=arc_ias_display,
+            y=st["y"],
+            mode="lines+markers",
+            line=dict(color="darkgreen", width=3),
+            marker=dict(size=8, symbol=["circle", "diamond"]),
+            name="Steep Turn",
+            hoverinfo="text",
+            hovertext=steep_hover,
+            showlegend=True
+        ))
+
+        # Annotation at operating point showing key values
+        fig.add_annotation(
+            x=arc_ias_display[1],
+            y=tr_deg,
+            text=f"<b>{aob_input}° AOB</b><br>{n:.1f}G | Ps: {st['ps']:.1f}",
+            showarrow=True,
+            arrowhead=2,
+            ax=50,
+            ay=-25,
+            font=dict(size=10, color="darkgreen"),
+            bgcolor="rgba(255,255,255,0.85)",
+            borderpad=3
+        )
+
+        # Annotation at wings level
+        fig.add_annotation(
+            x=arc_ias_display[0],
+            y=0,
+            text="Wings Level",
+            showarrow=False,
+            yshift=-15,
+            font=dict(size=9, color="darkgreen"),
+            bgcolor="rgba(255,255,255,0.7)",
+            borderpad=2
+        )
+
+    # === Ghost trace (ideal AOB for the ACS standard) ===
+    if result.steep_turn_ghost is not None:
+        ghost = result.steep_turn_ghost
+        fig.add_trace(go.Scatter(
+            x=ghost["x"],
+            y=ghost["y"],
+            mode="lines",
+            line=dict(color="white", width=2, dash="dot"),
+            name=f"{ghost['standard']} ({ghost['aob']}°)",
+            hoverinfo="skip",
+            showlegend=True
+        ))
+        fig.add_trace(go.Scatter(
+            x=[ghost["x"][1]],
+            y=[ghost["y"][1]],
+            mode="markers",
+            marker=dict(color="white", size=7, symbol="circle"),
+            name="",
+            hoverinfo="skip",
+            showlegend=False
+        ))
+
+    # === Chandelle maneuver traces ===
+    for path in result.chandelles:
+        if path["ghost"]:
+            _add_chandelle(fig, path, unit, color="white", dash="dot", label="Chandelle Ghost",
+                           show_annotations=False)
+        else:
+            _add_chandelle(fig, path, unit)
+
+    return fig
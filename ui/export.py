@@ -0,0 +1,119 @@
+# ui/export.py
+
+"""
+Decoration of EM figures for PNG/PDF export: logo, summary header and legal
+footer. Shared by the app's export callbacks and fleet_report.py, which
+renders sheets without importing the Dash app.
+"""
+
+import functools
+import os
+
+from core.aircraft_loader import aircraft_data
+from core.log import get_logger
+
+log = get_logger("export")
+
+# Resolved from this file, so exports work from any working directory
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+EXPORT_OVERLAY_NAMES = {
+    "ps": "Ps Contours",
+    "radius": "Turn Radius",
+    "g": "G-Lines",
+    "aob": "AOB Shading",
+    "negative_g": "Neg-G Envelope",
+    "vmca": "Dynamic Vmc",
+    "vyse": "Dynamic Vyse"
+}
+
+EXPORT_FOOTER_TEXT = "© 2025 Nicholas Len, AEROEDGE. All rights reserved. | Not FAA-approved. For educational and reference use only."
+
+
+@functools.lru_cache(maxsize=1)
+def load_export_logo():
+    """Decode logo2.png once per process; None if missing or PIL is unavailable."""
+    try:
+        logo_path = os.path.join(ASSETS_DIR, "logo2.png")
+        if os.path.exists(logo_path):
+            from PIL import Image
+            logo_img = Image.open(logo_path)
+            logo_img.load()
+            return logo_img
+    except Exception as e:
+        log.warning("Failed to load logo2.png: %s", e)
+    return None
+
+
+def get_export_summary_lines(ac_name, engine_name, config, gear, occupants, pax_weight, fuel, total_weight,
+                             power_fraction, altitude, oei_toggle, prop_condition, maneuver,
+                             oat_c, speed_unit, cg_position, active_overlays):
+    """Summary header lines for PNG/PDF exports (without the timestamp)."""
+    oei_status = "YES" if oei_toggle and "enabled" in oei_toggle else "NO"
+
+    # Convert OAT to Fahrenheit for display
+    oat_f = round(oat_c * 9/5 + 32) if oat_c is not None else "N/A"
+    oat_display = f"{oat_c}°C / {oat_f}°F" if oat_c is not None else "N/A"
+
+    # Calculate CG in inches from slider position and aircraft CG range
+    cg_display = "N/A"
+    if cg_position is not None and ac_name and ac_name in aircraft_data:
+        ac = aircraft_data[ac_name]
+        cg_range = ac.get("cg_range", [0, 100])
+        cg_inches = cg_range[0] + cg_position * (cg_range[1] - cg_range[0])
+        cg_display = f"{cg_inches:.1f} in"
+
+    # Format active overlays
+    active_overlay_list = [EXPORT_OVERLAY_NAMES.get(o, o) for o in (active_overlays or [])]
+    overlays_display = ", ".join(active_overlay_list) if active_overlay_list else "None"
+
+    return [
+        f"Engine: {engine_name} | {config} | Gear: {gear}",
+        f"Weight: {int(total_weight) if total_weight else 'N/A'} lbs | Occupants: {occupants} x {pax_weight or 180} lbs | Fuel: {fuel} gal | CG: {cg_display}",
+        f"Altitude: {altitude or 0} ft | OAT: {oat_display} | Power: {int(power_fraction * 100)}%",
+        f"Speed Unit: {speed_unit or 'KIAS'} | OEI: {oei_status}" + (f" ({prop_condition})" if oei_status == "YES" else ""),
+        f"Overlays: {overlays_display}" + (f" | Maneuver: {maneuver}" if maneuver else ""),
+    ]
+
+
+def decorate_export_figure(fig, summary_lines, export_timestamp):
+    """Add the logo, summary header and legal footer used by PNG/PDF exports."""
+    # ✅ Add Logo (logo2.png in top-left)
+    logo_img = load_export_logo()
+    if logo_img is not None:
+        fig.add_layout_image(
+            dict(
+                source=logo_img,
+                xref="paper", yref="paper",
+                x=-0.05, y=1.25,
+                sizex=0.25, sizey=0.25,
+                xanchor="left", yanchor="top",
+                layer="above"
+            )
+        )
+
+    # ✅ Summary Text
+    fig.add_annotation(
+        text="<br>".join(summary_lines + [f"<i>Generated: {export_timestamp}</i>"]),
+        xref="paper", yref="paper",
+        x=0.5, y=1.01,
+        xanchor="center", yanchor="bottom",
+        showarrow=False,
+        font=dict(size=10, color="#1b1e23"),
+        align="center"
+    )
+
+    # ✅ Footer for exports
+    fig.add_annotation(
+        text=EXPORT_FOOTER_TEXT,
+        xref="paper", yref="paper",
+        x=0.5, y=-0.12,
+        xanchor="center", yanchor="top",
+        showarrow=False,
+        font=dict(size=9, color="gray"),
+        align="center"
+    )
+
+    # ✅ Clean layout margin (increased top margin for additional info lines)
+    fig.update_layout(margin=dict(t=180, b=80))
+    return fig